@@ -27,45 +27,70 @@
 ###########################################################################
 from __future__ import annotations
 
-import html
 import logging
-import re
 import sqlite3
 import ssl
 import urllib
-import xml.dom.minidom
-import xml.etree.ElementTree as ET
-import zipfile
-from collections.abc import Callable, Iterator, Sequence
+from collections.abc import Callable, Sequence
 from functools import partial
-from pathlib import Path
-from shutil import copy, copytree, move, rmtree
+from itertools import chain
+from pathlib import Path, PurePosixPath
+from shutil import copy, rmtree
 from tempfile import TemporaryDirectory
-from time import localtime, strftime
-from typing import (
-    TYPE_CHECKING,
-    Final,
-    Literal,
-    NamedTuple,
-    assert_never,
-    overload,
-    override,
-)
-from xml.dom import EMPTY_NAMESPACE
-from xml.dom.minicompat import NodeList
-from xml.dom.minidom import Element
+from typing import Any, Final, Literal, assert_never, override
 from xml.parsers.expat import ExpatError
 
 import attrs
 import certifi
-import defusedxml.minidom  # type: ignore[import-untyped]
 import qtawesome
 from httpx import HTTPError
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from .__about__ import __title__
+from .addons.addon_info import (
+    Addon,
+    AddonInfo,
+    AddonType,
+    get_addons_feed_url,
+    get_compendium_plugin_files,
+    get_installed_addon_paths,
+    get_interface_info_url,
+    get_plugin_package_folder,
+    parse_addons_feed,
+    parse_compendium_file,
+)
+from .addons.cache import (
+    ADDON_COLUMN_NAMES,
+    ADDON_UPDATES_TABLE,
+    CACHE_STATE_TABLE,
+    LEGACY_ADDONS_CACHE_PATH,
+    attach_addon_catalog,
+    compute_addon_updates,
+    create_addon_updates_table,
+    create_cache_state_table,
+    get_addon_folder_fingerprint,
+    get_cache_state,
+    get_catalog_fetched_at,
+    get_catalog_modified_at,
+    get_installed_addons_cache_path,
+    get_outdated_addon_ids,
+    is_catalog_fresh,
+    replace_catalog,
+    set_cache_state,
+)
+from .addons.installer import (
+    AddonOperationError,
+    InstalledZipAddon,
+    get_addon_archive_id,
+    install_zip_addon,
+)
+from .addons.music_index import MusicIndex, MusicIndexEntry
 from .addons.startup_script import StartupScript
-from .config import platform_dirs
+from .addons.transactions import (
+    get_archived_addon_version,
+    is_transaction_path,
+    rollback_addon_version,
+)
 from .config_manager import ConfigManager
 from .game_config import GameConfigID, GameType
 from .game_launcher_local_config import GameLauncherLocalConfig
@@ -76,91 +101,14 @@ from .ui.qtapp import get_qapp
 from .ui.qtdesigner.custom_widgets import QWidgetWithStylePreview
 from .utilities import CaseInsensitiveAbsolutePath
 
-if TYPE_CHECKING:
-    from xml.dom.minidom import _ElementChildren
-
 logger = logging.getLogger(__name__)
 
 
-# Just to fix type hints
-class Document(xml.dom.minidom.Document):
-    @override
-    # The type hints for this didn't include the return type or that it accepts
-    # `EMPTY_NAMESPACE` which is equal to `None`.
-    def createElementNS(self, namespaceURI: str | None, qualifiedName: str) -> Element:
-        return super().createElementNS(namespaceURI, qualifiedName)
-
-
-AddonType = Literal["plugin", "music", "skin"]
-
-
-class Addon(NamedTuple):
-    interface_id: str
-    file: str
-    """File is the URL if the addon is remote."""
-    name: str
-
-
-@attrs.define
-class AddonInfo(Sequence[str]):
-    # DON'T CHANGE THE ORDER OF THESE FIELDS. This is a wrapper over what used to be
-    # normal sequences of strings.
-    name: str | Literal[""] = ""
-    category: str | Literal[""] = ""
-    version: str | Literal[""] = ""
-    author: str | Literal[""] = ""
-    latest_release: str | Literal[""] = ""
-    file: str | Literal[""] = ""
-    """File is the URL if the addon is remote."""
-    interface_id: str | Literal[""] = ""
-    dependencies: str | Literal[""] = ""
-    startup_script: str | Literal[""] = ""
-
-    @override
-    def __iter__(self) -> Iterator[str | Literal[""]]:
-        yield from attrs.astuple(self)
-
-    @override
-    def __len__(self) -> int:
-        return len(attrs.astuple(self))
-
-    @overload
-    def __getitem__(self, int: int, /) -> str: ...
-    @overload
-    def __getitem__(self, slice: slice, /) -> Sequence[str]: ...
-
-    @override
-    def __getitem__(self, key: int | slice) -> str | tuple[str, ...]:
-        return attrs.astuple(self).__getitem__(key)
-
-    def __setitem__(self, index: int, value: str) -> None:
-        setattr(self, tuple(attrs.asdict(self).keys())[index], value)
-
-
-def GetText(nodelist: NodeList[_ElementChildren]) -> str:
-    return "".join(
-        node.data  # type: ignore[union-attr]
-        for node in nodelist
-        if node.nodeType in [node.TEXT_NODE, node.CDATA_SECTION_NODE]
-    )
-
-
 class AddonManagerWindow(QWidgetWithStylePreview):
     # ID is from the order plugins are found on the filesystem. InterfaceID is
     # the unique ID for plugins on lotrointerface.com
     # Don't change order of list
-    COLUMN_LIST: Final = (
-        "ID",
-        "Name",
-        "Category",
-        "Version",
-        "Author",
-        "LatestRelease",
-        "File",
-        "InterfaceID",
-        "Dependencies",
-        "StartupScript",
-    )
+    COLUMN_LIST: Final = ("ID", *ADDON_COLUMN_NAMES)
     type TableWidgetColumnName = Literal[
         "ID",
         "Name",
@@ -202,15 +150,11 @@ class AddonManagerWindow(QWidgetWithStylePreview):
     TAB_NAMES_LOTRO: Final[tuple[AddonTypeTabName, ...]] = ("Plugins", "Skins", "Music")
     TAB_NAMES_DDO: Final[tuple[AddonTypeTabName, ...]] = ("Skins",)
 
-    PLUGINS_URL = "https://api.lotrointerface.com/fav/OneLauncher-Plugins.xml"
-    SKINS_URL = "https://api.lotrointerface.com/fav/OneLauncher-Themes.xml"
-    MUSIC_URL = "https://api.lotrointerface.com/fav/OneLauncher-Music.xml"
-    SKINS_DDO_URL = "https://api.lotrointerface.com/fav/OneLauncher-Themes-DDO.xml"
-
     CATEGORY_UNMANAGED: Final = "Unmanaged"
     """Category name for unmanaged addons"""
 
-    ADDONS_CACHE_PATH = platform_dirs.user_cache_path / "addons_cache.sqlite"
+    closed = QtCore.Signal()
+    """Emitted when the window is closed"""
 
     def __init__(
         self,
@@ -286,6 +230,8 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             self.actionUninstallAddonSelected
         )
         self.ui.actionUpdateAddon.triggered.connect(self.actionUpdateAddonSelected)
+        self.actionRollBackAddon = QtGui.QAction("Roll back to previous version", self)
+        self.actionRollBackAddon.triggered.connect(self.actionRollBackAddonSelected)
 
         self.ui.actionEnableStartupScript.triggered.connect(
             self.actionEnableStartupScriptSelected
@@ -346,12 +292,13 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             self.actionShowOnLotrointerfaceSelected
         )
 
-        self.openDB()
-
+        self.music_index: MusicIndex | None = None
         self.data_folder = get_game_settings_dir(
             game_config=self.config_manager.get_game_config(self.game_id),
             launcher_local_config=launcher_local_config,
         )
+        self.addons_cache_path = get_installed_addons_cache_path(self.data_folder)
+        self.openDB()
         if game_config.game_type == GameType.DDO:
             self.data_folder_skins = self.data_folder / "ui/skins"
             self.ui.tableSkinsInstalled.setObjectName("tableSkinsDDOInstalled")
@@ -360,6 +307,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             self.data_folder_plugins = self.data_folder / "Plugins"
             self.data_folder_skins = self.data_folder / "ui/skins"
             self.data_folder_music = self.data_folder / "Music"
+            self.music_index = MusicIndex(self.data_folder_music)
         # This will load up whatever's needed for the initial tab. Ex. Plugins
         self.tabBarInstalledIndexChanged(self.ui.tabBarInstalled.currentIndex())
 
@@ -367,11 +315,18 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self.data_folder_skins.mkdir(parents=True, exist_ok=True)
 
         if not folders_list:
+            self.saveInstalledAddonsFingerprint(
+                self.ui.tableSkinsInstalled,
+                get_addon_folder_fingerprint(self.data_folder_skins),
+            )
             self.c.execute(
                 f"DELETE FROM {self.ui.tableSkinsInstalled.objectName()}"  # nosec  # noqa: S608
             )
             folders_list = [
-                path for path in self.data_folder_skins.glob("*") if path.is_dir()
+                path
+                for path in self.data_folder_skins.glob("*")
+                if path.is_dir()
+                and not is_transaction_path(path.relative_to(self.data_folder_skins))
             ]
 
         skins_list = []
@@ -392,7 +347,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         table = self.ui.tableSkinsInstalled
 
         for skin in skins_list_compendium:
-            addon_info = self.parseCompendiumFile(skin, "SkinConfig")
+            addon_info = parse_compendium_file(skin, "SkinConfig")
             if addon_info is None:
                 continue
             addon_info = self.getOnlineAddonInfo(
@@ -411,50 +366,54 @@ class AddonManagerWindow(QWidgetWithStylePreview):
 
     def getInstalledMusic(self, folders_list: list[Path] | None = None) -> None:
         self.data_folder_music.mkdir(parents=True, exist_ok=True)
+        music_index = self.get_music_index()
+        music_index.refresh()
 
+        # Loose `.abc` files are only added when everything is being reloaded, since
+        # adding them again when specific folders are reloaded would duplicate them.
+        abc_files: list[MusicIndexEntry] = []
         if not folders_list:
+            self.saveInstalledAddonsFingerprint(
+                self.ui.tableMusicInstalled,
+                get_addon_folder_fingerprint(self.data_folder_music),
+            )
             self.c.execute(f"DELETE FROM {self.ui.tableMusicInstalled.objectName()}")  # noqa: S608
             folders_list = [
-                path for path in self.data_folder_music.glob("*") if path.is_dir()
+                self.data_folder_music / relative_folder
+                for relative_folder in music_index.get_subdirectories(PurePosixPath())
             ]
+            abc_files = music_index.get_files(PurePosixPath(), suffix=".abc")
 
-        music_list = []
-        music_list_compendium = []
+        music_list: list[Path] = []
+        music_list_compendium: list[Path] = []
         for folder in folders_list:
-            music_list.append(folder)
-            for file in folder.iterdir():
-                if file.suffix == ".musiccompendium":
-                    music_list_compendium.append(folder / file)
-                    music_list.remove(folder)
-                    break
+            if compendium_files := music_index.get_files(
+                PurePosixPath(folder.relative_to(self.data_folder_music).as_posix()),
+                suffix=".musiccompendium",
+            ):
+                music_list_compendium.append(
+                    self.data_folder_music / compendium_files[0].path
+                )
+            else:
+                music_list.append(folder)
 
-        music_list.extend(
-            file for file in self.data_folder_music.iterdir() if file.suffix == ".abc"
-        )
-        self.addInstalledMusicToDB(music_list, music_list_compendium)
-
-    def parse_abc_file(self, abc_path: Path) -> tuple[str, str]:
-        with abc_path.open() as file:
-            song_name = ""
-            author = ""
-            for _ in range(3):
-                line = file.readline().strip()
-                if line.startswith("T: "):
-                    song_name = line[3:]
-                if line.startswith("Z: "):
-                    author = (
-                        line[18:] if line.startswith("Z: Transcribed by ") else line[3:]
-                    )
+        self.addInstalledMusicToDB(music_list, music_list_compendium, abc_files)
 
-            return song_name, author
+    def get_music_index(self) -> MusicIndex:
+        if self.music_index is None:
+            raise ValueError("Game doesn't support music")
+        return self.music_index
 
     def addInstalledMusicToDB(
-        self, music_list: list[Path], music_list_compendium: list[Path]
+        self,
+        music_list: list[Path],
+        music_list_compendium: list[Path],
+        abc_files: Sequence[MusicIndexEntry] = (),
     ) -> None:
         table = self.ui.tableMusicInstalled
 
         for music in music_list_compendium:
-            addon_info = self.parseCompendiumFile(music, "MusicConfig")
+            addon_info = parse_compendium_file(music, "MusicConfig")
             if addon_info is None:
                 continue
             addon_info = self.getOnlineAddonInfo(addon_info, "tableMusic")
@@ -464,10 +423,16 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             addon_info = AddonInfo(
                 name=music.stem, file=str(music), category=self.CATEGORY_UNMANAGED
             )
-            if music.suffix == ".abc":
-                song_name, addon_info.author = self.parse_abc_file(music)
-                if song_name:
-                    addon_info.name = song_name
+            self.addRowToDB(table, addon_info)
+
+        for abc_file in abc_files:
+            path = self.data_folder_music / abc_file.path
+            addon_info = AddonInfo(
+                name=abc_file.title or path.stem,
+                author=abc_file.transcriber,
+                file=str(path),
+                category=self.CATEGORY_UNMANAGED,
+            )
             self.addRowToDB(table, addon_info)
 
         # Populate user visible table
@@ -479,9 +444,16 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self.data_folder_plugins.mkdir(parents=True, exist_ok=True)
 
         if not folders_list:
+            self.saveInstalledAddonsFingerprint(
+                self.ui.tablePluginsInstalled,
+                get_addon_folder_fingerprint(self.data_folder_plugins),
+            )
             self.c.execute(f"DELETE FROM {self.ui.tablePluginsInstalled.objectName()}")  # noqa: S608
             folders_list = [
-                path for path in self.data_folder_plugins.glob("*") if path.is_dir()
+                path
+                for path in self.data_folder_plugins.glob("*")
+                if path.is_dir()
+                and not is_transaction_path(path.relative_to(self.data_folder_plugins))
             ]
 
         # Finds all plugins and adds their .plugincompendium files to a list
@@ -489,6 +461,8 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         plugins_list = []
         for folder in folders_list:
             for file in folder.glob("**/*.plugin*"):
+                if is_transaction_path(file.relative_to(folder)):
+                    continue
                 if file.suffix == ".plugincompendium":
                     # .plugincompenmdium file should be in author folder of plugin
                     if file.parent == folder:
@@ -507,34 +481,22 @@ class AddonManagerWindow(QWidgetWithStylePreview):
     ) -> None:
         """Removes plugin files from plugin_files that aren't managed by a compendium file"""
         for compendium_file in compendium_files:
-            try:
-                doc = defusedxml.minidom.parse(str(compendium_file))
-            except ExpatError:
-                logger.warning(
-                    "`.plugincompendium` file has invalid XML: %s",
-                    compendium_file,
-                    exc_info=True,
-                )
+            descriptor_paths = get_compendium_plugin_files(
+                compendium_file, self.data_folder_plugins
+            )
+            if descriptor_paths is None:
                 continue
-            nodes = doc.getElementsByTagName("Descriptors")[0].childNodes
 
-            for node in nodes:
-                if node.nodeName == "descriptor":
-                    descriptor_path = self.data_folder_plugins / (
-                        GetText(node.childNodes).replace("\\", "/")
-                    )
+            for descriptor_path in descriptor_paths:
+                # Remove descriptor plugin file from plugin_files
+                descriptor_plugin_files = [
+                    file for file in plugin_files if file == descriptor_path
+                ]
+                for file in descriptor_plugin_files:
+                    plugin_files.remove(file)
 
-                    # Remove descriptor plugin file from plugin_files
-                    descriptor_plugin_files = [
-                        file for file in plugin_files if file == descriptor_path
-                    ]
-                    for file in descriptor_plugin_files:
-                        plugin_files.remove(file)
-
-                    if not descriptor_path.exists():
-                        logger.error(
-                            "%s has misconfigured descriptors", compendium_file
-                        )
+                if not descriptor_path.exists():
+                    logger.error("%s has misconfigured descriptors", compendium_file)
 
     def addInstalledPluginsToDB(
         self,
@@ -547,12 +509,12 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             # Sets tag for plugin file xml search and category for unmanaged
             # plugins
             if file.suffix == ".plugincompendium":
-                addon_info = self.parseCompendiumFile(file, "PluginConfig")
+                addon_info = parse_compendium_file(file, "PluginConfig")
                 if addon_info is None:
                     continue
                 addon_info = self.getOnlineAddonInfo(addon_info, "tablePlugins")
             else:
-                addon_info = self.parseCompendiumFile(file, "Information")
+                addon_info = parse_compendium_file(file, "Information")
                 if addon_info is None:
                     continue
                 addon_info.category = self.CATEGORY_UNMANAGED
@@ -562,40 +524,6 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         # Populate user visible table
         self.reloadSearch(self.ui.tablePluginsInstalled)
 
-    def getAddonDependencies(self, dependencies_node: Element) -> str:
-        dependencies = ""
-        for node in dependencies_node.childNodes:
-            if node.nodeName == "dependency" and node.childNodes:
-                dependencies = f"{dependencies},{GetText(node.childNodes)}"
-        return dependencies[1:]
-
-    def parseCompendiumFile(self, file: Path, tag: str) -> AddonInfo | None:
-        """Returns list of common values for compendium or .plugin files"""
-        addon_info = AddonInfo()
-
-        try:
-            doc = defusedxml.minidom.parse(str(file))
-            nodes = doc.getElementsByTagName(tag)[0].childNodes
-        except (ExpatError, IndexError):
-            logger.exception("`%s` has invalid XML", file.name)
-            return None
-        for node in nodes:
-            if node.nodeName == "Name":
-                addon_info.name = GetText(node.childNodes)
-            elif node.nodeName == "Author":
-                addon_info.author = GetText(node.childNodes)
-            elif node.nodeName == "Version":
-                addon_info.version = GetText(node.childNodes)
-            elif node.nodeName == "Id":
-                addon_info.interface_id = GetText(node.childNodes)
-            elif node.nodeName == "Dependencies":
-                addon_info.dependencies = self.getAddonDependencies(node)
-            elif node.nodeName == "StartupScript":
-                addon_info.startup_script = GetText(node.childNodes)
-        addon_info.file = str(file)
-
-        return addon_info
-
     def getOnlineAddonInfo(
         self, addon_info: AddonInfo, remote_addons_table: str
     ) -> AddonInfo:
@@ -615,27 +543,40 @@ class AddonManagerWindow(QWidgetWithStylePreview):
 
     def openDB(self) -> None:
         """
-        Opens addons_cache database and creates new database if
-        one doesn't exist or the current one has an outdated structure
+        Opens the addons cache database for the game settings folder and creates new
+        database if one doesn't exist or the current one has an outdated structure.
+        The shared addon catalog database gets attached as `catalog`.
         """
-        if self.ADDONS_CACHE_PATH.exists():
+        # The addons cache used to be one database for every game.
+        LEGACY_ADDONS_CACHE_PATH.unlink(missing_ok=True)
+
+        if self.addons_cache_path.exists():
             # Connects to addons_cache database
-            self.conn = sqlite3.connect(str(self.ADDONS_CACHE_PATH))
+            self.conn = sqlite3.connect(str(self.addons_cache_path))
             self.c = self.conn.cursor()
 
             # Replace old database if its structure is out of date
             if self.isCurrentDBOutdated():
                 self.closeDB()
-                self.ADDONS_CACHE_PATH.unlink()
+                self.addons_cache_path.unlink()
                 self.createDB()
         else:
             self.createDB()
 
+        create_cache_state_table(self.c)
+        create_addon_updates_table(self.c)
+        attach_addon_catalog(self.c)
+
     def isCurrentDBOutdated(self) -> bool:
         """
         Checks if currently loaded database's structure is up to date.
         Returns True if it is outdated and False otherwise.
         """
+        # Update state used to be stored as prefixes in the version columns.
+        if not self.c.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (ADDON_UPDATES_TABLE,)
+        ).fetchone():
+            return True
 
         tables_dict: dict[str, list[str]] = {}
         # SQL returns all the columns in all the tables labeled with what table
@@ -649,7 +590,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             # Ignore tables without actual information
             if column_data[0].endswith(
                 ("_idx", "_docsize", "_data", "_content", "_config")
-            ):
+            ) or column_data[0] in (CACHE_STATE_TABLE, ADDON_UPDATES_TABLE):
                 continue
 
             if column_data[0] in tables_dict:
@@ -680,8 +621,8 @@ class AddonManagerWindow(QWidgetWithStylePreview):
 
     def createDB(self) -> None:
         """Creates ans sets up addons_cache database"""
-        self.ADDONS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.ADDONS_CACHE_PATH))
+        self.addons_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.addons_cache_path))
         self.c = self.conn.cursor()
 
         for table in self.TABLE_LIST:
@@ -727,7 +668,17 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self,
         addon_path: Path,
         interface_id: str | None = None,
+        replaced_paths: Sequence[Path] = (),
     ) -> None:
+        """
+        Args:
+            addon_path (Path): Addon file or archive
+            interface_id (str | None, optional): Interface ID of the addon, if it was
+                installed from online.
+            replaced_paths (Sequence[Path], optional): Files from a previous version of
+                the addon. They get removed in the same transaction as the new version
+                gets installed in, so they are only removed if the install succeeds.
+        """
         # Install .abc files
         if addon_path.suffix == ".abc":
             self.installAbcFile(addon_path)
@@ -741,7 +692,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             )
             return
         elif addon_path.suffix == ".zip":
-            self.installZipAddon(addon_path, interface_id)
+            self.installZipAddon(addon_path, interface_id, replaced_paths)
 
     def installAbcFile(self, addon_path: Path) -> None:
         if self.config_manager.get_game_config(self.game_id).game_type == GameType.DDO:
@@ -759,246 +710,88 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self,
         addon_path: Path,
         interface_id: str | None,
+        replaced_paths: Sequence[Path] = (),
     ) -> None:
-        with TemporaryDirectory() as tmp_dir_name:
-            tmp_dir = CaseInsensitiveAbsolutePath(tmp_dir_name)
-
-            # Extract addon to temporary directory.
-            with zipfile.ZipFile(addon_path, "r") as archive:
-                # Addons without any files aren't valid
-                if all(zip_info.is_dir() for zip_info in archive.infolist()):
-                    logger.error("Addon Zip is empty")
-                    return
-
-                archive.extractall(tmp_dir)
-
-            self.clean_temp_addon_folder(tmp_dir)
-
-            for path in tmp_dir.glob("**/*.*"):
-                if path.suffix == ".plugin":
-                    self.install_plugin(tmp_dir, interface_id)
-                    return
-                elif path.suffix == ".abc":
-                    if (
-                        self.install_music(tmp_dir, interface_id, addon_path.stem)
-                        is not False
-                    ):
-                        return
-            # Skins always have `SkinDefinition.xml` files but there aren't necessarily
-            # at any given directory level.
-            self.install_skin(tmp_dir, interface_id, addon_path.stem)
-
-    def install_plugin(
-        self, tmp_dir: CaseInsensitiveAbsolutePath, interface_id: str | None
-    ) -> None:
-        """Install plugin from temporary directory"""
-        if self.config_manager.get_game_config(self.game_id).game_type == GameType.DDO:
-            logger.error("DDO does not support plugins")
-            return
-
-        table = self.ui.tablePlugins
-
-        author_folders = list(tmp_dir.glob("*/"))
-
-        # Filter out common dependency folder names
-        # that are sometimes included with plugins.
-        filtered_author_folders = [
-            folder
-            for folder in author_folders
-            if folder.name.lower() not in ["turbine", "turbineplugins"]
-        ]
-        # Use non-filtered author folders if there are no author
-        # folders left after filtering.
-        # Ex. When installing the filtered libraries standalone.
-        author_folders = filtered_author_folders or author_folders
-
-        # There can only be one author folder. That is where the
-        # compendium file goes. What appear to be extra author
-        # folders are usually included dependencies (grr.. there
-        # is compendium syntax for that). The true author folder
-        # where the actual plugin files are must be determined.
-        if len(author_folders) > 1:
-            # The most likely author folder is where a
-            # .plugincompendium file is.
-            if author_folders_compendium := [
-                folder
-                for folder in author_folders
-                if list(folder.glob("*.plugincompendium"))
-            ]:
-                author_folder = author_folders_compendium[0]
-            # The next most likely author folder is where
-            # .plugin files are. Dependencies may also
-            # have .plugin files though.
-            elif author_folders_plugin := [
-                folder for folder in author_folders if list(folder.glob("*.plugin"))
-            ]:
-                author_folder = author_folders_plugin[0]
-            else:
-                logger.error("Plugin doesn't have an author folder with a .plugin file")
-                return
-        else:
-            author_folder = author_folders[0]
-
-        # .plugin files should always be in the author folder. All others
-        # will be ignored by both me and the game.
-        plugin_files = list(author_folder.glob("*.plugin"))
-
-        # Don't install if there are invalid `.plugin` files.
-        for plugin_file in plugin_files:
-            if self.parseCompendiumFile(plugin_file, "Information") is None:
+        remote_addon_info: AddonInfo | None = None
+        if interface_id:
+            remote_addon_info = self.getRemoteAddonInfo(interface_id)
+            if remote_addon_info is None:
+                logger.error("No DB entry for Interface ID %s found", interface_id)
                 return
 
-        existing_compendium_file = self.get_existing_compendium_file(author_folder)
-        if existing_compendium_file is False:
-            return
-
-        compendium_files: list[CaseInsensitiveAbsolutePath] = []
-        # Only make compendium file for addons installed from online
-        if interface_id:
-            compendium_file = self.generateCompendiumFile(
-                author_folder,
-                interface_id,
-                "plugin",
-                table.objectName(),
-                existing_compendium_file,
+        game_type = self.config_manager.get_game_config(self.game_id).game_type
+        try:
+            installed_addon = install_zip_addon(
+                addon_path,
+                settings_dir=self.data_folder,
+                game_type=game_type,
+                remote_addon_info=remote_addon_info,
+                replaced_paths=replaced_paths,
             )
-            compendium_files.append(compendium_file)
-        # Remove compendium files from manually installed addons.
-        # This is to limit confusion since there is no way to verify
-        # that compendium files from manually installed addons have
-        # correct information. ex. They could have some random interface_id
-        # suggesting they're the wrong addon and end up getting replaced
-        # by the addon for that ID during the updating process.
-        elif existing_compendium_file:
-            existing_compendium_file.unlink()
-
-        # Move plugin from temp directory to actual plugins directory
-        for path in tmp_dir.glob("*/"):
-            copytree(path, self.data_folder_plugins / path.name, dirs_exist_ok=True)
-
-        # Make plugin and compendium file paths point to their new location
-        plugin_files = [
-            self.data_folder_plugins / file.relative_to(tmp_dir)
-            for file in plugin_files
-        ]
-        compendium_files = [
-            self.data_folder_plugins / file.relative_to(tmp_dir)
-            for file in compendium_files
-        ]
-
-        self.removeManagedPluginsFromList(plugin_files, compendium_files)
-
-        self.addInstalledPluginsToDB(plugin_files, compendium_files)
+        except AddonOperationError as e:
+            logger.error(e.msg)
+            return
 
-        if interface_id:
-            self.handleStartupScriptActivationPrompt(table, interface_id)
+        if installed_addon.addon_type == "plugin":
+            self.addInstalledPlugins(installed_addon)
+        elif installed_addon.addon_type == "music":
+            self.getInstalledMusic(folders_list=[installed_addon.root_dir])
+        elif installed_addon.addon_type == "skin":
+            self.getInstalledSkins(folders_list=[installed_addon.root_dir])
+        else:
+            assert_never(installed_addon.addon_type)
         logger.debug(
-            "Installed plugin corresponding to %s %s", plugin_files, compendium_files
+            "%s %s installed at %s",
+            addon_path.stem,
+            installed_addon.addon_type,
+            installed_addon.root_dir,
         )
 
-        self.installAddonRemoteDependencies(self.ui.tablePluginsInstalled)
-
-    def get_existing_compendium_file(
-        self, tmp_search_dir: CaseInsensitiveAbsolutePath
-    ) -> CaseInsensitiveAbsolutePath | None | Literal[False]:
-        """
-        Return existing compendium file, None, or False if there are multiple.
-
-        Args:
-            tmp_search_dir (Path): Directory to check for compendium files in.
-                                   It has to be a temporary folder the addon
-                                   has been extracted to or compendium files
-                                   from other addons will be detected.
-        """
-        existing_compendium_files = list(tmp_search_dir.glob("*.*compendium"))
-        if len(existing_compendium_files) > 1:
-            logger.error("Addon has multiple compendium files")
-            return False
-        elif len(existing_compendium_files) == 1:
-            return existing_compendium_files[0]
-        return None
-
-    def install_music(
-        self,
-        tmp_dir: CaseInsensitiveAbsolutePath,
-        interface_id: str | None,
-        addon_name: str,
-    ) -> None | Literal[False]:
-        if self.config_manager.get_game_config(self.game_id).game_type == GameType.DDO:
-            logger.error("DDO does not support .abc/music files")
-            return None
-
-        # Some plugins have .abc files, but music collections
-        # shouldn't have .plugin files.
-        if list(tmp_dir.glob("**/*.plugin")):
-            return False
-
-        table = self.ui.tableMusic
-
-        root_dir = self.fix_improper_root_dir_addon(tmp_dir, addon_name)
-
-        existing_compendium_file = self.get_existing_compendium_file(root_dir)
-        if existing_compendium_file is False:
-            return None
-
+        table_installed = self.getInstalledTableFromAddonType(
+            installed_addon.addon_type
+        )
         if interface_id:
-            self.generateCompendiumFile(
-                root_dir,
+            self.handleStartupScriptActivationPrompt(
+                self.getRemoteOrLocalTableFromOne(table_installed, remote=True),
                 interface_id,
-                "music",
-                table.objectName(),
-                existing_compendium_file,
             )
+        self.installAddonRemoteDependencies(table_installed)
 
-        # Move the addon into the real data folder
-        copytree(root_dir, self.data_folder_music / root_dir.name, dirs_exist_ok=True)
-        root_dir = self.data_folder_music / root_dir.name
-
-        self.getInstalledMusic(folders_list=[root_dir])
-
-        if interface_id:
-            self.handleStartupScriptActivationPrompt(table, interface_id)
-
-        logger.debug("%s music installed at %s", addon_name, root_dir)
-
-        self.installAddonRemoteDependencies(self.ui.tableMusicInstalled)
-        return None
-
-    def install_skin(
-        self,
-        tmp_dir: CaseInsensitiveAbsolutePath,
-        interface_id: str | None,
-        addon_name: str,
+    def addInstalledPlugins(
+        self, installed_addon: InstalledZipAddon[CaseInsensitiveAbsolutePath]
     ) -> None:
-        table = self.ui.tableSkins
-
-        root_dir = self.fix_improper_root_dir_addon(tmp_dir, addon_name)
-
-        existing_compendium_file = self.get_existing_compendium_file(root_dir)
-        if existing_compendium_file is False:
-            return
-
-        if interface_id:
-            self.generateCompendiumFile(
-                root_dir,
-                interface_id,
-                "skin",
-                table.objectName(),
-                existing_compendium_file,
-            )
-
-        # Move the addon into the real data folder
-        copytree(root_dir, self.data_folder_skins / root_dir.name, dirs_exist_ok=True)
-        root_dir = self.data_folder_skins / root_dir.name
-
-        self.getInstalledSkins(folders_list=[root_dir])
+        plugin_files = list(installed_addon.plugin_files)
+        compendium_files = (
+            [installed_addon.compendium_file] if installed_addon.compendium_file else []
+        )
+        self.removeManagedPluginsFromList(plugin_files, compendium_files)
+        self.addInstalledPluginsToDB(plugin_files, compendium_files)
 
-        if interface_id:
-            self.handleStartupScriptActivationPrompt(table, interface_id)
+    def getRemoteAddonInfo(self, interface_id: str) -> AddonInfo | None:
+        """Return the remote info for an addon with the status prefixes removed"""
+        for table in self.ui_tables_remote:
+            for row in self.c.execute(
+                f"SELECT * FROM {table.objectName()} WHERE InterfaceID = ?",  # noqa: S608
+                (interface_id,),
+            ):
+                return AddonInfo(*row).without_status_prefixes()
+        return None
 
-        logger.debug("%s skin installed at %s", addon_name, root_dir)
+    def getInstalledTableFromAddonType(
+        self, addon_type: AddonType
+    ) -> QtWidgets.QTableWidget:
+        if addon_type == "plugin":
+            return self.ui.tablePluginsInstalled
+        elif addon_type == "skin":
+            return self.ui.tableSkinsInstalled
+        elif addon_type == "music":
+            return self.ui.tableMusicInstalled
+        else:
+            assert_never(addon_type)
 
-        self.installAddonRemoteDependencies(table=self.ui.tableSkinsInstalled)
+    def get_addon_archive_id(self, addon_type: AddonType, addon_id: str) -> str:
+        """ID for archived versions of an addon. See `AddonTransaction`."""
+        return get_addon_archive_id(self.data_folder, addon_type, addon_id)
 
     def installAddonRemoteDependencies(self, table: QtWidgets.QTableWidget) -> None:
         """Installs the dependencies for the last installed addon"""
@@ -1031,233 +824,6 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             ):
                 self.installRemoteAddon(item[0], item[1], interface_id)
 
-    def fix_improper_root_dir_addon(
-        self, addon_tmp_dir: CaseInsensitiveAbsolutePath, addon_name: str
-    ) -> CaseInsensitiveAbsolutePath:
-        """Moves addon to new folder if the top of the directory tree
-           is anything but one folder and no files. This should only be
-           used for skins and music.
-
-        Args:
-            addon_tmp_dir (Path): Temporary directory where the addon has been extracted.
-            addon_name (str): Name to give the new folder if it is made.
-
-        Returns:
-            (Path): Root dir of the addon. Where the compendium file should go.
-        """
-        temp_dir_contents = list(addon_tmp_dir.glob("*"))
-
-        # If there is already a root dir and nothing else
-        if len(temp_dir_contents) == 1 and temp_dir_contents[0].is_dir():
-            return temp_dir_contents[0]
-
-        with TemporaryDirectory() as tmp_dir_name:
-            tmp_dir = CaseInsensitiveAbsolutePath(tmp_dir_name)
-
-            # Move addon_tmp_dir contents to new temporary folder.
-            # This is to prevent issues with addon_name being the
-            # same as one of the existing folders in addon_tmp_dir.
-            for path in temp_dir_contents:
-                move(path, tmp_dir)
-
-            # Make new folder to be the addon root dir
-            new_addon_root_dir = addon_tmp_dir / addon_name
-            new_addon_root_dir.mkdir()
-
-            # Move all of the original contents of addon_tmp_dir
-            # into the new root dir.
-            for path in tmp_dir.glob("*"):
-                move(path, new_addon_root_dir)
-
-        return new_addon_root_dir
-
-    def clean_temp_addon_folder(self, addon_dir: Path) -> None:
-        """Scans temp folder for invalid folder names like "ui" or
-           "plugins" and moves stuff out of them. Addon authors put
-           files in invalid folders when they want the user to extract
-           the file somewhere higher up the folder tree than where their
-           work ends up. This is usually done for user convenience.
-
-        Args:
-            addon_dir (Path): Temporary folder where addon has been extracted.
-        """
-        invalid_folder_names = [
-            "ui",
-            "skins",
-            "plugins",
-            "music",
-            "my documents",
-            "documents",
-            "the lord of the rings online",
-            "dungeons and dragons online",
-            "dungeons & dragons online",
-        ]
-        with TemporaryDirectory() as tmp_dir_name:
-            tmp_dir = Path(tmp_dir_name)
-
-            while True:  # This outer loop is to check for nested invalid directories.
-                invalid_dir = None
-                for potential_invalid_dir in addon_dir.glob("*/"):
-                    if potential_invalid_dir.name.lower() in invalid_folder_names:
-                        invalid_dir = potential_invalid_dir
-                        # Move everything from the invalid directory to a temporary one.
-                        # This is done to prevent issues when a folder in the invalid folder
-                        # has the same name as the invalid folder.
-                        for path in invalid_dir.glob("*"):
-                            move(str(path), str(tmp_dir))
-
-                        invalid_dir.rmdir()
-
-                        # Move files that were originally in the invalid folder
-                        # to the root addon_dir.
-                        # Now the whole loop can run again to check for nested invalid
-                        # folders that have now been moved to the root addon_dir.
-                        for path in tmp_dir.glob("*"):
-                            move(str(path), str(addon_dir))
-
-                # Stop loop if there were no more invalid folders discovered.
-                if invalid_dir is None:
-                    break
-
-    def generateCompendiumFile(
-        self,
-        tmp_addon_root_dir: CaseInsensitiveAbsolutePath,
-        interface_id: str,
-        addon_type: AddonType,
-        table: str,
-        existing_compendium_file: CaseInsensitiveAbsolutePath | None = None,
-    ) -> CaseInsensitiveAbsolutePath:
-        """
-        Generate compendium file for addon. If there is an existing one
-        data that can only be gotten from it will be gathered and put
-        in the new file. The old one will be removed.
-
-        Args:
-            tmp_addon_root_dir (Path): Where the compendium file goes. In the
-                                       case of plugins it should be the author's
-                                       name. This has to be the addon root dir
-                                       while it is still in a temporary directory
-                                       for proper .plugin file detection.
-            interface_id (str): [description]
-            addon_type (AddonType): The type of the addon.
-            table (str): The database table name for the addon type. Used to get remote
-                         addon information.
-            existing_compendium_file (Path, optional): An existing compendium file to
-                                                       extract data from. Defaults to None.
-        """
-        dependencies = ""
-        startup_python_script = ""
-        # Get dependencies and startup_python_script from existing compendium
-        # file if present.
-        if existing_compendium_file:
-            existing_compendium_values = self.parseCompendiumFile(
-                existing_compendium_file, f"{addon_type.title()}Config"
-            )
-            if existing_compendium_values is not None:
-                dependencies = existing_compendium_values[7]
-                startup_python_script = existing_compendium_values[8]
-            existing_compendium_file.unlink()
-
-        for row in self.c.execute(
-            f"SELECT * FROM {table} WHERE InterfaceID = ?",  # noqa: S608
-            (interface_id,),
-        ):
-            if row[0]:
-                doc = Document()
-                mainNode = doc.createElementNS(
-                    EMPTY_NAMESPACE, f"{addon_type.title()}Config"
-                )
-                doc.appendChild(mainNode)
-
-                tempNode = doc.createElementNS(EMPTY_NAMESPACE, "Id")
-                tempNode.appendChild(doc.createTextNode(f"{row[6]}"))
-                mainNode.appendChild(tempNode)
-
-                tempNode = doc.createElementNS(EMPTY_NAMESPACE, "Name")
-                tempNode.appendChild(doc.createTextNode(f"{row[0]}"))
-                mainNode.appendChild(tempNode)
-
-                tempNode = doc.createElementNS(EMPTY_NAMESPACE, "Version")
-                tempNode.appendChild(doc.createTextNode(f"{row[2]}"))
-                mainNode.appendChild(tempNode)
-
-                tempNode = doc.createElementNS(EMPTY_NAMESPACE, "Author")
-                tempNode.appendChild(doc.createTextNode(f"{row[3]}"))
-                mainNode.appendChild(tempNode)
-
-                tempNode = doc.createElementNS(EMPTY_NAMESPACE, "InfoUrl")
-                tempNode.appendChild(
-                    doc.createTextNode(f"{self.getInterfaceInfoUrl(row[5])}")
-                )
-                mainNode.appendChild(tempNode)
-
-                tempNode = doc.createElementNS(EMPTY_NAMESPACE, "DownloadUrl")
-                tempNode.appendChild(doc.createTextNode(f"{row[5]}"))
-                mainNode.appendChild(tempNode)
-
-                if addon_type.title() == "Plugin":
-                    # Add plugin's .plugin file descriptors
-                    descriptorsNode = doc.createElementNS(
-                        EMPTY_NAMESPACE, "Descriptors"
-                    )
-                    mainNode.appendChild(descriptorsNode)
-                    for plugin_file in tmp_addon_root_dir.glob("*.plugin"):
-                        tempNode = doc.createElementNS(EMPTY_NAMESPACE, "descriptor")
-                        tempNode.appendChild(
-                            doc.createTextNode(
-                                f"{tmp_addon_root_dir.name}\\{plugin_file.name}"
-                            )
-                        )
-                        descriptorsNode.appendChild(tempNode)
-
-                # Can't add dependencies, because they are defined in
-                # compendium files
-                dependenciesNode = doc.createElementNS(EMPTY_NAMESPACE, "Dependencies")
-                mainNode.appendChild(dependenciesNode)
-
-                # If compendium file from addon already existed with
-                # dependencies
-                if dependencies:
-                    for dependency in dependencies.split(","):
-                        tempNode = doc.createElementNS(EMPTY_NAMESPACE, "dependency")
-                        tempNode.appendChild(doc.createTextNode(f"{dependency}"))
-                        dependenciesNode.appendChild(tempNode)
-
-                # Can't add startup script, because it is defined in compendium
-                # files
-                startupScriptNode = doc.createElementNS(
-                    EMPTY_NAMESPACE, "StartupScript"
-                )
-                # If compendium file from add-n already existed with startup
-                # script
-                if startup_python_script:
-                    startupScriptNode.appendChild(
-                        doc.createTextNode(f"{startup_python_script}")
-                    )
-                mainNode.appendChild(startupScriptNode)
-
-                # Write compendium file
-                compendium_file = (
-                    tmp_addon_root_dir / f"{row[0]}.{addon_type.lower()}compendium"
-                )
-                with compendium_file.open("w+") as file:
-                    # Use ElementTree for prettification. Minidom isn't great at it.
-                    etree_element = ET.XML(doc.toxml())
-                    ET.indent(etree_element)
-                    file.write(ET.tostring(etree_element, encoding="unicode"))
-
-                return compendium_file
-
-        raise KeyError(f"No DB entry for Interface ID {interface_id} found")
-
-    def getInterfaceInfoUrl(self, download_url: str) -> str:
-        """Replaces "download" with "info" in download url to make info url
-
-        An example is: https://www.lotrointerface.com/downloads/download1078-VitalTarget
-                   to: https://www.lotrointerface.com/downloads/info1078-VitalTarget
-        """
-        return download_url.replace("/downloads/download", "/downloads/info")
-
     def txtSearchBarTextChanged(self, text: str) -> None:
         index = self.ui.tabBarSource.currentIndex()
         if self.SOURCE_TAB_NAMES[index] == "Installed":
@@ -1299,15 +865,21 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         table.clearContents()
         table.setRowCount(0)
 
+        outdated_addon_ids = get_outdated_addon_ids(
+            self.c, self.getRemoteOrLocalTableFromOne(table, remote=False).objectName()
+        )
         text = text.strip()
         if text:
             for word in text.split():
                 search_word = f"%{word}%"
 
-                for result in self.c.execute(
-                    # nosec
-                    f"SELECT rowid, * FROM {table.objectName()} WHERE Author LIKE ? OR Category LIKE ? OR Name LIKE ?",  # noqa: S608
-                    (search_word, search_word, search_word),
+                for result in chain(
+                    self.c.execute(
+                        # nosec
+                        f"SELECT rowid, * FROM {table.objectName()} WHERE Author LIKE ? OR Category LIKE ? OR Name LIKE ?",  # noqa: S608
+                        (search_word, search_word, search_word),
+                    ).fetchall(),
+                    self.search_installed_music_songs(table, word),
                 ):
                     rowid = result[0]
                     addon_info = AddonInfo(*result[1:])
@@ -1324,20 +896,58 @@ class AddonManagerWindow(QWidgetWithStylePreview):
                             duplicate = True
                             break
                     if not duplicate:
-                        self.addRowToTable(table, rowid=rowid, addon_info=addon_info)
+                        self.addRowToTable(
+                            table,
+                            rowid=rowid,
+                            addon_info=addon_info,
+                            has_update=addon_info.interface_id in outdated_addon_ids,
+                        )
         else:
             # Shows all plugins if the search bar is empty
             for result in self.c.execute(
                 # nosec
                 f"SELECT rowid, * FROM {table.objectName()}"  # noqa: S608
             ):
+                addon_info = AddonInfo(*result[1:])
                 self.addRowToTable(
-                    table, rowid=result[0], addon_info=AddonInfo(*result[1:])
+                    table,
+                    rowid=result[0],
+                    addon_info=addon_info,
+                    has_update=addon_info.interface_id in outdated_addon_ids,
                 )
 
         self.optimizeTableColumnWidths(table)
         self.tables_loaded.add(table)
 
+    def search_installed_music_songs(
+        self, table: QtWidgets.QTableWidget, word: str
+    ) -> list[Any]:
+        """
+        Return the installed music table rows for the folders with songs that have
+        titles or transcribers matching `word`.
+        """
+        if table is not self.ui.tableMusicInstalled or self.music_index is None:
+            return []
+        matching_top_level_names = {
+            entry.path.parts[0] for entry in self.music_index.search(word)
+        }
+        if not matching_top_level_names:
+            return []
+        music_folder_parts = self.data_folder_music.relative_to(self.data_folder).parts
+        results = []
+        for result in self.c.execute(
+            f"SELECT rowid, * FROM {table.objectName()}"  # noqa: S608
+        ).fetchall():
+            # `File` is relative to the game settings folder. Ex. "Music/Song"
+            file_parts = Path(AddonInfo(*result[1:]).file).parts
+            if (
+                file_parts[: len(music_folder_parts)] == music_folder_parts
+                and len(file_parts) > len(music_folder_parts)
+                and file_parts[len(music_folder_parts)] in matching_top_level_names
+            ):
+                results.append(result)
+        return results
+
     def reloadSearch(self, table: QtWidgets.QTableWidget) -> None:
         """Re-searches the current search"""
         self.searchDB(table, self.ui.txtSearchBar.text())
@@ -1358,15 +968,6 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             ),
         )
 
-        # Remove indicator that a new version of an installed addon is out if present.
-        # This is important, because addons are uninstalled and then reinstalled
-        # during the update process.
-        self.c.execute(
-            # nosec
-            f"UPDATE {remote_table.objectName()} SET Version = REPLACE(Version,'(Updated) ', '') WHERE "  # noqa: S608
-            "Version LIKE '(Updated) %'"
-        )
-
     def setRemoteAddonToInstalled(
         self, addon: Addon, remote_table: QtWidgets.QTableWidget
     ) -> None:
@@ -1379,7 +980,11 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         )
 
     def addRowToTable(
-        self, table: QtWidgets.QTableWidget, rowid: int | str, addon_info: AddonInfo
+        self,
+        table: QtWidgets.QTableWidget,
+        rowid: int | str,
+        addon_info: AddonInfo,
+        has_update: bool = False,
     ) -> None:
         """Add row to a visible table. First value in list is row name"""
         table.setSortingEnabled(False)
@@ -1406,14 +1011,13 @@ class AddonManagerWindow(QWidgetWithStylePreview):
                 if addon_info.category == self.CATEGORY_UNMANAGED:
                     tbl_item.setForeground(QtGui.QColor("darkred"))
             elif column_name == "Version":
-                if addon_info.version.startswith("(Updated) "):
-                    tbl_item.setText(addon_info.version.split("(Updated) ")[1])
-                    tbl_item.setForeground(QtGui.QColor("green"))
-                elif addon_info.version.startswith("(Outdated) "):
-                    tbl_item.setText(addon_info.version.split("(Outdated) ")[1])
+                tbl_item.setText(addon_info.version)
+                # Installed versions with updates are red, and the newer remote
+                # versions are green.
+                if has_update and table in self.ui_tables_installed:
                     tbl_item.setForeground(QtGui.QColor("crimson"))
-                else:
-                    tbl_item.setText(addon_info.version)
+                elif has_update:
+                    tbl_item.setForeground(QtGui.QColor("green"))
             elif column_name == "Author":
                 tbl_item.setText(addon_info.author)
             elif column_name == "Latest Release":
@@ -1454,7 +1058,9 @@ class AddonManagerWindow(QWidgetWithStylePreview):
 
             uninstallConfirm, addons = self.getUninstallConfirm(table)
             if uninstallConfirm:
-                uninstall_function(addons, table)
+                # Each addon with a startup script updates the game config.
+                with self.config_manager.batch_writes():
+                    uninstall_function(addons, table)
                 self.resetRemoteAddonsTables()
         elif self.SOURCE_TAB_NAMES[self.ui.tabBarSource.currentIndex()] == "Find More":
             self.installRemoteAddons()
@@ -1511,14 +1117,22 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             assert_never(source_tab)
         return table
 
-    def installRemoteAddon(self, url: str, name: str, interface_id: str) -> None:
+    def installRemoteAddon(
+        self,
+        url: str,
+        name: str,
+        interface_id: str,
+        replaced_paths: Sequence[Path] = (),
+    ) -> None:
         with TemporaryDirectory() as tmp_dir_name:
             tmp_dir = Path(tmp_dir_name)
 
             path = tmp_dir / f"{name}.zip"
             status = self.downloader(url, path)
             if status:
-                self.installAddon(path, interface_id=interface_id)
+                self.installAddon(
+                    path, interface_id=interface_id, replaced_paths=replaced_paths
+                )
                 path.unlink()
 
     def getUninstallConfirm(
@@ -1585,58 +1199,32 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             if plugin[1].endswith(".plugin"):
                 plugin_files = [Path(plugin[1])]
             else:
-                plugin_files = []
-                if self.checkAddonForDependencies(plugin, table):
-                    try:
-                        doc = defusedxml.minidom.parse(plugin[1])
-                    except ExpatError:
-                        logger.warning(
-                            "`.plugincompendium` file has invalid XML: %s",
-                            plugin[1],
-                            exc_info=True,
-                        )
-                        continue
-                    nodes = doc.getElementsByTagName("Descriptors")[0].childNodes
-                    for node in nodes:
-                        if node.nodeName == "descriptor":
-                            plugin_files.append(
-                                self.data_folder_plugins
-                                / (GetText(node.childNodes).replace("\\", "/"))
-                            )
-
-                    # Check for startup scripts to remove them
-                    nodes = doc.getElementsByTagName("PluginConfig")[0].childNodes
-                    for node in nodes:
-                        if node.nodeName == "StartupScript":
-                            script = GetText(node.childNodes)
-                            self.uninstallStartupScript(
-                                script, self.data_folder_plugins
-                            )
-                else:
+                if not self.checkAddonForDependencies(plugin, table):
                     continue
+                compendium_plugin_files = get_compendium_plugin_files(
+                    Path(plugin.file), self.data_folder_plugins
+                )
+                if compendium_plugin_files is None:
+                    continue
+                plugin_files = list(compendium_plugin_files)
+
+                # Check for startup scripts to remove them
+                if addon_info := parse_compendium_file(
+                    Path(plugin.file), "PluginConfig"
+                ):
+                    self.uninstallStartupScript(
+                        addon_info.startup_script, self.data_folder_plugins
+                    )
 
             plugin_folder: CaseInsensitiveAbsolutePath | None = None
             for plugin_file in plugin_files:
                 if plugin_file.exists():
-                    try:
-                        doc = defusedxml.minidom.parse(str(plugin_file))
-                    except ExpatError:
-                        logger.warning(
-                            "`.plugin` file has invalid XML: %s",
-                            plugin_file,
-                            exc_info=True,
-                        )
-                    else:
-                        nodes = doc.getElementsByTagName("Plugin")[0].childNodes
-                        for node in nodes:
-                            if node.nodeName == "Package":
-                                plugin_folder = self.data_folder_plugins / (
-                                    "/".join(GetText(node.childNodes).split(".")[:2])
-                                )
-
-                                # Removes plugin and all related files
-                                if plugin_folder.exists():
-                                    rmtree(plugin_folder)
+                    plugin_folder = get_plugin_package_folder(
+                        plugin_file, self.data_folder_plugins
+                    )
+                    # Removes plugin and all related files
+                    if plugin_folder and plugin_folder.exists():
+                        rmtree(plugin_folder)
 
                     plugin_file.unlink(missing_ok=True)
             Path(plugin.file).unlink(missing_ok=True)
@@ -1654,6 +1242,16 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self.getInstalledPlugins()
         self.getOutOfDateAddons()
 
+    def get_installed_addon_paths(
+        self, addon: Addon, table: QtWidgets.QTableWidget
+    ) -> list[Path]:
+        """Return all of the files and folders that make up an installed addon"""
+        return get_installed_addon_paths(
+            Path(addon.file),
+            self.get_addon_type_from_table(table),
+            self.data_folder / "Plugins",
+        )
+
     def uninstallSkins(self, skins: list[Addon], table: QtWidgets.QTableWidget) -> None:
         table = self.getRemoteOrLocalTableFromOne(table, remote=False)
 
@@ -1661,7 +1259,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             if skin[1].endswith(".skincompendium"):
                 skin_path = Path(skin[1]).parent
 
-                addon_info = self.parseCompendiumFile(Path(skin[1]), "SkinConfig")
+                addon_info = parse_compendium_file(Path(skin[1]), "SkinConfig")
                 if addon_info is not None:
                     self.uninstallStartupScript(
                         script=addon_info.startup_script,
@@ -1687,7 +1285,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             if music[1].endswith(".musiccompendium"):
                 music_path = Path(music[1]).parent
 
-                items_row = self.parseCompendiumFile(Path(music[1]), "MusicConfig")
+                items_row = parse_compendium_file(Path(music[1]), "MusicConfig")
                 if items_row is not None:
                     script = items_row[8]
                     self.uninstallStartupScript(script, self.data_folder_music)
@@ -1775,15 +1373,46 @@ class AddonManagerWindow(QWidgetWithStylePreview):
 
     def loadPluginsIfNotDone(self) -> None:
         if self.ui.tablePluginsInstalled not in self.tables_loaded:
-            self.getInstalledPlugins()
+            self.loadInstalledAddons(self.ui.tablePluginsInstalled)
 
     def loadSkinsIfNotDone(self) -> None:
         if self.ui.tableSkinsInstalled not in self.tables_loaded:
-            self.getInstalledSkins()
+            self.loadInstalledAddons(self.ui.tableSkinsInstalled)
 
     def loadMusicIfNotDone(self) -> None:
         if self.ui.tableMusicInstalled not in self.tables_loaded:
-            self.getInstalledMusic()
+            self.loadInstalledAddons(self.ui.tableMusicInstalled)
+
+    def loadInstalledAddons(self, table: QtWidgets.QTableWidget) -> None:
+        """
+        Show the cached installed addons for `table`. They are only rescanned if the
+        addon folder has changed since the last scan. The music index is always
+        refreshed, since song searches use it directly.
+        """
+        data_folder = self.getAddonTypeDataFolderFromTable(table)
+        music_index_changed = False
+        if table is self.ui.tableMusicInstalled:
+            music_index_changed = self.get_music_index().refresh()
+        fingerprint = get_addon_folder_fingerprint(data_folder)
+        if (
+            not music_index_changed
+            and fingerprint
+            and fingerprint
+            == get_cache_state(self.c, f"fingerprint:{table.objectName()}")
+        ):
+            self.reloadSearch(table)
+        else:
+            self.reloadInstalledAddons(table)
+
+    def saveInstalledAddonsFingerprint(
+        self, table: QtWidgets.QTableWidget, fingerprint: str
+    ) -> None:
+        """
+        Record that the cached installed addons for `table` match the addon folder
+        state in `fingerprint`. The fingerprint should be from before the folder was
+        scanned, so changes made during the scan are picked up later.
+        """
+        set_cache_state(self.c, f"fingerprint:{table.objectName()}", fingerprint)
 
     def tabBarRemoteIndexChanged(self, index: int) -> None:
         if self.tab_names[index] == "Plugins":
@@ -1820,52 +1449,84 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self.searchSearchBarContents()
 
     def loadRemoteAddons(self) -> bool:
-        if (
-            self.config_manager.get_game_config(self.game_id).game_type
-            == GameType.LOTRO
-        ):
+        game_type = self.config_manager.get_game_config(self.game_id).game_type
+        if game_type == GameType.LOTRO:
             # Only keep loading remote addons if the first load doesn't run
             # into issues
-            if self.getRemoteAddons(self.PLUGINS_URL, self.ui.tablePlugins):
-                self.getRemoteAddons(self.SKINS_URL, self.ui.tableSkins)
-                self.getRemoteAddons(self.MUSIC_URL, self.ui.tableMusic)
+            if self.getRemoteAddons(
+                get_addons_feed_url(game_type, "plugin"), self.ui.tablePlugins
+            ):
+                self.getRemoteAddons(
+                    get_addons_feed_url(game_type, "skin"), self.ui.tableSkins
+                )
+                self.getRemoteAddons(
+                    get_addons_feed_url(game_type, "music"), self.ui.tableMusic
+                )
                 return True
-        elif self.getRemoteAddons(self.SKINS_DDO_URL, self.ui.tableSkins):
+        elif self.getRemoteAddons(
+            get_addons_feed_url(game_type, "skin"), self.ui.tableSkins
+        ):
             return True
 
         return False
 
-    def unescape_lotrointerface_feed_unicode(self, escaped_string: str) -> str:
-        """
-        Convert feed escaped characters to Unicode characters. This shouold be used with
-        strings that have already had the XML unesaaped.
-
-        Unicode characters in LotroInterface feeds are escaped with an ampersand followed
-        by the Unicode character number. Ex. `&1088`.
-        """
-        return html.unescape(
-            # Convert to HTML escape notation by adding `#`.
-            re.sub(
-                r"&(\d+);",
-                lambda match: f"&#{match.group(1)};",  # type: ignore[str-bytes-safe]
-                escaped_string,
-            )
-        )
-
     def getRemoteAddons(
         self, favorites_url: str, table: QtWidgets.QTableWidget
     ) -> bool:
-        # Clears rows from db table
-        self.c.execute(f"DELETE FROM {table.objectName()}")  # noqa: S608
+        """
+        Load the remote addons for `table` from the shared addon catalog. The catalog
+        is only fetched if it's older than `ADDON_CATALOG_MAX_AGE`.
+        """
+        table_name = table.objectName()
+        if not is_catalog_fresh(self.c, table_name):
+            fetched_addons = self.fetchRemoteAddons(favorites_url)
+            if fetched_addons is not None:
+                replace_catalog(self.c, table_name, fetched_addons)
+                # Commit right away, so other addon manager windows can use it.
+                self.conn.commit()
+            elif get_catalog_fetched_at(self.c, table_name) is None:
+                self.ui.tabBarSource.setCurrentIndex(0)
+                return False
+            else:
+                logger.warning("Using outdated addon catalog")
 
-        # Gets list of Interface IDs for installed addons
-        installed_IDs = []
-        for ID in self.c.execute(
-            f"SELECT InterfaceID FROM {table.objectName() + 'Installed'}"  # noqa: S608
-        ):
-            if ID[0]:
-                installed_IDs.append(ID[0])
+        self.syncRemoteAddonsFromCatalog(table)
 
+        # Populate user visible table. This should not reload the current
+        # search.
+        self.searchDB(table, "")
+
+        return True
+
+    def syncRemoteAddonsFromCatalog(self, table: QtWidgets.QTableWidget) -> None:
+        """
+        Copy the shared addon catalog into this game's remote addons table, if it
+        isn't already up to date. The copy is where per-game state, like which addons
+        are installed, is stored.
+        """
+        table_name = table.objectName()
+        modified_at = get_catalog_modified_at(self.c, table_name)
+        if modified_at is None:
+            return
+        synced_state_name = f"catalog_synced:{table_name}"
+        if get_cache_state(self.c, synced_state_name) == modified_at.isoformat():
+            return
+
+        columns = ", ".join(self.COLUMN_LIST[1:])
+        self.c.execute(f"DELETE FROM main.{table_name}")  # noqa: S608
+        self.c.execute(
+            f"INSERT INTO main.{table_name}({columns}) SELECT {columns} FROM catalog.{table_name}"  # noqa: S608
+        )
+        # Prepends name with (Installed) if already installed
+        self.c.execute(
+            f"UPDATE main.{table_name} SET Name = ('(Installed) ' || Name) WHERE "  # noqa: S608
+            f"InterfaceID IN (SELECT InterfaceID FROM main.{table_name}Installed "
+            "WHERE InterfaceID != '')"
+        )
+        set_cache_state(self.c, synced_state_name, modified_at.isoformat())
+
+    def fetchRemoteAddons(self, favorites_url: str) -> list[AddonInfo] | None:
+        """Fetch and parse a LotroInterface favorites feed"""
         try:
             addons_file_response = get_httpx_client_sync(favorites_url).get(
                 favorites_url
@@ -1875,60 +1536,15 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             logger.exception(
                 "There was a network error. You may want to check your connection."
             )
-            self.ui.tabBarSource.setCurrentIndex(0)
-            return False
+            return None
 
         try:
-            doc = defusedxml.minidom.parseString(addons_file_response.text)
+            return parse_addons_feed(addons_file_response.text)
         except ExpatError:
             logger.exception(
                 "Addons feed has invalid XML. Please report this error if it continues."
             )
-            return False
-
-        tags = doc.getElementsByTagName("Ui")
-        for tag in tags:
-            addon_info = AddonInfo()
-            nodes = tag.childNodes
-            for node in nodes:
-                if node.nodeName == "UIName":
-                    addon_info.name = GetText(node.childNodes)
-                    addon_info.name = self.unescape_lotrointerface_feed_unicode(
-                        addon_info.name
-                    )
-                    # Sanitize
-                    addon_info.name = addon_info.name.replace("/", "-").replace(
-                        "\\", "-"
-                    )
-                elif node.nodeName == "UIAuthorName":
-                    addon_info.author = GetText(node.childNodes)
-                    addon_info.author = self.unescape_lotrointerface_feed_unicode(
-                        addon_info.author
-                    )
-                elif node.nodeName == "UICategory":
-                    addon_info.category = GetText(node.childNodes)
-                elif node.nodeName == "UID":
-                    addon_info.interface_id = GetText(node.childNodes)
-                elif node.nodeName == "UIVersion":
-                    addon_info.version = GetText(node.childNodes)
-                elif node.nodeName == "UIUpdated":
-                    addon_info.latest_release = strftime(
-                        "%Y-%m-%d", localtime(int(GetText(node.childNodes)))
-                    )
-                elif node.nodeName == "UIFileURL":
-                    addon_info.file = GetText(node.childNodes)
-
-            # Prepends name with (Installed) if already installed
-            if addon_info.interface_id in installed_IDs:
-                addon_info.name = f"(Installed) {addon_info.name}"
-
-            self.addRowToDB(table, addon_info)
-
-        # Populate user visible table. This should not reload the current
-        # search.
-        self.searchDB(table, "")
-
-        return True
+            return None
 
     def downloader(self, url: str, path: Path) -> bool:
         """
@@ -1964,7 +1580,10 @@ class AddonManagerWindow(QWidgetWithStylePreview):
     @override
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         self.closeDB()
+        if self.music_index is not None:
+            self.music_index.close()
         super().closeEvent(event)
+        self.closed.emit()
 
     def contextMenuRequested(
         self, cursor_position: QtCore.QPoint, table: QtWidgets.QTableWidget
@@ -2007,6 +1626,19 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         ]:
             menu.addAction(self.ui.actionUpdateAddon)
 
+        # If addon has an archived previous version
+        if (
+            self.context_menu_selected_interface_ID
+            and self.context_menu_selected_table in self.ui_tables_installed
+            and get_archived_addon_version(
+                self.get_addon_archive_id(
+                    self.get_addon_type_from_table(self.context_menu_selected_table),
+                    self.context_menu_selected_interface_ID,
+                )
+            )
+        ):
+            menu.addAction(self.actionRollBackAddon)
+
         # If addon has a startup script
         if self.context_menu_selected_interface_ID:
             relative_script_path = self.getRelativeStartupScriptFromInterfaceID(
@@ -2079,7 +1711,7 @@ class AddonManagerWindow(QWidgetWithStylePreview):
                 return (
                     addon_url[0]
                     if download_url
-                    else self.getInterfaceInfoUrl(addon_url[0])
+                    else get_interface_info_url(addon_url[0])
                 )
         raise ValueError("No addon URL founnd for interface ID", interface_ID)
 
@@ -2290,9 +1922,8 @@ class AddonManagerWindow(QWidgetWithStylePreview):
 
     def getOutOfDateAddons(self) -> None:
         """
-        Marks addons as out of date in database with '(Outdated) '
-        in installed table and '(Updated) ' in remote table. These
-        are prepended to the Version column.
+        Compute which installed addons have updates in the remote addon catalog. The
+        update state of every addon type is replaced in one transaction.
         """
         game_config = self.config_manager.get_game_config(self.game_id)
         if game_config.game_type != GameType.DDO:
@@ -2304,67 +1935,18 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         else:
             tables = (self.ui.tableSkinsInstalled,)
 
-        for table_installed in tables:
-            table_remote = self.getRemoteOrLocalTableFromOne(
-                table_installed, remote=True
-            )
-            if table_remote not in self.tables_loaded:
-                continue
-
-            addons_info_remote = {
-                addon[1]: (addon[0], addon[2])
-                for addon in self.c.execute(
-                    f"SELECT Version, InterfaceID, rowid FROM {table_remote.objectName()} WHERE"  # noqa: S608
-                    f" Name LIKE '(Installed) %'"
-                )
-            }
-
-            for addon in tuple(
-                self.c.execute(
-                    f"SELECT Version, InterfaceID, rowid FROM {table_installed.objectName()} WHERE"  # noqa: S608
-                    f" InterfaceID != ''"
+        with self.conn:
+            for table_installed in tables:
+                table_remote = self.getRemoteOrLocalTableFromOne(
+                    table_installed, remote=True
                 )
-            ):
-                # Will raise KeyError if addon has Interface ID that isn't in
-                # remote table.
-                try:
-                    remote_addon_info = addons_info_remote[addon[1]]
-                except KeyError:
+                if table_remote not in self.tables_loaded:
                     continue
-
-                latest_version = remote_addon_info[0]
-                if addon[0] != latest_version:
-                    rowid_remote = remote_addon_info[1]
-                    self.markAddonForUpdating(
-                        rowid_local=addon[2],
-                        rowid_remote=rowid_remote,
-                        table_installed=table_installed,
-                    )
-
-    def markAddonForUpdating(
-        self,
-        rowid_local: str | int,
-        rowid_remote: str | int,
-        table_installed: QtWidgets.QTableWidget,
-    ) -> None:
-        """
-        Marks addon as having having updates
-        available in installed and remote tables
-        """
-        table_remote = self.getRemoteOrLocalTableFromOne(table_installed, remote=True)
-
-        self.c.execute(
-            (
-                f"UPDATE {table_installed.objectName()} SET Version=('(Outdated) ' || Version) WHERE rowid=?"  # noqa: S608
-            ),
-            (str(rowid_local),),
-        )
-        self.c.execute(
-            (
-                f"UPDATE {table_remote.objectName()} SET Version=('(Updated) ' || Version) WHERE rowid=?"  # noqa: S608
-            ),
-            (str(rowid_remote),),
-        )
+                compute_addon_updates(
+                    self.c,
+                    installed_table=table_installed.objectName(),
+                    catalog_table=table_remote.objectName(),
+                )
 
     def updateAll(self) -> None:
         if not self.loadRemoteAddons():
@@ -2382,7 +1964,10 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         for table in tables:
             for addon in tuple(
                 self.c.execute(
-                    f"SELECT InterfaceID, File, Name FROM {table.objectName()} WHERE Version LIKE '(Outdated) %'"  # noqa: S608
+                    f"SELECT installed.InterfaceID, installed.File, installed.Name FROM main.{table.objectName()} AS installed "  # noqa: S608
+                    f"JOIN main.{ADDON_UPDATES_TABLE} AS updates ON updates.table_name = ? "
+                    "AND updates.interface_id = installed.InterfaceID WHERE updates.has_update",
+                    (table.objectName(),),
                 )
             ):
                 self.updateAddon(
@@ -2398,12 +1983,9 @@ class AddonManagerWindow(QWidgetWithStylePreview):
         self.searchSearchBarContents()
 
     def updateAddon(self, addon: Addon, table: QtWidgets.QTableWidget) -> None:
-        uninstall_function = self.getUninstallFunctionFromTable(table)
         table_installed = self.getRemoteOrLocalTableFromOne(table, remote=False)
         table_remote = self.getRemoteOrLocalTableFromOne(table, remote=True)
 
-        uninstall_function([addon], table_installed)
-
         url: str | None = None
         for entry in self.c.execute(
             f"SELECT File FROM {table_remote.objectName()} WHERE InterfaceID = ?",  # noqa: S608
@@ -2412,8 +1994,57 @@ class AddonManagerWindow(QWidgetWithStylePreview):
             url = entry[0]
         if url is None:
             raise ValueError("Addon not found in DB", addon)
-        self.installRemoteAddon(url, addon.name, addon.interface_id)
+        # The old version is only removed if the new one is installed successfully.
+        self.installRemoteAddon(
+            url,
+            addon.name,
+            addon.interface_id,
+            replaced_paths=self.get_installed_addon_paths(addon, table_installed),
+        )
         self.setRemoteAddonToInstalled(addon, table_remote)
+        self.reloadInstalledAddons(table_installed)
+        self.getOutOfDateAddons()
+
+    def reloadInstalledAddons(self, table: QtWidgets.QTableWidget) -> None:
+        """Rescan the installed addons of the type that `table` is for"""
+        addon_type = self.get_addon_type_from_table(table)
+        if addon_type == "plugin":
+            self.getInstalledPlugins()
+        elif addon_type == "skin":
+            self.getInstalledSkins()
+        elif addon_type == "music":
+            self.getInstalledMusic()
+        else:
+            assert_never(addon_type)
+
+    def actionRollBackAddonSelected(self) -> None:
+        table = self.context_menu_selected_table
+        interface_id = self.context_menu_selected_interface_ID
+        if not interface_id:
+            return
+        archived_version = get_archived_addon_version(
+            self.get_addon_archive_id(
+                self.get_addon_type_from_table(table), interface_id
+            )
+        )
+        if archived_version is None:
+            return
+
+        if not self.confirmationPrompt(
+            text="Are you sure you want to roll back this addon to its previous version?",
+            details=f"The previous version was replaced {archived_version.archived_at.astimezone():%c}",
+        ):
+            return
+        try:
+            rollback_addon_version(archived_version)
+        except OSError:
+            logger.exception("Failed to roll back addon")
+            return
+
+        self.reloadInstalledAddons(table)
+        self.getOutOfDateAddons()
+        self.resetRemoteAddonsTables()
+        self.searchSearchBarContents()
 
     def actionUpdateAddonSelected(self) -> None:
         table = self.context_menu_selected_table
@@ -2443,14 +2074,14 @@ class AddonManagerWindow(QWidgetWithStylePreview):
     def checkIfAddonHasUpdate(
         self, addon: Addon, table: QtWidgets.QTableWidget
     ) -> bool | None:
-        for entry in self.c.execute(
-            f"SELECT Version FROM {table.objectName()} WHERE InterfaceID = ?",  # noqa: S608
-            (addon[0],),
+        for (has_update,) in self.c.execute(
+            f"SELECT has_update FROM main.{ADDON_UPDATES_TABLE} WHERE table_name = ? AND interface_id = ?",  # noqa: S608
+            (
+                self.getRemoteOrLocalTableFromOne(table, remote=False).objectName(),
+                addon.interface_id,
+            ),
         ):
-            version: str = entry[0]
-            return bool(
-                version.startswith("(Outdated) ") or version.startswith("(Updated) ")
-            )
+            return bool(has_update)
         return None
 
     def actionEnableStartupScriptSelected(self) -> None:
@@ -2549,6 +2180,14 @@ class AddonManagerWindow(QWidgetWithStylePreview):
     ) -> None:
         """Ask user if they want to enable an addon's startup script if present"""
         if script := self.getRelativeStartupScriptFromInterfaceID(table, interface_ID):
+            # The script will already be enabled if this is an update.
+            if script in (
+                enabled_script.relative_path
+                for enabled_script in self.config_manager.read_game_config_file(
+                    self.game_id
+                ).addons.enabled_startup_scripts
+            ):
+                return
             addon_name: str | None = None
             for name in self.c.execute(
                 f"SELECT Name from {table.objectName()} WHERE InterfaceID = ?",  # noqa: S608
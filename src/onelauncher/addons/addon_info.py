@@ -0,0 +1,431 @@
+import html
+import logging
+import re
+import xml.dom.minidom
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from time import localtime, strftime
+from typing import (
+    TYPE_CHECKING,
+    Final,
+    Literal,
+    NamedTuple,
+    assert_never,
+    overload,
+    override,
+)
+from xml.dom import EMPTY_NAMESPACE
+from xml.dom.minicompat import NodeList
+from xml.dom.minidom import Element
+from xml.parsers.expat import ExpatError
+
+import attrs
+import defusedxml.minidom  # type: ignore[import-untyped]
+
+from ..game_config import GameType
+
+if TYPE_CHECKING:
+    from xml.dom.minidom import _ElementChildren
+
+logger = logging.getLogger(__name__)
+
+type AddonType = Literal["plugin", "music", "skin"]
+
+INSTALLED_NAME_PREFIX: Final = "(Installed) "
+"""Prefix for the names of installed addons in remote addon listings"""
+
+
+# Just to fix type hints
+class Document(xml.dom.minidom.Document):
+    @override
+    # The type hints for this didn't include the return type or that it accepts
+    # `EMPTY_NAMESPACE` which is equal to `None`.
+    def createElementNS(self, namespaceURI: str | None, qualifiedName: str) -> Element:
+        return super().createElementNS(namespaceURI, qualifiedName)
+
+
+class Addon(NamedTuple):
+    interface_id: str
+    file: str
+    """File is the URL if the addon is remote."""
+    name: str
+
+
+@attrs.define
+class AddonInfo(Sequence[str]):
+    # DON'T CHANGE THE ORDER OF THESE FIELDS. This is a wrapper over what used to be
+    # normal sequences of strings.
+    name: str | Literal[""] = ""
+    category: str | Literal[""] = ""
+    version: str | Literal[""] = ""
+    author: str | Literal[""] = ""
+    latest_release: str | Literal[""] = ""
+    file: str | Literal[""] = ""
+    """File is the URL if the addon is remote."""
+    interface_id: str | Literal[""] = ""
+    dependencies: str | Literal[""] = ""
+    startup_script: str | Literal[""] = ""
+
+    @override
+    def __iter__(self) -> Iterator[str | Literal[""]]:
+        yield from attrs.astuple(self)
+
+    @override
+    def __len__(self) -> int:
+        return len(attrs.astuple(self))
+
+    @overload
+    def __getitem__(self, int: int, /) -> str: ...
+    @overload
+    def __getitem__(self, slice: slice, /) -> Sequence[str]: ...
+
+    @override
+    def __getitem__(self, key: int | slice) -> str | tuple[str, ...]:
+        return attrs.astuple(self).__getitem__(key)
+
+    def __setitem__(self, index: int, value: str) -> None:
+        setattr(self, tuple(attrs.asdict(self).keys())[index], value)
+
+    def without_status_prefixes(self) -> "AddonInfo":
+        """Return copy without the installed status name prefix"""
+        return attrs.evolve(self, name=self.name.removeprefix(INSTALLED_NAME_PREFIX))
+
+
+def GetText(nodelist: NodeList["_ElementChildren"]) -> str:
+    return "".join(
+        node.data
+        for node in nodelist
+        if node.nodeType in [node.TEXT_NODE, node.CDATA_SECTION_NODE]
+    )
+
+
+def get_supported_addon_types(game_type: GameType) -> tuple[AddonType, ...]:
+    if game_type == GameType.LOTRO:
+        return ("plugin", "skin", "music")
+    elif game_type == GameType.DDO:
+        # DDO doesn't support plugins or playing music from `.abc` files.
+        return ("skin",)
+    else:
+        assert_never(game_type)
+
+
+def get_addons_feed_url(game_type: GameType, addon_type: AddonType) -> str:
+    """Return the LotroInterface favorites feed for an addon type"""
+    if game_type == GameType.DDO and addon_type == "skin":
+        return "https://api.lotrointerface.com/fav/OneLauncher-Themes-DDO.xml"
+    elif addon_type == "plugin":
+        return "https://api.lotrointerface.com/fav/OneLauncher-Plugins.xml"
+    elif addon_type == "skin":
+        return "https://api.lotrointerface.com/fav/OneLauncher-Themes.xml"
+    elif addon_type == "music":
+        return "https://api.lotrointerface.com/fav/OneLauncher-Music.xml"
+    else:
+        assert_never(addon_type)
+
+
+def get_addon_data_folder[P: Path](settings_dir: P, addon_type: AddonType) -> P:
+    """Return the folder that addons of `addon_type` are installed to"""
+    if addon_type == "plugin":
+        return settings_dir / "Plugins"
+    elif addon_type == "skin":
+        return settings_dir / "ui/skins"
+    elif addon_type == "music":
+        return settings_dir / "Music"
+    else:
+        assert_never(addon_type)
+
+
+def get_addon_dependencies(dependencies_node: Element) -> str:
+    dependencies = ""
+    for node in dependencies_node.childNodes:
+        if node.nodeName == "dependency" and node.childNodes:
+            dependencies = f"{dependencies},{GetText(node.childNodes)}"
+    return dependencies[1:]
+
+
+def parse_compendium_file(file: Path, tag: str) -> AddonInfo | None:
+    """Returns list of common values for compendium or .plugin files"""
+    addon_info = AddonInfo()
+
+    try:
+        doc = defusedxml.minidom.parse(str(file))
+        nodes = doc.getElementsByTagName(tag)[0].childNodes
+    except (ExpatError, IndexError):
+        logger.exception("`%s` has invalid XML", file.name)
+        return None
+    for node in nodes:
+        if node.nodeName == "Name":
+            addon_info.name = GetText(node.childNodes)
+        elif node.nodeName == "Author":
+            addon_info.author = GetText(node.childNodes)
+        elif node.nodeName == "Version":
+            addon_info.version = GetText(node.childNodes)
+        elif node.nodeName == "Id":
+            addon_info.interface_id = GetText(node.childNodes)
+        elif node.nodeName == "Dependencies":
+            addon_info.dependencies = get_addon_dependencies(node)
+        elif node.nodeName == "StartupScript":
+            addon_info.startup_script = GetText(node.childNodes)
+    addon_info.file = str(file)
+
+    return addon_info
+
+
+def get_compendium_plugin_files[P: Path](
+    compendium_file: Path, data_folder_plugins: P
+) -> list[P] | None:
+    """
+    Return the `.plugin` files described by a `.plugincompendium` file or `None` if
+    it has invalid XML. A compendium without `<Descriptors>` describes no files.
+    """
+    try:
+        doc = defusedxml.minidom.parse(str(compendium_file))
+    except ExpatError:
+        logger.warning(
+            "`.plugincompendium` file has invalid XML: %s",
+            compendium_file,
+            exc_info=True,
+        )
+        return None
+    descriptors_nodes = doc.getElementsByTagName("Descriptors")
+    if not descriptors_nodes:
+        return []
+    return [
+        data_folder_plugins / (GetText(node.childNodes).replace("\\", "/"))
+        for node in descriptors_nodes[0].childNodes
+        if node.nodeName == "descriptor"
+    ]
+
+
+def get_plugin_package_folder[P: Path](
+    plugin_file: Path, data_folder_plugins: P
+) -> P | None:
+    """Return the folder with the code for a `.plugin` file"""
+    try:
+        doc = defusedxml.minidom.parse(str(plugin_file))
+    except ExpatError:
+        logger.warning("`.plugin` file has invalid XML: %s", plugin_file, exc_info=True)
+        return None
+    plugin_folder: P | None = None
+    for node in doc.getElementsByTagName("Plugin")[0].childNodes:
+        if node.nodeName == "Package":
+            plugin_folder = data_folder_plugins / (
+                "/".join(GetText(node.childNodes).split(".")[:2])
+            )
+    return plugin_folder
+
+
+def get_installed_addon_paths(
+    addon_file: Path, addon_type: AddonType, data_folder_plugins: Path
+) -> list[Path]:
+    """
+    Return all of the files and folders that make up an installed addon.
+
+    Args:
+        addon_file (Path): The addon's compendium file, `.plugin` file, folder, or
+            `.abc` file.
+    """
+    paths: list[Path] = []
+    if addon_type == "plugin":
+        if addon_file.suffix == ".plugin":
+            plugin_files: list[Path] = [addon_file]
+        else:
+            paths.append(addon_file)
+            plugin_files = list(
+                get_compendium_plugin_files(addon_file, data_folder_plugins) or []
+            )
+        for plugin_file in plugin_files:
+            if not plugin_file.exists():
+                continue
+            paths.append(plugin_file)
+            if plugin_folder := get_plugin_package_folder(
+                plugin_file, data_folder_plugins
+            ):
+                paths.append(plugin_folder)
+    else:
+        paths.append(
+            addon_file.parent
+            if addon_file.suffix.endswith("compendium")
+            else addon_file
+        )
+    return [path for path in paths if path.exists()]
+
+
+def get_interface_info_url(download_url: str) -> str:
+    """Replaces "download" with "info" in download url to make info url
+
+    An example is: https://www.lotrointerface.com/downloads/download1078-VitalTarget
+               to: https://www.lotrointerface.com/downloads/info1078-VitalTarget
+    """
+    return download_url.replace("/downloads/download", "/downloads/info")
+
+
+def unescape_lotrointerface_feed_unicode(escaped_string: str) -> str:
+    """
+    Convert feed escaped characters to Unicode characters. This shouold be used with
+    strings that have already had the XML unesaaped.
+
+    Unicode characters in LotroInterface feeds are escaped with an ampersand followed
+    by the Unicode character number. Ex. `&1088`.
+    """
+    return html.unescape(
+        # Convert to HTML escape notation by adding `#`.
+        re.sub(
+            r"&(\d+);",
+            lambda match: f"&#{match.group(1)};",
+            escaped_string,
+        )
+    )
+
+
+def parse_addons_feed(feed: str) -> list[AddonInfo]:
+    """
+    Parse a LotroInterface favorites feed.
+
+    Raises:
+        ExpatError: Feed has invalid XML
+    """
+    doc = defusedxml.minidom.parseString(feed)
+    addons: list[AddonInfo] = []
+    for tag in doc.getElementsByTagName("Ui"):
+        addon_info = AddonInfo()
+        for node in tag.childNodes:
+            if node.nodeName == "UIName":
+                addon_info.name = unescape_lotrointerface_feed_unicode(
+                    GetText(node.childNodes)
+                )
+                # Sanitize
+                addon_info.name = addon_info.name.replace("/", "-").replace("\\", "-")
+            elif node.nodeName == "UIAuthorName":
+                addon_info.author = unescape_lotrointerface_feed_unicode(
+                    GetText(node.childNodes)
+                )
+            elif node.nodeName == "UICategory":
+                addon_info.category = GetText(node.childNodes)
+            elif node.nodeName == "UID":
+                addon_info.interface_id = GetText(node.childNodes)
+            elif node.nodeName == "UIVersion":
+                addon_info.version = GetText(node.childNodes)
+            elif node.nodeName == "UIUpdated":
+                addon_info.latest_release = strftime(
+                    "%Y-%m-%d", localtime(int(GetText(node.childNodes)))
+                )
+            elif node.nodeName == "UIFileURL":
+                addon_info.file = GetText(node.childNodes)
+        addons.append(addon_info)
+    return addons
+
+
+def get_existing_compendium_file[P: Path](search_dir: P) -> P | Literal[False] | None:
+    """
+    Return existing compendium file, None, or False if there are multiple.
+
+    Args:
+        search_dir (Path): Directory to check for compendium files in. It has to be a
+            staging folder the addon has been extracted to or compendium files from
+            other addons will be detected.
+    """
+    existing_compendium_files = list(search_dir.glob("*.*compendium"))
+    if len(existing_compendium_files) > 1:
+        logger.error("Addon has multiple compendium files")
+        return False
+    elif len(existing_compendium_files) == 1:
+        return existing_compendium_files[0]
+    return None
+
+
+def generate_compendium_file[P: Path](
+    addon_root_dir: P,
+    remote_addon_info: AddonInfo,
+    addon_type: AddonType,
+    existing_compendium_file: Path | None = None,
+) -> P:
+    """
+    Generate compendium file for addon. If there is an existing one
+    data that can only be gotten from it will be gathered and put
+    in the new file. The old one will be removed.
+
+    Args:
+        addon_root_dir (Path): Where the compendium file goes. In the case of plugins it
+            should be the author's name. This has to be the addon root dir while it is
+            still in a staging directory for proper .plugin file detection.
+        remote_addon_info (AddonInfo): Remote information for the addon
+        addon_type (AddonType): The type of the addon.
+        existing_compendium_file (Path, optional): An existing compendium file to
+            extract data from. Defaults to None.
+    """
+    dependencies = ""
+    startup_python_script = ""
+    # Get dependencies and startup_python_script from existing compendium
+    # file if present.
+    if existing_compendium_file:
+        existing_compendium_values = parse_compendium_file(
+            existing_compendium_file, f"{addon_type.title()}Config"
+        )
+        if existing_compendium_values is not None:
+            dependencies = existing_compendium_values.dependencies
+            startup_python_script = existing_compendium_values.startup_script
+        existing_compendium_file.unlink()
+
+    remote_addon_info = remote_addon_info.without_status_prefixes()
+    doc = Document()
+    mainNode = doc.createElementNS(EMPTY_NAMESPACE, f"{addon_type.title()}Config")
+    doc.appendChild(mainNode)
+
+    for node_name, value in (
+        ("Id", remote_addon_info.interface_id),
+        ("Name", remote_addon_info.name),
+        ("Version", remote_addon_info.version),
+        ("Author", remote_addon_info.author),
+        ("InfoUrl", get_interface_info_url(remote_addon_info.file)),
+        ("DownloadUrl", remote_addon_info.file),
+    ):
+        tempNode = doc.createElementNS(EMPTY_NAMESPACE, node_name)
+        tempNode.appendChild(doc.createTextNode(value))
+        mainNode.appendChild(tempNode)
+
+    if addon_type == "plugin":
+        # Add plugin's .plugin file descriptors
+        descriptorsNode = doc.createElementNS(EMPTY_NAMESPACE, "Descriptors")
+        mainNode.appendChild(descriptorsNode)
+        for plugin_file in addon_root_dir.glob("*.plugin"):
+            tempNode = doc.createElementNS(EMPTY_NAMESPACE, "descriptor")
+            tempNode.appendChild(
+                doc.createTextNode(f"{addon_root_dir.name}\\{plugin_file.name}")
+            )
+            descriptorsNode.appendChild(tempNode)
+
+    # Can't add dependencies, because they are defined in
+    # compendium files
+    dependenciesNode = doc.createElementNS(EMPTY_NAMESPACE, "Dependencies")
+    mainNode.appendChild(dependenciesNode)
+
+    # If compendium file from addon already existed with
+    # dependencies
+    if dependencies:
+        for dependency in dependencies.split(","):
+            tempNode = doc.createElementNS(EMPTY_NAMESPACE, "dependency")
+            tempNode.appendChild(doc.createTextNode(f"{dependency}"))
+            dependenciesNode.appendChild(tempNode)
+
+    # Can't add startup script, because it is defined in compendium
+    # files
+    startupScriptNode = doc.createElementNS(EMPTY_NAMESPACE, "StartupScript")
+    # If compendium file from add-n already existed with startup
+    # script
+    if startup_python_script:
+        startupScriptNode.appendChild(doc.createTextNode(f"{startup_python_script}"))
+    mainNode.appendChild(startupScriptNode)
+
+    # Write compendium file
+    compendium_file = (
+        addon_root_dir / f"{remote_addon_info.name}.{addon_type.lower()}compendium"
+    )
+    with compendium_file.open("w+") as file:
+        # Use ElementTree for prettification. Minidom isn't great at it.
+        etree_element = ET.XML(doc.toxml())
+        ET.indent(etree_element)
+        file.write(ET.tostring(etree_element, encoding="unicode"))
+
+    return compendium_file
@@ -0,0 +1,343 @@
+"""
+Addon manager database caches
+
+Installed addon state is cached in a database for each game settings directory, so
+game configs that share a settings directory share their installed addons, and ones
+that don't can all stay cached. The remote addon catalog is cached in a separate
+database that every game of the same `GameType` reads from. It's attached to the
+installed addons database as `catalog`.
+"""
+
+import hashlib
+import os
+import sqlite3
+from collections.abc import Collection, Iterable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Final, assert_never
+
+from ..config import platform_dirs
+from ..game_config import GameType
+from .addon_info import AddonInfo, AddonType
+
+ADDONS_CACHE_DIR: Final = platform_dirs.user_cache_path / "addons_cache"
+ADDON_CATALOG_PATH: Final = ADDONS_CACHE_DIR / "catalog.sqlite"
+LEGACY_ADDONS_CACHE_PATH: Final = platform_dirs.user_cache_path / "addons_cache.sqlite"
+"""Single addons cache database that was used for every game"""
+
+ADDON_CATALOG_MAX_AGE: Final = timedelta(hours=1)
+"""How long a fetched addon catalog is used before being fetched again"""
+
+_FINGERPRINTED_FILE_SUFFIXES: Final = frozenset(
+    (".plugin", ".plugincompendium", ".skincompendium", ".musiccompendium")
+)
+"""Suffixes of the addon files that `get_addon_folder_fingerprint` includes"""
+
+CACHE_STATE_TABLE: Final = "cache_state"
+"""Key value table in the installed addons database for tracking cache freshness"""
+ADDON_UPDATES_TABLE: Final = "addon_updates"
+"""Table in the installed addons database with the update state of managed addons"""
+
+ADDON_COLUMN_NAMES: Final = (
+    "Name",
+    "Category",
+    "Version",
+    "Author",
+    "LatestRelease",
+    "File",
+    "InterfaceID",
+    "Dependencies",
+    "StartupScript",
+)
+"""Columns of the addon tables. They match the fields of `AddonInfo`."""
+CATALOG_TABLE_NAMES: Final = (
+    "tablePlugins",
+    "tableSkins",
+    "tableMusic",
+    "tableSkinsDDO",
+)
+
+_CATALOG_SCHEMA_VERSION: Final = 2
+
+
+def get_path_cache_key(path: Path) -> str:
+    """Return a file name safe key for caches that are per-path"""
+    return hashlib.sha256(str(path).encode()).hexdigest()[:16]
+
+
+def get_catalog_table_name(game_type: GameType, addon_type: AddonType) -> str:
+    """Return the addon catalog table with the remote addons for an addon type"""
+    if game_type == GameType.DDO and addon_type == "skin":
+        return "tableSkinsDDO"
+    elif addon_type == "plugin":
+        return "tablePlugins"
+    elif addon_type == "skin":
+        return "tableSkins"
+    elif addon_type == "music":
+        return "tableMusic"
+    else:
+        assert_never(addon_type)
+
+
+def get_installed_addons_cache_path(settings_dir: Path) -> Path:
+    return ADDONS_CACHE_DIR / f"installed-{get_path_cache_key(settings_dir)}.sqlite"
+
+
+def get_addon_folder_fingerprint(folder: Path) -> str:
+    """
+    Return a value that changes when addons are added to, removed from, or updated in
+    `folder`. This is based on the modification times of `folder`, its
+    subdirectories, and the `.plugin` and compendium files in them, so it doesn't need
+    to look at every file. Those files are what addon scans read, and they can be
+    rewritten without their directory's modification time changing.
+    """
+    fingerprint = hashlib.sha256()
+    try:
+        fingerprint.update(str(folder.stat().st_mtime_ns).encode())
+        entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+    except OSError:
+        return ""
+    for entry in entries:
+        try:
+            if not entry.is_dir():
+                continue
+            mtime_ns = entry.stat().st_mtime_ns
+            subentries = sorted(
+                os.scandir(entry.path), key=lambda subentry: subentry.name
+            )
+        except OSError:
+            continue
+        fingerprint.update(f"\0{entry.name}\0{mtime_ns}".encode())
+        for subentry in subentries:
+            if Path(subentry.name).suffix.lower() not in _FINGERPRINTED_FILE_SUFFIXES:
+                continue
+            try:
+                stat = subentry.stat()
+            except OSError:
+                continue
+            relative_path = f"{entry.name}/{subentry.name}"
+            fingerprint.update(
+                f"\0{relative_path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode()
+            )
+    return fingerprint.hexdigest()
+
+
+def create_cache_state_table(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {CACHE_STATE_TABLE} "
+        "(name TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+    )
+
+
+def get_cache_state(cursor: sqlite3.Cursor, name: str) -> str | None:
+    for (value,) in cursor.execute(
+        f"SELECT value FROM main.{CACHE_STATE_TABLE} WHERE name = ?",  # noqa: S608
+        (name,),
+    ):
+        return str(value)
+    return None
+
+
+def set_cache_state(cursor: sqlite3.Cursor, name: str, value: str) -> None:
+    cursor.execute(
+        f"INSERT OR REPLACE INTO main.{CACHE_STATE_TABLE}(name, value) VALUES (?, ?)",  # noqa: S608
+        (name, value),
+    )
+
+
+def create_addon_updates_table(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {ADDON_UPDATES_TABLE} "
+        "(table_name TEXT NOT NULL, interface_id TEXT NOT NULL, "
+        "installed_version TEXT NOT NULL, latest_version TEXT NOT NULL, "
+        "has_update INTEGER NOT NULL, PRIMARY KEY (table_name, interface_id)) "
+        "WITHOUT ROWID"
+    )
+
+
+def compute_addon_updates(
+    cursor: sqlite3.Cursor, installed_table: str, catalog_table: str
+) -> None:
+    """
+    Replace the update state of the addons in `installed_table` by joining it with
+    the addon catalog. This is always two queries, no matter how many addons are
+    installed. Run it in a transaction when computing multiple tables, so readers
+    never see a partial result.
+
+    Args:
+        installed_table (str): Installed addons table in the main database
+        catalog_table (str): Table in the attached addon catalog with the remote
+            addons of the same type. See `get_catalog_table_name`.
+    """
+    cursor.execute(
+        f"DELETE FROM main.{ADDON_UPDATES_TABLE} WHERE table_name = ?",  # noqa: S608
+        (installed_table,),
+    )
+    cursor.execute(
+        f"INSERT OR REPLACE INTO main.{ADDON_UPDATES_TABLE} "  # noqa: S608
+        "(table_name, interface_id, installed_version, latest_version, has_update) "
+        "SELECT ?, installed.InterfaceID, installed.Version, remote.Version, "
+        "installed.Version != remote.Version "
+        f"FROM main.{installed_table} AS installed "
+        f"JOIN catalog.{catalog_table} AS remote "
+        "ON remote.InterfaceID = installed.InterfaceID "
+        "WHERE installed.InterfaceID != ''",
+        (installed_table,),
+    )
+
+
+def get_outdated_addon_ids(cursor: sqlite3.Cursor, installed_table: str) -> set[str]:
+    """Return the interface IDs of addons in `installed_table` with updates"""
+    return {
+        interface_id
+        for (interface_id,) in cursor.execute(
+            f"SELECT interface_id FROM main.{ADDON_UPDATES_TABLE} "  # noqa: S608
+            "WHERE table_name = ? AND has_update",
+            (installed_table,),
+        )
+    }
+
+
+def attach_addon_catalog(
+    cursor: sqlite3.Cursor,
+    table_names: Iterable[str] = CATALOG_TABLE_NAMES,
+    column_names: Collection[str] = ADDON_COLUMN_NAMES,
+    catalog_path: Path = ADDON_CATALOG_PATH,
+) -> None:
+    """
+    Attach the shared addon catalog database as `catalog`, and make sure it has a table
+    for each remote addons table.
+    """
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    cursor.execute("ATTACH DATABASE ? AS catalog", (str(catalog_path),))
+    (version,) = cursor.execute("PRAGMA catalog.user_version").fetchone()
+    if version not in (0, _CATALOG_SCHEMA_VERSION):
+        # The catalog can always be fetched again, so it's cleared rather than
+        # migrated.
+        for (table_name,) in cursor.execute(
+            "SELECT name FROM catalog.sqlite_master WHERE type = 'table'"
+        ).fetchall():
+            cursor.execute(f"DROP TABLE catalog.{table_name}")
+    columns = ", ".join(column_names)
+    for table_name in table_names:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS catalog.{table_name} ({columns})")
+        if "InterfaceID" in column_names:
+            # For joining against installed addons. See `compute_addon_updates`.
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS catalog.{table_name}_interface_id "
+                f"ON {table_name}(InterfaceID)"
+            )
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS catalog.fetches "
+        "(table_name TEXT PRIMARY KEY, fetched_at TEXT NOT NULL, "
+        "modified_at TEXT NOT NULL, etag TEXT, last_modified TEXT) WITHOUT ROWID"
+    )
+    cursor.execute(f"PRAGMA catalog.user_version = {_CATALOG_SCHEMA_VERSION}")
+    cursor.connection.commit()
+
+
+def get_catalog_fetched_at(cursor: sqlite3.Cursor, table_name: str) -> datetime | None:
+    """Return when the catalog for `table_name` was last fetched"""
+    for (fetched_at,) in cursor.execute(
+        "SELECT fetched_at FROM catalog.fetches WHERE table_name = ?", (table_name,)
+    ):
+        return datetime.fromisoformat(fetched_at)
+    return None
+
+
+def get_catalog_modified_at(cursor: sqlite3.Cursor, table_name: str) -> datetime | None:
+    """
+    Return when the catalog for `table_name` last changed. Unlike the fetch time, this
+    stays the same when the feed is fetched again without changes.
+    """
+    for (modified_at,) in cursor.execute(
+        "SELECT modified_at FROM catalog.fetches WHERE table_name = ?", (table_name,)
+    ):
+        return datetime.fromisoformat(modified_at)
+    return None
+
+
+def get_catalog_conditional_headers(
+    cursor: sqlite3.Cursor, table_name: str
+) -> dict[str, str]:
+    """
+    Return HTTP headers for fetching the feed of `table_name` only if it changed since
+    the last fetch
+    """
+    headers: dict[str, str] = {}
+    for etag, last_modified in cursor.execute(
+        "SELECT etag, last_modified FROM catalog.fetches WHERE table_name = ?",
+        (table_name,),
+    ):
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def is_catalog_fresh(cursor: sqlite3.Cursor, table_name: str) -> bool:
+    fetched_at = get_catalog_fetched_at(cursor, table_name)
+    return (
+        fetched_at is not None
+        and datetime.now(UTC) - fetched_at < ADDON_CATALOG_MAX_AGE
+    )
+
+
+def set_catalog_fetched(
+    cursor: sqlite3.Cursor,
+    table_name: str,
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> datetime:
+    """
+    Record that the catalog for `table_name` was fetched with new contents
+
+    Args:
+        etag (str | None, optional): `ETag` header of the feed response
+        last_modified (str | None, optional): `Last-Modified` header of the feed
+            response
+    """
+    fetched_at = datetime.now(UTC)
+    cursor.execute(
+        "INSERT OR REPLACE INTO catalog.fetches"
+        "(table_name, fetched_at, modified_at, etag, last_modified) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (
+            table_name,
+            fetched_at.isoformat(),
+            fetched_at.isoformat(),
+            etag,
+            last_modified,
+        ),
+    )
+    return fetched_at
+
+
+def set_catalog_not_modified(cursor: sqlite3.Cursor, table_name: str) -> datetime:
+    """Record that the feed for `table_name` was fetched, but hadn't changed"""
+    fetched_at = datetime.now(UTC)
+    cursor.execute(
+        "UPDATE catalog.fetches SET fetched_at = ? WHERE table_name = ?",
+        (fetched_at.isoformat(), table_name),
+    )
+    return fetched_at
+
+
+def replace_catalog(
+    cursor: sqlite3.Cursor,
+    table_name: str,
+    addons: Iterable[AddonInfo],
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> None:
+    """Replace the catalog for `table_name` with freshly fetched `addons`"""
+    cursor.execute(f"DELETE FROM catalog.{table_name}")  # noqa: S608
+    question_marks = ",".join("?" * len(ADDON_COLUMN_NAMES))
+    cursor.executemany(
+        f"INSERT INTO catalog.{table_name} VALUES({question_marks})",
+        addons,
+    )
+    set_catalog_fetched(cursor, table_name, etag=etag, last_modified=last_modified)
@@ -10,3 +10,17 @@ class AddonsConfigSection:
         default=(),
         help="Python scripts run before game launch. Paths are relative to the game's documents config directory",
     )
+    update_before_launch: bool = config_field(
+        default=False,
+        help=(
+            "Update addons while logging in and waiting in the world queue. "
+            "Updates that aren't done by the deadline are skipped."
+        ),
+    )
+    update_before_launch_deadline: int = config_field(
+        default=30,
+        help=(
+            "Maximum number of seconds that updating addons before launch can delay "
+            "starting the game"
+        ),
+    )
@@ -0,0 +1,334 @@
+"""
+Installing, scanning, and uninstalling addons without any UI
+
+These are used by both the addon manager window and the `addons` CLI commands.
+"""
+
+import logging
+import zipfile
+from collections.abc import Sequence
+from pathlib import Path
+
+import attrs
+
+from ..game_config import GameType
+from .addon_info import (
+    AddonInfo,
+    AddonType,
+    generate_compendium_file,
+    get_addon_data_folder,
+    get_compendium_plugin_files,
+    get_existing_compendium_file,
+    get_installed_addon_paths,
+    get_supported_addon_types,
+    parse_compendium_file,
+)
+from .music_index import parse_abc_file
+from .transactions import AddonTransaction, addon_transaction, is_transaction_path
+from .zip_addon import (
+    InvalidAddonArchiveError,
+    ZipAddonLayout,
+    extract_zip_addon,
+    get_zip_addon_layout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@attrs.frozen(kw_only=True)
+class AddonOperationError(Exception):
+    msg: str
+
+
+@attrs.frozen(kw_only=True)
+class InstalledZipAddon[P: Path]:
+    addon_type: AddonType
+    root_dir: P
+    """Installed addon root dir. For plugins, this is the author folder."""
+    plugin_files: tuple[P, ...] = ()
+    compendium_file: P | None = None
+
+
+def get_addon_archive_id(
+    settings_dir: Path, addon_type: AddonType, addon_id: str
+) -> str:
+    """ID for archived versions of an addon. See `AddonTransaction`."""
+    return f"{settings_dir.as_posix()}:{addon_type}:{addon_id}"
+
+
+def get_compendium_tag(addon_type: AddonType) -> str:
+    """Root XML tag of compendium files for `addon_type`"""
+    return f"{addon_type.title()}Config"
+
+
+def install_zip_addon[P: Path](
+    addon_path: Path,
+    *,
+    settings_dir: P,
+    game_type: GameType,
+    remote_addon_info: AddonInfo | None = None,
+    replaced_paths: Sequence[Path] = (),
+) -> InstalledZipAddon[P]:
+    """
+    Install an addon zip archive in a transaction.
+
+    Args:
+        addon_path (Path): The addon zip archive
+        settings_dir (Path): Game settings directory to install the addon in
+        game_type (GameType): Type of the game `settings_dir` is for
+        remote_addon_info (AddonInfo | None, optional): Remote information for the
+            addon, if it was installed from online. A compendium file is only
+            generated for addons installed from online.
+        replaced_paths (Sequence[Path], optional): Files from a previous version of
+            the addon. They get removed in the same transaction as the new version
+            gets installed in, so they are only removed if the install succeeds.
+
+    Raises:
+        AddonOperationError: The addon couldn't be installed
+    """
+    with zipfile.ZipFile(addon_path, "r") as archive:
+        try:
+            layout = get_zip_addon_layout(archive, addon_name=addon_path.stem)
+        except InvalidAddonArchiveError as e:
+            raise AddonOperationError(msg=e.msg) from e
+
+        if layout.addon_type not in get_supported_addon_types(game_type):
+            raise AddonOperationError(
+                msg=f"{game_type} does not support {layout.addon_type} addons"
+            )
+
+        addon_id = (
+            remote_addon_info.interface_id if remote_addon_info else addon_path.stem
+        )
+        with addon_transaction(
+            addon_id=get_addon_archive_id(settings_dir, layout.addon_type, addon_id)
+        ) as transaction:
+            for path in replaced_paths:
+                transaction.replace(path)
+
+            if layout.addon_type == "plugin":
+                return _install_plugin(
+                    archive,
+                    layout,
+                    transaction,
+                    data_folder=get_addon_data_folder(settings_dir, "plugin"),
+                    remote_addon_info=remote_addon_info,
+                )
+            else:
+                return _install_root_dir(
+                    archive,
+                    layout,
+                    transaction,
+                    data_folder=get_addon_data_folder(settings_dir, layout.addon_type),
+                    remote_addon_info=remote_addon_info,
+                )
+
+
+def _commit(transaction: AddonTransaction) -> None:
+    try:
+        transaction.commit()
+    except OSError as e:
+        raise AddonOperationError(msg="Failed to move addon files into place") from e
+
+
+def _install_plugin[P: Path](
+    archive: zipfile.ZipFile,
+    layout: ZipAddonLayout,
+    transaction: AddonTransaction,
+    *,
+    data_folder: P,
+    remote_addon_info: AddonInfo | None,
+) -> InstalledZipAddon[P]:
+    # Extract to a staging directory in the plugins folder, so moving the plugin
+    # into place is just a rename.
+    staging_dir = transaction.make_staging_dir(data_folder)
+    extract_zip_addon(archive, layout, staging_dir)
+    author_folder = staging_dir / layout.root_dir
+
+    # .plugin files should always be in the author folder. All others
+    # will be ignored by both me and the game.
+    plugin_files = list(author_folder.glob("*.plugin"))
+
+    # Don't install if there are invalid `.plugin` files.
+    for plugin_file in plugin_files:
+        if parse_compendium_file(plugin_file, "Information") is None:
+            raise AddonOperationError(msg=f"`{plugin_file.name}` has invalid XML")
+
+    existing_compendium_file = get_existing_compendium_file(author_folder)
+    if existing_compendium_file is False:
+        raise AddonOperationError(msg="Addon has multiple compendium files")
+
+    compendium_file: P | None = None
+    # Only make compendium file for addons installed from online
+    if remote_addon_info:
+        compendium_file = generate_compendium_file(
+            author_folder, remote_addon_info, "plugin", existing_compendium_file
+        )
+    # Remove compendium files from manually installed addons.
+    # This is to limit confusion since there is no way to verify
+    # that compendium files from manually installed addons have
+    # correct information. ex. They could have some random interface_id
+    # suggesting they're the wrong addon and end up getting replaced
+    # by the addon for that ID during the updating process.
+    elif existing_compendium_file:
+        existing_compendium_file.unlink()
+
+    # Author folders can be shared by multiple plugins, so what's in them is
+    # swapped in rather than the folders themselves.
+    for dir_name in layout.top_level_dirs:
+        for path in (staging_dir / dir_name).iterdir():
+            transaction.replace(data_folder / dir_name / path.name, staged=path)
+    _commit(transaction)
+
+    # Make plugin and compendium file paths point to their new location
+    return InstalledZipAddon(
+        addon_type="plugin",
+        root_dir=data_folder / author_folder.relative_to(staging_dir),
+        plugin_files=tuple(
+            data_folder / file.relative_to(staging_dir) for file in plugin_files
+        ),
+        compendium_file=data_folder / compendium_file.relative_to(staging_dir)
+        if compendium_file
+        else None,
+    )
+
+
+def _install_root_dir[P: Path](
+    archive: zipfile.ZipFile,
+    layout: ZipAddonLayout,
+    transaction: AddonTransaction,
+    *,
+    data_folder: P,
+    remote_addon_info: AddonInfo | None,
+) -> InstalledZipAddon[P]:
+    """
+    Extract a skin or music addon with a generated compendium file, and swap it
+    into `data_folder`. This should only be used for skins and music.
+    """
+    # Extract to a staging directory in the data folder, so moving the addon into
+    # place is just a rename.
+    staging_dir = transaction.make_staging_dir(data_folder)
+    extract_zip_addon(archive, layout, staging_dir)
+    staging_root_dir = staging_dir / layout.root_dir
+
+    existing_compendium_file = get_existing_compendium_file(staging_root_dir)
+    if existing_compendium_file is False:
+        raise AddonOperationError(msg="Addon has multiple compendium files")
+
+    compendium_file: P | None = None
+    if remote_addon_info:
+        compendium_file = generate_compendium_file(
+            staging_root_dir,
+            remote_addon_info,
+            layout.addon_type,
+            existing_compendium_file,
+        )
+
+    root_dir = data_folder / staging_root_dir.name
+    transaction.replace(root_dir, staged=staging_root_dir)
+    _commit(transaction)
+    return InstalledZipAddon(
+        addon_type=layout.addon_type,
+        root_dir=root_dir,
+        compendium_file=root_dir / compendium_file.name if compendium_file else None,
+    )
+
+
+def uninstall_addon(
+    addon_file: Path, *, settings_dir: Path, addon_type: AddonType, addon_id: str
+) -> None:
+    """
+    Remove an installed addon in a transaction. The removed files are archived, so
+    the addon can be rolled back.
+
+    Args:
+        addon_file (Path): The addon's compendium file, `.plugin` file, folder, or
+            `.abc` file.
+        addon_id (str): Interface ID of the addon or its name if it's unmanaged
+
+    Raises:
+        AddonOperationError: The addon couldn't be removed
+    """
+    data_folder_plugins = get_addon_data_folder(settings_dir, "plugin")
+    paths = get_installed_addon_paths(addon_file, addon_type, data_folder_plugins)
+    with addon_transaction(
+        addon_id=get_addon_archive_id(settings_dir, addon_type, addon_id)
+    ) as transaction:
+        for path in paths:
+            transaction.replace(path)
+        _commit(transaction)
+
+    if addon_type == "plugin":
+        # Remove author folders if there are no other plugins in them.
+        for author_dir in {
+            path.parent for path in paths if path.parent != data_folder_plugins
+        }:
+            if author_dir.is_dir() and next(author_dir.iterdir(), None) is None:
+                author_dir.rmdir()
+
+
+def scan_installed_addons(settings_dir: Path, addon_type: AddonType) -> list[AddonInfo]:
+    """
+    Find the installed addons of `addon_type`. The `file` of each is an absolute path
+    to its compendium file, `.plugin` file, folder, or `.abc` file. Unmanaged addons
+    don't have an interface ID.
+    """
+    data_folder = get_addon_data_folder(settings_dir, addon_type)
+    if not data_folder.is_dir():
+        return []
+    folders = sorted(
+        path
+        for path in data_folder.iterdir()
+        if path.is_dir() and not is_transaction_path(path.relative_to(data_folder))
+    )
+
+    addons: list[AddonInfo] = []
+    if addon_type == "plugin":
+        compendium_files: list[Path] = []
+        plugin_files: list[Path] = []
+        for folder in folders:
+            for file in folder.glob("**/*.plugin*"):
+                if is_transaction_path(file.relative_to(folder)):
+                    continue
+                # .plugincompenmdium file should be in author folder of plugin
+                if file.suffix == ".plugincompendium" and file.parent == folder:
+                    compendium_files.append(file)
+                elif file.suffix == ".plugin":
+                    plugin_files.append(file)
+        managed_plugin_files: set[Path] = set()
+        for compendium_file in compendium_files:
+            managed_plugin_files.update(
+                get_compendium_plugin_files(compendium_file, data_folder) or ()
+            )
+            if addon_info := parse_compendium_file(
+                compendium_file, get_compendium_tag(addon_type)
+            ):
+                addons.append(addon_info)
+        for plugin_file in plugin_files:
+            if plugin_file in managed_plugin_files:
+                continue
+            if addon_info := parse_compendium_file(plugin_file, "Information"):
+                # Only compendium files from installing addons online have trusted
+                # interface IDs.
+                addons.append(attrs.evolve(addon_info, interface_id=""))
+        return addons
+
+    for folder in folders:
+        folder_compendium_file = next(folder.glob(f"*.{addon_type}compendium"), None)
+        if folder_compendium_file is None:
+            addons.append(AddonInfo(name=folder.name, file=str(folder)))
+        elif addon_info := parse_compendium_file(
+            folder_compendium_file, get_compendium_tag(addon_type)
+        ):
+            addons.append(addon_info)
+    if addon_type == "music":
+        for abc_file in sorted(data_folder.glob("*.abc")):
+            abc_info = parse_abc_file(abc_file)
+            addons.append(
+                AddonInfo(
+                    name=abc_info.title or abc_file.stem,
+                    author=abc_info.transcriber,
+                    file=str(abc_file),
+                )
+            )
+    return addons
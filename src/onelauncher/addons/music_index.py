@@ -0,0 +1,382 @@
+"""
+Persistent index of music (`.abc` file) libraries
+
+Music collections can have tens of thousands of `.abc` files. Reading all of their
+headers every time the music library is shown is too slow, so they are stored in an
+SQLite database that gets incrementally refreshed. Directories whose modification time
+hasn't changed aren't relisted, but their indexed files are still stat'ed, since editing
+a file in place doesn't change its directory's modification time. Files are only re-read
+when their modification time or size changes.
+"""
+
+import logging
+import os
+import sqlite3
+from pathlib import Path, PurePosixPath
+from typing import Final, Self
+
+import attrs
+
+from ..config import platform_dirs
+from .cache import get_path_cache_key
+from .transactions import is_transaction_path
+
+logger = logging.getLogger(__name__)
+
+MUSIC_INDEXES_DIR: Final = platform_dirs.user_cache_path / "music_indexes"
+
+INDEXED_FILE_SUFFIXES: Final = frozenset((".abc", ".musiccompendium"))
+
+_SCHEMA_VERSION: Final = 1
+_SCHEMA: Final = """
+CREATE TABLE directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX directories_parent ON directories(parent);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    directory TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    transcriber TEXT NOT NULL,
+    parts INTEGER NOT NULL
+);
+CREATE INDEX files_directory ON files(directory);
+CREATE VIRTUAL TABLE files_fts USING fts5(
+    title, transcriber, content='files', content_rowid='id'
+);
+CREATE TRIGGER files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, title, transcriber)
+    VALUES (new.id, new.title, new.transcriber);
+END;
+CREATE TRIGGER files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, title, transcriber)
+    VALUES ('delete', old.id, old.title, old.transcriber);
+END;
+CREATE TRIGGER files_au AFTER UPDATE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, title, transcriber)
+    VALUES ('delete', old.id, old.title, old.transcriber);
+    INSERT INTO files_fts(rowid, title, transcriber)
+    VALUES (new.id, new.title, new.transcriber);
+END;
+"""
+
+
+@attrs.frozen(kw_only=True)
+class AbcFileInfo:
+    title: str = ""
+    transcriber: str = ""
+    parts: int = 0
+    """Number of tunes (`X:` fields) in the file. Each is one part of the song."""
+
+
+@attrs.frozen(kw_only=True)
+class MusicIndexEntry:
+    path: PurePosixPath
+    """Path relative to the music folder"""
+    title: str
+    transcriber: str
+    parts: int
+
+
+def parse_abc_file(abc_path: Path) -> AbcFileInfo:
+    """
+    Get the song title and transcriber from the first `T:` and `Z:` fields of an `.abc`
+    file, along with the number of parts.
+    """
+    title = ""
+    transcriber = ""
+    parts = 0
+    with abc_path.open(encoding="utf-8", errors="replace") as file:
+        for raw_line in file:
+            line = raw_line.strip()
+            if line.startswith("X:"):
+                parts += 1
+            elif line.startswith("T:") and not title:
+                title = line[2:].strip()
+            elif line.startswith("Z:") and not transcriber:
+                transcriber = line[2:].strip().removeprefix("Transcribed by ")
+    return AbcFileInfo(title=title, transcriber=transcriber, parts=parts)
+
+
+def get_music_index_path(music_dir: Path) -> Path:
+    """Return where the index for `music_dir` is stored"""
+    return MUSIC_INDEXES_DIR / f"{get_path_cache_key(music_dir)}.sqlite"
+
+
+def _to_relative_path(path: str) -> PurePosixPath:
+    return PurePosixPath(path) if path else PurePosixPath()
+
+
+def _make_fts_query(text: str) -> str:
+    """Prefix match every word in `text`. Words are quoted to escape FTS syntax."""
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in text.split())
+
+
+class MusicIndex:
+    def __init__(self, music_dir: Path, index_path: Path | None = None) -> None:
+        self.music_dir = music_dir
+        self.index_path = index_path or get_music_index_path(music_dir)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.index_path)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version == _SCHEMA_VERSION:
+            return
+
+        # The index is only a cache, so it's rebuilt rather than migrated.
+        if version != 0:
+            logger.info("Rebuilding music index with new schema: %s", self.index_path)
+            self.conn.close()
+            self.index_path.unlink()
+            self.conn = sqlite3.connect(self.index_path)
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def refresh(self, full: bool = False) -> bool:
+        """
+        Update the index to match the music folder. Files in directories whose
+        modification time hasn't changed are still checked for in place edits.
+
+        Args:
+            full (bool, optional): Relist every directory, even ones whose modification
+                time hasn't changed. This picks up files that were added or removed
+                without the directory's modification time changing, like on
+                filesystems with coarse timestamps. Files are still only re-read if
+                their modification time or size has changed.
+
+        Returns:
+            bool: Whether anything in the index changed
+        """
+        total_changes = self.conn.total_changes
+        indexed_dirs: dict[str, int] = dict(
+            self.conn.execute("SELECT path, mtime_ns FROM directories")
+        )
+        seen_dirs: set[str] = set()
+        dirs_to_scan: list[tuple[str, str | None]] = [("", None)]
+        with self.conn:
+            while dirs_to_scan:
+                relative_dir, parent = dirs_to_scan.pop()
+                try:
+                    mtime_ns = (self.music_dir / relative_dir).stat().st_mtime_ns
+                except OSError:
+                    continue
+                seen_dirs.add(relative_dir)
+
+                if not full and indexed_dirs.get(relative_dir) == mtime_ns:
+                    # The directory listing hasn't changed, so the indexed
+                    # subdirectories and files can be used.
+                    dirs_to_scan.extend(
+                        (subdir, relative_dir)
+                        for (subdir,) in self.conn.execute(
+                            "SELECT path FROM directories WHERE parent = ?",
+                            (relative_dir,),
+                        )
+                    )
+                    self._check_indexed_files(relative_dir=relative_dir)
+                    continue
+
+                dirs_to_scan.extend(
+                    (subdir, relative_dir)
+                    for subdir in self._scan_dir(relative_dir=relative_dir)
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO directories(path, parent, mtime_ns) "
+                    "VALUES (?, ?, ?)",
+                    (relative_dir, parent, mtime_ns),
+                )
+
+            for removed_dir in indexed_dirs.keys() - seen_dirs:
+                self.conn.execute(
+                    "DELETE FROM directories WHERE path = ?", (removed_dir,)
+                )
+                self.conn.execute(
+                    "DELETE FROM files WHERE directory = ?", (removed_dir,)
+                )
+        return self.conn.total_changes != total_changes
+
+    def _get_indexed_files(self, relative_dir: str) -> dict[str, tuple[int, int]]:
+        """Return the modification time and size of each indexed file in a directory"""
+        return {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.conn.execute(
+                "SELECT path, mtime_ns, size FROM files WHERE directory = ?",
+                (relative_dir,),
+            )
+        }
+
+    def _check_indexed_files(self, relative_dir: str) -> None:
+        """
+        Update the indexed files of a directory that doesn't need to be relisted.
+        Files can be edited in place without the directory's modification time
+        changing.
+        """
+        for relative_path, indexed_stat in self._get_indexed_files(
+            relative_dir
+        ).items():
+            path = self.music_dir / relative_path
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (relative_path,))
+                continue
+            except OSError:
+                continue
+            if indexed_stat != (stat.st_mtime_ns, stat.st_size):
+                self._index_file(
+                    path,
+                    relative_path=relative_path,
+                    relative_dir=relative_dir,
+                    stat=stat,
+                )
+
+    def _scan_dir(self, relative_dir: str) -> list[str]:
+        """
+        Update the indexed files for a directory.
+
+        Returns:
+            list[str]: Relative paths of the subdirectories
+        """
+        indexed_files = self._get_indexed_files(relative_dir)
+        subdirs: list[str] = []
+        seen_files: set[str] = set()
+        try:
+            entries = list(os.scandir(self.music_dir / relative_dir))
+        except OSError:
+            logger.warning(
+                "Couldn't list music directory: %s", relative_dir, exc_info=True
+            )
+            entries = []
+        for entry in entries:
+            relative_path = (
+                f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+            )
+            if is_transaction_path(PurePosixPath(entry.name)):
+                continue
+            if entry.is_dir():
+                subdirs.append(relative_path)
+                continue
+            suffix = Path(entry.name).suffix.lower()
+            if suffix not in INDEXED_FILE_SUFFIXES:
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen_files.add(relative_path)
+            if indexed_files.get(relative_path) == (stat.st_mtime_ns, stat.st_size):
+                continue
+            self._index_file(
+                Path(entry.path),
+                relative_path=relative_path,
+                relative_dir=relative_dir,
+                stat=stat,
+            )
+
+        for removed_file in indexed_files.keys() - seen_files:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (removed_file,))
+        return subdirs
+
+    def _index_file(
+        self,
+        path: Path,
+        *,
+        relative_path: str,
+        relative_dir: str,
+        stat: os.stat_result,
+    ) -> None:
+        """Read a new or changed file and add it to the index"""
+        suffix = path.suffix.lower()
+        abc_info = AbcFileInfo()
+        if suffix == ".abc":
+            try:
+                abc_info = parse_abc_file(path)
+            except OSError:
+                logger.warning("Couldn't read music file: %s", path, exc_info=True)
+        self.conn.execute(
+            "INSERT INTO files(path, directory, suffix, mtime_ns, size, title, "
+            "transcriber, parts) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, "
+            "size = excluded.size, title = excluded.title, "
+            "transcriber = excluded.transcriber, parts = excluded.parts",
+            (
+                relative_path,
+                relative_dir,
+                suffix,
+                stat.st_mtime_ns,
+                stat.st_size,
+                abc_info.title,
+                abc_info.transcriber,
+                abc_info.parts,
+            ),
+        )
+
+    def get_subdirectories(self, directory: PurePosixPath) -> list[PurePosixPath]:
+        """Return the indexed subdirectories of a directory relative to the music dir"""
+        return [
+            _to_relative_path(path)
+            for (path,) in self.conn.execute(
+                "SELECT path FROM directories WHERE parent = ? ORDER BY path",
+                (self._to_db_path(directory),),
+            )
+        ]
+
+    def get_files(
+        self, directory: PurePosixPath, suffix: str = ".abc"
+    ) -> list[MusicIndexEntry]:
+        """Return the indexed files with `suffix` directly in `directory`"""
+        return self._get_entries(
+            "WHERE directory = ? AND suffix = ? ORDER BY path",
+            (self._to_db_path(directory), suffix),
+        )
+
+    def search(self, text: str) -> list[MusicIndexEntry]:
+        """
+        Return `.abc` files with titles or transcribers that have words starting with
+        every word in `text`.
+        """
+        query = _make_fts_query(text)
+        if not query:
+            return []
+        return self._get_entries(
+            "WHERE id IN (SELECT rowid FROM files_fts WHERE files_fts MATCH ?) "
+            "AND suffix = '.abc' ORDER BY path",
+            (query,),
+        )
+
+    def _get_entries(
+        self, where_clause: str, parameters: tuple[str, ...]
+    ) -> list[MusicIndexEntry]:
+        return [
+            MusicIndexEntry(
+                path=_to_relative_path(path),
+                title=title,
+                transcriber=transcriber,
+                parts=parts,
+            )
+            for path, title, transcriber, parts in self.conn.execute(
+                f"SELECT path, title, transcriber, parts FROM files {where_clause}",  # noqa: S608
+                parameters,
+            )
+        ]
+
+    @staticmethod
+    def _to_db_path(path: PurePosixPath) -> str:
+        return "" if path == PurePosixPath() else path.as_posix()
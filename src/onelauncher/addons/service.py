@@ -0,0 +1,755 @@
+"""
+Headless addon management
+
+`AddonService` does the same scanning, catalog fetching, installing, updating, and
+uninstalling as the addon manager window without any UI, so it can be used from the
+command line and scripts. Downloads run concurrently, while changes to the addon
+folders are made one at a time in worker threads.
+"""
+
+import logging
+import sqlite3
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+from typing import Final, Literal
+from xml.parsers.expat import ExpatError
+
+import attrs
+import httpx
+import trio
+
+from ..async_utils import TemporaryDirectoryAsyncPath
+from ..config_manager import ConfigManager
+from ..game_config import GameConfigID, GameType
+from ..game_launcher_local_config import GameLauncherLocalConfig
+from ..game_utilities import get_game_settings_dir
+from ..network.httpx_client import get_httpx_client
+from ..tracing import Span
+from .addon_info import (
+    AddonInfo,
+    AddonType,
+    get_addon_data_folder,
+    get_addons_feed_url,
+    get_installed_addon_paths,
+    get_supported_addon_types,
+    parse_addons_feed,
+    parse_compendium_file,
+)
+from .cache import (
+    ADDON_CATALOG_PATH,
+    attach_addon_catalog,
+    get_addon_folder_fingerprint,
+    get_catalog_conditional_headers,
+    get_catalog_fetched_at,
+    get_catalog_modified_at,
+    get_catalog_table_name,
+    is_catalog_fresh,
+    replace_catalog,
+    set_catalog_not_modified,
+)
+from .installer import (
+    AddonOperationError,
+    get_compendium_tag,
+    install_zip_addon,
+    scan_installed_addons,
+    uninstall_addon,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_DOWNLOADS: Final = 4
+
+TURBINE_UTILITIES_DEPENDENCY_ID: Final = "0"
+"""Arbitrary ID that compendium files use for Turbine Utilities"""
+TURBINE_UTILITIES_INTERFACE_ID: Final = "1064"
+"""ID of OneLauncher's upload of Turbine Utilities on LotroInterface"""
+
+
+type AddonAction = Literal["install", "update", "uninstall"]
+
+
+@attrs.frozen(kw_only=True)
+class InstalledAddon:
+    addon_type: AddonType
+    name: str
+    version: str
+    author: str
+    interface_id: str
+    """Empty for unmanaged addons"""
+    path: Path
+    """Compendium file, `.plugin` file, folder, or `.abc` file of the addon"""
+    latest_version: str | None = None
+    """Version in the addon catalog. `None` if the addon isn't in it."""
+    dependencies: tuple[str, ...] = ()
+    """Interface IDs of addons this one depends on"""
+    startup_script: Path | None = None
+    """Path of the addon's startup script relative to the game settings directory"""
+
+    @property
+    def has_update(self) -> bool:
+        return self.latest_version is not None and self.latest_version != self.version
+
+
+@attrs.frozen(kw_only=True)
+class AddonOperationResult:
+    action: AddonAction
+    interface_id: str
+    name: str = ""
+    succeeded: bool
+    message: str = ""
+    version: str = ""
+    dependencies: tuple[str, ...] = ()
+    """Interface IDs of addons the addon depends on"""
+    startup_script: Path | None = None
+    """
+    Startup script of the addon relative to the game settings directory. Startup
+    scripts are never enabled automatically.
+    """
+
+
+@attrs.frozen(kw_only=True)
+class _FetchedFeed:
+    addons: list[AddonInfo]
+    etag: str | None
+    """`ETag` header of the feed response"""
+    last_modified: str | None
+    """`Last-Modified` header of the feed response"""
+
+
+def get_dependency_interface_id(dependency: str) -> str:
+    return (
+        TURBINE_UTILITIES_INTERFACE_ID
+        if dependency == TURBINE_UTILITIES_DEPENDENCY_ID
+        else dependency
+    )
+
+
+class AddonService:
+    """
+    Manage the addons in a game settings directory.
+
+    Args:
+        settings_dir (Path): See `game_utilities.get_game_settings_dir`
+        game_type (GameType): Type of the game the settings directory is for
+        catalog_path (Path, optional): Shared addon catalog database
+        max_concurrent_downloads (int, optional): How many addons are downloaded at
+            once
+    """
+
+    def __init__(
+        self,
+        *,
+        settings_dir: Path,
+        game_type: GameType,
+        catalog_path: Path = ADDON_CATALOG_PATH,
+        max_concurrent_downloads: int = MAX_CONCURRENT_DOWNLOADS,
+    ) -> None:
+        self.settings_dir = settings_dir
+        self.game_type = game_type
+        self.catalog_path = catalog_path
+        self.addon_types = get_supported_addon_types(game_type)
+        self._download_limiter = trio.CapacityLimiter(max_concurrent_downloads)
+        # Changes to the addon folders are made one at a time.
+        self._filesystem_lock = trio.Lock()
+
+    def _open_catalog(self) -> closing[sqlite3.Connection]:
+        conn = sqlite3.connect(":memory:")
+        attach_addon_catalog(conn.cursor(), catalog_path=self.catalog_path)
+        return closing(conn)
+
+    @Span("Fetch addon catalog", "addons")
+    async def _fetch_catalog(
+        self, addon_type: AddonType, headers: dict[str, str]
+    ) -> _FetchedFeed | Literal["not-modified"] | None:
+        """
+        Fetch the feed for `addon_type`. `None` is returned if there was an error.
+
+        Args:
+            headers (dict[str, str]): Conditional request headers. See
+                `get_catalog_conditional_headers`.
+        """
+        url = get_addons_feed_url(self.game_type, addon_type)
+        try:
+            response = await get_httpx_client(url).get(url, headers=headers)
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                return "not-modified"
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.exception(
+                "There was a network error. You may want to check your connection."
+            )
+            return None
+        try:
+            addons = parse_addons_feed(response.text)
+        except ExpatError:
+            logger.exception(
+                "Addons feed has invalid XML. Please report this error if it continues."
+            )
+            return None
+        return _FetchedFeed(
+            addons=addons,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    async def refresh_catalog(self, *, force: bool = False) -> None:
+        """
+        Fetch the addon catalog for every addon type that is older than
+        `ADDON_CATALOG_MAX_AGE` or all of them, if `force` is `True`. The feeds are
+        fetched concurrently with conditional requests, so unchanged feeds aren't
+        downloaded or parsed again.
+
+        Raises:
+            AddonOperationError: A catalog couldn't be fetched and there is no cached
+                version of it.
+        """
+        outdated_types = await trio.to_thread.run_sync(
+            partial(self._get_outdated_catalog_types, force=force)
+        )
+        fetched: dict[AddonType, _FetchedFeed | Literal["not-modified"] | None] = {}
+
+        async def fetch(addon_type: AddonType, headers: dict[str, str]) -> None:
+            fetched[addon_type] = await self._fetch_catalog(addon_type, headers)
+
+        async with trio.open_nursery() as nursery:
+            for addon_type, headers in outdated_types.items():
+                nursery.start_soon(fetch, addon_type, headers)
+
+        await trio.to_thread.run_sync(self._store_fetched_catalogs, fetched)
+
+    def _get_outdated_catalog_types(
+        self, *, force: bool
+    ) -> dict[AddonType, dict[str, str]]:
+        """
+        Return the conditional request headers of each catalog that should be
+        fetched by `refresh_catalog`
+        """
+        with self._open_catalog() as conn:
+            cursor = conn.cursor()
+            return {
+                addon_type: get_catalog_conditional_headers(
+                    cursor, get_catalog_table_name(self.game_type, addon_type)
+                )
+                for addon_type in self.addon_types
+                if force
+                or not is_catalog_fresh(
+                    cursor, get_catalog_table_name(self.game_type, addon_type)
+                )
+            }
+
+    def _store_fetched_catalogs(
+        self,
+        fetched: dict[AddonType, _FetchedFeed | Literal["not-modified"] | None],
+    ) -> None:
+        """
+        Raises:
+            AddonOperationError: A catalog couldn't be fetched and there is no cached
+                version of it.
+        """
+        with self._open_catalog() as conn:
+            cursor = conn.cursor()
+            for addon_type, feed in fetched.items():
+                table_name = get_catalog_table_name(self.game_type, addon_type)
+                if feed == "not-modified":
+                    set_catalog_not_modified(cursor, table_name)
+                    conn.commit()
+                elif feed is not None:
+                    replace_catalog(
+                        cursor,
+                        table_name,
+                        feed.addons,
+                        etag=feed.etag,
+                        last_modified=feed.last_modified,
+                    )
+                    conn.commit()
+                elif get_catalog_fetched_at(cursor, table_name) is None:
+                    raise AddonOperationError(
+                        msg=f"Couldn't fetch the {addon_type} addon catalog"
+                    )
+                else:
+                    logger.warning("Using outdated %s addon catalog", addon_type)
+
+    def get_catalog(self, addon_type: AddonType) -> list[AddonInfo]:
+        """Return the cached remote addons of `addon_type`. See `refresh_catalog`."""
+        table_name = get_catalog_table_name(self.game_type, addon_type)
+        with self._open_catalog() as conn:
+            return [
+                AddonInfo(*row)
+                for row in conn.execute(f"SELECT * FROM catalog.{table_name}")  # noqa: S608
+            ]
+
+    def _get_catalog_by_id(self) -> dict[str, tuple[AddonType, AddonInfo]]:
+        return {
+            addon_info.interface_id: (addon_type, addon_info)
+            for addon_type in self.addon_types
+            for addon_info in self.get_catalog(addon_type)
+        }
+
+    @Span("Scan installed addons", "addons")
+    def _scan_installed_addons(self) -> list[InstalledAddon]:
+        catalog = self._get_catalog_by_id()
+        installed_addons: list[InstalledAddon] = []
+        for addon_type in self.addon_types:
+            data_folder = get_addon_data_folder(self.settings_dir, addon_type)
+            for addon_info in scan_installed_addons(self.settings_dir, addon_type):
+                remote_addon = catalog.get(addon_info.interface_id)
+                script = addon_info.startup_script.replace("\\", "/")
+                installed_addons.append(
+                    InstalledAddon(
+                        addon_type=addon_type,
+                        name=addon_info.name,
+                        version=addon_info.version,
+                        author=addon_info.author,
+                        interface_id=addon_info.interface_id,
+                        path=Path(addon_info.file),
+                        latest_version=remote_addon[1].version
+                        if remote_addon and addon_info.interface_id
+                        else None,
+                        dependencies=_split_dependencies(addon_info.dependencies),
+                        startup_script=(data_folder / script).relative_to(
+                            self.settings_dir
+                        )
+                        if script
+                        else None,
+                    )
+                )
+        return installed_addons
+
+    def get_state_fingerprint(self) -> str:
+        """
+        Return a value that changes when addons are added to, removed from, or updated
+        in the addon folders, or when the addon catalog changes. It's much cheaper to
+        compute than scanning the installed addons.
+        """
+        with self._open_catalog() as conn:
+            cursor = conn.cursor()
+            catalog_modified_ats = [
+                get_catalog_modified_at(
+                    cursor, get_catalog_table_name(self.game_type, addon_type)
+                )
+                for addon_type in self.addon_types
+            ]
+        return "\0".join(
+            [
+                *(str(modified_at) for modified_at in catalog_modified_ats),
+                *(
+                    get_addon_folder_fingerprint(
+                        get_addon_data_folder(self.settings_dir, addon_type)
+                    )
+                    for addon_type in self.addon_types
+                ),
+            ]
+        )
+
+    async def get_installed_addons(self) -> list[InstalledAddon]:
+        """
+        Scan the installed addons. Call `refresh_catalog` first to have up to date
+        `InstalledAddon.latest_version` values.
+        """
+        return await trio.to_thread.run_sync(self._scan_installed_addons)
+
+    async def install_addons(
+        self, interface_ids: Iterable[str]
+    ) -> list[AddonOperationResult]:
+        """
+        Install addons from the catalog along with any of their dependencies that
+        aren't installed yet. Addons that are already installed are skipped.
+        """
+        installed_ids = {
+            addon.interface_id for addon in await self.get_installed_addons()
+        }
+        catalog = self._get_catalog_by_id()
+        results: list[AddonOperationResult] = []
+        for interface_id in dict.fromkeys(interface_ids):
+            if interface_id not in catalog:
+                results.append(
+                    AddonOperationResult(
+                        action="install",
+                        interface_id=interface_id,
+                        succeeded=False,
+                        message="Addon isn't in the addon catalog",
+                    )
+                )
+        results.extend(
+            await self._install_with_dependencies(
+                [
+                    (catalog[interface_id][1], ())
+                    for interface_id in dict.fromkeys(interface_ids)
+                    if interface_id in catalog and interface_id not in installed_ids
+                ],
+                action="install",
+                installed_ids=installed_ids,
+                catalog=catalog,
+            )
+        )
+        return results
+
+    async def update_addons(
+        self, interface_ids: Iterable[str] | None = None
+    ) -> list[AddonOperationResult]:
+        """
+        Update installed addons that have newer versions in the catalog. Every
+        outdated addon is updated if `interface_ids` is `None`. The old version of each
+        addon is only removed if its new version is installed successfully.
+        """
+        installed_addons = {
+            addon.interface_id: addon
+            for addon in await self.get_installed_addons()
+            if addon.interface_id
+        }
+        catalog = self._get_catalog_by_id()
+        results: list[AddonOperationResult] = []
+        if interface_ids is None:
+            outdated_addons = [
+                addon for addon in installed_addons.values() if addon.has_update
+            ]
+        else:
+            outdated_addons = []
+            for interface_id in dict.fromkeys(interface_ids):
+                addon = installed_addons.get(interface_id)
+                if addon is None:
+                    results.append(
+                        AddonOperationResult(
+                            action="update",
+                            interface_id=interface_id,
+                            succeeded=False,
+                            message="Addon isn't installed",
+                        )
+                    )
+                elif not addon.has_update:
+                    results.append(
+                        AddonOperationResult(
+                            action="update",
+                            interface_id=interface_id,
+                            name=addon.name,
+                            succeeded=True,
+                            message="Already up to date",
+                            version=addon.version,
+                        )
+                    )
+                else:
+                    outdated_addons.append(addon)
+
+        data_folder_plugins = get_addon_data_folder(self.settings_dir, "plugin")
+        results.extend(
+            await self._install_with_dependencies(
+                [
+                    (
+                        catalog[addon.interface_id][1],
+                        get_installed_addon_paths(
+                            addon.path, addon.addon_type, data_folder_plugins
+                        ),
+                    )
+                    for addon in outdated_addons
+                ],
+                action="update",
+                installed_ids=set(installed_addons),
+                catalog=catalog,
+            )
+        )
+        return results
+
+    async def _install_with_dependencies(
+        self,
+        addons: Sequence[tuple[AddonInfo, Sequence[Path]]],
+        *,
+        action: AddonAction,
+        installed_ids: set[str],
+        catalog: dict[str, tuple[AddonType, AddonInfo]],
+    ) -> list[AddonOperationResult]:
+        """
+        Concurrently install `addons` and then any of their dependencies that aren't
+        installed yet.
+
+        Args:
+            addons (Sequence[tuple[AddonInfo, Sequence[Path]]]): Remote addon info
+                along with the paths of the addon version being replaced
+        """
+        results: list[AddonOperationResult] = []
+        while addons:
+            round_results = await self._run_concurrently(
+                partial(
+                    self._install_addon,
+                    remote_addon_info,
+                    action=action,
+                    replaced_paths=replaced_paths,
+                )
+                for remote_addon_info, replaced_paths in addons
+            )
+            results.extend(round_results)
+            installed_ids.update(
+                result.interface_id for result in round_results if result.succeeded
+            )
+            dependency_ids = dict.fromkeys(
+                dependency
+                for result in round_results
+                for dependency in result.dependencies
+                if dependency not in installed_ids and dependency in catalog
+            )
+            addons = [(catalog[dependency][1], ()) for dependency in dependency_ids]
+            action = "install"
+        return results
+
+    async def _run_concurrently(
+        self, operations: Iterable[Callable[[], Awaitable[AddonOperationResult]]]
+    ) -> list[AddonOperationResult]:
+        results: dict[int, AddonOperationResult] = {}
+
+        async def run(
+            index: int, operation: Callable[[], Awaitable[AddonOperationResult]]
+        ) -> None:
+            results[index] = await operation()
+
+        async with trio.open_nursery() as nursery:
+            for index, operation in enumerate(operations):
+                nursery.start_soon(run, index, operation)
+        return [results[index] for index in sorted(results)]
+
+    async def _download(self, url: str, path: Path) -> None:
+        """
+        Raises:
+            httpx.HTTPError: Network error while downloading
+        """
+        async with self._download_limiter:
+            logger.info("Downloading %s", url)
+            async with (
+                get_httpx_client(url).stream(
+                    "GET", url, follow_redirects=True
+                ) as response,
+                await trio.open_file(path, "wb") as file,
+            ):
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    await file.write(chunk)
+
+    async def _install_addon(
+        self,
+        remote_addon_info: AddonInfo,
+        *,
+        action: AddonAction,
+        replaced_paths: Sequence[Path] = (),
+    ) -> AddonOperationResult:
+        remote_addon_info = remote_addon_info.without_status_prefixes()
+        result = AddonOperationResult(
+            action=action,
+            interface_id=remote_addon_info.interface_id,
+            name=remote_addon_info.name,
+            succeeded=False,
+            version=remote_addon_info.version,
+        )
+        async with TemporaryDirectoryAsyncPath() as tmp_dir:
+            addon_path = Path(tmp_dir) / f"{remote_addon_info.interface_id}.zip"
+            try:
+                await self._download(remote_addon_info.file, addon_path)
+            except httpx.HTTPError as e:
+                logger.exception("Failed to download %s", remote_addon_info.name)
+                return attrs.evolve(result, message=f"Download failed: {e}")
+
+            async with self._filesystem_lock:
+                try:
+                    installed = await trio.to_thread.run_sync(
+                        partial(
+                            install_zip_addon,
+                            addon_path,
+                            settings_dir=self.settings_dir,
+                            game_type=self.game_type,
+                            remote_addon_info=remote_addon_info,
+                            replaced_paths=replaced_paths,
+                        )
+                    )
+                except AddonOperationError as e:
+                    return attrs.evolve(result, message=e.msg)
+
+        addon_info = (
+            parse_compendium_file(
+                installed.compendium_file, get_compendium_tag(installed.addon_type)
+            )
+            if installed.compendium_file
+            else None
+        )
+        logger.info("Installed %s %s", result.name, result.version)
+        return attrs.evolve(
+            result,
+            succeeded=True,
+            dependencies=_split_dependencies(addon_info.dependencies)
+            if addon_info
+            else (),
+            startup_script=self._get_relative_startup_script(
+                installed.addon_type, addon_info.startup_script
+            )
+            if addon_info
+            else None,
+        )
+
+    async def uninstall_addons(
+        self, interface_ids: Iterable[str], *, force: bool = False
+    ) -> list[AddonOperationResult]:
+        """
+        Uninstall managed addons. The removed files are archived, so each addon can be
+        rolled back to its removed version.
+
+        Args:
+            force (bool, optional): Uninstall addons even if other installed addons
+                depend on them.
+        """
+        interface_ids = tuple(dict.fromkeys(interface_ids))
+        installed_addons = await self.get_installed_addons()
+        addons_by_id = {
+            addon.interface_id: addon
+            for addon in installed_addons
+            if addon.interface_id
+        }
+        results: list[AddonOperationResult] = []
+        for interface_id in interface_ids:
+            result = AddonOperationResult(
+                action="uninstall", interface_id=interface_id, succeeded=False
+            )
+            addon = addons_by_id.get(interface_id)
+            if addon is None:
+                results.append(attrs.evolve(result, message="Addon isn't installed"))
+                continue
+            result = attrs.evolve(
+                result,
+                name=addon.name,
+                version=addon.version,
+                startup_script=addon.startup_script,
+            )
+
+            dependents = [
+                dependent.name
+                for dependent in installed_addons
+                if interface_id in dependent.dependencies
+                and dependent.interface_id not in interface_ids
+            ]
+            if dependents and not force:
+                results.append(
+                    attrs.evolve(result, message=f"Required by {', '.join(dependents)}")
+                )
+                continue
+
+            async with self._filesystem_lock:
+                try:
+                    await trio.to_thread.run_sync(
+                        partial(
+                            uninstall_addon,
+                            addon.path,
+                            settings_dir=self.settings_dir,
+                            addon_type=addon.addon_type,
+                            addon_id=interface_id,
+                        )
+                    )
+                except AddonOperationError as e:
+                    results.append(attrs.evolve(result, message=e.msg))
+                    continue
+            logger.info("Uninstalled %s", addon.name)
+            results.append(attrs.evolve(result, succeeded=True))
+        return results
+
+    def _get_relative_startup_script(
+        self, addon_type: AddonType, script: str
+    ) -> Path | None:
+        """
+        Return path of a startup script from a compendium file relative to the game
+        settings directory
+        """
+        if not script:
+            return None
+        return (
+            get_addon_data_folder(self.settings_dir, addon_type)
+            / script.replace("\\", "/")
+        ).relative_to(self.settings_dir)
+
+
+@attrs.frozen(kw_only=True)
+class AddonUpdateCheck:
+    state_fingerprint: str
+    """See `AddonService.get_state_fingerprint`"""
+    outdated_addons: tuple[InstalledAddon, ...]
+
+
+async def check_for_addon_updates(
+    service: AddonService, previous: AddonUpdateCheck | None = None
+) -> AddonUpdateCheck:
+    """
+    Refresh the addon catalog and find the installed addons that have updates. The
+    installed addons are only scanned again if the addon folders or catalog changed
+    since the `previous` check, so checks are cheap when nothing has changed.
+
+    Raises:
+        AddonOperationError: See `AddonService.refresh_catalog`
+    """
+    # Conditional requests make refreshing unchanged feeds cheap.
+    await service.refresh_catalog(force=True)
+    state_fingerprint = await trio.to_thread.run_sync(service.get_state_fingerprint)
+    if previous is not None and previous.state_fingerprint == state_fingerprint:
+        return previous
+    return AddonUpdateCheck(
+        state_fingerprint=state_fingerprint,
+        outdated_addons=tuple(
+            addon for addon in await service.get_installed_addons() if addon.has_update
+        ),
+    )
+
+
+async def get_game_addon_service(
+    config_manager: ConfigManager, game_id: GameConfigID
+) -> AddonService:
+    """
+    Raises:
+        AddonOperationError: The game directory doesn't have a valid launcher config,
+            so the game settings directory can't be found.
+    """
+    game_config = config_manager.get_game_config(game_id)
+    launcher_local_config = await GameLauncherLocalConfig.from_game_dir(
+        game_directory=game_config.game_directory, game_type=game_config.game_type
+    )
+    if launcher_local_config is None:
+        raise AddonOperationError(
+            msg=f"{game_config.name} has no valid game launcher config"
+        )
+    return AddonService(
+        settings_dir=get_game_settings_dir(
+            game_config=game_config, launcher_local_config=launcher_local_config
+        ),
+        game_type=game_config.game_type,
+    )
+
+
+def disable_startup_scripts(
+    config_manager: ConfigManager, game_id: GameConfigID, scripts: Iterable[Path]
+) -> None:
+    """
+    Remove startup scripts from a game's enabled startup scripts
+
+    Args:
+        scripts (Iterable[Path]): Startup script paths relative to the game settings
+            directory
+    """
+    scripts = set(scripts)
+    game_config = config_manager.read_game_config_file(game_id)
+    enabled_startup_scripts = tuple(
+        script
+        for script in game_config.addons.enabled_startup_scripts
+        if script.relative_path not in scripts
+    )
+    if enabled_startup_scripts == game_config.addons.enabled_startup_scripts:
+        return
+    config_manager.update_game_config_file(
+        game_id=game_id,
+        config=attrs.evolve(
+            game_config,
+            addons=attrs.evolve(
+                game_config.addons, enabled_startup_scripts=enabled_startup_scripts
+            ),
+        ),
+    )
+
+
+def _split_dependencies(dependencies: str) -> tuple[str, ...]:
+    return tuple(
+        get_dependency_interface_id(dependency)
+        for dependency in dependencies.split(",")
+        if dependency
+    )
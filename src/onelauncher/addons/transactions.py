@@ -0,0 +1,444 @@
+"""
+Atomic addon installs and updates
+
+New addon versions are staged next to where they will be installed, and then swapped
+into place with renames. Each transaction is recorded in a journal, so one that gets
+interrupted can be reverted or finished by `recover_addon_transactions`. The versions
+that get replaced are kept in an archive for rolling back.
+"""
+
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from enum import StrEnum
+from functools import cache
+from pathlib import Path, PurePath
+from typing import Final
+from uuid import uuid4
+
+import attrs
+import cattrs
+from cattrs.preconf.json import JsonConverter, make_converter
+
+from ..config import platform_dirs
+from ..utilities import invalidate_case_insensitive_path_cache
+
+logger = logging.getLogger(__name__)
+
+ADDON_TRANSACTIONS_DIR: Final = platform_dirs.user_state_path / "addon_transactions"
+ADDON_ARCHIVE_DIR: Final = platform_dirs.user_cache_path / "addon_archive"
+
+STAGING_DIR_PREFIX: Final = ".onelauncher-staging-"
+"""
+Prefix for directories that new addon versions are extracted into. Staging directories
+are made in the same folder as the addon's destination, so moving the addon into place
+is a rename rather than a copy.
+"""
+BACKUP_PREFIX: Final = ".onelauncher-backup-"
+"""Prefix for replaced addon files while they are waiting to be archived"""
+
+_ARCHIVE_RECORD_NAME: Final = "transaction.json"
+
+_swap_lock = threading.Lock()
+"""
+Swaps are only renames, so they are serialized. That keeps transactions that run
+concurrently from interleaving their swaps, without blocking their slow parts.
+"""
+
+
+def is_transaction_path(path: PurePath) -> bool:
+    """
+    Return whether `path` is, or is inside of, a staging directory or backup of an
+    addon transaction. These are in the addon data folders while a transaction is
+    running or after it was interrupted, so scans of installed addons should skip them.
+    Every part of `path` is checked, so it should be relative to the folder being
+    scanned.
+    """
+    return any(
+        part.startswith((STAGING_DIR_PREFIX, BACKUP_PREFIX)) for part in path.parts
+    )
+
+
+class AddonTransactionState(StrEnum):
+    STAGED = "staged"
+    """New versions are being staged. Nothing has been swapped yet."""
+    SWAPPING = "swapping"
+    """Swaps have started, but may not have all been done."""
+    SWAPPED = "swapped"
+    """All swaps are done. Replaced versions still need to be archived."""
+
+
+@attrs.frozen(kw_only=True)
+class AddonTransactionEntry:
+    destination: Path
+    staged: Path | None = None
+    """New version that replaces `destination`. `None` if it's only being removed."""
+    backup: Path
+    """Where the existing `destination` is moved to when it is swapped out"""
+
+
+@attrs.frozen(kw_only=True)
+class AddonTransactionJournal:
+    id: str
+    addon_id: str
+    state: AddonTransactionState
+    staging_dirs: tuple[Path, ...] = ()
+    entries: tuple[AddonTransactionEntry, ...] = ()
+
+
+@attrs.frozen(kw_only=True)
+class ArchivedAddonEntry:
+    destination: Path
+    archived: Path | None
+    """The replaced version of `destination`. `None` if `destination` was new."""
+
+
+@attrs.frozen(kw_only=True)
+class ArchivedAddonVersion:
+    """Previous version of an addon that can be rolled back to"""
+
+    transaction_id: str
+    addon_id: str
+    archived_at: datetime
+    entries: tuple[ArchivedAddonEntry, ...]
+
+
+@cache
+def _get_converter() -> JsonConverter:
+    converter = make_converter()
+    converter.register_unstructure_hook(Path, str)
+    converter.register_structure_hook(Path, lambda value, _: Path(value))
+    return converter
+
+
+def _write_json_atomic(path: Path, data: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as file:
+        file.write(_get_converter().dumps(data))
+        file.flush()
+        os.fsync(file.fileno())
+    tmp_path.replace(path)
+
+
+def _remove_path(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+class AddonTransaction:
+    """
+    Replace addon files atomically. Use `addon_transaction` rather than making these
+    directly.
+
+    Args:
+        addon_id (str): Identifies the addon. Only the most recently archived version
+            of each addon is kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        addon_id: str,
+        journal_dir: Path = ADDON_TRANSACTIONS_DIR,
+        archive_dir: Path = ADDON_ARCHIVE_DIR,
+    ) -> None:
+        self.id = f"{datetime.now(UTC):%Y%m%dT%H%M%S}-{uuid4().hex[:8]}"
+        self.addon_id = addon_id
+        self.journal_dir = journal_dir
+        self.archive_dir = archive_dir
+        self.committed = False
+        self._staging_dirs: list[Path] = []
+        self._entries: dict[Path, AddonTransactionEntry] = {}
+
+    @property
+    def journal_path(self) -> Path:
+        return self.journal_dir / f"{self.id}.json"
+
+    def _write_journal(self, state: AddonTransactionState) -> None:
+        _write_json_atomic(self.journal_path, self._journal(state))
+
+    def make_staging_dir[P: Path](self, parent_dir: P) -> P:
+        """
+        Make a directory in `parent_dir` to stage new addon files in. It is removed when
+        the transaction finishes.
+        """
+        parent_dir.mkdir(parents=True, exist_ok=True)
+        staging_dir = parent_dir / f"{STAGING_DIR_PREFIX}{self.id}"
+        staging_dir.mkdir()
+        self._staging_dirs.append(staging_dir)
+        self._write_journal(AddonTransactionState.STAGED)
+        return staging_dir
+
+    def replace(self, destination: Path, staged: Path | None = None) -> None:
+        """
+        Replace `destination` with `staged` when the transaction is committed.
+        `destination` is only removed if `staged` is `None`. `staged` must be on the
+        same filesystem as `destination`.
+        """
+        if existing_entry := self._entries.get(destination):
+            self._entries[destination] = attrs.evolve(existing_entry, staged=staged)
+            return
+        self._entries[destination] = AddonTransactionEntry(
+            destination=destination,
+            staged=staged,
+            backup=destination.with_name(
+                f"{BACKUP_PREFIX}{self.id}-{len(self._entries)}"
+            ),
+        )
+
+    def commit(self) -> None:
+        """
+        Swap all of the staged files into place. Everything is reverted if any swap
+        fails, and the staged files are put back in their staging dirs.
+
+        Raises:
+            OSError: A swap failed.
+        """
+        with _swap_lock:
+            self._write_journal(AddonTransactionState.SWAPPING)
+            try:
+                for entry in self._entries.values():
+                    _swap_entry(entry)
+            except OSError:
+                logger.exception("Failed swapping in new addon files. Reverting.")
+                _revert_entries(tuple(self._entries.values()))
+                raise
+            self._write_journal(AddonTransactionState.SWAPPED)
+        self.committed = True
+        _finish_transaction(
+            self._journal(AddonTransactionState.SWAPPED),
+            journal_dir=self.journal_dir,
+            archive_dir=self.archive_dir,
+        )
+
+    def abort(self) -> None:
+        """Throw away the staged files. This does nothing after a commit."""
+        if self.committed:
+            return
+        for staging_dir in self._staging_dirs:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.journal_path.unlink(missing_ok=True)
+
+    def _journal(self, state: AddonTransactionState) -> AddonTransactionJournal:
+        return AddonTransactionJournal(
+            id=self.id,
+            addon_id=self.addon_id,
+            state=state,
+            staging_dirs=tuple(self._staging_dirs),
+            entries=tuple(self._entries.values()),
+        )
+
+
+@contextmanager
+def addon_transaction(
+    *,
+    addon_id: str,
+    journal_dir: Path = ADDON_TRANSACTIONS_DIR,
+    archive_dir: Path = ADDON_ARCHIVE_DIR,
+) -> Iterator[AddonTransaction]:
+    """
+    Start an `AddonTransaction`. It is aborted if it hasn't been committed by the end
+    of the context.
+    """
+    transaction = AddonTransaction(
+        addon_id=addon_id, journal_dir=journal_dir, archive_dir=archive_dir
+    )
+    try:
+        yield transaction
+    finally:
+        transaction.abort()
+
+
+def _swap_entry(entry: AddonTransactionEntry) -> None:
+    if os.path.lexists(entry.destination):
+        entry.destination.rename(entry.backup)
+    if entry.staged is not None:
+        entry.destination.parent.mkdir(parents=True, exist_ok=True)
+        entry.staged.rename(entry.destination)
+    invalidate_case_insensitive_path_cache(entry.destination.parent)
+
+
+def _revert_entries(entries: tuple[AddonTransactionEntry, ...]) -> None:
+    """Undo swaps. This works on entries that may only be partially swapped."""
+    for entry in reversed(entries):
+        # The staged version was swapped in if it's no longer in the staging dir.
+        if (
+            entry.staged is not None
+            and not os.path.lexists(entry.staged)
+            and os.path.lexists(entry.destination)
+        ):
+            entry.staged.parent.mkdir(parents=True, exist_ok=True)
+            entry.destination.rename(entry.staged)
+        if os.path.lexists(entry.backup):
+            entry.backup.rename(entry.destination)
+        invalidate_case_insensitive_path_cache(entry.destination.parent)
+
+
+def _finish_transaction(
+    journal: AddonTransactionJournal, journal_dir: Path, archive_dir: Path
+) -> None:
+    """Archive the replaced versions and clean up after a swapped transaction"""
+    transaction_archive_dir = archive_dir / journal.id
+    archived_entries: list[ArchivedAddonEntry] = []
+    for i, entry in enumerate(journal.entries):
+        if not os.path.lexists(entry.backup):
+            archived_entries.append(
+                ArchivedAddonEntry(destination=entry.destination, archived=None)
+            )
+            continue
+        transaction_archive_dir.mkdir(parents=True, exist_ok=True)
+        archived_path = transaction_archive_dir / str(i)
+        try:
+            shutil.move(entry.backup, archived_path)
+        except OSError:
+            logger.warning(
+                "Couldn't archive replaced addon file: %s", entry.backup, exc_info=True
+            )
+            _remove_path(entry.backup)
+            continue
+        archived_entries.append(
+            ArchivedAddonEntry(destination=entry.destination, archived=archived_path)
+        )
+
+    if any(entry.archived is not None for entry in archived_entries):
+        # Only the newest archived version of each addon is kept.
+        if previous_version := get_archived_addon_version(
+            journal.addon_id, archive_dir=archive_dir
+        ):
+            shutil.rmtree(
+                archive_dir / previous_version.transaction_id, ignore_errors=True
+            )
+        _write_json_atomic(
+            transaction_archive_dir / _ARCHIVE_RECORD_NAME,
+            ArchivedAddonVersion(
+                transaction_id=journal.id,
+                addon_id=journal.addon_id,
+                archived_at=datetime.now(UTC),
+                entries=tuple(archived_entries),
+            ),
+        )
+
+    for staging_dir in journal.staging_dirs:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    (journal_dir / f"{journal.id}.json").unlink(missing_ok=True)
+
+
+def recover_addon_transactions(
+    journal_dir: Path = ADDON_TRANSACTIONS_DIR,
+    archive_dir: Path = ADDON_ARCHIVE_DIR,
+) -> None:
+    """
+    Finish or revert transactions that were interrupted. Transactions that had all of
+    their swaps done are finished. All others are reverted.
+    """
+    if not journal_dir.exists():
+        return
+
+    for journal_path in journal_dir.glob("*.json"):
+        try:
+            journal = _get_converter().loads(
+                journal_path.read_text(encoding="utf-8"), AddonTransactionJournal
+            )
+        except (OSError, ValueError, cattrs.BaseValidationError):
+            logger.warning(
+                "Removing invalid addon transaction journal: %s",
+                journal_path,
+                exc_info=True,
+            )
+            journal_path.unlink(missing_ok=True)
+            continue
+
+        if journal.state == AddonTransactionState.SWAPPED:
+            logger.info("Finishing interrupted addon transaction: %s", journal.addon_id)
+            _finish_transaction(
+                journal, journal_dir=journal_dir, archive_dir=archive_dir
+            )
+            continue
+
+        if journal.state == AddonTransactionState.SWAPPING:
+            logger.warning(
+                "Reverting interrupted addon transaction: %s", journal.addon_id
+            )
+            try:
+                _revert_entries(journal.entries)
+            except OSError:
+                logger.exception(
+                    "Failed to revert addon transaction. Its journal is being kept: %s",
+                    journal_path,
+                )
+                continue
+        for staging_dir in journal.staging_dirs:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        journal_path.unlink(missing_ok=True)
+
+
+def get_archived_addon_version(
+    addon_id: str, archive_dir: Path = ADDON_ARCHIVE_DIR
+) -> ArchivedAddonVersion | None:
+    """Return the archived previous version of an addon if there is one"""
+    if not archive_dir.exists():
+        return None
+
+    for record_path in archive_dir.glob(f"*/{_ARCHIVE_RECORD_NAME}"):
+        try:
+            archived_version = _get_converter().loads(
+                record_path.read_text(encoding="utf-8"), ArchivedAddonVersion
+            )
+        except (OSError, ValueError, cattrs.BaseValidationError):
+            logger.warning(
+                "Invalid archived addon record: %s", record_path, exc_info=True
+            )
+            continue
+        if archived_version.addon_id == addon_id:
+            return archived_version
+    return None
+
+
+def rollback_addon_version(
+    archived_version: ArchivedAddonVersion,
+    journal_dir: Path = ADDON_TRANSACTIONS_DIR,
+    archive_dir: Path = ADDON_ARCHIVE_DIR,
+) -> None:
+    """
+    Swap an archived addon version back into place. The current version gets archived
+    in its place, so rollbacks can also be rolled back.
+
+    Raises:
+        OSError: Rolling back failed. The current version is left in place.
+    """
+    archived_dir = archive_dir / archived_version.transaction_id
+    moved_from_archive: list[tuple[Path, Path]] = []
+    with addon_transaction(
+        addon_id=archived_version.addon_id,
+        journal_dir=journal_dir,
+        archive_dir=archive_dir,
+    ) as transaction:
+        staging_dirs: dict[Path, Path] = {}
+        try:
+            for entry in archived_version.entries:
+                if entry.archived is None:
+                    transaction.replace(entry.destination)
+                    continue
+                parent_dir = entry.destination.parent
+                if parent_dir not in staging_dirs:
+                    staging_dirs[parent_dir] = transaction.make_staging_dir(parent_dir)
+                staged = staging_dirs[parent_dir] / entry.archived.name
+                # This is a rename when the archive is on the same filesystem.
+                shutil.move(entry.archived, staged)
+                moved_from_archive.append((entry.archived, staged))
+                transaction.replace(entry.destination, staged=staged)
+            transaction.commit()
+        except OSError:
+            # Put the archived version back, so the rollback can be tried again.
+            for archived, staged in moved_from_archive:
+                if os.path.lexists(staged):
+                    shutil.move(staged, archived)
+            raise
+    shutil.rmtree(archived_dir, ignore_errors=True)
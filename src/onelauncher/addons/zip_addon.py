@@ -0,0 +1,256 @@
+import os
+import shutil
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Final
+
+import attrs
+
+from .addon_info import AddonType
+
+INVALID_ADDON_FOLDER_NAMES: Final = frozenset(
+    (
+        "ui",
+        "skins",
+        "plugins",
+        "music",
+        "my documents",
+        "documents",
+        "the lord of the rings online",
+        "dungeons and dragons online",
+        "dungeons & dragons online",
+    )
+)
+"""
+Folder names that addon authors put files in when they want the user to extract the
+archive somewhere higher up the folder tree than where their work ends up. This is
+usually done for user convenience. The contents of these folders get moved up a level.
+"""
+
+PLUGIN_DEPENDENCY_FOLDER_NAMES: Final = frozenset(("turbine", "turbineplugins"))
+"""Common dependency folder names that are sometimes included with plugins"""
+
+
+@attrs.frozen(kw_only=True)
+class InvalidAddonArchiveError(Exception):
+    msg: str
+
+
+@attrs.frozen(kw_only=True)
+class ZipAddonMember:
+    zip_info: zipfile.ZipInfo
+    path: PurePosixPath
+    """Where the member goes relative to the addon type's data folder"""
+
+
+@attrs.frozen(kw_only=True)
+class ZipAddonLayout:
+    """Where everything in an addon zip archive should be installed"""
+
+    addon_type: AddonType
+    root_dir: PurePosixPath
+    """
+    Relative path of the addon root dir. This is where the compendium file goes. For
+    plugins, it is the author folder.
+    """
+    members: tuple[ZipAddonMember, ...]
+
+    @property
+    def top_level_dirs(self) -> tuple[str, ...]:
+        """Names of the folders that get moved into the addon type's data folder"""
+        return tuple(dict.fromkeys(member.path.parts[0] for member in self.members))
+
+
+def _get_member_parts(zip_info: zipfile.ZipInfo) -> tuple[str, ...]:
+    """
+    Get path parts for where a zip member should be extracted to. Sanitization is the
+    same as `zipfile.ZipFile.extract`, but with backslashes also treated as
+    separators, since some addon archives are made with them.
+    """
+    arcname = zip_info.filename.replace("\\", "/")
+    return tuple(
+        part
+        for part in os.path.splitdrive(arcname)[1].split("/")
+        if part not in ("", os.path.curdir, os.path.pardir)
+    )
+
+
+def _remove_invalid_folders(
+    members: list[tuple[zipfile.ZipInfo, tuple[str, ...]]],
+) -> list[tuple[zipfile.ZipInfo, tuple[str, ...]]]:
+    """
+    Move the contents of top level folders with names in `INVALID_ADDON_FOLDER_NAMES`
+    up a level. This is repeated until there are no more top level invalid folders.
+    """
+    while True:
+        cleaned_members: list[tuple[zipfile.ZipInfo, tuple[str, ...]]] = []
+        found_invalid_folder = False
+        for zip_info, parts in members:
+            is_in_folder = len(parts) > 1 or zip_info.is_dir()
+            if is_in_folder and parts[0].lower() in INVALID_ADDON_FOLDER_NAMES:
+                found_invalid_folder = True
+                # Drop the entry for the invalid folder itself.
+                if len(parts) > 1:
+                    cleaned_members.append((zip_info, parts[1:]))
+            else:
+                cleaned_members.append((zip_info, parts))
+        members = cleaned_members
+        if not found_invalid_folder:
+            return members
+
+
+def _get_plugin_author_folder(
+    members: list[tuple[zipfile.ZipInfo, tuple[str, ...]]],
+) -> str:
+    """
+    There can only be one author folder. That is where the compendium file goes. What
+    appear to be extra author folders are usually included dependencies (grr.. there is
+    compendium syntax for that). The true author folder where the actual plugin files
+    are must be determined.
+
+    Raises:
+        InvalidAddonArchiveError: No author folder could be determined.
+    """
+    author_folders = list(
+        dict.fromkeys(
+            parts[0]
+            for zip_info, parts in members
+            if len(parts) > 1 or zip_info.is_dir()
+        )
+    )
+    if not author_folders:
+        raise InvalidAddonArchiveError(msg="Plugin doesn't have an author folder")
+
+    # Use non-filtered author folders if there are no author folders left after
+    # filtering. Ex. When installing the filtered libraries standalone.
+    author_folders = [
+        folder
+        for folder in author_folders
+        if folder.lower() not in PLUGIN_DEPENDENCY_FOLDER_NAMES
+    ] or author_folders
+    if len(author_folders) == 1:
+        return author_folders[0]
+
+    def get_folders_with_file_suffix(suffix: str) -> list[str]:
+        folders_with_suffix = {
+            parts[0]
+            for zip_info, parts in members
+            if len(parts) == 2  # noqa: PLR2004
+            and not zip_info.is_dir()
+            and PurePosixPath(parts[1]).suffix.lower() == suffix
+        }
+        return [folder for folder in author_folders if folder in folders_with_suffix]
+
+    # The most likely author folder is where a .plugincompendium file is. The next
+    # most likely author folder is where .plugin files are. Dependencies may also
+    # have .plugin files though.
+    if author_folders_compendium := get_folders_with_file_suffix(".plugincompendium"):
+        return author_folders_compendium[0]
+    elif author_folders_plugin := get_folders_with_file_suffix(".plugin"):
+        return author_folders_plugin[0]
+    raise InvalidAddonArchiveError(
+        msg="Plugin doesn't have an author folder with a .plugin file"
+    )
+
+
+def get_zip_addon_layout(archive: zipfile.ZipFile, addon_name: str) -> ZipAddonLayout:
+    """
+    Classify an addon archive and figure out where its files go, using only the
+    archive's member listing.
+
+    Args:
+        archive (zipfile.ZipFile): Addon archive
+        addon_name (str): Name to use for the root folder of skins and music that
+            don't have a single root folder.
+
+    Raises:
+        InvalidAddonArchiveError: The archive isn't a valid addon.
+    """
+    members = [
+        (zip_info, parts)
+        for zip_info in archive.infolist()
+        if (parts := _get_member_parts(zip_info))
+    ]
+    # Addons without any files aren't valid
+    if all(zip_info.is_dir() for zip_info, _ in members):
+        raise InvalidAddonArchiveError(msg="Addon Zip is empty")
+
+    members = _remove_invalid_folders(members)
+
+    file_suffixes = {
+        PurePosixPath(parts[-1]).suffix.lower()
+        for zip_info, parts in members
+        if not zip_info.is_dir()
+    }
+    addon_type: AddonType
+    # Some plugins have .abc files, but music collections shouldn't have .plugin
+    # files. Skins always have `SkinDefinition.xml` files but they aren't necessarily at
+    # any given directory level, so anything else is assumed to be a skin.
+    if ".plugin" in file_suffixes:
+        addon_type = "plugin"
+    elif ".abc" in file_suffixes:
+        addon_type = "music"
+    else:
+        addon_type = "skin"
+
+    if addon_type == "plugin":
+        root_dir_name = _get_plugin_author_folder(members)
+        # Only folders get installed for plugins. Loose files are ignored by the game.
+        members = [
+            (zip_info, parts)
+            for zip_info, parts in members
+            if len(parts) > 1 or zip_info.is_dir()
+        ]
+    else:
+        top_level_names = {parts[0] for _, parts in members}
+        is_single_root_dir = len(top_level_names) == 1 and all(
+            len(parts) > 1 or zip_info.is_dir() for zip_info, parts in members
+        )
+        # Put the addon in a new folder if the top of the directory tree is anything
+        # but one folder and no files.
+        if is_single_root_dir:
+            root_dir_name = top_level_names.pop()
+        else:
+            root_dir_name = addon_name
+            members = [(zip_info, (addon_name, *parts)) for zip_info, parts in members]
+
+    return ZipAddonLayout(
+        addon_type=addon_type,
+        root_dir=PurePosixPath(root_dir_name),
+        members=tuple(
+            ZipAddonMember(zip_info=zip_info, path=PurePosixPath(*parts))
+            for zip_info, parts in members
+        ),
+    )
+
+
+def extract_zip_addon(
+    archive: zipfile.ZipFile, layout: ZipAddonLayout, destination: Path
+) -> None:
+    """Extract the members of `layout` directly to their paths within `destination`"""
+    for member in layout.members:
+        member_destination = destination.joinpath(*member.path.parts)
+        if member.zip_info.is_dir():
+            member_destination.mkdir(parents=True, exist_ok=True)
+            continue
+        member_destination.parent.mkdir(parents=True, exist_ok=True)
+        with (
+            archive.open(member.zip_info) as source,
+            member_destination.open("wb") as target,
+        ):
+            shutil.copyfileobj(source, target)
+
+
+def move_into_place(source: Path, destination: Path) -> None:
+    """
+    Rename `source` to `destination`. If both are existing folders, `source` is merged
+    into `destination`, replacing any files that are in both. `source` and
+    `destination` must be on the same filesystem.
+    """
+    if not (source.is_dir() and destination.is_dir()):
+        source.replace(destination)
+        return
+
+    for path in source.iterdir():
+        move_into_place(path, destination / path.name)
+    source.rmdir()
@@ -3,7 +3,7 @@ import logging
 import os
 import subprocess
 import sysconfig
-from collections.abc import Sequence
+from collections.abc import Awaitable, Callable, Sequence
 from enum import Enum
 from functools import partial
 from pathlib import Path
@@ -15,11 +15,14 @@ from typing import (
 
 import attrs
 import cyclopts
+import trio
+from cattrs.preconf.json import make_converter as make_json_converter
 from cyclopts import Parameter, Token
 from cyclopts.types import (
     ResolvedDirectory,
     ResolvedExistingDirectory,
     ResolvedExistingFile,
+    ResolvedFile,
 )
 
 import onelauncher
@@ -27,6 +30,14 @@ from onelauncher.main import start_ui, verify_configs
 
 from .__about__ import __title__, __version__, version_parsed
 from .addons.config import AddonsConfigSection
+from .addons.installer import AddonOperationError
+from .addons.service import (
+    AddonOperationResult,
+    AddonService,
+    InstalledAddon,
+    disable_startup_scripts,
+    get_game_addon_service,
+)
 from .addons.startup_script import StartupScript
 from .async_utils import start_async_gui
 from .config import ConfigFieldMetadata
@@ -42,6 +53,7 @@ from .game_config import ClientType, GameConfig, GameConfigID, GameType
 from .logs import LogLevel, setup_application_logging
 from .program_config import GamesSortingMode, OnGameStartAction, ProgramConfig
 from .resources import OneLauncherLocale
+from .tracing import start_tracing, stop_tracing, write_trace
 from .ui import qtdesigner
 from .utilities import CaseInsensitiveAbsolutePath
 from .wine.config import WineConfigSection
@@ -76,6 +88,7 @@ def _merge_program_config(
     games_sorting_mode: GamesSortingMode | None,
     on_game_start: OnGameStartAction | None,
     log_verbosity: LogLevel | None,
+    addon_update_check_interval: int | None,
 ) -> ProgramConfig:
     """
     Merge `program_config` with CLI options. Any specified CLI options will
@@ -94,6 +107,11 @@ def _merge_program_config(
         log_verbosity=(
             log_verbosity if log_verbosity is not None else program_config.log_verbosity
         ),
+        addon_update_check_interval=(
+            addon_update_check_interval
+            if addon_update_check_interval is not None
+            else program_config.addon_update_check_interval
+        ),
     )
 
 
@@ -110,6 +128,8 @@ def _merge_game_config(
     newsfeed: str | None,
     # Addons Section
     enabled_startup_scripts: tuple[Path, ...] | None,
+    update_addons_before_launch: bool | None,
+    update_addons_before_launch_deadline: int | None,
     # WINE section
     builtin_prefix_enabled: bool | None,
     user_wine_executable_path: Path | None,
@@ -136,6 +156,16 @@ def _merge_game_config(
             if startup_scripts_structured is not None
             else game_config.addons.enabled_startup_scripts
         ),
+        update_before_launch=(
+            update_addons_before_launch
+            if update_addons_before_launch is not None
+            else game_config.addons.update_before_launch
+        ),
+        update_before_launch_deadline=(
+            update_addons_before_launch_deadline
+            if update_addons_before_launch_deadline is not None
+            else game_config.addons.update_before_launch_deadline
+        ),
     )
 
     wine_section = attrs.evolve(
@@ -236,6 +266,109 @@ def _merge_accounts_config(
     return attrs.evolve(game_accounts_config, accounts=tuple(accounts))
 
 
+@attrs.frozen(kw_only=True)
+class _GameAddonsReport:
+    game_id: str
+    game_name: str
+    error: str | None = None
+    installed_addons: tuple[InstalledAddon, ...] = ()
+    results: tuple[AddonOperationResult, ...] = ()
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and all(result.succeeded for result in self.results)
+
+
+type _AddonsOperation = Callable[
+    [AddonService, GameConfigID, _GameAddonsReport], Awaitable[_GameAddonsReport]
+]
+
+
+async def _run_addons_operation(
+    config_manager: ConfigManager,
+    game_ids: Sequence[GameConfigID],
+    operation: _AddonsOperation,
+    *,
+    force_catalog_refresh: bool = False,
+) -> list[_GameAddonsReport]:
+    """Run `operation` for each game concurrently"""
+    reports: dict[int, _GameAddonsReport] = {}
+
+    async def run(index: int, game_id: GameConfigID) -> None:
+        report = _GameAddonsReport(
+            game_id=str(game_id),
+            game_name=config_manager.get_game_config(game_id).name,
+        )
+        try:
+            service = await get_game_addon_service(config_manager, game_id)
+            await service.refresh_catalog(force=force_catalog_refresh)
+            reports[index] = await operation(service, game_id, report)
+        except AddonOperationError as e:
+            reports[index] = attrs.evolve(report, error=e.msg)
+
+    async with trio.open_nursery() as nursery:
+        for index, game_id in enumerate(game_ids):
+            nursery.start_soon(run, index, game_id)
+    return [reports[index] for index in sorted(reports)]
+
+
+def _print_addons_reports(
+    reports: Sequence[_GameAddonsReport], *, json_output: bool
+) -> int:
+    """Print addon command output and return the exit code"""
+    if json_output:
+        converter = make_json_converter()
+        converter.register_unstructure_hook(Path, lambda path: path.as_posix())
+        converter.register_unstructure_hook(
+            InstalledAddon,
+            lambda addon: {
+                **converter.unstructure_attrs_asdict(addon),
+                "has_update": addon.has_update,
+            },
+        )
+        print(  # noqa: T201
+            converter.dumps(
+                [
+                    {
+                        **converter.unstructure(report),
+                        "succeeded": report.succeeded,
+                    }
+                    for report in reports
+                ],
+                indent=2,
+            )
+        )
+        return 0 if all(report.succeeded for report in reports) else 1
+
+    for report in reports:
+        print(f"{report.game_name} ({report.game_id}):")  # noqa: T201
+        if report.error:
+            print(f"  Error: {report.error}")  # noqa: T201
+        for addon in report.installed_addons:
+            line = f"  [{addon.addon_type}] {addon.name} {addon.version}".rstrip()
+            if not addon.interface_id:
+                line += " (unmanaged)"
+            elif addon.has_update:
+                line += f" -> {addon.latest_version}"
+            print(line)  # noqa: T201
+        for result in report.results:
+            status = "done" if result.succeeded else "failed"
+            line = f"  {result.action} {result.name or result.interface_id}: {status}"
+            if result.message:
+                line += f" ({result.message})"
+            print(line)  # noqa: T201
+            if (
+                result.succeeded
+                and result.action != "uninstall"
+                and result.startup_script
+            ):
+                print(  # noqa: T201
+                    f"    Has a startup script that isn't enabled automatically: "
+                    f"{result.startup_script.as_posix()}"
+                )
+    return 0 if all(report.succeeded for report in reports) else 1
+
+
 ProgramGroup = cyclopts.Group.create_ordered(name="Program Options")
 GameGroup = cyclopts.Group.create_ordered(name="Game Options")
 AccountGroup = cyclopts.Group.create_ordered(name="Game Account Options")
@@ -330,6 +463,32 @@ def get_app() -> cyclopts.App:
             ResolvedDirectory,
             Parameter(help=f"Where {__title__} game specific data is stored"),
         ] = GAMES_DIR_DEFAULT,
+        trace_file: Annotated[
+            ResolvedFile | None,
+            Parameter(
+                help=(
+                    "Record where time is spent, like on network requests and config "
+                    "files, and write it to this file on exit. The file is in the "
+                    "Chrome trace event format, which can be opened with "
+                    "<https://ui.perfetto.dev>."
+                )
+            ),
+        ] = None,
+    ) -> int:
+        if trace_file is None:
+            return run_meta(tokens, config_directory, games_directory)
+
+        start_tracing()
+        try:
+            return run_meta(tokens, config_directory, games_directory)
+        finally:
+            try:
+                write_trace(stop_tracing(), trace_file)
+            except OSError:
+                logger.exception("Couldn't write trace file")
+
+    def run_meta(
+        tokens: Sequence[str], config_directory: Path, games_directory: Path
     ) -> int:
         nonlocal _config_manager
         _config_manager = ConfigManager(
@@ -373,6 +532,12 @@ def get_app() -> cyclopts.App:
             LogLevel | None,
             Parameter(group=ProgramGroup, help=prog_help("log_verbosity")),
         ] = None,
+        addon_update_check_interval: Annotated[
+            int | None,
+            Parameter(
+                group=ProgramGroup, help=prog_help("addon_update_check_interval")
+            ),
+        ] = None,
         # Game
         game: Annotated[
             _GameParamGameType | GameConfigID | None,
@@ -391,6 +556,7 @@ def get_app() -> cyclopts.App:
             games_sorting_mode=games_sorting_mode,
             on_game_start=on_game_start,
             log_verbosity=log_verbosity,
+            addon_update_check_interval=addon_update_check_interval,
         )
         nonlocal _game_id
         if game is None:
@@ -404,6 +570,11 @@ def get_app() -> cyclopts.App:
         command, bound, _ignored = app.parse_args(tokens)
         if command is default:
             return default(*bound.args, **bound.kwargs, config_manager=config_manager)
+        elif command in addons_commands:
+            exit_code: int = command(
+                *bound.args, **bound.kwargs, config_manager=config_manager
+            )
+            return exit_code
         elif command is app["--install-completion"].default_command:
             command(*bound.args, **bound.kwargs)
             return 0
@@ -485,6 +656,16 @@ def get_app() -> cyclopts.App:
                 ),
             ),
         ] = None,
+        update_addons_before_launch: Annotated[
+            bool | None,
+            Parameter(group=AddonsGroup, help=addons_help("update_before_launch")),
+        ] = None,
+        update_addons_before_launch_deadline: Annotated[
+            int | None,
+            Parameter(
+                group=AddonsGroup, help=addons_help("update_before_launch_deadline")
+            ),
+        ] = None,
         # Game WINE options
         builtin_prefix_enabled: Annotated[
             bool | None,
@@ -523,6 +704,8 @@ def get_app() -> cyclopts.App:
             newsfeed=newsfeed,
             # Addons Section
             enabled_startup_scripts=startup_scripts,
+            update_addons_before_launch=update_addons_before_launch,
+            update_addons_before_launch_deadline=update_addons_before_launch_deadline,
             # WINE Section
             builtin_prefix_enabled=builtin_prefix_enabled,
             user_wine_executable_path=user_wine_executable_path,
@@ -539,6 +722,186 @@ def get_app() -> cyclopts.App:
             entry=partial(start_ui, config_manager=config_manager, game_id=_game_id),
         )
 
+    addons_app = cyclopts.App(
+        name="addons",
+        help=(
+            "Manage the addons of a game without starting the UI. Use `--game` to "
+            "choose the game."
+        ),
+    )
+    app.command(addons_app)
+
+    def get_addons_game_ids(
+        config_manager: ConfigManager, all_games: bool
+    ) -> tuple[GameConfigID, ...]:
+        if all_games:
+            return config_manager.get_game_config_ids()
+        return () if _game_id is None else (_game_id,)
+
+    def run_addons_operation(
+        config_manager: ConfigManager,
+        operation: _AddonsOperation,
+        *,
+        all_games: bool,
+        json_output: bool,
+        force_catalog_refresh: bool = False,
+    ) -> int:
+        setup_application_logging(
+            log_level_override=config_manager.get_program_config().log_verbosity
+        )
+        game_ids = get_addons_game_ids(config_manager, all_games)
+        if not game_ids:
+            logger.error("No games found")
+            return 1
+        reports = trio.run(
+            partial(
+                _run_addons_operation,
+                config_manager,
+                game_ids,
+                operation,
+                force_catalog_refresh=force_catalog_refresh,
+            )
+        )
+        return _print_addons_reports(reports, json_output=json_output)
+
+    AllGamesParameter = Parameter(
+        name="--all-games", help="Run for every game instead of just one"
+    )
+    JsonParameter = Parameter(name="--json", help="Print machine-readable JSON output")
+
+    @addons_app.command(name="list")
+    def addons_list(
+        *,
+        config_manager: Annotated[ConfigManager, Parameter(parse=False)],
+        outdated: Annotated[
+            bool, Parameter(help="Only list addons that have updates available")
+        ] = False,
+        refresh: Annotated[
+            bool, Parameter(help="Fetch the addon catalog even if it's recent")
+        ] = False,
+        all_games: Annotated[bool, AllGamesParameter] = False,
+        json_output: Annotated[bool, JsonParameter] = False,
+    ) -> int:
+        """List installed addons and whether they have updates."""
+
+        async def operation(
+            service: AddonService, game_id: GameConfigID, report: _GameAddonsReport
+        ) -> _GameAddonsReport:
+            installed_addons = await service.get_installed_addons()
+            return attrs.evolve(
+                report,
+                installed_addons=tuple(
+                    addon
+                    for addon in installed_addons
+                    if addon.has_update or not outdated
+                ),
+            )
+
+        return run_addons_operation(
+            config_manager,
+            operation,
+            all_games=all_games,
+            json_output=json_output,
+            force_catalog_refresh=refresh,
+        )
+
+    @addons_app.command(name="update")
+    def addons_update(
+        *interface_ids: Annotated[
+            str, Parameter(help="Interface IDs of the addons to update")
+        ],
+        config_manager: Annotated[ConfigManager, Parameter(parse=False)],
+        update_all: Annotated[
+            bool, Parameter(name="--all", help="Update every outdated addon")
+        ] = False,
+        all_games: Annotated[bool, AllGamesParameter] = False,
+        json_output: Annotated[bool, JsonParameter] = False,
+    ) -> int:
+        """Update addons to the latest versions in the addon catalog."""
+        if not interface_ids and not update_all:
+            logger.error("Either provide addon interface IDs or use `--all`")
+            return 1
+        if interface_ids and update_all:
+            logger.error("Addon interface IDs can't be combined with `--all`")
+            return 1
+
+        async def operation(
+            service: AddonService, game_id: GameConfigID, report: _GameAddonsReport
+        ) -> _GameAddonsReport:
+            results = await service.update_addons(None if update_all else interface_ids)
+            return attrs.evolve(report, results=tuple(results))
+
+        return run_addons_operation(
+            config_manager, operation, all_games=all_games, json_output=json_output
+        )
+
+    @addons_app.command(name="install")
+    def addons_install(
+        *interface_ids: Annotated[
+            str, Parameter(help="Interface IDs of the addons to install")
+        ],
+        config_manager: Annotated[ConfigManager, Parameter(parse=False)],
+        all_games: Annotated[bool, AllGamesParameter] = False,
+        json_output: Annotated[bool, JsonParameter] = False,
+    ) -> int:
+        """
+        Install addons from the addon catalog along with their dependencies.
+
+        Startup scripts are never enabled automatically.
+        """
+        if not interface_ids:
+            logger.error("Provide the interface IDs of the addons to install")
+            return 1
+
+        async def operation(
+            service: AddonService, game_id: GameConfigID, report: _GameAddonsReport
+        ) -> _GameAddonsReport:
+            results = await service.install_addons(interface_ids)
+            return attrs.evolve(report, results=tuple(results))
+
+        return run_addons_operation(
+            config_manager, operation, all_games=all_games, json_output=json_output
+        )
+
+    @addons_app.command(name="uninstall")
+    def addons_uninstall(
+        *interface_ids: Annotated[
+            str, Parameter(help="Interface IDs of the addons to uninstall")
+        ],
+        config_manager: Annotated[ConfigManager, Parameter(parse=False)],
+        force: Annotated[
+            bool,
+            Parameter(help="Uninstall addons even if other addons depend on them"),
+        ] = False,
+        all_games: Annotated[bool, AllGamesParameter] = False,
+        json_output: Annotated[bool, JsonParameter] = False,
+    ) -> int:
+        """Uninstall addons. Their startup scripts get disabled."""
+        if not interface_ids:
+            logger.error("Provide the interface IDs of the addons to uninstall")
+            return 1
+
+        async def operation(
+            service: AddonService, game_id: GameConfigID, report: _GameAddonsReport
+        ) -> _GameAddonsReport:
+            results = await service.uninstall_addons(interface_ids, force=force)
+            disable_startup_scripts(
+                config_manager,
+                game_id,
+                (
+                    result.startup_script
+                    for result in results
+                    if result.succeeded and result.startup_script
+                ),
+            )
+            return attrs.evolve(report, results=tuple(results))
+
+        return run_addons_operation(
+            config_manager, operation, all_games=all_games, json_output=json_output
+        )
+
+    addons_commands = (addons_list, addons_update, addons_install, addons_uninstall)
+
     @app.meta.meta.command(group=DevGroup)
     def designer() -> int:
         """Start pyside6-designer with the correct plugins and environment variables."""
@@ -1,7 +1,11 @@
 import datetime
 import logging
-from collections.abc import Callable
-from contextlib import suppress
+import os
+import pickle
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from functools import cache, partial
 from pathlib import Path
 from shutil import rmtree
@@ -9,10 +13,9 @@ from typing import Any, Final
 
 import attrs
 import cattrs
-import keyring
 import tomlkit
+import trio
 from cattrs.preconf.tomlkit import make_converter
-from keyring.errors import KeyringLocked, NoKeyringError
 from packaging.version import InvalidVersion, Version
 from tomlkit.items import Comment, Table, Whitespace
 
@@ -23,14 +26,20 @@ from .addons.startup_script import StartupScript
 from .config import Config, ConfigValWithMetadata, platform_dirs, unstructure_config
 from .game_account_config import GameAccountConfig, GameAccountsConfig
 from .game_config import GameConfig, GameConfigID, GameType
+from .keyring_cache import KeyringCache
 from .program_config import GamesSortingMode, ProgramConfig
 from .resources import OneLauncherLocale, available_locales
+from .tracing import Span, count
+from .utilities import RACY_MTIME_WINDOW_NS
 
 logger = logging.getLogger(__name__)
 
 PROGRAM_CONFIG_DIR_DEFAULT: Path = platform_dirs.user_config_path
 PROGRAM_CONFIG_DEFAULT_NAME = f"{__title__.lower()}.toml"
 GAMES_DIR_DEFAULT: Path = platform_dirs.user_data_path / "games"
+CONFIG_SNAPSHOTS_PATH_DEFAULT: Path = (
+    platform_dirs.user_cache_path / "config_snapshots.pickle"
+)
 
 
 def _structure_onelauncher_locale(
@@ -169,8 +178,8 @@ def _tables_to_array_of_tables(
         if not isinstance(table, dict):
             final_dict[table_name] = table
             continue
-        table[table_name_key_name] = table_name
-        array_of_tables.append(table)
+        # The original table isn't modified, since it may be from a config snapshot.
+        array_of_tables.append({**table, table_name_key_name: table_name})
     final_dict[array_name] = array_of_tables
     return final_dict
 
@@ -237,31 +246,140 @@ class WrongConfigVersionError(ConfigFileError):
     config_file_version: Version
 
 
-def read_config_file[T: Config](
+@attrs.frozen(kw_only=True)
+class _ConfigSnapshot:
+    mtime_ns: int
+    size: int
+    config_version: str
+    unstructured_config: dict[str, Any]
+
+
+class ConfigSnapshots:
+    """
+    Cache of parsed config files, so unchanged configs don't need to be parsed with
+    tomlkit again. Snapshots are only used while the config file's modification time,
+    size, and the config version all match. Files modified within
+    `RACY_MTIME_WINDOW_NS` of being checked are always parsed, since they could have
+    been edited again without their modification time changing. The config files are
+    always the source of truth.
+
+    The unstructured configs are cached rather than config objects. Structuring them
+    with cattrs is fast, and config objects can refer to things that shouldn't be
+    copied, like `OneLauncherLocale`s.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._snapshots: dict[str, _ConfigSnapshot] = {}
+        self._changed = False
+        try:
+            with path.open("rb") as file:
+                # The cache is only ever written by OneLauncher.
+                self._snapshots = pickle.load(file)  # noqa: S301
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.debug("Couldn't load config snapshots", exc_info=True)
+
+    def get(
+        self, config_class: type[Config], config_file_path: Path
+    ) -> dict[str, Any] | None:
+        """
+        Raises:
+            FileNotFoundError: Config file not found
+        """
+        stat_time_ns = time.time_ns()
+        stat = config_file_path.stat()
+        snapshot = self._snapshots.get(str(config_file_path))
+        if (
+            snapshot is None
+            or stat_time_ns - stat.st_mtime_ns < RACY_MTIME_WINDOW_NS
+            or snapshot.mtime_ns != stat.st_mtime_ns
+            or snapshot.size != stat.st_size
+            or snapshot.config_version != str(config_class.get_config_version())
+        ):
+            return None
+        return snapshot.unstructured_config
+
+    def add(
+        self,
+        config_class: type[Config],
+        config_file_path: Path,
+        unstructured_config: dict[str, Any],
+        stat: os.stat_result,
+        stat_time_ns: int,
+    ) -> None:
+        """
+        Add snapshot, unless the config file was modified too recently to tell later
+        edits apart.
+
+        Args:
+            stat (os.stat_result): Stat of the config file from before it was read
+            stat_time_ns (int): `time.time_ns()` from right before `stat` was taken
+        """
+        if stat_time_ns - stat.st_mtime_ns < RACY_MTIME_WINDOW_NS:
+            return
+        self._snapshots[str(config_file_path)] = _ConfigSnapshot(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            config_version=str(config_class.get_config_version()),
+            unstructured_config=unstructured_config,
+        )
+        self._changed = True
+
+    def save(self) -> None:
+        """Save snapshots, if any were added. Snapshots of deleted files are dropped."""
+        if not self._changed:
+            return
+        snapshots = {
+            path: snapshot
+            for path, snapshot in self._snapshots.items()
+            if Path(path).exists()
+        }
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as file:
+                pickle.dump(snapshots, file, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(self.path)
+        except (OSError, pickle.PicklingError):
+            logger.debug("Couldn't save config snapshots", exc_info=True)
+            with suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+        self._changed = False
+
+
+def parse_config_file(
     *,
-    config_class: type[T],
+    config_class: type[Config],
     config_file_path: Path,
-    preconverter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
-) -> T:
+    snapshots: ConfigSnapshots | None = None,
+) -> dict[str, Any]:
     """
-    Read and parse config file into config_class object.
+    Read config file and check that it's the right config version. The unstructured
+    config can be converted to a `config_class` object with `structure_config`.
 
     Args:
-        config_class (Config): The config class to convert to
-        config_file_path (Path): Path to the config file.
-        preconverter (Callable[[dict[str, Any]], dict[str, Any]] | None):
-            Optional function used to change the unstructured config before
-            converting it to `config_class`
+        snapshots (ConfigSnapshots | None): Snapshots to use instead of parsing the
+            config file, if it hasn't changed. New snapshots are added to it.
 
     Raises:
         FileNotFoundError: Config file not found
         ConfigFileParseError: Error parsing config file
         WrongConfigVersionError: Config file has wrong config version
     """
+    if snapshots is not None and (
+        (unstructured_snapshot := snapshots.get(config_class, config_file_path))
+        is not None
+    ):
+        count("Config file snapshot hits")
+        return unstructured_snapshot
+    # Stat before reading, so edits made while reading make the snapshot outdated.
+    stat_time_ns = time.time_ns()
+    stat = config_file_path.stat()
     try:
-        unstructured_config: tomlkit.TOMLDocument = tomlkit.parse(
-            config_file_path.read_text(encoding="UTF-8")
-        )
+        with Span("Parse config file", "config", path=config_file_path):
+            document = tomlkit.parse(config_file_path.read_text(encoding="UTF-8"))
     except tomlkit.exceptions.ParseError as e:
         raise ConfigFileParseError(
             msg="Error parsing config TOML",
@@ -269,7 +387,7 @@ def read_config_file[T: Config](
             config_file_path=config_file_path,
         ) from e
 
-    config_file_version = get_toml_doc_config_version(unstructured_config)
+    config_file_version = get_toml_doc_config_version(document)
     if config_file_version is None:
         raise ConfigFileParseError(
             msg="Config has no version specified.",
@@ -284,13 +402,43 @@ def read_config_file[T: Config](
             config_file_path=config_file_path,
             config_file_version=config_file_version,
         )
+    # Plain Python objects are faster to structure than tomlkit ones.
+    unstructured_config = document.unwrap()
+    if snapshots is not None:
+        snapshots.add(
+            config_class, config_file_path, unstructured_config, stat, stat_time_ns
+        )
+    return unstructured_config
+
+
+def structure_config[T: Config](
+    *,
+    config_class: type[T],
+    config_file_path: Path,
+    unstructured_config: dict[str, Any],
+    preconverter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> T:
+    """
+    Convert config from `parse_config_file` into `config_class` object.
 
+    Args:
+        config_class (Config): The config class to convert to
+        config_file_path (Path): Path to the config file. Only used for errors.
+        unstructured_config (dict[str, Any]): Config to convert
+        preconverter (Callable[[dict[str, Any]], dict[str, Any]] | None):
+            Optional function used to change the unstructured config before
+            converting it to `config_class`
+
+    Raises:
+        ConfigFileParseError: Error structuring config
+    """
     preconverted_config = (
         preconverter(unstructured_config) if preconverter else unstructured_config
     )
 
     try:
-        return get_converter().structure(preconverted_config, config_class)
+        with Span("Structure config", "config", path=config_file_path):
+            return get_converter().structure(preconverted_config, config_class)
     except cattrs.ClassValidationError as e:
         raise ConfigFileParseError(
             msg="Error structuring config",
@@ -299,6 +447,41 @@ def read_config_file[T: Config](
         ) from e
 
 
+def read_config_file[T: Config](
+    *,
+    config_class: type[T],
+    config_file_path: Path,
+    preconverter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    snapshots: ConfigSnapshots | None = None,
+) -> T:
+    """
+    Read and parse config file into config_class object.
+
+    Args:
+        config_class (Config): The config class to convert to
+        config_file_path (Path): Path to the config file.
+        preconverter (Callable[[dict[str, Any]], dict[str, Any]] | None):
+            Optional function used to change the unstructured config before
+            converting it to `config_class`
+        snapshots (ConfigSnapshots | None): See `parse_config_file`
+
+    Raises:
+        FileNotFoundError: Config file not found
+        ConfigFileParseError: Error parsing config file
+        WrongConfigVersionError: Config file has wrong config version
+    """
+    return structure_config(
+        config_class=config_class,
+        config_file_path=config_file_path,
+        unstructured_config=parse_config_file(
+            config_class=config_class,
+            config_file_path=config_file_path,
+            snapshots=snapshots,
+        ),
+        preconverter=preconverter,
+    )
+
+
 def update_config_file(
     config: Config,
     config_file_path: Path,
@@ -332,7 +515,28 @@ def update_config_file(
     )
 
     convert_to_toml(postconverted_unstructured, doc)
-    config_file_path.write_text(doc.as_string())
+    _write_text_atomic(config_file_path, doc.as_string())
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """
+    Write `text` to a temporary file first and then move it into place, so `path` is
+    never left half written.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with (
+            Span("Write config file", "config", path=path),
+            tmp_path.open("w", encoding="UTF-8") as file,
+        ):
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        tmp_path.replace(path)
+    except BaseException:
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        raise
 
 
 type ConfigManagerConfigClass = ProgramConfig | GameConfig | GameAccountsConfig
@@ -347,6 +551,13 @@ class NoValidGamesError(Exception):
     msg: str = "There are no valid games registered."
 
 
+def _invalidate_game_caches_on_setattr[T](
+    config_manager: "ConfigManager", _attribute: "attrs.Attribute[T]", value: T
+) -> T:
+    config_manager._invalidate_game_caches()
+    return value
+
+
 @attrs.define(kw_only=True)
 class ConfigManager:
     """
@@ -356,22 +567,41 @@ class ConfigManager:
     get_merged_program_config: Callable[[ProgramConfig], ProgramConfig] = (
         lambda config: config
     )
-    get_merged_game_config: Callable[[GameConfig], GameConfig] = lambda config: config
+    get_merged_game_config: Callable[[GameConfig], GameConfig] = attrs.field(
+        default=lambda config: config, on_setattr=_invalidate_game_caches_on_setattr
+    )
     get_merged_game_accounts_config: Callable[
         [GameAccountsConfig], GameAccountsConfig
     ] = lambda config: config
     program_config_dir: Final[Path] = PROGRAM_CONFIG_DIR_DEFAULT
     games_dir: Final[Path] = GAMES_DIR_DEFAULT
+    config_snapshots_path: Final[Path | None] = CONFIG_SNAPSHOTS_PATH_DEFAULT
+    """Where to cache parsed configs. See `ConfigSnapshots`."""
 
     GAME_CONFIG_FILE_NAME: Final[str] = attrs.field(default="config.toml", init=False)
     configs_are_verified: bool = attrs.field(default=False, init=False)
-    verified_game_config_ids: list[GameConfigID] = attrs.field(default=[], init=False)
+    verified_game_config_ids: list[GameConfigID] = attrs.field(factory=list, init=False)
     _cached_program_config: ProgramConfig | None = attrs.field(default=None, init=False)
     _cached_game_configs: dict[GameConfigID, GameConfig] = attrs.field(
-        default={}, init=False
+        factory=dict, init=False
     )
     _cached_game_accounts_configs: dict[GameConfigID, GameAccountsConfig] = attrs.field(
-        default={}, init=False
+        factory=dict, init=False
+    )
+    _pending_writes: dict[Path, Callable[[], None]] | None = attrs.field(
+        default=None, init=False
+    )
+    """Config file writes waiting for `batch_writes` to finish"""
+    _merged_game_configs: dict[GameConfigID, GameConfig] = attrs.field(
+        factory=dict, init=False
+    )
+    """Memoized results of `get_merged_game_config`"""
+    _game_indexes: dict[tuple[object, ...], tuple[GameConfigID, ...]] = attrs.field(
+        factory=dict, init=False
+    )
+    """Memoized filtered and sorted game config IDs"""
+    _keyring_cache: KeyringCache = attrs.field(
+        factory=lambda: KeyringCache(__title__), init=False
     )
 
     def __attrs_post_init__(self) -> None:
@@ -382,28 +612,140 @@ class ConfigManager:
         """
         Verify that all config files are present and can be parsed.
 
+        Game and game accounts configs are read and structured concurrently.
+
         Raises:
             ConfigFileParseError: Error parsing a config file
             WrongConfigVersionError: Config file has wrong config version
         """
         self.verified_game_config_ids.clear()
-
-        # ConfigFileParseError and WrongConfigVersionError are handled by caller
-        self._read_program_config_file()
+        self._cached_game_configs.clear()
+        self._cached_game_accounts_configs.clear()
+        self._invalidate_game_caches()
+
+        snapshots = (
+            ConfigSnapshots(self.config_snapshots_path)
+            if self.config_snapshots_path
+            else None
+        )
+        game_ids = self._get_game_config_ids()
+        with ThreadPoolExecutor(thread_name_prefix="verify_configs") as executor:
+            game_config_futures = [
+                executor.submit(
+                    read_config_file,
+                    config_class=GameConfig,
+                    config_file_path=self.get_game_config_path(game_id),
+                    snapshots=snapshots,
+                )
+                for game_id in game_ids
+            ]
+            game_accounts_config_futures = [
+                executor.submit(
+                    read_config_file,
+                    config_class=GameAccountsConfig,
+                    config_file_path=self.get_game_accounts_config_path(game_id),
+                    preconverter=partial(
+                        _tables_to_array_of_tables,
+                        array_name="accounts",
+                        table_name_key_name="username",
+                    ),
+                    snapshots=snapshots,
+                )
+                for game_id in game_ids
+            ]
+            # ConfigFileParseError and WrongConfigVersionError are handled by caller
+            self._read_program_config_file(snapshots=snapshots)
 
         # Verify game configs
-        for game_id in self._get_game_config_ids():
+        for game_id, game_config_future, game_accounts_config_future in zip(
+            game_ids, game_config_futures, game_accounts_config_futures, strict=True
+        ):
             # FileNotFoundError is handled by using known to exist game IDs
             # ConfigFileParseError and WrongConfigVersionError are handled by caller
-            self._read_game_config_file(game_id)
+            self._cached_game_configs[game_id] = game_config_future.result()
             try:
                 # ConfigFileParseError and WrongConfigVersionError are handled by caller
-                self._read_game_accounts_config_file_full(game_id)
+                self._cached_game_accounts_configs[game_id] = (
+                    game_accounts_config_future.result()
+                )
             except FileNotFoundError:
                 self.update_game_accounts_config_file(game_id=game_id, accounts=())
 
             self.verified_game_config_ids.append(game_id)
         self.configs_are_verified = True
+        if snapshots is not None:
+            snapshots.save()
+
+    @contextmanager
+    def batch_writes(self) -> Iterator[None]:
+        """
+        Hold config file writes until the end of the block. Only the last update to
+        each file is written. Updated configs are returned by the config getters
+        right away.
+        """
+        if self._pending_writes is not None:
+            # Nested batches are written with the outermost one.
+            yield
+            return
+
+        self._pending_writes = {}
+        try:
+            yield
+        finally:
+            pending_writes = self._pending_writes
+            self._pending_writes = None
+            for write in pending_writes.values():
+                write()
+
+    def _write_config_file(
+        self,
+        config: Config,
+        config_file_path: Path,
+        postconverter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ) -> None:
+        write = partial(
+            update_config_file,
+            config=config,
+            config_file_path=config_file_path,
+            postconverter=postconverter,
+        )
+        if self._pending_writes is None:
+            write()
+        else:
+            self._pending_writes[config_file_path] = write
+
+    def _invalidate_game_caches(self, game_id: GameConfigID | None = None) -> None:
+        """
+        Forget memoized merged game configs and game indexes. They must be
+        invalidated whenever a game config, or the list of games, changes.
+
+        Args:
+            game_id (GameConfigID | None): Only forget the merged config of this
+                game. The merged configs of all games are forgotten by default.
+        """
+        if game_id is None:
+            self._merged_game_configs.clear()
+        else:
+            self._merged_game_configs.pop(game_id, None)
+        self._game_indexes.clear()
+
+    def _get_game_index(
+        self,
+        key: tuple[object, ...],
+        build_index: Callable[[], Iterable[GameConfigID]],
+    ) -> tuple[GameConfigID, ...]:
+        """Get memoized game config IDs from `build_index`"""
+        if (index := self._game_indexes.get(key)) is None:
+            index = self._game_indexes[key] = tuple(build_index())
+        return index
+
+    def _discard_pending_writes(self, directory: Path) -> None:
+        """Discard batched writes to files in `directory`, because it was deleted"""
+        if self._pending_writes is None:
+            return
+        for path in tuple(self._pending_writes):
+            if path.is_relative_to(directory):
+                del self._pending_writes[path]
 
     @property
     def program_config_path(self) -> Path:
@@ -436,17 +778,24 @@ class ConfigManager:
         else:
             raise ConfigManagerNotSetupError("")
 
-    def _read_program_config_file(self) -> ProgramConfig:
+    def _read_program_config_file(
+        self, snapshots: ConfigSnapshots | None = None
+    ) -> ProgramConfig:
         """
         Read and parse program config file into `ProgramConfig` object.
 
+        Args:
+            snapshots (ConfigSnapshots | None): See `parse_config_file`
+
         Raises:
             ConfigFileParseError: Error parsing config file
             WrongConfigVersionError: Config file has wrong config version
         """
         try:
             config = read_config_file(
-                config_class=ProgramConfig, config_file_path=self.program_config_path
+                config_class=ProgramConfig,
+                config_file_path=self.program_config_path,
+                snapshots=snapshots,
             )
         except FileNotFoundError:
             # There should always be a program config.
@@ -461,17 +810,45 @@ class ConfigManager:
         """
         Replace contents of program config file with `config`.
         """
-        update_config_file(config=config, config_file_path=self.program_config_path)
+        if config != self._cached_program_config or not (
+            self.program_config_path.exists()
+            or self.program_config_path in (self._pending_writes or {})
+        ):
+            self._write_config_file(
+                config=config, config_file_path=self.program_config_path
+            )
         self._cached_program_config = config
 
     def delete_program_config(self) -> None:
         """Delete program config"""
+        if self._pending_writes is not None:
+            self._pending_writes.pop(self.program_config_path, None)
         self.program_config_path.unlink(missing_ok=True)
         # Update the cache.
         # Parse error and config version errors are handled, because there is no file
         # to parse.
         self._read_program_config_file()
 
+    def reload_program_config_file(self) -> bool:
+        """
+        Read the program config file again after it was changed by something other
+        than this `ConfigManager`. The cached config is kept if the file is invalid.
+
+        Returns:
+            bool: Whether the program config changed
+
+        Raises:
+            ConfigFileParseError: Error parsing config file
+            WrongConfigVersionError: Config file has wrong config version
+        """
+        if not self.configs_are_verified:
+            raise ConfigManagerNotSetupError("")
+        if self.program_config_path in (self._pending_writes or {}):
+            # The pending write replaces whatever is on disk.
+            return False
+        previous_config = self._cached_program_config
+        return self._read_program_config_file() != previous_config
+
     def get_game_config_ids(self) -> tuple[GameConfigID, ...]:
         if self.configs_are_verified:
             return tuple(self.verified_game_config_ids)
@@ -485,10 +862,13 @@ class ConfigManager:
         )
 
     def get_games_by_game_type(self, game_type: GameType) -> tuple[GameConfigID, ...]:
-        return tuple(
-            game_id
-            for game_id in self.get_game_config_ids()
-            if self.get_game_config(game_id).game_type == game_type
+        return self._get_game_index(
+            ("game_type", game_type),
+            lambda: (
+                game_id
+                for game_id in self.get_game_config_ids()
+                if self.get_game_config(game_id).game_type == game_type
+            ),
         )
 
     def get_games_sorted_by_priority(
@@ -510,7 +890,9 @@ class ConfigManager:
 
         # Sort games by sorting_priority. Games with sorting_priority of -1 are
         # put at the end
-        return tuple(sorted(game_ids, key=sorter))
+        return self._get_game_index(
+            ("priority", game_type), lambda: sorted(game_ids, key=sorter)
+        )
 
     def get_games_sorted_by_last_played(
         self, game_type: GameType | None = None
@@ -532,12 +914,9 @@ class ConfigManager:
             )
 
         # Get list of played games sorted by when they were last played
-        return tuple(
-            sorted(
-                game_ids,
-                key=sorter,
-                reverse=True,
-            )
+        return self._get_game_index(
+            ("last_played", game_type),
+            lambda: sorted(game_ids, key=sorter, reverse=True),
         )
 
     def get_games_sorted(
@@ -561,8 +940,11 @@ class ConfigManager:
             if game_type
             else self.get_game_config_ids()
         )
-        return tuple(
-            sorted(game_ids, key=lambda game_id: self.get_game_config(game_id).name)
+        return self._get_game_index(
+            ("alphabetical", game_type),
+            lambda: sorted(
+                game_ids, key=lambda game_id: self.get_game_config(game_id).name
+            ),
         )
 
     def get_initial_game(self) -> GameConfigID:
@@ -584,10 +966,16 @@ class ConfigManager:
         """
         Get merged game config object.
         """
-        return self.get_merged_game_config(self.read_game_config_file(game_id))
+        if (merged_config := self._merged_game_configs.get(game_id)) is None:
+            merged_config = self._merged_game_configs[game_id] = (
+                self.get_merged_game_config(self.read_game_config_file(game_id))
+            )
+        return merged_config
 
     def read_game_config_file(self, game_id: GameConfigID) -> GameConfig:
-        """Read and parse game config file into `GameConfig` object."""
+        """
+        Read and parse game config file into `GameConfig` object.
+        """
         if not self.configs_are_verified:
             raise ConfigManagerNotSetupError("")
         if game_id not in self.verified_game_config_ids:
@@ -595,22 +983,6 @@ class ConfigManager:
 
         return self._cached_game_configs[game_id]
 
-    def _read_game_config_file(self, game_id: GameConfigID) -> GameConfig:
-        """
-        Read and parse game config file into `GameConfig` object.
-
-        Raises:
-            FileNotFoundError: Config file not found
-            ConfigFileParseError: Error parsing config file
-            WrongConfigVersionError: Config file has wrong config version
-        """
-        config = read_config_file(
-            config_class=GameConfig,
-            config_file_path=self.get_game_config_path(game_id),
-        )
-        self._cached_game_configs[game_id] = config
-        return config
-
     def update_game_config_file(
         self, game_id: GameConfigID, config: GameConfig
     ) -> None:
@@ -619,12 +991,16 @@ class ConfigManager:
         """
         game_config_path = self.get_game_config_path(game_id)
         game_config_path.parent.mkdir(exist_ok=True)
-        update_config_file(config=config, config_file_path=game_config_path)
+        if game_id not in self.verified_game_config_ids or config != (
+            self._cached_game_configs.get(game_id)
+        ):
+            self._write_config_file(config=config, config_file_path=game_config_path)
         if game_id not in self.verified_game_config_ids:
             # Veriefed game config IDs are expected to have an accounts config file
             self.update_game_accounts_config_file(game_id=game_id, accounts=())
             self.verified_game_config_ids.append(game_id)
         self._cached_game_configs[game_id] = config
+        self._invalidate_game_caches(game_id)
 
     def delete_game_config(
         self, game_id: GameConfigID, *, exclude_install_dir: bool = False
@@ -648,20 +1024,93 @@ class ConfigManager:
                 path.unlink()
         with suppress(OSError):
             self.get_game_config_dir(game_id).rmdir()
+        self._discard_pending_writes(self.get_game_config_dir(game_id))
 
         self.verified_game_config_ids.remove(game_id)
-        del self._cached_game_configs[game_id]
-        del self._cached_game_accounts_configs[game_id]
+        self._cached_game_configs.pop(game_id, None)
+        self._cached_game_accounts_configs.pop(game_id, None)
+        self._invalidate_game_caches(game_id)
+
+    def reload_game_config_file(self, game_id: GameConfigID) -> bool:
+        """
+        Read a game config file again after it was changed by something other than
+        this `ConfigManager`. Games whose config file was added or deleted are
+        added or removed. The cached config is kept if the file is invalid.
+
+        Returns:
+            bool: Whether the game config changed
+
+        Raises:
+            ConfigFileParseError: Error parsing config file
+            WrongConfigVersionError: Config file has wrong config version
+        """
+        if not self.configs_are_verified:
+            raise ConfigManagerNotSetupError("")
+        config_path = self.get_game_config_path(game_id)
+        if config_path in (self._pending_writes or {}):
+            # The pending write replaces whatever is on disk.
+            return False
+        is_verified = game_id in self.verified_game_config_ids
+
+        try:
+            unstructured_config = parse_config_file(
+                config_class=GameConfig, config_file_path=config_path
+            )
+        except FileNotFoundError:
+            if not is_verified:
+                return False
+            self.verified_game_config_ids.remove(game_id)
+            self._cached_game_configs.pop(game_id, None)
+            self._cached_game_accounts_configs.pop(game_id, None)
+            self._invalidate_game_caches(game_id)
+            return True
+        config = structure_config(
+            config_class=GameConfig,
+            config_file_path=config_path,
+            unstructured_config=unstructured_config,
+        )
+
+        previous_config: GameConfig | None = None
+        if is_verified:
+            with suppress(ConfigFileError):
+                previous_config = self.read_game_config_file(game_id)
+        else:
+            # The accounts config is left to be written with the first update, in
+            # case whatever added the game is about to write it too.
+            self._cached_game_accounts_configs[game_id] = (
+                self._get_existing_game_accounts_config(game_id)
+                or GameAccountsConfig(())
+            )
+            self.verified_game_config_ids.append(game_id)
+        self._cached_game_configs[game_id] = config
+        self._invalidate_game_caches(game_id)
+        return config != previous_config
 
     def get_game_accounts(self, game_id: GameConfigID) -> tuple[GameAccountConfig, ...]:
+        return self.get_merged_game_accounts_config(
+            self._get_game_accounts_config(game_id)
+        ).accounts
+
+    def _get_game_accounts_config(self, game_id: GameConfigID) -> GameAccountsConfig:
         if not self.configs_are_verified:
             raise ConfigManagerNotSetupError("")
         if game_id not in self.verified_game_config_ids:
             raise ValueError(f"Game config ID: {game_id} has not been verified")
 
-        return self.get_merged_game_accounts_config(
-            self._cached_game_accounts_configs[game_id]
-        ).accounts
+        return self._cached_game_accounts_configs[game_id]
+
+    def _get_existing_game_accounts_config(
+        self, game_id: GameConfigID
+    ) -> GameAccountsConfig | None:
+        """
+        Get the game accounts config that's currently saved. Verified games use
+        the cached config. Others are read from disk.
+        """
+        if game_id in self._cached_game_accounts_configs:
+            return self._cached_game_accounts_configs[game_id]
+        with suppress(FileNotFoundError, ConfigFileError):
+            return self._read_game_accounts_config_file_full(game_id=game_id)
+        return None
 
     def _read_game_accounts_config_file_full(
         self, game_id: GameConfigID
@@ -694,12 +1143,7 @@ class ConfigManager:
         Read and parse game accounts config file into tuple of
         `GameAccountConfig` objects.
         """
-        if not self.configs_are_verified:
-            raise ConfigManagerNotSetupError("")
-        if game_id not in self.verified_game_config_ids:
-            raise ValueError(f"Game config ID: {game_id} has not been verified")
-
-        return self._cached_game_accounts_configs[game_id].accounts
+        return self._get_game_accounts_config(game_id).accounts
 
     def update_game_accounts_config_file(
         self, game_id: GameConfigID, accounts: tuple[GameAccountConfig, ...]
@@ -707,28 +1151,67 @@ class ConfigManager:
         """
         Replace contents of game accounts config file with `accounts`.
         """
+        existing_config = self._get_existing_game_accounts_config(game_id)
         # Delete keyring info for any removed accounts
-        with suppress(FileNotFoundError, ConfigFileError):
-            existing_accounts = self._read_game_accounts_config_file_full(
-                game_id=game_id
-            ).accounts
+        if existing_config is not None:
             updated_accounts_usernames = [account.username for account in accounts]
-            for existing_account in existing_accounts:
+            for existing_account in existing_config.accounts:
                 if existing_account.username not in updated_accounts_usernames:
                     self.delete_game_account_keyring_info(
                         game_id=game_id, game_account=existing_account
                     )
         config = GameAccountsConfig(accounts)
-        update_config_file(
-            config=config,
-            config_file_path=self.get_game_accounts_config_path(game_id),
-            postconverter=partial(
-                _array_of_tables_to_tables,
-                array_name="accounts",
-                table_name_key_name="username",
-            ),
-        )
+        if config != existing_config:
+            self._write_config_file(
+                config=config,
+                config_file_path=self.get_game_accounts_config_path(game_id),
+                postconverter=partial(
+                    _array_of_tables_to_tables,
+                    array_name="accounts",
+                    table_name_key_name="username",
+                ),
+            )
+        self._cached_game_accounts_configs[game_id] = config
+
+    def reload_game_accounts_config_file(self, game_id: GameConfigID) -> bool:
+        """
+        Read a game accounts config file again after it was changed by something
+        other than this `ConfigManager`. A deleted file means there are no accounts.
+        The cached config is kept if the file is invalid.
+
+        Returns:
+            bool: Whether the game accounts config changed
+
+        Raises:
+            ConfigFileParseError: Error parsing config file
+            WrongConfigVersionError: Config file has wrong config version
+        """
+        if not self.configs_are_verified:
+            raise ConfigManagerNotSetupError("")
+        config_path = self.get_game_accounts_config_path(game_id)
+        if game_id not in self.verified_game_config_ids or config_path in (
+            self._pending_writes or {}
+        ):
+            return False
+
+        try:
+            config = structure_config(
+                config_class=GameAccountsConfig,
+                config_file_path=config_path,
+                unstructured_config=parse_config_file(
+                    config_class=GameAccountsConfig, config_file_path=config_path
+                ),
+                preconverter=partial(
+                    _tables_to_array_of_tables,
+                    array_name="accounts",
+                    table_name_key_name="username",
+                ),
+            )
+        except FileNotFoundError:
+            config = GameAccountsConfig(())
+        previous_config = self._get_existing_game_accounts_config(game_id)
         self._cached_game_accounts_configs[game_id] = config
+        return config != previous_config
 
     def _get_account_keyring_username(
         self, game_id: GameConfigID, game_account: GameAccountConfig
@@ -742,12 +1225,13 @@ class ConfigManager:
         Get account password that is saved in keyring. Will return `None` if no saved
         passwords are found or there is no keyring backend.
         """
+        from keyring.errors import KeyringLocked, NoKeyringError
+
         try:
-            return keyring.get_password(
-                service_name=__title__,
-                username=self._get_account_keyring_username(
+            return self._keyring_cache.get_password(
+                self._get_account_keyring_username(
                     game_id=game_id, game_account=game_account
-                ),
+                )
             )
         except (NoKeyringError, KeyringLocked):
             logger.exception("")
@@ -760,10 +1244,11 @@ class ConfigManager:
         Save account password with keyring. Will silently fail if there is no keyring
         backend.
         """
+        from keyring.errors import KeyringLocked, NoKeyringError
+
         with suppress(NoKeyringError, KeyringLocked):
-            keyring.set_password(
-                service_name=__title__,
-                username=self._get_account_keyring_username(
+            self._keyring_cache.set_password(
+                self._get_account_keyring_username(
                     game_id=game_id, game_account=game_account
                 ),
                 password=password,
@@ -773,14 +1258,13 @@ class ConfigManager:
         self, game_id: GameConfigID, game_account: GameAccountConfig
     ) -> None:
         """Delete account password saved with keyring"""
-        with suppress(
-            keyring.errors.PasswordDeleteError, NoKeyringError, KeyringLocked
-        ):
-            keyring.delete_password(
-                service_name=__title__,
-                username=self._get_account_keyring_username(
+        from keyring.errors import KeyringLocked, NoKeyringError, PasswordDeleteError
+
+        with suppress(PasswordDeleteError, NoKeyringError, KeyringLocked):
+            self._keyring_cache.delete_password(
+                self._get_account_keyring_username(
                     game_id=game_id, game_account=game_account
-                ),
+                )
             )
 
     def _get_account_last_used_subscription_keyring_username(
@@ -798,12 +1282,13 @@ class ConfigManager:
         Get name of the subscription that was last played with from keyring.
         See `login_account.py`
         """
+        from keyring.errors import KeyringLocked, NoKeyringError
+
         try:
-            return keyring.get_password(
-                service_name=__title__,
-                username=self._get_account_last_used_subscription_keyring_username(
+            return self._keyring_cache.get_password(
+                self._get_account_last_used_subscription_keyring_username(
                     game_id=game_id, game_account=game_account
-                ),
+                )
             )
         except (NoKeyringError, KeyringLocked):
             logger.exception("")
@@ -816,10 +1301,11 @@ class ConfigManager:
         subscription_name: str,
     ) -> None:
         """Save last used subscription name with keyring"""
+        from keyring.errors import KeyringLocked, NoKeyringError
+
         with suppress(NoKeyringError, KeyringLocked):
-            keyring.set_password(
-                service_name=__title__,
-                username=self._get_account_last_used_subscription_keyring_username(
+            self._keyring_cache.set_password(
+                self._get_account_last_used_subscription_keyring_username(
                     game_id=game_id, game_account=game_account
                 ),
                 password=subscription_name,
@@ -831,14 +1317,13 @@ class ConfigManager:
         game_account: GameAccountConfig,
     ) -> None:
         """Delete last used subscription name saved with keyring"""
-        with suppress(
-            keyring.errors.PasswordDeleteError, NoKeyringError, KeyringLocked
-        ):
-            keyring.delete_password(
-                service_name=__title__,
-                username=self._get_account_last_used_subscription_keyring_username(
+        from keyring.errors import KeyringLocked, NoKeyringError, PasswordDeleteError
+
+        with suppress(PasswordDeleteError, NoKeyringError, KeyringLocked):
+            self._keyring_cache.delete_password(
+                self._get_account_last_used_subscription_keyring_username(
                     game_id=game_id, game_account=game_account
-                ),
+                )
             )
 
     def delete_game_account_keyring_info(
@@ -852,6 +1337,30 @@ class ConfigManager:
             game_id=game_id, game_account=game_account
         )
 
+    async def prefetch_game_keyring_info(self, game_id: GameConfigID) -> None:
+        """
+        Fetch keyring info for all of a game's accounts at once in a worker thread,
+        so that getting it later doesn't block. This also unlocks the keyring, if
+        needed.
+
+        Raises:
+            NoKeyringError: There is no keyring backend
+            KeyringLocked: The keyring couldn't be unlocked
+        """
+        keyring_usernames = [
+            keyring_username
+            for game_account in self.get_game_accounts(game_id)
+            for keyring_username in (
+                self._get_account_keyring_username(
+                    game_id=game_id, game_account=game_account
+                ),
+                self._get_account_last_used_subscription_keyring_username(
+                    game_id=game_id, game_account=game_account
+                ),
+            )
+        ]
+        await trio.to_thread.run_sync(self._keyring_cache.prefetch, keyring_usernames)
+
     def get_ui_locale(self, game_id: GameConfigID) -> OneLauncherLocale:
         program_config = self.get_program_config()
         game_config = self.get_game_config(game_id)
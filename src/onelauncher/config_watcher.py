@@ -0,0 +1,154 @@
+"""
+Reload config files when they're changed by something other than this OneLauncher
+process, like another OneLauncher instance or a text editor.
+
+Only the files that changed are read again. Changes made through the `ConfigManager`
+itself are already in its cache, so they don't cause any reloads or signals.
+"""
+
+import logging
+from pathlib import Path
+from typing import Final
+
+from PySide6 import QtCore
+
+from .config_manager import ConfigFileError, ConfigManager
+from .game_config import GameConfigID
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher(QtCore.QObject):
+    RELOAD_DELAY_MS: Final = 100
+    """
+    How long to wait for more changes before reloading. Config files are often
+    changed with several file system operations, like writing a temporary file and
+    then renaming it.
+    """
+
+    program_config_changed = QtCore.Signal()
+    game_config_ids_changed = QtCore.Signal()
+    """Emitted when a game is added or removed"""
+    game_config_changed = QtCore.Signal(GameConfigID)
+    game_accounts_config_changed = QtCore.Signal(GameConfigID)
+
+    def __init__(
+        self, config_manager: ConfigManager, parent: QtCore.QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self._changed_paths: set[Path] = set()
+
+        self._file_system_watcher = QtCore.QFileSystemWatcher(self)
+        self._file_system_watcher.fileChanged.connect(self._path_changed)
+        self._file_system_watcher.directoryChanged.connect(self._path_changed)
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self.reload_changed_configs)
+        self._update_watched_paths()
+
+    def _get_paths_to_watch(self) -> list[Path]:
+        paths = [
+            self.config_manager.program_config_dir,
+            self.config_manager.program_config_path,
+            self.config_manager.games_dir,
+        ]
+        for game_dir in self.config_manager.games_dir.iterdir():
+            if not game_dir.is_dir():
+                continue
+            game_id = GameConfigID(game_dir.name)
+            paths.extend(
+                (
+                    game_dir,
+                    self.config_manager.get_game_config_path(game_id),
+                    self.config_manager.get_game_accounts_config_path(game_id),
+                )
+            )
+        return [path for path in paths if path.exists()]
+
+    def _update_watched_paths(self) -> None:
+        """
+        Watch any config files and directories that aren't watched yet. Files that
+        were replaced or deleted aren't watched anymore.
+        """
+        watched_paths = {
+            *self._file_system_watcher.files(),
+            *self._file_system_watcher.directories(),
+        }
+        new_paths = [
+            str(path)
+            for path in self._get_paths_to_watch()
+            if str(path) not in watched_paths
+        ]
+        if new_paths:
+            self._file_system_watcher.addPaths(new_paths)
+
+    def _path_changed(self, path: str) -> None:
+        self._changed_paths.add(Path(path))
+        self._reload_timer.start()
+
+    def _get_changed_game_ids(self, changed_paths: set[Path]) -> list[GameConfigID]:
+        games_dir = self.config_manager.games_dir
+        # Existing IDs are reused, because `GameConfigID` is compared by identity.
+        game_ids = {
+            str(game_id): game_id
+            for game_id in self.config_manager.get_game_config_ids()
+        }
+        changed_names = {
+            path.relative_to(games_dir).parts[0]
+            for path in changed_paths
+            if path.is_relative_to(games_dir) and path != games_dir
+        }
+        if games_dir in changed_paths:
+            # Games may have been added or removed.
+            game_dir_names = {
+                path.name for path in games_dir.iterdir() if path.is_dir()
+            }
+            changed_names |= game_dir_names ^ game_ids.keys()
+        return [
+            game_ids.get(name) or GameConfigID(name) for name in sorted(changed_names)
+        ]
+
+    def reload_changed_configs(self) -> None:
+        """
+        Reload the config files that changed since this was last called, and emit
+        signals for the configs that are now different. Invalid config files are
+        logged and ignored until they change again.
+        """
+        changed_paths = self._changed_paths
+        self._changed_paths = set()
+        self._update_watched_paths()
+
+        if (
+            self.config_manager.program_config_dir in changed_paths
+            or self.config_manager.program_config_path in changed_paths
+        ):
+            try:
+                if self.config_manager.reload_program_config_file():
+                    self.program_config_changed.emit()
+            except ConfigFileError as e:
+                logger.warning("Couldn't reload %s: %s", e.config_file_path, e.msg)
+
+        previous_game_ids = self.config_manager.get_game_config_ids()
+        changed_game_ids: list[GameConfigID] = []
+        changed_game_accounts_ids: list[GameConfigID] = []
+        for game_id in self._get_changed_game_ids(changed_paths):
+            try:
+                if self.config_manager.reload_game_config_file(game_id):
+                    changed_game_ids.append(game_id)
+            except ConfigFileError as e:
+                logger.warning("Couldn't reload %s: %s", e.config_file_path, e.msg)
+            try:
+                if self.config_manager.reload_game_accounts_config_file(game_id):
+                    changed_game_accounts_ids.append(game_id)
+            except ConfigFileError as e:
+                logger.warning("Couldn't reload %s: %s", e.config_file_path, e.msg)
+
+        if self.config_manager.get_game_config_ids() != previous_game_ids:
+            self.game_config_ids_changed.emit()
+        for game_id in changed_game_ids:
+            if game_id in self.config_manager.get_game_config_ids():
+                self.game_config_changed.emit(game_id)
+        for game_id in changed_game_accounts_ids:
+            self.game_accounts_config_changed.emit(game_id)
@@ -0,0 +1,198 @@
+"""
+Cached access to the system keyring
+
+Keyring calls can be slow. With Secret Service on Linux, each one is a D-Bus round
+trip that may also have to unlock the collection. `KeyringCache` fetches many entries
+at once, with a single collection search when the backend supports it, and keeps them
+in memory for a short time. Entries that are saved or deleted through the cache stay
+up to date.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from contextlib import closing
+from typing import TYPE_CHECKING, Final
+
+import attrs
+
+if TYPE_CHECKING:
+    from keyring.backends import SecretService
+
+logger = logging.getLogger(__name__)
+
+KEYRING_CACHE_MAX_AGE_DEFAULT: Final = 60
+"""Seconds that fetched keyring entries are reused for"""
+_SECRET_SERVICE_SCHEMES: Final = {
+    "default": ("service", "username"),
+    "KeePassXC": ("Title", "UserName"),
+}
+"""
+Secret Service item attributes for the service name and username with each of the
+keyring Secret Service backend's schemes. These are the same from keyring 25.3, the
+oldest supported version, through at least 25.7. Entries are fetched one at a time
+with other schemes.
+"""
+
+
+@attrs.frozen
+class _CachedSecret:
+    secret: str | None
+    fetch_time: float
+
+
+@attrs.define
+class KeyringCache:
+    service_name: str
+    max_age: float = KEYRING_CACHE_MAX_AGE_DEFAULT
+    _secrets: dict[str, _CachedSecret] = attrs.field(factory=dict, init=False)
+    """Cached secrets by keyring username. `None` means there is no entry."""
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False)
+    """`prefetch` is meant to be run in a worker thread."""
+
+    def _get_cached(self, username: str) -> _CachedSecret | None:
+        with self._lock:
+            cached = self._secrets.get(username)
+        if cached is None or time.monotonic() - cached.fetch_time > self.max_age:
+            return None
+        return cached
+
+    def _set_cached(self, secrets: dict[str, str | None]) -> None:
+        fetch_time = time.monotonic()
+        with self._lock:
+            self._secrets.update(
+                (username, _CachedSecret(secret, fetch_time))
+                for username, secret in secrets.items()
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._secrets.clear()
+
+    def prefetch(self, usernames: Iterable[str]) -> None:
+        """
+        Fetch the entries for `usernames` that aren't cached yet. This blocks,
+        possibly on a prompt to unlock the keyring, so it should be run in a worker
+        thread. A locked keyring is unlocked even if nothing needs to be fetched.
+
+        Raises:
+            NoKeyringError: There is no keyring backend
+            KeyringLocked: The keyring couldn't be unlocked
+        """
+        import keyring
+        from keyring.backends import SecretService, fail
+        from keyring.errors import NoKeyringError
+
+        usernames = {
+            username for username in usernames if self._get_cached(username) is None
+        }
+        backend = keyring.get_keyring()
+        if isinstance(backend, fail.Keyring):
+            raise NoKeyringError("No keyring backend is available")
+        secrets: dict[str, str | None] | None = None
+        if isinstance(backend, SecretService.Keyring):
+            secrets = self._search_secret_service(backend, usernames)
+        if secrets is None:
+            secrets = {
+                username: backend.get_password(self.service_name, username)
+                for username in usernames
+            }
+        self._set_cached(secrets)
+
+    def _search_secret_service(
+        self, backend: "SecretService.Keyring", usernames: set[str]
+    ) -> dict[str, str | None] | None:
+        """
+        Get `usernames` with a single search of the Secret Service collection.
+        Returns `None` if the collection can't be searched like that, in which case
+        the entries should be fetched one at a time.
+
+        Raises:
+            KeyringLocked: The keyring couldn't be unlocked
+        """
+        # keyring only documents setting the scheme, not how it maps to attributes.
+        attribute_names = _SECRET_SERVICE_SCHEMES.get(
+            getattr(backend, "scheme", "default")
+        )
+        if attribute_names is None:
+            return None
+        service_attribute, username_attribute = attribute_names
+
+        secrets: dict[str, str | None] = dict.fromkeys(usernames)
+        # This unlocks the collection, if it's locked.
+        collection = backend.get_preferred_collection()  # type: ignore[no-untyped-call]
+        try:
+            with closing(collection.connection):
+                for item in collection.search_items(
+                    {service_attribute: self.service_name}
+                ):
+                    username = item.get_attributes().get(username_attribute)
+                    # Only the first item for each username is used, like
+                    # `keyring.get_password` does.
+                    if username in secrets and secrets[username] is None:
+                        backend.unlock(item)  # type: ignore[no-untyped-call]
+                        secrets[username] = item.get_secret().decode("utf-8")
+        # The backend or SecretStorage library may have changed.
+        except (AttributeError, KeyError, TypeError):
+            logger.debug(
+                "Couldn't search Secret Service collection. Getting entries one at a "
+                "time instead.",
+                exc_info=True,
+            )
+            return None
+        return secrets
+
+    def get_password(self, username: str) -> str | None:
+        """
+        Raises:
+            NoKeyringError: There is no keyring backend
+            KeyringLocked: The keyring couldn't be unlocked
+        """
+        import keyring
+
+        if (cached := self._get_cached(username)) is not None:
+            return cached.secret
+        secret = keyring.get_password(service_name=self.service_name, username=username)
+        self._set_cached({username: secret})
+        return secret
+
+    def set_password(self, username: str, password: str) -> None:
+        """
+        Raises:
+            NoKeyringError: There is no keyring backend
+            KeyringLocked: The keyring couldn't be unlocked
+        """
+        import keyring
+
+        try:
+            keyring.set_password(
+                service_name=self.service_name, username=username, password=password
+            )
+        except BaseException:
+            # It's unknown what ended up in the keyring.
+            with self._lock:
+                self._secrets.pop(username, None)
+            raise
+        self._set_cached({username: password})
+
+    def delete_password(self, username: str) -> None:
+        """
+        Raises:
+            PasswordDeleteError: There is no entry for `username`
+            NoKeyringError: There is no keyring backend
+            KeyringLocked: The keyring couldn't be unlocked
+        """
+        import keyring
+        from keyring.errors import PasswordDeleteError
+
+        try:
+            keyring.delete_password(service_name=self.service_name, username=username)
+        except PasswordDeleteError:
+            self._set_cached({username: None})
+            raise
+        except BaseException:
+            with self._lock:
+                self._secrets.pop(username, None)
+            raise
+        self._set_cached({username: None})
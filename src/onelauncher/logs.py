@@ -1,15 +1,25 @@
+import atexit
+import copy
 import logging
+import math
 import os
+import queue
 import sys
-from collections.abc import Callable
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
 from enum import IntEnum
 from functools import partial
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from platform import platform
 from types import TracebackType
 from typing import Final, override
 
+import attrs
+from PySide6 import QtCore
+
 from onelauncher.async_utils import app_cancel_scope
 from onelauncher.resources import data_dir
 
@@ -18,6 +28,10 @@ from .config import platform_dirs
 
 LOGS_DIR = platform_dirs.user_log_path
 MAIN_LOG_FILE_NAME = "main.log"
+LOG_QUEUE_MAX_SIZE: Final = 10_000
+"""Log records waiting to be written before less important ones are dropped"""
+
+_queue_listener: QueueListener | None = None
 
 
 class LogLevel(IntEnum):
@@ -62,8 +76,90 @@ class RedactHomeDirFormatter(logging.Formatter):
         return unredacted.replace(str(Path.home()), "<HOME>")
 
 
+def _get_dropped_record(dropped_count: int, reason: str) -> logging.LogRecord:
+    """Get record saying that `dropped_count` log records were dropped"""
+    return logging.getLogger(__name__).makeRecord(
+        name=__name__,
+        level=LogLevel.WARNING,
+        fn=__file__,
+        lno=0,
+        msg="%d log messages were dropped, because %s",
+        args=(dropped_count, reason),
+        exc_info=None,
+    )
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Put log records in a bounded queue to be handled by a `QueueListener` on another
+    thread. Logging then never waits on I/O.
+
+    When the queue is full, records below `block_level` are dropped instead of
+    waiting for room. Dropped records are counted, and the count is logged as a single
+    record once there is room again. Records at `block_level` or above wait for up to
+    `block_timeout` seconds.
+
+    Records are only formatted by the listener's handlers. `prepare` just merges the
+    message arguments, since they may be changed after the logging call returns.
+    """
+
+    def __init__(
+        self,
+        queue: "queue.Queue[logging.LogRecord]",
+        block_level: int = LogLevel.WARNING,
+        block_timeout: float = 1,
+    ) -> None:
+        super().__init__(queue)
+        self.block_level = block_level
+        self.block_timeout = block_timeout
+        self.dropped_count = 0
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    @override
+    def enqueue(self, record: logging.LogRecord) -> None:
+        log_queue: queue.Queue[logging.LogRecord] = self.queue  # type: ignore[assignment]
+        if self.dropped_count:
+            try:
+                log_queue.put_nowait(
+                    _get_dropped_record(self.dropped_count, "logging fell behind")
+                )
+            except queue.Full:
+                pass
+            else:
+                self.dropped_count = 0
+
+        try:
+            if record.levelno >= self.block_level:
+                log_queue.put(record, timeout=self.block_timeout)
+            else:
+                log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_count += 1
+
+
+def _stop_queue_listener() -> None:
+    """Write out any queued log records and stop the listener thread"""
+    global _queue_listener  # noqa: PLW0603
+    if _queue_listener is None:
+        return
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        handler.close()
+    _queue_listener = None
+
+
 def setup_application_logging(log_level_override: LogLevel | None = None) -> None:
-    """Create root logger configured for running application"""
+    """
+    Create root logger configured for running application. Records are written to
+    the stream and log file on a separate thread.
+    """
+    global _queue_listener  # noqa: PLW0603
     if log_level_override is not None:
         file_logging_level = log_level_override
         stream_logging_level = log_level_override
@@ -87,11 +183,18 @@ def setup_application_logging(log_level_override: LogLevel | None = None) -> Non
     # attached to it have their own levels.
     logger.setLevel(LogLevel.DEBUG)
 
+    # Replace the handlers from any previous setup.
+    for handler in logger.handlers.copy():
+        if isinstance(handler, DroppingQueueHandler):
+            logger.removeHandler(handler)
+    _stop_queue_listener()
+    handlers: list[logging.Handler] = []
+
     stream_handler = logging.StreamHandler()
     stream_handler.setLevel(stream_logging_level)
     stream_format = logging.Formatter("%(name)s - %(levelname)s - %(message)s")
     stream_handler.setFormatter(stream_format)
-    logger.addHandler(stream_handler)
+    handlers.append(stream_handler)
 
     # Don't log to file during testing.
     if os.environ.get("PYTEST_VERSION") is None:
@@ -108,7 +211,16 @@ def setup_application_logging(log_level_override: LogLevel | None = None) -> Non
             "%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(lineno)d - %(message)s"
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(LOG_QUEUE_MAX_SIZE)
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    atexit.unregister(_stop_queue_listener)
+    atexit.register(_stop_queue_listener)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.setLevel(min(handler.level for handler in handlers))
+    logger.addHandler(queue_handler)
 
     # Setup handling of uncaught exceptions
     sys.excepthook = partial(handle_uncaught_exceptions, logger=logger)
@@ -116,21 +228,111 @@ def setup_application_logging(log_level_override: LogLevel | None = None) -> Non
     log_basic_info(logger=logger)
 
 
+@attrs.frozen
+class ForwardedLogRecord:
+    record: logging.LogRecord
+    repeat_count: int = 1
+    """How many times in a row the message was logged"""
+
+
+def _call_later_on_main_thread(delay: float, callback: Callable[[], None]) -> None:
+    if (application := QtCore.QCoreApplication.instance()) is None:
+        callback()
+        return
+    # Timers with a context object run on the context object's thread.
+    QtCore.QTimer.singleShot(round(delay * 1000), application, callback)
+
+
 class ForwardLogsHandler(logging.Handler):
     """
-    Send new log records to `new_log_callback`. Useful for showing log messages in a UI
+    Send new log records to `new_logs_callback` in batches. Useful for showing log
+    messages in a UI
+
+    Batches are sent on the Qt main thread at most `max_batches_per_second` times a
+    second, no matter how fast records are logged. Repeats of the same message in a
+    row are collapsed into one `ForwardedLogRecord`. Only the newest
+    `max_pending_records` are kept between batches. A record saying how many were
+    dropped is sent in their place.
     """
 
     def __init__(
-        self, new_log_callback: Callable[[logging.LogRecord], None], level: int = 0
+        self,
+        new_logs_callback: Callable[[Sequence[ForwardedLogRecord]], None],
+        level: int = 0,
+        max_batches_per_second: float = 10,
+        max_pending_records: int = 500,
+        call_later: Callable[
+            [float, Callable[[], None]], None
+        ] = _call_later_on_main_thread,
     ) -> None:
         super().__init__(level)
-        self.new_log_callback = new_log_callback
+        self.new_logs_callback = new_logs_callback
+        self.min_batch_interval = 1 / max_batches_per_second
+        self.call_later = call_later
+        self._pending_records: deque[ForwardedLogRecord] = deque(
+            maxlen=max_pending_records
+        )
+        self._dropped_count = 0
+        self._send_scheduled = False
+        self._last_send_time = -math.inf
+        self._pending_lock = threading.Lock()
 
     @override
     def emit(self, record: logging.LogRecord) -> None:
         self.format(record=record)
-        self.new_log_callback(record)
+        with self._pending_lock:
+            last_record = (
+                self._pending_records[-1].record if self._pending_records else None
+            )
+            if (
+                last_record is not None
+                and last_record.levelno == record.levelno
+                and last_record.message == record.message
+            ):
+                self._pending_records[-1] = attrs.evolve(
+                    self._pending_records[-1],
+                    repeat_count=self._pending_records[-1].repeat_count + 1,
+                )
+            else:
+                if len(self._pending_records) == self._pending_records.maxlen:
+                    self._dropped_count += 1
+                self._pending_records.append(ForwardedLogRecord(record))
+
+            if self._send_scheduled:
+                return
+            self._send_scheduled = True
+            delay = max(
+                0, self._last_send_time + self.min_batch_interval - time.monotonic()
+            )
+        self.call_later(delay, self.send_pending_records)
+
+    def send_pending_records(self) -> None:
+        """Send pending records now, instead of waiting for the next batch"""
+        with self._pending_lock:
+            forwarded_records = list(self._pending_records)
+            self._pending_records.clear()
+            if self._dropped_count:
+                forwarded_records.insert(
+                    0,
+                    ForwardedLogRecord(
+                        _get_dropped_record(
+                            self._dropped_count, "they were logged too quickly"
+                        )
+                    ),
+                )
+                self.format(forwarded_records[0].record)
+                self._dropped_count = 0
+            self._send_scheduled = False
+            self._last_send_time = time.monotonic()
+        if forwarded_records:
+            self.new_logs_callback(forwarded_records)
+
+    @override
+    def close(self) -> None:
+        with self._pending_lock:
+            self._pending_records.clear()
+            self._dropped_count = 0
+        super().close()
 
 
 class ExternalProcessLogsFilter(logging.Filter):
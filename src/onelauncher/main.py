@@ -4,6 +4,7 @@ import traceback
 from PySide6 import QtWidgets
 
 from .__about__ import __title__
+from .addons.transactions import recover_addon_transactions
 from .config_manager import (
     ConfigFileError,
     ConfigManager,
@@ -11,8 +12,6 @@ from .config_manager import (
     WrongConfigVersionError,
 )
 from .game_config import GameConfigID
-from .main_window import MainWindow
-from .setup_wizard import SetupWizard
 from .ui.error_message_window_uic import Ui_errorMessageWindow
 from .ui.qtapp import get_qapp
 
@@ -79,6 +78,10 @@ def verify_configs(config_manager: ConfigManager) -> bool:
 
 
 async def start_ui(config_manager: ConfigManager, game_id: GameConfigID | None) -> None:
+    # These pull in most of the UI, so the CLI doesn't import them until needed.
+    from .main_window import MainWindow
+    from .setup_wizard import SetupWizard
+
     # Run setup wizard.
     if not config_manager.program_config_path.exists():
         logger.info("No program config found. Starting setup wizard.")
@@ -105,6 +108,9 @@ async def start_ui(config_manager: ConfigManager, game_id: GameConfigID | None)
             return
         return await start_ui(config_manager=config_manager, game_id=game_id)
 
+    # Finish or revert any addon installs that were interrupted last run.
+    recover_addon_transactions()
+
     main_window = MainWindow(
         config_manager=config_manager, game_id=game_id or initial_game_id
     )
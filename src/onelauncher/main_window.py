@@ -28,26 +28,34 @@
 from __future__ import annotations
 
 import logging
+import math
 import sys
+from collections.abc import Sequence
+from datetime import timedelta
 from functools import partial
 from pathlib import Path
-from typing import cast, override
+from typing import TYPE_CHECKING, cast, override
 
 import attrs
 import httpx
-import keyring
 import packaging.version
 import qtawesome
 import trio
-from keyring.errors import KeyringLocked, NoKeyringError
 from PySide6 import QtCore, QtGui, QtWidgets
-from xmlschema import XMLSchemaValidationError
 
 from onelauncher.async_utils import app_cancel_scope
 
-from . import __about__, addon_manager_window
+from . import __about__
+from .addons.installer import AddonOperationError
+from .addons.service import (
+    AddonUpdateCheck,
+    InstalledAddon,
+    check_for_addon_updates,
+    get_game_addon_service,
+)
 from .addons.startup_script import run_startup_script
 from .config_manager import ConfigManager, NoValidGamesError
+from .config_watcher import ConfigWatcher
 from .game_account_config import GameAccountConfig
 from .game_config import GameConfigID, GameType
 from .game_launcher_local_config import (
@@ -60,7 +68,7 @@ from .game_utilities import (
     find_game_dir_game_type,
     get_game_settings_dir,
 )
-from .logs import ForwardLogsHandler
+from .logs import ForwardedLogRecord, ForwardLogsHandler
 from .network import login_account
 from .network.game_launcher_config import (
     GameLauncherConfig,
@@ -74,6 +82,7 @@ from .network.world import World, WorldUnavailableError
 from .network.world_login_queue import (
     JoinWorldQueueFailedError,
     WorldLoginQueue,
+    WorldQueueProgress,
     WorldQueueResultXMLParseError,
 )
 from .resources import get_resource
@@ -85,7 +94,13 @@ from .ui.main_window_uic import Ui_mainWindow
 from .ui.patch_game_window import PatchGameWindow
 from .ui.qtapp import get_app_style, get_qapp
 from .ui.select_subscription_window_uic import Ui_selectSubscriptionWindow
-from .ui.utilities import log_record_to_rich_text, show_message_box_details_as_markdown
+from .ui.utilities import (
+    forwarded_log_records_to_rich_text,
+    show_message_box_details_as_markdown,
+)
+
+if TYPE_CHECKING:
+    from .addon_manager_window import AddonManagerWindow
 
 logger = logging.getLogger(__name__)
 
@@ -105,11 +120,14 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
         self.network_setup_nursery: trio.Nursery | None = None
         self.starting_game: bool = False
         self.game_cancel_scope: trio.CancelScope | None = None
-        self.addon_manager_window: addon_manager_window.AddonManagerWindow | None = None
+        self.addon_manager_window: AddonManagerWindow | None = None
         self.game_launcher_config: GameLauncherConfig | None = None
+        self.addon_update_check_requested = trio.Event()
 
-    def addon_manager_error_log(self, record: logging.LogRecord) -> None:
-        self.ui.txtStatus.append(log_record_to_rich_text(record))
+    def addon_manager_error_log(
+        self, forwarded_records: Sequence[ForwardedLogRecord]
+    ) -> None:
+        self.ui.txtStatus.append(forwarded_log_records_to_rich_text(forwarded_records))
         self.raise_()
         self.activateWindow()
 
@@ -119,15 +137,16 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
 
         logger.addHandler(
             ForwardLogsHandler(
-                new_log_callback=lambda record: self.ui.txtStatus.append(
-                    log_record_to_rich_text(record)
+                new_logs_callback=lambda forwarded_records: self.ui.txtStatus.append(
+                    forwarded_log_records_to_rich_text(forwarded_records)
                 ),
                 level=logging.INFO,
             )
         )
-        addon_manager_window.logger.addHandler(
+        # The addon manager window module is only imported once it's opened.
+        logging.getLogger(f"{__package__}.addon_manager_window").addHandler(
             ForwardLogsHandler(
-                new_log_callback=self.addon_manager_error_log, level=logging.INFO
+                new_logs_callback=self.addon_manager_error_log, level=logging.INFO
             )
         )
 
@@ -172,6 +191,18 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
         account_line_edit.textEdited.connect(self.user_edited_account_name)
         self.ui.chkSaveAccount.toggled.connect(self.chk_save_account_toggled)
 
+        self.config_watcher = ConfigWatcher(self.config_manager, parent=self)
+        self.config_watcher.program_config_changed.connect(
+            self.refresh_switch_game_button
+        )
+        self.config_watcher.game_config_ids_changed.connect(
+            self.game_config_ids_changed
+        )
+        self.config_watcher.game_config_changed.connect(self.game_config_changed)
+        self.config_watcher.game_accounts_config_changed.connect(
+            self.game_accounts_config_changed
+        )
+
         self.setupMousePropagation()
 
         # Basic MacOS native menu bar support.
@@ -189,6 +220,7 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
             self.show()
             self.nursery.start_soon(self.InitialSetup)
             self.nursery.start_soon(check_for_update)
+            self.nursery.start_soon(self.check_for_addon_updates_periodically)
             # Will be canceled when the window is closed
             self.nursery.start_soon(trio.sleep_forever)
 
@@ -312,6 +344,31 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
         self.ui.btnSwitchGame.menu()
         self.ui.btnSwitchGame.setEnabled(True)
 
+    def refresh_switch_game_button(self) -> None:
+        """Update switch game button options without changing if it's enabled"""
+        if self.game_id not in self.config_manager.get_game_config_ids():
+            # The button is set up again once another game is chosen.
+            return
+        enabled = self.ui.btnSwitchGame.isEnabled()
+        self.setup_switch_game_button()
+        self.ui.btnSwitchGame.setEnabled(enabled)
+
+    def game_config_ids_changed(self) -> None:
+        if self.game_id in self.config_manager.get_game_config_ids():
+            self.refresh_switch_game_button()
+        elif not self.starting_game and self.game_cancel_scope is None:
+            # `InitialSetup` switches to another game.
+            self.nursery.start_soon(self.InitialSetup)
+
+    def game_config_changed(self, game_id: GameConfigID) -> None:
+        if game_id is self.game_id:
+            self.setWindowTitle(self.config_manager.get_game_config(game_id).name)
+        self.refresh_switch_game_button()
+
+    def game_accounts_config_changed(self, game_id: GameConfigID) -> None:
+        if game_id is self.game_id and not self.starting_game:
+            self.loadAllSavedAccounts()
+
     def btnAboutSelected(self) -> None:
         about_window = QtWidgets.QDialog(self, QtCore.Qt.WindowType.Popup)
 
@@ -365,13 +422,77 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
             else:
                 self.addon_manager_window.deleteLater()
 
-        self.addon_manager_window = addon_manager_window.AddonManagerWindow(
+        from .addon_manager_window import AddonManagerWindow
+
+        self.addon_manager_window = AddonManagerWindow(
             config_manager=self.config_manager,
             game_id=self.game_id,
             launcher_local_config=self.game_launcher_local_config,
         )
+        # Addons may have been installed, updated, or removed.
+        self.addon_manager_window.closed.connect(self.request_addon_update_check)
         self.addon_manager_window.show()
 
+    def request_addon_update_check(self) -> None:
+        self.addon_update_check_requested.set()
+
+    async def check_for_addon_updates_periodically(self) -> None:
+        """
+        Keep the addon update count on `btnAddonManager` up to date. Checks happen on
+        the interval from the program config and whenever
+        `request_addon_update_check` is called.
+        """
+        last_check: AddonUpdateCheck | None = None
+        last_check_game_id: GameConfigID | None = None
+        # The first check is requested by `InitialSetup`.
+        timeout = math.inf
+        while True:
+            with trio.move_on_after(timeout):
+                await self.addon_update_check_requested.wait()
+            self.addon_update_check_requested = trio.Event()
+
+            interval = (
+                self.config_manager.get_program_config().addon_update_check_interval
+            )
+            game_id = self.game_id
+            if (
+                interval <= 0
+                or game_id not in self.config_manager.get_game_config_ids()
+            ):
+                self.set_addon_updates_badge(())
+            else:
+                if game_id != last_check_game_id:
+                    last_check = None
+                try:
+                    service = await get_game_addon_service(self.config_manager, game_id)
+                    last_check = await check_for_addon_updates(service, last_check)
+                except AddonOperationError as e:
+                    logger.debug("Couldn't check for addon updates: %s", e.msg)
+                # This runs in the background the whole time the launcher is open.
+                # Any failure is only for this check, so it shouldn't close the
+                # launcher.
+                except Exception:
+                    logger.exception("Error while checking for addon updates")
+                else:
+                    last_check_game_id = game_id
+                    # The game may have been switched during the check.
+                    if game_id == self.game_id:
+                        self.set_addon_updates_badge(last_check.outdated_addons)
+            timeout = interval * 60 if interval > 0 else math.inf
+
+    def set_addon_updates_badge(
+        self, outdated_addons: tuple[InstalledAddon, ...]
+    ) -> None:
+        if outdated_addons:
+            self.ui.btnAddonManager.setBadgeText(str(len(outdated_addons)))
+            self.ui.btnAddonManager.setToolTip(
+                f"Addon manager ({len(outdated_addons)} "
+                f"update{'s' if len(outdated_addons) != 1 else ''} available)"
+            )
+        else:
+            self.ui.btnAddonManager.setBadgeText("")
+            self.ui.btnAddonManager.setToolTip("Addon manager")
+
     async def btnSwitchGameClicked(self) -> None:
         new_game_type = (
             GameType.LOTRO
@@ -610,6 +731,23 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
         return login_response
 
     async def start_game(self, game_launcher_config: GameLauncherConfig) -> None:  # noqa: PLR0911
+        addons_config = self.config_manager.get_game_config(self.game_id).addons
+        pre_launch_addon_updates: tuple[trio.CancelScope, trio.Event] | None = None
+        if addons_config.update_before_launch:
+            # Addons are updated while logging in and waiting in the world queue.
+            pre_launch_addon_updates = (
+                trio.CancelScope(
+                    deadline=trio.current_time()
+                    + addons_config.update_before_launch_deadline
+                ),
+                trio.Event(),
+            )
+            self.nursery.start_soon(
+                self.update_addons_before_launch,
+                self.game_id,
+                *pre_launch_addon_updates,
+            )
+
         current_account = self.get_current_game_account()
         current_world: World = self.ui.cboWorld.currentData()
         if current_account is None:
@@ -681,6 +819,8 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
 
         selected_world: World = self.ui.cboWorld.currentData()
 
+        from xmlschema import XMLSchemaValidationError
+
         try:
             selected_world_status = await selected_world.get_status()
         except httpx.HTTPError:
@@ -735,6 +875,14 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
                 logger.exception(e.msg)
                 return
 
+        if pre_launch_addon_updates:
+            cancel_scope, done = pre_launch_addon_updates
+            with trio.move_on_at(cancel_scope.deadline):
+                await done.wait()
+            # Launching is never delayed past the deadline. Updates that are already
+            # moving files into place still finish, since that part is atomic.
+            cancel_scope.cancel()
+
         self.run_startup_scripts()
         logger.info("Starting game")
         self.ui.btnStartGame.setText("Abort")
@@ -797,6 +945,45 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
         self.ui.actionPatch.setEnabled(True)
         self.ui.btnOptions.setEnabled(True)
 
+    async def update_addons_before_launch(
+        self, game_id: GameConfigID, cancel_scope: trio.CancelScope, done: trio.Event
+    ) -> None:
+        """
+        Update outdated addons using the cached addon catalog. The catalog is only
+        fetched if it's out of date.
+
+        Args:
+            cancel_scope (trio.CancelScope): Scope with the deadline for the updates
+            done (trio.Event): Set once the updates are done or canceled
+        """
+        try:
+            with cancel_scope:
+                logger.info("Updating addons...")
+                service = await get_game_addon_service(self.config_manager, game_id)
+                await service.refresh_catalog()
+                results = await service.update_addons()
+                for result in results:
+                    if result.succeeded:
+                        logger.info("Updated %s to %s", result.name, result.version)
+                    else:
+                        logger.warning(
+                            "Failed to update %s: %s",
+                            result.name or result.interface_id,
+                            result.message,
+                        )
+                if not results:
+                    logger.info("Addons are up to date")
+        except AddonOperationError as e:
+            logger.warning("Couldn't update addons: %s", e.msg)
+        # Updates are best-effort. The game is still launched without them.
+        except Exception:
+            logger.exception("Error while updating addons")
+        finally:
+            done.set()
+        if cancel_scope.cancelled_caught:
+            logger.warning("Addon updates didn't finish in time and were skipped")
+        self.request_addon_update_check()
+
     async def world_queue(
         self,
         queueURL: str,
@@ -810,6 +997,8 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
             JoinWorldQueueFailedError
             WorldQueueResultXMLParseError
         """
+        from babel.dates import format_timedelta
+
         world_login_queue = WorldLoginQueue(
             game_launcher_config.login_queue_url,
             game_launcher_config.login_queue_params_template,
@@ -817,14 +1006,23 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
             login_response.session_ticket,
             queueURL,
         )
-        while True:
-            world_queue_result = await world_login_queue.join_queue()
-            if world_queue_result.queue_number <= world_queue_result.now_serving_number:
-                break
-            people_ahead_in_queue = (
-                world_queue_result.queue_number - world_queue_result.now_serving_number
-            )
-            logger.info("Position in queue: %s", people_ahead_in_queue)
+
+        def log_progress(progress: WorldQueueProgress) -> None:
+            if progress.eta is None or math.isinf(progress.eta):
+                logger.info("Position in queue: %s", progress.people_ahead)
+            else:
+                logger.info(
+                    "Position in queue: %s (about %s left)",
+                    progress.people_ahead,
+                    format_timedelta(
+                        timedelta(seconds=progress.eta),
+                        locale=self.config_manager.get_ui_locale(
+                            self.game_id
+                        ).babel_locale,
+                    ),
+                )
+
+        await world_login_queue.wait_for_turn(on_progress=log_progress)
 
     def set_banner_image(self) -> None:
         game_config = self.config_manager.get_game_config(self.game_id)
@@ -955,8 +1153,12 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
             await self.InitialSetup()
             return
 
+        from keyring.errors import KeyringLocked, NoKeyringError
+
         try:
-            keyring.get_password(__about__.__title__, "TEST")
+            # Saved passwords and subscriptions are then ready for the account
+            # widgets without waiting on the keyring again.
+            await self.config_manager.prefetch_game_keyring_info(self.game_id)
         except NoKeyringError:
             logger.warning(
                 "No system keyring found. Password and subscription saving will fail.",
@@ -977,6 +1179,7 @@ class MainWindow(FramelessQMainWindowWithStylePreview):
 
         # Setup btnSwitchGame for current game
         self.setup_switch_game_button()
+        self.request_addon_update_check()
 
         if not self.setup_game():
             return
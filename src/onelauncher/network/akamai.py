@@ -1,20 +1,12 @@
 from pathlib import Path
-from typing import Any, Final, Literal, Self
+from typing import Self
 
 import attrs
-import xmlschema
 from asyncache import cached as async_cached
 from cachetools import TTLCache
 
 from onelauncher.network.httpx_client import get_httpx_client
-from onelauncher.resources import data_dir
-
-_PATCHING_FILE_LIST_SCHEMA: Final = xmlschema.XMLSchema(
-    source=data_dir / "network" / "schemas" / "akamai_patching_file_list.xsd"
-)
-_SPLASHSCREEN_FILE_LIST_SCHEMA: Final = xmlschema.XMLSchema(
-    data_dir / "network" / "schemas" / "splashscreen_file_list.xsd"
-)
+from onelauncher.network.xml_schemas import decode_xml
 
 
 @attrs.frozen(kw_only=True)
@@ -40,10 +32,15 @@ class PatchingDownloadList:
         """
         response = await get_httpx_client(url).get(url)
         response.raise_for_status()
+        return cls.from_xml(response.text)
 
-        file_list_dict: dict[Literal["File"], Any] = _PATCHING_FILE_LIST_SCHEMA.to_dict(  # type: ignore[assignment]
-            response.text
-        )
+    @classmethod
+    def from_xml(cls: type[Self], file_list_xml: str) -> Self:
+        """
+        Raises:
+            XMLSchemaValidationError: File list doesn't match schema
+        """
+        file_list_dict = decode_xml("akamai_patching_file_list", file_list_xml)
         return cls(
             download_files=tuple(
                 PatchingDownloadFile(
@@ -78,12 +75,15 @@ class SplashscreenDownloadList:
         """
         response = await get_httpx_client(url).get(url)
         response.raise_for_status()
+        return cls.from_xml(response.text)
 
-        file_list_dict: dict[Literal["File"], Any] = (
-            _SPLASHSCREEN_FILE_LIST_SCHEMA.to_dict(  # type: ignore[assignment]
-                response.text
-            )
-        )
+    @classmethod
+    def from_xml(cls: type[Self], file_list_xml: str) -> Self:
+        """
+        Raises:
+            XMLSchemaValidationError: File list doesn't match schema
+        """
+        file_list_dict = decode_xml("splashscreen_file_list", file_list_xml)
         return cls(
             download_files=tuple(
                 SplashscreenDownloadFile(
@@ -13,6 +13,7 @@ from ..official_clients import (
     DDO_PREVIEW_NEWS_URL_TEMPLATE,
 )
 from ..resources import OneLauncherLocale
+from ..tracing import Span
 from ..utilities import AppSettingsParseError, parse_app_settings_config
 from .game_services_info import GameServicesInfo
 from .httpx_client import get_httpx_client
@@ -161,6 +162,7 @@ class GameLauncherConfig:
             return None
 
     @staticmethod
+    @Span("Get game launcher config", "network")
     async def _get_config_xml(config_url: str) -> str:
         """Return world queue config appsettings xml from url
 
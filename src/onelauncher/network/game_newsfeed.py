@@ -3,10 +3,8 @@ import html
 import logging
 from datetime import datetime
 from io import StringIO
-from typing import assert_never
+from typing import TYPE_CHECKING, assert_never
 
-import feedparser
-from babel.dates import format_datetime
 from PySide6 import QtCore
 
 from onelauncher.game_config import GameConfig, GameType
@@ -20,6 +18,9 @@ from onelauncher.ui.qtapp import get_qapp
 
 from .httpx_client import get_httpx_client
 
+if TYPE_CHECKING:
+    import feedparser
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,7 +42,7 @@ async def get_game_newsfeed_html(
     )
 
 
-def _escape_feed_val(details: feedparser.util.FeedParserDict) -> str:  # type: ignore[no-any-unimported]
+def _escape_feed_val(details: "feedparser.util.FeedParserDict") -> str:  # type: ignore[no-any-unimported]
     """Return escaped value if the type is 'text/plain'. Otherwise, return the original value.
         See https://github.com/kurtmckee/feedparser/blame/b6917f83354a58348a16cf1106d64ea6622e24df/docs/html-sanitization.rst#L24-L31
         Summary is that values marked as 'text/plain' aren't sanitized.
@@ -89,6 +90,9 @@ def newsfeed_xml_to_html(
     game_config: GameConfig,
     original_feed_url: str,
 ) -> str:
+    import feedparser
+    from babel.dates import format_datetime
+
     with StringIO(initial_value=newsfeed_string) as feed_text_stream:
         feed_dict = feedparser.parse(feed_text_stream.getvalue())
 
@@ -1,13 +1,13 @@
 import logging
 from typing import Any, Self
 
-import zeep.exceptions
 from asyncache import cached
 from cachetools import TTLCache
 from httpx import HTTPError
 
 from ..game_config import GameConfig
 from ..game_launcher_local_config import GameLauncherLocalConfig
+from ..tracing import Span
 from .soap import GLSServiceError, get_soap_client
 from .world import World
 
@@ -133,9 +133,14 @@ class GameServicesInfo:
             dict: Parsed GetDatacenters response
         """
         client = await get_soap_client(gls_datacenter_service)
+        import zeep.exceptions
 
         try:
-            return (await client.service.GetDatacenters(game=game_datacenter_name))[0]  # type: ignore[no-any-return]
+            with Span("GetDatacenters", "gls", game=game_datacenter_name):
+                datacenters = await client.service.GetDatacenters(
+                    game=game_datacenter_name
+                )
+            return datacenters[0]  # type: ignore[no-any-return]
         except zeep.exceptions.Error as e:
             raise GLSServiceError("Error while parsing GetDatacenters response") from e
         except AttributeError as e:
@@ -1,8 +1,8 @@
 from typing import Any, Self
 
 import attrs
-import zeep.exceptions
 
+from ..tracing import Span
 from .soap import GLSServiceError, get_soap_client
 
 
@@ -134,11 +134,12 @@ async def login_account(
         AccountLoginResponse
     """
     client = await get_soap_client(auth_server)
+    import zeep.exceptions
 
     try:
-        return AccountLoginResponse.from_soap_response_dict(
-            await client.service.LoginAccount(username, password, "")
-        )
+        with Span("LoginAccount", "gls", url=auth_server):
+            login_response = await client.service.LoginAccount(username, password, "")
+        return AccountLoginResponse.from_soap_response_dict(login_response)
     except zeep.exceptions.Fault as e:
         if "no subscriber formal entity was found" in e.message.lower():
             raise WrongUsernameOrPasswordError(
@@ -1,15 +1,15 @@
 import logging
-from typing import Any, ClassVar, override
+from typing import Any, override
 from urllib.parse import urlparse, urlunparse
 
 import attrs
 import httpx
-import xmlschema
 from asyncache import cached
 from cachetools import TTLCache
 
-from ..resources import data_dir
+from ..tracing import Span
 from .httpx_client import get_httpx_client
+from .xml_schemas import decode_xml
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +33,6 @@ class World:
     status_server_url: str
     _gls_datacenter_service: str | None = None
 
-    _WORLD_STATUS_SCHEMA: ClassVar = xmlschema.XMLSchema(
-        data_dir / "network" / "schemas" / "world_status.xsd"
-    )
-
     @cached(cache=TTLCache(maxsize=1, ttl=60))
     async def get_status(self) -> WorldStatus:
         """Return current world status info
@@ -46,7 +42,8 @@ class World:
             WorldUnavailableError: World is unavailable
             XMLSchemaValidationError: Status XML doesn't match schema
         """
-        status_dict = await self._get_status_dict(self.status_server_url)
+        with Span("Get world status", "network", world=self.name):
+            status_dict = await self._get_status_dict(self.status_server_url)
 
         if not status_dict["queueurls"]:
             # There have yet to be any modern examples of queue URLs not being
@@ -88,7 +85,7 @@ class World:
 
         Returns:
             dict: Dictionary representation of world status.
-                  See `self._WORLD_STATUS_SCHEMA` schema file for what to expect.
+                  See the "world_status" schema file for what to expect.
         """
         response = await get_httpx_client(status_server_url).get(status_server_url)
 
@@ -125,7 +122,7 @@ class World:
 
         response.raise_for_status()
 
-        return self._WORLD_STATUS_SCHEMA.to_dict(response.text)  # type: ignore[return-value]
+        return decode_xml("world_status", response.text)
 
     @override
     def __str__(self) -> str:
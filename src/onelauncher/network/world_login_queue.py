@@ -1,10 +1,17 @@
-from typing import Any, Final, NamedTuple
+import logging
+import random
+from collections.abc import Callable
+from typing import NamedTuple
 
 import attrs
-import xmlschema
+import httpx
+import trio
 
-from ..resources import data_dir
+from ..tracing import Span
 from .httpx_client import get_httpx_client
+from .xml_schemas import decode_xml
+
+logger = logging.getLogger(__name__)
 
 
 class JoinWorldQueueResult(NamedTuple):
@@ -12,6 +19,59 @@ class JoinWorldQueueResult(NamedTuple):
     now_serving_number: int
 
 
+@attrs.frozen(kw_only=True)
+class WorldQueueProgress:
+    people_ahead: int
+    serving_rate: float | None
+    """Queue numbers served per second. `None` until it's been measured."""
+    eta: float | None
+    """Estimated seconds until the front of the queue is reached"""
+
+
+@attrs.frozen(kw_only=True)
+class WorldQueuePollingPolicy:
+    """How often the world login queue is polled. All times are in seconds."""
+
+    min_interval: float = 1
+    max_interval: float = 30
+    polls_per_eta: float = 4
+    """
+    Number of polls to aim for before reaching the front of the queue. Polls get
+    more frequent as the front gets closer.
+    """
+    rate_smoothing: float = 0.3
+    """Weight of the newest measurement in the serving rate moving average"""
+    jitter: float = 0.2
+    """Poll intervals are randomly scaled by up to this fraction"""
+    retry_interval: float = 2
+    """First delay after a network error. It doubles for each error in a row."""
+    max_retry_interval: float = 60
+    max_retries: int = 5
+    """Network errors in a row before giving up"""
+
+    def get_poll_interval(self, eta: float | None) -> float:
+        if eta is None:
+            interval = self.min_interval
+        else:
+            interval = min(
+                max(eta / self.polls_per_eta, self.min_interval), self.max_interval
+            )
+        return max(
+            interval * random.uniform(1 - self.jitter, 1 + self.jitter),  # noqa: S311
+            self.min_interval,
+        )
+
+    def get_retry_interval(self, retry_number: int) -> float:
+        """
+        Args:
+            retry_number (int): Zero for the first retry after an error
+        """
+        interval = min(self.retry_interval * 2.0**retry_number, self.max_retry_interval)
+        # Half of the interval is random, so clients that lost their connection at
+        # the same time don't all come back at once.
+        return interval / 2 + random.uniform(0, interval / 2)  # noqa: S311
+
+
 class WorldQueueResultXMLParseError(Exception):
     """Error with content/formatting of world queue response XML"""
 
@@ -22,10 +82,6 @@ class JoinWorldQueueFailedError(Exception):
 
 
 class WorldLoginQueue:
-    _WORLD_QUEUE_RESULT_SCHEMA: Final = xmlschema.XMLSchema(
-        data_dir / "network" / "schemas" / "world_queue_result.xsd"
-    )
-
     def __init__(
         self,
         login_queue_url: str,
@@ -61,6 +117,7 @@ class WorldLoginQueue:
             arguments_dict[param_name] = param_value
         return arguments_dict
 
+    @Span("Poll world login queue", "network")
     async def join_queue(self) -> JoinWorldQueueResult:
         """
         Raises:
@@ -72,12 +129,13 @@ class WorldLoginQueue:
         response = await get_httpx_client(self._login_queue_url).post(
             self._login_queue_url, data=self._login_queue_arguments_dict
         )
+        response.raise_for_status()
+
+        from xmlschema import XMLSchemaValidationError
 
         try:
-            queue_result_dict: dict[str, Any] = self._WORLD_QUEUE_RESULT_SCHEMA.to_dict(
-                response.text
-            )  # type: ignore[assignment]
-        except xmlschema.XMLSchemaValidationError as e:
+            queue_result_dict = decode_xml("world_queue_result", response.text)
+        except XMLSchemaValidationError as e:
             raise WorldQueueResultXMLParseError(
                 "Queue XML result doesn't match schema"
             ) from e
@@ -113,3 +171,78 @@ class WorldLoginQueue:
             raise WorldQueueResultXMLParseError(
                 "World queue result missing required value"
             ) from e
+
+    @Span("Wait in world login queue", "queue")
+    async def wait_for_turn(
+        self,
+        on_progress: Callable[[WorldQueueProgress], None] | None = None,
+        polling_policy: WorldQueuePollingPolicy | None = None,
+    ) -> None:
+        """
+        Join the queue and poll it until the front is reached. The poll interval
+        adapts to how fast the queue is moving, and network errors are retried with
+        jittered exponential backoff.
+
+        Args:
+            on_progress (Callable[[WorldQueueProgress], None] | None): Called after
+                each poll that didn't reach the front of the queue
+
+        Raises:
+            HTTPError: Network error that persisted through all retries
+            WorldQueueResultXMLParseError: Error with content/formatting of
+                                           world queue response XML
+            JoinWorldQueueFailedError: Failed to join world login queue
+        """
+        policy = polling_policy or WorldQueuePollingPolicy()
+        # Time and now serving number of the previous successful poll
+        previous_poll: tuple[float, int] | None = None
+        serving_rate: float | None = None
+        retry_number = 0
+        while True:
+            try:
+                result = await self.join_queue()
+            except httpx.HTTPError:
+                if retry_number >= policy.max_retries:
+                    raise
+                retry_interval = policy.get_retry_interval(retry_number)
+                retry_number += 1
+                logger.debug(
+                    "Network error polling world login queue. Retrying in %.1fs",
+                    retry_interval,
+                    exc_info=True,
+                )
+                await trio.sleep(retry_interval)
+                continue
+            retry_number = 0
+            if result.queue_number <= result.now_serving_number:
+                return
+
+            now = trio.current_time()
+            if previous_poll is not None and now > previous_poll[0]:
+                previous_time, previous_now_serving_number = previous_poll
+                # The queue never goes backwards, but the numbers could be reset.
+                rate = max(
+                    result.now_serving_number - previous_now_serving_number, 0
+                ) / (now - previous_time)
+                serving_rate = (
+                    rate
+                    if serving_rate is None
+                    else policy.rate_smoothing * rate
+                    + (1 - policy.rate_smoothing) * serving_rate
+                )
+            previous_poll = (now, result.now_serving_number)
+
+            people_ahead = result.queue_number - result.now_serving_number
+            if serving_rate is None:
+                eta = None
+            elif serving_rate > 0:
+                eta = people_ahead / serving_rate
+            else:
+                eta = float("inf")
+            if on_progress is not None:
+                on_progress(
+                    WorldQueueProgress(
+                        people_ahead=people_ahead, serving_rate=serving_rate, eta=eta
+                    )
+                )
+            await trio.sleep(policy.get_poll_interval(eta))
@@ -0,0 +1,299 @@
+"""
+XML schemas for documents from game servers
+
+Importing xmlschema and compiling XSDs is slow, so schemas are only compiled the first
+time one is needed. The compiled schemas are then pickled to the user cache directory
+and reused until the schema files, xmlschema, or Python change.
+
+Documents that are fetched often, like world status and world queue results, are flat
+enough to decode without xmlschema at all. `decode_xml` takes that fast path whenever
+it can tell that a document is simple. Anything unusual goes through the full schema,
+so results and errors are the same either way.
+"""
+
+import hashlib
+import logging
+import pickle
+import re
+import sys
+from collections.abc import Callable, Mapping
+from contextlib import suppress
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, Literal
+from xml.etree import ElementTree as ET
+
+import attrs
+from defusedxml import ElementTree  # type: ignore[import-untyped]
+
+from ..config import platform_dirs
+from ..resources import data_dir
+
+if TYPE_CHECKING:
+    from xmlschema import XMLSchema
+
+logger = logging.getLogger(__name__)
+
+SCHEMAS_DIR: Final = data_dir / "network" / "schemas"
+SCHEMAS_CACHE_PATH: Final = platform_dirs.user_cache_path / "network_xml_schemas.pickle"
+
+type NetworkXMLSchemaName = Literal[
+    "akamai_patching_file_list",
+    "splashscreen_file_list",
+    "world_queue_result",
+    "world_status",
+]
+
+_XSD_NAMESPACE: Final = "{http://www.w3.org/2001/XMLSchema}"
+_INT_PATTERN: Final = re.compile(r"[+-]?[0-9]+")
+_INT_RANGE: Final = range(-(2**31), 2**31)
+_FLOAT_PATTERN: Final = re.compile(
+    r"[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?"
+)
+_WHITESPACE_PATTERN: Final = re.compile(r"\s")
+_PORTABLE_XSD_PATTERN: Final = re.compile(r"[\w\[\]{},+*?|()-]*", flags=re.ASCII)
+"""XSD patterns made of only these characters mean the same thing in Python"""
+
+
+def _get_cache_key(schema_paths: list[Path], xmlschema_version: str) -> str:
+    key_hash = hashlib.sha256()
+    for part in (sys.version, xmlschema_version, str(SCHEMAS_DIR)):
+        key_hash.update(part.encode())
+    for path in schema_paths:
+        key_hash.update(path.name.encode())
+        key_hash.update(path.read_bytes())
+    return key_hash.hexdigest()
+
+
+def _load_cached_schemas(cache_key: str) -> dict[str, "XMLSchema"] | None:
+    try:
+        with SCHEMAS_CACHE_PATH.open("rb") as file:
+            # The cache is only ever written by OneLauncher.
+            if pickle.load(file) != cache_key:  # noqa: S301
+                return None
+            schemas: dict[str, XMLSchema] = pickle.load(file)  # noqa: S301
+            return schemas
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.debug("Couldn't load cached XML schemas", exc_info=True)
+        return None
+
+
+def _save_cached_schemas(cache_key: str, schemas: dict[str, "XMLSchema"]) -> None:
+    tmp_path = SCHEMAS_CACHE_PATH.with_name(f".{SCHEMAS_CACHE_PATH.name}.tmp")
+    try:
+        SCHEMAS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as file:
+            pickle.dump(cache_key, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(schemas, file, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(SCHEMAS_CACHE_PATH)
+    except (OSError, pickle.PicklingError):
+        logger.debug("Couldn't cache XML schemas", exc_info=True)
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+
+
+@cache
+def _get_xml_schemas() -> dict[str, "XMLSchema"]:
+    import xmlschema
+
+    schema_paths = sorted(SCHEMAS_DIR.glob("*.xsd"))
+    cache_key = _get_cache_key(schema_paths, xmlschema.__version__)
+    if (schemas := _load_cached_schemas(cache_key)) is not None:
+        return schemas
+
+    # All schemas are compiled and cached together, because they share the XSD
+    # meta-schema. That's most of the compile time and the size of the pickle.
+    schemas = {path.stem: xmlschema.XMLSchema(path) for path in schema_paths}
+    _save_cached_schemas(cache_key, schemas)
+    return schemas
+
+
+def get_xml_schema(name: NetworkXMLSchemaName) -> "XMLSchema":
+    """Return compiled schema from `network/schemas`"""
+    return _get_xml_schemas()[name]
+
+
+class _FastPathUnsupportedError(Exception):
+    """Document or schema isn't simple enough for the fast path"""
+
+
+def _decode_string(text: str) -> str | None:
+    return text or None
+
+
+def _decode_any_uri(text: str) -> str | None:
+    # xmlschema collapses whitespace in URIs.
+    if _WHITESPACE_PATTERN.search(text):
+        raise _FastPathUnsupportedError
+    return text or None
+
+
+def _decode_int(text: str) -> int:
+    text = text.strip()
+    if not _INT_PATTERN.fullmatch(text) or int(text) not in _INT_RANGE:
+        raise _FastPathUnsupportedError
+    return int(text)
+
+
+def _decode_float(text: str) -> float:
+    text = text.strip()
+    if not _FLOAT_PATTERN.fullmatch(text):
+        raise _FastPathUnsupportedError
+    return float(text)
+
+
+def _get_pattern_decoder(pattern: str) -> Callable[[str], str]:
+    if not _PORTABLE_XSD_PATTERN.fullmatch(pattern):
+        raise _FastPathUnsupportedError
+    compiled_pattern = re.compile(pattern)
+
+    def decode(text: str) -> str:
+        if not text or not compiled_pattern.fullmatch(text):
+            raise _FastPathUnsupportedError
+        return text
+
+    return decode
+
+
+_BUILTIN_TYPE_DECODERS: Final[Mapping[str, Callable[[str], Any]]] = {
+    "xs:string": _decode_string,
+    "xs:anyURI": _decode_any_uri,
+    "xs:int": _decode_int,
+    "xs:float": _decode_float,
+}
+
+
+@attrs.frozen(kw_only=True)
+class _FlatXMLFormat:
+    """
+    Root element with text-only child elements that each appear at most once, in any
+    order. This is an XSD `xs:all` group of simple types.
+    """
+
+    root_tag: str
+    decoders: Mapping[str, Callable[[str], Any]]
+    required_tags: frozenset[str]
+
+    @classmethod
+    def from_xsd(cls, xsd_path: Path) -> "_FlatXMLFormat":
+        """
+        Raises:
+            _FastPathUnsupportedError: Schema uses features that aren't supported
+        """
+        # Schemas are trusted files that ship with OneLauncher.
+        schema = ET.parse(xsd_path).getroot()  # noqa: S314
+        if "targetNamespace" in schema.attrib:
+            raise _FastPathUnsupportedError
+
+        type_decoders = dict(_BUILTIN_TYPE_DECODERS)
+        root_elements: list[ET.Element] = []
+        for node in schema:
+            if node.tag == f"{_XSD_NAMESPACE}element":
+                root_elements.append(node)
+            elif node.tag == f"{_XSD_NAMESPACE}simpleType":
+                restriction = node.find(f"{_XSD_NAMESPACE}restriction")
+                patterns = node.findall(f"{_XSD_NAMESPACE}restriction/*")
+                if (
+                    len(node) != 1
+                    or restriction is None
+                    or restriction.get("base") != "xs:string"
+                    or len(patterns) != 1
+                    or patterns[0].tag != f"{_XSD_NAMESPACE}pattern"
+                ):
+                    raise _FastPathUnsupportedError
+                type_decoders[node.attrib["name"]] = _get_pattern_decoder(
+                    patterns[0].attrib["value"]
+                )
+            else:
+                raise _FastPathUnsupportedError
+        if len(root_elements) != 1:
+            raise _FastPathUnsupportedError
+        (root_element,) = root_elements
+
+        complex_type = root_element.find(f"{_XSD_NAMESPACE}complexType")
+        all_group = (
+            complex_type.find(f"{_XSD_NAMESPACE}all")
+            if complex_type is not None
+            else None
+        )
+        if (
+            root_element.attrib.keys() != {"name"}
+            or len(root_element) != 1
+            or complex_type is None
+            or complex_type.attrib
+            or len(complex_type) != 1
+            or all_group is None
+            or all_group.attrib
+        ):
+            raise _FastPathUnsupportedError
+
+        decoders: dict[str, Callable[[str], Any]] = {}
+        required_tags: set[str] = set()
+        for child in all_group:
+            if (
+                child.tag != f"{_XSD_NAMESPACE}element"
+                or len(child)
+                or not child.attrib.keys() <= {"name", "type", "minOccurs"}
+                or child.get("type") not in type_decoders
+                or child.get("minOccurs", "1") not in {"0", "1"}
+            ):
+                raise _FastPathUnsupportedError
+            decoders[child.attrib["name"]] = type_decoders[child.attrib["type"]]
+            if child.get("minOccurs", "1") == "1":
+                required_tags.add(child.attrib["name"])
+        return cls(
+            root_tag=root_element.attrib["name"],
+            decoders=decoders,
+            required_tags=frozenset(required_tags),
+        )
+
+    def decode(self, xml: str) -> dict[str, Any]:
+        """
+        Raises:
+            _FastPathUnsupportedError: `xml` may not match the schema
+        """
+        try:
+            root = ElementTree.fromstring(xml)
+        except Exception as e:
+            raise _FastPathUnsupportedError from e
+        if root.tag != self.root_tag or root.attrib or (root.text or "").strip():
+            raise _FastPathUnsupportedError
+
+        decoded: dict[str, Any] = {}
+        for child in root:
+            decoder = self.decoders.get(child.tag)
+            if (
+                decoder is None
+                or child.tag in decoded
+                or len(child)
+                or child.attrib
+                or (child.tail or "").strip()
+            ):
+                raise _FastPathUnsupportedError
+            decoded[child.tag] = decoder(child.text or "")
+        if not self.required_tags <= decoded.keys():
+            raise _FastPathUnsupportedError
+        return decoded
+
+
+@cache
+def _get_flat_xml_format(name: NetworkXMLSchemaName) -> _FlatXMLFormat | None:
+    try:
+        return _FlatXMLFormat.from_xsd(SCHEMAS_DIR / f"{name}.xsd")
+    except _FastPathUnsupportedError:
+        return None
+
+
+def decode_xml(name: NetworkXMLSchemaName, xml: str) -> dict[str, Any]:
+    """
+    Decode `xml` with the schema called `name`
+
+    Raises:
+        XMLSchemaValidationError: `xml` doesn't match the schema
+    """
+    if (flat_format := _get_flat_xml_format(name)) is not None:
+        with suppress(_FastPathUnsupportedError):
+            return flat_format.decode(xml)
+    return get_xml_schema(name).to_dict(xml)  # type: ignore[return-value]
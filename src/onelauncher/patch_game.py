@@ -2,6 +2,7 @@ import logging
 import os
 import subprocess
 import sys
+from contextlib import AsyncExitStack
 from functools import partial
 from pathlib import Path
 from types import MappingProxyType
@@ -12,7 +13,6 @@ import attrs
 import httpx
 import trio
 from httpx import HTTPError, HTTPStatusError
-from xmlschema import XMLSchemaValidationError
 
 from onelauncher.async_utils import for_each_in_stream
 from onelauncher.config_manager import ConfigManager
@@ -26,7 +26,9 @@ from onelauncher.network.akamai import (
 )
 from onelauncher.network.game_launcher_config import GameLauncherConfig
 from onelauncher.network.httpx_client import get_httpx_client
+from onelauncher.process_logs import ProcessOutputCapture
 from onelauncher.resources import external_dependencies_dir
+from onelauncher.tracing import Span, count
 from onelauncher.utilities import (
     CaseInsensitiveAbsolutePath,
     Progress,
@@ -216,6 +218,9 @@ async def _handle_akamai_download_file(
 
     try:
         async with (
+            Span(
+                "Download Akamai file", "patching", path=download_file.relative_path
+            ) as download_span,
             get_httpx_client(url).stream(
                 "GET", url, timeout=httpx.Timeout(20, pool=None)
             ) as response,
@@ -238,7 +243,9 @@ async def _handle_akamai_download_file(
                 else:
                     progress_item.completed += len(chunk)
 
+                count("Akamai bytes downloaded", len(chunk))
                 await temp_download_file.write(chunk)
+            download_span.set(size=response.num_bytes_downloaded)
     except HTTPError as e:
         if (
             isinstance(e, HTTPStatusError)
@@ -262,6 +269,7 @@ class AkamaiPatchingError(Exception):
     msg: str
 
 
+@Span("Akamai patching", "patching")
 async def akamai_patching(
     game_id: GameConfigID, config_manager: ConfigManager, progress: Progress
 ) -> None:
@@ -299,6 +307,8 @@ async def akamai_patching(
         f"{base_download_url}/{language}_"
         f"{'highres' if game_config.high_res_enabled else 'lowres'}_download_list.xml"
     )
+    from xmlschema import XMLSchemaValidationError
+
     try:
         file_list = (
             await PatchingDownloadList.get_from_url(download_list_url)
@@ -397,34 +407,39 @@ async def patch_game(
         logger.info("Skipping phase")
 
     try:
-        async with trio.open_nursery() as nursery:
-            patching_progress_monitor = PatchingProgressMonitor(progress=progress)
-            for i, phase in enumerate(PATCHCLIENT_PATCH_PHASES):
-                patching_progress_monitor.reset()
-                progress.progress_text_suffix = (
-                    f"     Phase {i + 2}/{len(PATCHCLIENT_PATCH_PHASES) + 1}"
-                )
-                run_patching = partial(
-                    trio.run_process,
-                    (
-                        *command,
-                        # `run_ptch_client.exe` takes everything that will get
-                        # passed to `patchclient.dll` as a single argument.
-                        " ".join(
-                            get_patchclient_arguments(
-                                phase=phase,
-                                patch_server_url=patch_server_url,
-                                game_id=game_id,
-                                config_manager=config_manager,
-                            )
-                        ),
+        patching_progress_monitor = PatchingProgressMonitor(progress=progress)
+        for i, phase in enumerate(PATCHCLIENT_PATCH_PHASES):
+            patching_progress_monitor.reset()
+            progress.progress_text_suffix = (
+                f"     Phase {i + 2}/{len(PATCHCLIENT_PATCH_PHASES) + 1}"
+            )
+            run_patching = partial(
+                trio.run_process,
+                (
+                    *command,
+                    # `run_ptch_client.exe` takes everything that will get
+                    # passed to `patchclient.dll` as a single argument.
+                    " ".join(
+                        get_patchclient_arguments(
+                            phase=phase,
+                            patch_server_url=patch_server_url,
+                            game_id=game_id,
+                            config_manager=config_manager,
+                        )
                     ),
-                    check=False,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    env=environment,
-                    cwd=game_config.game_directory,
-                )
+                ),
+                check=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=environment,
+                cwd=game_config.game_directory,
+            )
+            # Each phase gets its own nursery, so its output capture is closed as soon
+            # as the phase's process has exited and its output has all been read.
+            async with (
+                AsyncExitStack() as exit_stack,
+                trio.open_nursery() as nursery,
+            ):
                 if sys.platform == "win32":
                     process: trio.Process = await nursery.start(
                         partial(run_patching, creationflags=subprocess.CREATE_NO_WINDOW)
@@ -438,27 +453,42 @@ async def patch_game(
                 process_logging_adapter.extra = {
                     ExternalProcessLogsFilter.EXTERNAL_PROCESS_ID_KEY: process.pid
                 }
+                output_capture = await exit_stack.enter_async_context(
+                    ProcessOutputCapture(
+                        process=process,
+                        phase=f"patch_{phase}",
+                        game_id=str(game_id),
+                    )
+                )
 
                 def process_output_line(line: str) -> None:
                     process_logging_adapter.debug(line)  # noqa: B023
                     patching_progress_monitor.feed_line(line)
 
                 nursery.start_soon(
-                    partial(for_each_in_stream, process.stdout, process_output_line)
+                    partial(
+                        for_each_in_stream,
+                        process.stdout,
+                        output_capture.get_line_handler("stdout", process_output_line),
+                    )
                 )
                 nursery.start_soon(
                     partial(
                         for_each_in_stream,
                         process.stderr,
-                        process_logging_adapter.warning,
+                        output_capture.get_line_handler(
+                            "stderr", process_logging_adapter.warning
+                        ),
                     )
                 )
-                if await process.wait() != 0:
-                    logger.debug(
-                        "Patching process failed with %s exit status",
-                        process.returncode,
-                    )
-                    logger.error("Patching failed")
-                    return
+                with Span("Patch client phase", "patching", phase=phase):
+                    exit_code = await process.wait()
+            if exit_code != 0:
+                logger.debug(
+                    "Patching process failed with %s exit status",
+                    process.returncode,
+                )
+                logger.error("Patching failed")
+                return
     except* OSError:
         logger.exception("Failed to start patching")
@@ -0,0 +1,327 @@
+"""
+Per-run capture of output from external processes, like the game and patch clients
+
+Their output is very chatty, and would otherwise push everything else out of the
+main log. Each run's output is also written to its own gzip compressed JSON lines
+file, and the newest lines are kept in memory. `PROCESS_LOGS_INDEX_NAME` has one JSON
+line for each run, including the end of its output. That makes getting the crash tail
+of a specific run quick, without decompressing any logs.
+"""
+
+import gzip
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import suppress
+from datetime import UTC, datetime
+from functools import cache
+from pathlib import Path
+from types import TracebackType
+from typing import Final, Literal, Self
+from uuid import uuid4
+
+import attrs
+import cattrs
+import trio
+from cattrs.preconf.json import JsonConverter, make_converter
+
+from .logs import LOGS_DIR
+
+logger = logging.getLogger(__name__)
+
+PROCESS_LOGS_DIR: Final = LOGS_DIR / "processes"
+PROCESS_LOGS_INDEX_NAME: Final = "index.jsonl"
+MAX_PROCESS_RUNS: Final = 50
+"""Logs for older runs are deleted"""
+INDEX_TAIL_LENGTH: Final = 50
+"""Lines from the end of each run's output that are saved in the index"""
+MAX_QUEUED_LINES: Final = 10_000
+"""Lines waiting to be written to a log file before new ones are left out of it"""
+
+type ProcessOutputStream = Literal["stdout", "stderr"]
+
+
+@attrs.frozen(kw_only=True)
+class ProcessOutputLine:
+    time: datetime
+    pid: int
+    phase: str
+    game_id: str
+    stream: ProcessOutputStream
+    text: str
+
+
+@attrs.frozen(kw_only=True)
+class ProcessRunInfo:
+    """Entry in the process logs index"""
+
+    run_id: str
+    pid: int
+    phase: str
+    """What the process was run for. ex. "game" or "patch_FilesOnly" """
+    game_id: str
+    start_time: datetime
+    end_time: datetime
+    exit_code: int | None
+    """`None` if the process was still running when capturing stopped"""
+    log_file_name: str
+    tail: tuple[ProcessOutputLine, ...]
+
+
+@cache
+def _get_converter() -> JsonConverter:
+    return make_converter()
+
+
+class ProcessOutputCapture:
+    """
+    Capture the output of one run of `process`. Add lines with `add_line`, or with
+    the callables from `get_line_handler`. Lines are written to the log file on a
+    separate thread, so capturing output never waits on disk I/O. Closing the capture
+    with `aclose` records the run in the index.
+
+    Args:
+        tail_length (int): How many of the newest lines to keep in `tail`
+    """
+
+    def __init__(
+        self,
+        *,
+        process: trio.Process,
+        phase: str,
+        game_id: str,
+        logs_dir: Path = PROCESS_LOGS_DIR,
+        tail_length: int = 1000,
+    ) -> None:
+        self.process = process
+        self.phase = phase
+        self.game_id = game_id
+        self.logs_dir = logs_dir
+        self.run_id = uuid4().hex
+        self.start_time = datetime.now(UTC)
+        self.log_file_name = (
+            f"{self.start_time:%Y%m%dT%H%M%S}-{phase}-{process.pid}-{self.run_id}"
+            ".jsonl.gz"
+        )
+        self.tail: deque[ProcessOutputLine] = deque(maxlen=tail_length)
+        """Newest lines of output"""
+
+        self._closed = False
+        self._dropped_line_count = 0
+        # `None` tells the writer thread to finish the log file.
+        self._line_queue: queue.Queue[ProcessOutputLine | None] = queue.Queue(
+            MAX_QUEUED_LINES
+        )
+        self._writer_thread = threading.Thread(
+            target=self._write_log_file, name="Process log writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def _write_log_file(self) -> None:
+        """Write queued lines to the log file until `None` is queued"""
+        log_file: gzip.GzipFile | None = None
+        try:
+            self.logs_dir.mkdir(parents=True, exist_ok=True)
+            log_file = gzip.GzipFile(self.logs_dir / self.log_file_name, mode="wb")
+        except OSError:
+            # Output is still kept in `tail` and passed on to the line handlers.
+            logger.exception("Couldn't create process log file")
+
+        while (line := self._line_queue.get()) is not None:
+            if log_file is None:
+                continue
+            try:
+                log_file.write(f"{_get_converter().dumps(line)}\n".encode())
+            except OSError:
+                logger.exception("Couldn't write to process log file")
+                with suppress(OSError):
+                    log_file.close()
+                log_file = None
+
+        if log_file is not None:
+            try:
+                log_file.close()
+            except OSError:
+                logger.exception("Couldn't finish process log file")
+
+    def add_line(self, stream: ProcessOutputStream, text: str) -> None:
+        line = ProcessOutputLine(
+            time=datetime.now(UTC),
+            pid=self.process.pid,
+            phase=self.phase,
+            game_id=self.game_id,
+            stream=stream,
+            text=text,
+        )
+        self.tail.append(line)
+        if self._closed:
+            return
+        try:
+            self._line_queue.put_nowait(line)
+        except queue.Full:
+            self._dropped_line_count += 1
+
+    def get_line_handler(
+        self, stream: ProcessOutputStream, log: Callable[[str], object]
+    ) -> Callable[[str], None]:
+        """Get function that captures a line of `stream` and then calls `log` on it"""
+
+        def handle_line(text: str) -> None:
+            self.add_line(stream, text)
+            log(text)
+
+        return handle_line
+
+    async def aclose(self) -> ProcessRunInfo | None:
+        """
+        Finish the log file and add the run to the index. Does nothing if already
+        closed.
+        """
+        if self._closed:
+            return None
+        self._closed = True
+        if self._dropped_line_count:
+            logger.warning(
+                "%d lines of process output weren't written to its log file, because "
+                "writing fell behind",
+                self._dropped_line_count,
+            )
+
+        run_info = ProcessRunInfo(
+            run_id=self.run_id,
+            pid=self.process.pid,
+            phase=self.phase,
+            game_id=self.game_id,
+            start_time=self.start_time,
+            end_time=datetime.now(UTC),
+            exit_code=self.process.returncode,
+            log_file_name=self.log_file_name,
+            tail=tuple(self.tail)[-INDEX_TAIL_LENGTH:],
+        )
+        # The run is still recorded when capturing stops because of cancellation.
+        with trio.CancelScope(shield=True):
+            await trio.to_thread.run_sync(self._finish, run_info)
+        return run_info
+
+    def _finish(self, run_info: ProcessRunInfo) -> None:
+        self._line_queue.put(None)
+        self._writer_thread.join()
+        try:
+            _add_to_index(self.logs_dir, run_info)
+        except OSError:
+            logger.exception("Couldn't add process run to the process logs index")
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+
+def _add_to_index(logs_dir: Path, run_info: ProcessRunInfo) -> None:
+    index_path = logs_dir / PROCESS_LOGS_INDEX_NAME
+    with index_path.open("a", encoding="utf-8") as index_file:
+        index_file.write(f"{_get_converter().dumps(run_info)}\n")
+
+    runs = read_process_runs(logs_dir)
+    retained_runs = runs[-MAX_PROCESS_RUNS:]
+    _prune_unindexed_log_files(
+        logs_dir,
+        indexed_log_file_names={run.log_file_name for run in runs},
+        cutoff_time=min(
+            (run.start_time for run in retained_runs), default=run_info.start_time
+        ),
+    )
+    if len(runs) <= MAX_PROCESS_RUNS:
+        return
+    for old_run in runs[:-MAX_PROCESS_RUNS]:
+        (logs_dir / old_run.log_file_name).unlink(missing_ok=True)
+    tmp_path = index_path.with_name(f".{index_path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as index_file:
+        index_file.writelines(
+            f"{_get_converter().dumps(run)}\n" for run in retained_runs
+        )
+        index_file.flush()
+        os.fsync(index_file.fileno())
+    tmp_path.replace(index_path)
+
+
+def _prune_unindexed_log_files(
+    logs_dir: Path, indexed_log_file_names: set[str], cutoff_time: datetime
+) -> None:
+    """
+    Delete log files that aren't in the index and were last written before
+    `cutoff_time`. Runs are never indexed when OneLauncher crashes while capturing
+    them. Newer log files may be for runs that are still being captured.
+    """
+    for log_file_path in logs_dir.glob("*.jsonl.gz"):
+        if log_file_path.name in indexed_log_file_names:
+            continue
+        try:
+            if datetime.fromtimestamp(log_file_path.stat().st_mtime, UTC) < cutoff_time:
+                log_file_path.unlink()
+        except OSError:
+            logger.debug(
+                "Couldn't prune unindexed process log file: %s",
+                log_file_path,
+                exc_info=True,
+            )
+
+
+def read_process_runs(logs_dir: Path = PROCESS_LOGS_DIR) -> list[ProcessRunInfo]:
+    """Get the runs in the process logs index, oldest first"""
+    try:
+        index_lines = (
+            (logs_dir / PROCESS_LOGS_INDEX_NAME)
+            .read_text(encoding="utf-8")
+            .splitlines()
+        )
+    except FileNotFoundError:
+        return []
+
+    runs: list[ProcessRunInfo] = []
+    for index_line in index_lines:
+        try:
+            runs.append(_get_converter().loads(index_line, ProcessRunInfo))
+        except (cattrs.BaseValidationError, ValueError):
+            # A line may have only been partially written.
+            logger.debug("Skipping invalid process logs index entry", exc_info=True)
+    return runs
+
+
+def get_process_run(
+    run_id: str, logs_dir: Path = PROCESS_LOGS_DIR
+) -> ProcessRunInfo | None:
+    """Get run from the process logs index. Its `tail` is the end of its output."""
+    for run in reversed(read_process_runs(logs_dir)):
+        if run.run_id == run_id:
+            return run
+    return None
+
+
+def read_process_run_output(
+    run_info: ProcessRunInfo, logs_dir: Path = PROCESS_LOGS_DIR
+) -> Iterator[ProcessOutputLine]:
+    """
+    Read the full output of a run. Output that was cut off, like by OneLauncher
+    crashing, is read up to where it ends.
+
+    Raises:
+        FileNotFoundError: The run's log file has been deleted
+    """
+    with gzip.open(
+        logs_dir / run_info.log_file_name, mode="rt", encoding="utf-8"
+    ) as file:
+        try:
+            for line in file:
+                yield _get_converter().loads(line, ProcessOutputLine)
+        except (EOFError, gzip.BadGzipFile, cattrs.BaseValidationError, ValueError):
+            logger.debug("Process log ended early", exc_info=True)
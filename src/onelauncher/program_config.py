@@ -47,6 +47,13 @@ class ProgramConfig(Config):
         default=None,
         help="Minimum log severity that will be shown in the console and log file",
     )
+    addon_update_check_interval: int = config_field(
+        default=60,
+        help=(
+            "Minutes between background checks for addon updates. "
+            "Set to 0 to disable them."
+        ),
+    )
 
     @override
     @staticmethod
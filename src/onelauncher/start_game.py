@@ -3,7 +3,7 @@ import logging
 import os
 import subprocess
 import sys
-from contextlib import suppress
+from contextlib import AsyncExitStack, suppress
 from copy import deepcopy
 from datetime import UTC, datetime
 from functools import partial
@@ -23,6 +23,7 @@ from onelauncher.logs import ExternalProcessLogsFilter
 from .game_config import ClientType, GameConfig, GameConfigID
 from .network.game_launcher_config import GameLauncherConfig
 from .network.world import World
+from .process_logs import ProcessOutputCapture
 from .resources import OneLauncherLocale
 from .wine_environment import GRAPHICS_TRANSLATION_LAYER, get_wine_process_args
 
@@ -277,7 +278,8 @@ async def start_game(
             command=command, environment=environment, wine_config=game_config.wine
         )
 
-    async with trio.open_nursery() as nursery:
+    # The output capture is closed once the output has all been read.
+    async with AsyncExitStack() as exit_stack, trio.open_nursery() as nursery:
         process: trio.Process = await nursery.start(
             partial(
                 trio.run_process,
@@ -293,13 +295,28 @@ async def start_game(
         process_logging_adapter.extra = {
             ExternalProcessLogsFilter.EXTERNAL_PROCESS_ID_KEY: process.pid
         }
+        output_capture = await exit_stack.enter_async_context(
+            ProcessOutputCapture(process=process, phase="game", game_id=str(game_id))
+        )
         if process.stdout is None or process.stderr is None:
             raise TypeError("Process pipe is `None`")
         nursery.start_soon(
-            partial(for_each_in_stream, process.stdout, process_logging_adapter.debug)
+            partial(
+                for_each_in_stream,
+                process.stdout,
+                output_capture.get_line_handler(
+                    "stdout", process_logging_adapter.debug
+                ),
+            )
         )
         nursery.start_soon(
-            partial(for_each_in_stream, process.stderr, process_logging_adapter.warning)
+            partial(
+                for_each_in_stream,
+                process.stderr,
+                output_capture.get_line_handler(
+                    "stderr", process_logging_adapter.warning
+                ),
+            )
         )
         task_status.started(process)  # type: ignore[call-overload]
         return await process.wait()
@@ -0,0 +1,269 @@
+"""
+Timing instrumentation for finding out where time is spent
+
+Code is timed with `Span`, which works as a context manager or decorator, and values
+like downloaded bytes are tracked with `count`. Nothing is recorded unless tracing
+was started with `start_tracing`, so both are cheap enough to leave in hot code paths.
+The recorded events are in the Chrome trace event format. Files from `write_trace`
+can be opened with <https://ui.perfetto.dev> or chrome://tracing.
+
+Each trio task and thread gets its own track in the trace, so spans from concurrent
+tasks don't overlap.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final, Self, cast
+
+import attrs
+import trio
+
+from .__about__ import __title__, __version__
+
+type TraceEvent = dict[str, Any]
+"""See the Chrome "Trace Event Format" document"""
+
+COUNTER_SAMPLE_INTERVAL_NS: Final = 10_000_000
+"""
+Minimum time between recorded values of a counter. Counters like downloaded bytes
+change very often, and every value doesn't need to be in the trace.
+"""
+
+
+@attrs.define
+class _Counter:
+    value: float = 0
+    recorded_value: float = 0
+    recorded_time_ns: int = 0
+
+
+@attrs.define
+class _Trace:
+    start_time_ns: int = attrs.field(factory=time.perf_counter_ns)
+    pid: int = attrs.field(factory=os.getpid)
+    events: list[TraceEvent] = attrs.field(factory=list)
+    _lock: threading.Lock = attrs.field(factory=threading.Lock)
+    _track_ids: weakref.WeakKeyDictionary[object, int] = attrs.field(
+        factory=weakref.WeakKeyDictionary
+    )
+    _next_track_id: int = 1
+    _counters: dict[str, _Counter] = attrs.field(factory=dict)
+
+    def __attrs_post_init__(self) -> None:
+        self.events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": f"{__title__} {__version__}"},
+            }
+        )
+
+    def get_timestamp(self, time_ns: int) -> float:
+        """Get trace timestamp in microseconds"""
+        return (time_ns - self.start_time_ns) / 1000
+
+    def add_event(self, event: TraceEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def get_track_id(self) -> int:
+        """Get track for the current trio task or, outside of trio, thread"""
+        track: object
+        try:
+            track = trio.lowlevel.current_task()
+            track_name = track.name
+        except RuntimeError:
+            track = threading.current_thread()
+            track_name = f"{track.name} thread"
+        with self._lock:
+            track_id = self._track_ids.get(track)
+            if track_id is None:
+                # Not the task or thread ID, since those can be reused once the
+                # task or thread is gone.
+                track_id = self._next_track_id
+                self._next_track_id += 1
+                self._track_ids[track] = track_id
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self.pid,
+                        "tid": track_id,
+                        "args": {"name": track_name},
+                    }
+                )
+        return track_id
+
+    def _record_counter(self, name: str, counter: _Counter, time_ns: int) -> None:
+        counter.recorded_value = counter.value
+        counter.recorded_time_ns = time_ns
+        self.events.append(
+            {
+                "name": name,
+                "ph": "C",
+                "ts": self.get_timestamp(time_ns),
+                "pid": self.pid,
+                "args": {"value": counter.value},
+            }
+        )
+
+    def count(self, name: str, value: float) -> None:
+        time_ns = time.perf_counter_ns()
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = _Counter()
+            counter.value += value
+            if time_ns - counter.recorded_time_ns >= COUNTER_SAMPLE_INTERVAL_NS:
+                self._record_counter(name, counter, time_ns)
+
+    def finish(self) -> list[TraceEvent]:
+        """Record the final value of each counter and return all of the events"""
+        time_ns = time.perf_counter_ns()
+        with self._lock:
+            for name, counter in self._counters.items():
+                if counter.value != counter.recorded_value:
+                    self._record_counter(name, counter, time_ns)
+            return self.events
+
+
+_trace: _Trace | None = None
+
+
+class Span:
+    """
+    Record how long the code in a `with` block or each call of a decorated function
+    takes. Async functions and `async with` are supported as well.
+
+    Args:
+        name (str): What's being timed. Shouldn't be different for every call, so
+            spans can be grouped together. Use `args` for the specifics.
+        category (str): Broad area like "network" or "config"
+        args: Extra information shown with the span. Never include anything
+            sensitive, like passwords or usernames.
+    """
+
+    __slots__ = ("_start_time_ns", "_trace", "_track_id", "args", "category", "name")
+
+    def __init__(self, name: str, category: str, /, **args: object) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self._trace: _Trace | None = None
+        self._track_id = 0
+        self._start_time_ns = 0
+
+    def set(self, **args: object) -> None:
+        """Add information to the span, like how much data was processed"""
+        self.args.update(args)
+
+    def __enter__(self) -> Self:
+        trace = _trace
+        if trace is not None:
+            self._trace = trace
+            self._track_id = trace.get_track_id()
+            self._start_time_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        trace = self._trace
+        if trace is None:
+            return
+        end_time_ns = time.perf_counter_ns()
+        self._trace = None
+        args = {key: str(value) for key, value in self.args.items()}
+        if exc_type is not None:
+            args["exception"] = exc_type.__qualname__
+        trace.add_event(
+            {
+                "name": self.name,
+                "cat": self.category,
+                "ph": "X",
+                "ts": trace.get_timestamp(self._start_time_ns),
+                "dur": (end_time_ns - self._start_time_ns) / 1000,
+                "pid": trace.pid,
+                "tid": self._track_id,
+                "args": args,
+            }
+        )
+
+    async def __aenter__(self) -> Self:
+        return self.__enter__()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.__exit__(exc_type, exc_value, traceback)
+
+    def __call__[**P, R](self, func: Callable[P, R]) -> Callable[P, R]:
+        name = self.name
+        category = self.category
+        args = self.args
+        if inspect.iscoroutinefunction(func):
+            async_func = cast(Callable[P, Awaitable[object]], func)
+
+            @functools.wraps(async_func)
+            async def async_wrapper(*f_args: P.args, **f_kwargs: P.kwargs) -> object:
+                if _trace is None:
+                    return await async_func(*f_args, **f_kwargs)
+                with Span(name, category, **args):
+                    return await async_func(*f_args, **f_kwargs)
+
+            return cast(Callable[P, R], async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*f_args: P.args, **f_kwargs: P.kwargs) -> R:
+            if _trace is None:
+                return func(*f_args, **f_kwargs)
+            with Span(name, category, **args):
+                return func(*f_args, **f_kwargs)
+
+        return wrapper
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add `value` to the counter called `name`. Counters are totals over time."""
+    trace = _trace
+    if trace is not None:
+        trace.count(name, value)
+
+
+def is_tracing() -> bool:
+    return _trace is not None
+
+
+def start_tracing() -> None:
+    """Start recording spans and counters. Any previous trace is discarded."""
+    global _trace  # noqa: PLW0603
+    _trace = _Trace()
+
+
+def stop_tracing() -> list[TraceEvent]:
+    """Stop recording and return the recorded events"""
+    global _trace  # noqa: PLW0603
+    trace = _trace
+    _trace = None
+    return [] if trace is None else trace.finish()
+
+
+def write_trace(events: list[TraceEvent], path: Path) -> None:
+    """Write `events` to a Chrome trace event format JSON file"""
+    with path.open("w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -58,6 +58,46 @@ class NoOddSizesQToolButton(QtWidgets.QToolButton):
         return hint
 
 
+class BadgeQToolButton(NoOddSizesQToolButton):
+    """Tool button that can show a short text badge, like a count, in its corner."""
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._badge_text = ""
+
+    def badgeText(self) -> str:
+        return self._badge_text
+
+    def setBadgeText(self, text: str) -> None:
+        """Set badge text. The badge is hidden when `text` is empty."""
+        self._badge_text = text
+        self.update()
+
+    @override
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        super().paintEvent(event)
+        if not self._badge_text:
+            return
+
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        font = painter.font()
+        font.setPixelSize(max(8, self.height() // 3))
+        font.setBold(True)
+        painter.setFont(font)
+        metrics = painter.fontMetrics()
+        height = metrics.height()
+        width = max(height, metrics.horizontalAdvance(self._badge_text) + height // 2)
+        rect = QtCore.QRectF(self.width() - width, 0, width, height)
+
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(QtGui.QColor("crimson"))
+        painter.drawRoundedRect(rect, height / 2, height / 2)
+        painter.setPen(QtGui.QColor("white"))
+        painter.drawText(rect, QtCore.Qt.AlignmentFlag.AlignCenter, self._badge_text)
+        painter.end()
+
+
 class QResizingPixmapLabel(QtWidgets.QLabel):
     """
     `QLabel` for displaying `QPixmap`s that scales the image, keeping aspect ratio.
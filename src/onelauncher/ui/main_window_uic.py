@@ -21,7 +21,7 @@ from PySide6.QtWidgets import (QApplication, QCheckBox, QComboBox, QFormLayout,
     QSizePolicy, QSpacerItem, QTextBrowser, QToolButton,
     QVBoxLayout, QWidget)
 
-from .custom_widgets import (FramelessQMainWindowWithStylePreview, GameNewsfeedBrowser, NoOddSizesQToolButton)
+from .custom_widgets import (BadgeQToolButton, FramelessQMainWindowWithStylePreview, GameNewsfeedBrowser, NoOddSizesQToolButton)
 from .qtdesigner.custom_widgets import QMainWindowWithStylePreview
 
 class Ui_mainWindow(object):
@@ -62,7 +62,7 @@ class Ui_mainWindow(object):
 
         self.layoutTopButtons.addWidget(self.btnOptions)
 
-        self.btnAddonManager = NoOddSizesQToolButton(self.centralwidget)
+        self.btnAddonManager = BadgeQToolButton(self.centralwidget)
         self.btnAddonManager.setObjectName(u"btnAddonManager")
         self.btnAddonManager.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
         self.btnAddonManager.setAutoRaise(True)
@@ -45,7 +45,7 @@ from onelauncher.utilities import Progress
 
 from .patch_game_window_uic import Ui_patchGameWindow
 from .qtapp import get_qapp
-from .utilities import log_record_to_rich_text
+from .utilities import forwarded_log_records_to_rich_text
 
 logger = logging.getLogger(__name__)
 
@@ -72,8 +72,8 @@ class PatchGameWindow(QtWidgets.QDialog):
         self.setWindowTitle("Patching Output")
 
         self.ui_logs_handler = ForwardLogsHandler(
-            new_log_callback=lambda record: self.ui.txtLog.append(
-                log_record_to_rich_text(record)
+            new_logs_callback=lambda forwarded_records: self.ui.txtLog.append(
+                forwarded_log_records_to_rich_text(forwarded_records)
             ),
             level=logging.INFO,
         )
@@ -30,7 +30,6 @@ import sys
 from functools import cache
 from pathlib import Path
 
-import qtawesome
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from onelauncher.__about__ import __title__, __version__
@@ -41,6 +40,8 @@ from .style import ApplicationStyle
 
 @cache
 def _setup_qapplication() -> QtWidgets.QApplication:
+    import qtawesome
+
     application = QtWidgets.QApplication()
     # See https://github.com/zhiyiYo/PyQt-Frameless-Window/issues/50
     application.setAttribute(
@@ -1,7 +1,10 @@
 import logging
+from collections.abc import Sequence
 
 from PySide6 import QtCore, QtWidgets
 
+from ..logs import ForwardedLogRecord
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,3 +46,17 @@ def log_record_to_rich_text(record: logging.LogRecord) -> str:
         return f'<font color="red">{record.message}</font>'
     else:
         return record.message
+
+
+def forwarded_log_records_to_rich_text(
+    forwarded_records: Sequence[ForwardedLogRecord],
+) -> str:
+    return "<br>".join(
+        log_record_to_rich_text(forwarded_record.record)
+        + (
+            f" <i>(repeated {forwarded_record.repeat_count} times)</i>"
+            if forwarded_record.repeat_count > 1
+            else ""
+        )
+        for forwarded_record in forwarded_records
+    )
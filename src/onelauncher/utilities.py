@@ -30,10 +30,13 @@ from __future__ import annotations
 import logging
 import os
 import sys
+import threading
+import time
 from collections.abc import Generator, Iterator
 from math import log, trunc
 from pathlib import Path, PurePath
 from typing import (
+    Final,
     Literal,
     Self,
     assert_never,
@@ -55,6 +58,68 @@ class RelativePathError(ValueError):
 type StrPath = str | os.PathLike[str]
 
 
+@attrs.frozen
+class _DirectoryListing:
+    mtime_ns: int
+    names: dict[str, tuple[str, ...]]
+    """Names in the directory indexed by their lowercase versions"""
+
+
+_DIRECTORY_LISTINGS_MAX_SIZE: Final = 4096
+RACY_MTIME_WINDOW_NS: Final = 2_000_000_000
+"""
+Files and directories modified this recently aren't cached. Filesystems with coarse
+timestamps could change them again without their mtime changing.
+"""
+_directory_listings: dict[str, _DirectoryListing] = {}
+_directory_listings_lock = threading.Lock()
+
+
+def _get_directory_names(directory: str) -> dict[str, tuple[str, ...]] | None:
+    """
+    Return the names in `directory` indexed by their lowercase versions. Listings are
+    cached until the directory's mtime changes.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+    listing = _directory_listings.get(directory)
+    if listing is not None and listing.mtime_ns == mtime_ns:
+        return listing.names
+
+    try:
+        path_names = os.listdir(directory)
+    except OSError:
+        return None
+    names: dict[str, tuple[str, ...]] = {}
+    for path_name in path_names:
+        lowercase_name = path_name.lower()
+        names[lowercase_name] = (*names.get(lowercase_name, ()), path_name)
+
+    if time.time_ns() - mtime_ns >= RACY_MTIME_WINDOW_NS:
+        with _directory_listings_lock:
+            if len(_directory_listings) >= _DIRECTORY_LISTINGS_MAX_SIZE:
+                del _directory_listings[next(iter(_directory_listings))]
+            _directory_listings[directory] = _DirectoryListing(
+                mtime_ns=mtime_ns, names=names
+            )
+    return names
+
+
+def invalidate_case_insensitive_path_cache(directory: StrPath | None = None) -> None:
+    """
+    Forget the cached listing of `directory` or of every directory, if it's `None`.
+    Changed directories are noticed from their mtime, but this should still be called
+    after making changes, since mtimes can be too coarse to tell changes apart.
+    """
+    with _directory_listings_lock:
+        if directory is None:
+            _directory_listings.clear()
+        else:
+            _directory_listings.pop(str(Path(directory)), None)
+
+
 class CaseInsensitiveAbsolutePath(Path):
     """
     `pathlib.Path` subclass that automatically converts from the provided
@@ -68,6 +133,9 @@ class CaseInsensitiveAbsolutePath(Path):
     been encountered in real game folders before. There are similar concerns regarding
     addon folders or anything else used by the games or in the WINE prefixes.
 
+    Directory listings used for resolving paths are cached. See
+    `invalidate_case_insensitive_path_cache`.
+
     Raises:
         RelativePathError: Path is not absolute
     """
@@ -104,7 +172,7 @@ class CaseInsensitiveAbsolutePath(Path):
             current_path_parts = parts if i == len(parts) - 1 else parts[: i + 1]
             real_path_name = cls._get_real_path_name_from_case_insensitive_path_name(
                 case_insensitive_name=current_path_parts[-1],
-                parent_dir=os.path.sep.join(current_path_parts[:-1]),
+                parent_dir=os.path.join(*current_path_parts[:-1]),
             )
             # No version exists, so the original is just returned.
             if real_path_name is None:
@@ -123,14 +191,10 @@ class CaseInsensitiveAbsolutePath(Path):
         case. `parent_dir` has to exist. Use _get_case_sensitive_full_path if this may
         not be the case.
         """
-        try:
-            matches = tuple(
-                path_name
-                for path_name in os.listdir(parent_dir)
-                if path_name.lower() == case_insensitive_name.lower()
-            )
-        except OSError:
+        names = _get_directory_names(parent_dir)
+        if names is None:
             return None
+        matches = names.get(case_insensitive_name.lower(), ())
         if len(matches) == 1:
             return matches[0]
         elif len(matches) > 1:
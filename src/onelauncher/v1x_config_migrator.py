@@ -7,9 +7,6 @@ from typing import Any, Literal, assert_never
 
 import attrs
 import cattrs
-import keyring
-import xmlschema
-from keyring.errors import KeyringLocked, NoKeyringError
 
 from onelauncher.addons.config import AddonsConfigSection
 from onelauncher.addons.startup_script import StartupScript
@@ -191,6 +188,8 @@ def convert_v1x_config(xml_str: str) -> V1xConfig:
     Raises:
         V1xConfigParseError: Error parsing config XML
     """
+    import xmlschema
+
     schema = xmlschema.XMLSchema11(data_dir / "schemas/v1x_config.xsd")
     try:
         xml_dict: dict[str, Any] = schema.to_dict(xml_str)  # type: ignore[assignment]
@@ -328,6 +327,9 @@ def migrate_v1x_config(config_manager: ConfigManager, delete_old_config: bool) -
                 else (),
             )
         )
+    import keyring
+    from keyring.errors import KeyringLocked, NoKeyringError
+
     for i, configs in enumerate(game_configs):
         game_config = configs[0]
         game_id = generate_game_config_id(game_config)
@@ -0,0 +1,198 @@
+"""
+Micro-benchmarks of hot paths. They use synthetic data, so they run offline. Results
+can be saved as a JSON baseline and later compared against it:
+
+    pytest tests/benchmarks --benchmarks --benchmark-save=baseline.json
+    pytest tests/benchmarks --benchmarks --benchmark-compare=baseline.json
+
+Baselines are only meaningful on the machine that made them.
+"""
+
+import json
+import platform
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Final
+
+import attrs
+import cattrs
+import pytest
+
+MIN_ROUNDS: Final = 5
+MAX_ROUNDS: Final = 1000
+MIN_TIME: Final = 0.5
+"""Seconds that each benchmark is run for, if it hasn't hit `MAX_ROUNDS`"""
+
+
+@attrs.frozen(kw_only=True)
+class BenchmarkResult:
+    rounds: int
+    min_ns: int
+    median_ns: float
+    mean_ns: float
+
+
+@attrs.frozen(kw_only=True)
+class BenchmarkBaseline:
+    python_version: str = platform.python_version()
+    machine: str = platform.platform()
+    benchmarks: dict[str, BenchmarkResult] = attrs.Factory(dict)
+
+
+_results_key = pytest.StashKey[dict[str, BenchmarkResult]]()
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(pytestconfig: pytest.Config) -> BenchmarkBaseline | None:
+    compare_path: str | None = pytestconfig.getoption("--benchmark-compare")
+    if compare_path is None:
+        return None
+    return cattrs.structure(
+        json.loads(Path(compare_path).read_text()), BenchmarkBaseline
+    )
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(
+    pytestconfig: pytest.Config,
+) -> Iterator[dict[str, BenchmarkResult]]:
+    results = pytestconfig.stash.setdefault(_results_key, {})
+    yield results
+    save_path: str | None = pytestconfig.getoption("--benchmark-save")
+    if save_path is not None:
+        Path(save_path).write_text(
+            json.dumps(
+                cattrs.unstructure(BenchmarkBaseline(benchmarks=dict(results))),
+                indent=4,
+            )
+        )
+
+
+class Benchmark:
+    """Time a function. It can only be used once per test."""
+
+    def __init__(
+        self,
+        name: str,
+        results: dict[str, BenchmarkResult],
+        baseline: BenchmarkBaseline | None,
+        max_regression: float,
+    ) -> None:
+        self.name = name
+        self.results = results
+        self.baseline = baseline
+        self.max_regression = max_regression
+        self._end_time = 0.0
+
+    def __call__[T](
+        self, func: Callable[[], T], setup: Callable[[], object] | None = None
+    ) -> T:
+        """
+        Args:
+            setup (Callable[[], object] | None): Run before every call to `func`
+                without being timed
+        """
+        self._check_unused()
+        # Warm up caches and lazy imports.
+        if setup is not None:
+            setup()
+        result = func()
+        timings: list[int] = []
+        while self._needs_more_rounds(timings):
+            if setup is not None:
+                setup()
+            start_ns = time.perf_counter_ns()
+            result = func()
+            timings.append(time.perf_counter_ns() - start_ns)
+        self.record(timings)
+        return result
+
+    async def call_async[T](
+        self,
+        func: Callable[[], Awaitable[T]],
+        setup: Callable[[], object] | None = None,
+    ) -> T:
+        """Async version of calling the benchmark directly"""
+        self._check_unused()
+        if setup is not None:
+            setup()
+        result = await func()
+        timings: list[int] = []
+        while self._needs_more_rounds(timings):
+            if setup is not None:
+                setup()
+            start_ns = time.perf_counter_ns()
+            result = await func()
+            timings.append(time.perf_counter_ns() - start_ns)
+        self.record(timings)
+        return result
+
+    def _check_unused(self) -> None:
+        if self.name in self.results:
+            raise RuntimeError("`benchmark` can only be called once per test")
+        self._end_time = time.perf_counter() + MIN_TIME
+
+    def _needs_more_rounds(self, timings: list[int]) -> bool:
+        return len(timings) < MIN_ROUNDS or (
+            len(timings) < MAX_ROUNDS and time.perf_counter() < self._end_time
+        )
+
+    def record(self, timings: list[int]) -> None:
+        """Record nanosecond timings that were measured some other way"""
+        self._check_unused()
+        benchmark_result = BenchmarkResult(
+            rounds=len(timings),
+            min_ns=min(timings),
+            median_ns=statistics.median(timings),
+            mean_ns=statistics.fmean(timings),
+        )
+        self.results[self.name] = benchmark_result
+        self._compare(benchmark_result)
+
+    def _compare(self, benchmark_result: BenchmarkResult) -> None:
+        if self.baseline is None:
+            return
+        baseline_result = self.baseline.benchmarks.get(self.name)
+        if baseline_result is None:
+            return
+        ratio = benchmark_result.median_ns / baseline_result.median_ns
+        if ratio > 1 + self.max_regression:
+            pytest.fail(
+                f"{ratio:.2f}x slower than the baseline median of "
+                f"{baseline_result.median_ns / 1e6:.3f}ms",
+                pytrace=False,
+            )
+
+
+@pytest.fixture
+def benchmark(
+    request: pytest.FixtureRequest,
+    benchmark_results: dict[str, BenchmarkResult],
+    benchmark_baseline: BenchmarkBaseline | None,
+) -> Benchmark:
+    return Benchmark(
+        name=request.node.name,
+        results=benchmark_results,
+        baseline=benchmark_baseline,
+        max_regression=request.config.getoption("--benchmark-max-regression"),
+    )
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    name_width = max(len(name) for name in results)
+    terminalreporter.write_line(
+        f"{'name':<{name_width}}  {'min (ms)':>10}  {'median (ms)':>11}  {'rounds':>6}"
+    )
+    for name, result in sorted(results.items()):
+        terminalreporter.write_line(
+            f"{name:<{name_width}}  {result.min_ns / 1e6:>10.3f}  "
+            f"{result.median_ns / 1e6:>11.3f}  {result.rounds:>6}"
+        )
@@ -0,0 +1,182 @@
+"""
+Run OneLauncher with startup instrumentation and write a JSON report of when each
+startup phase ran. This is run in a fresh process by `test_startup.py`.
+
+    python startup_driver.py REPORT_PATH SPAWN_TIME_NS [ONELAUNCHER_ARGS...]
+
+`SPAWN_TIME_NS` is the `time.time_ns()` of when the process was started, so that
+interpreter startup is included in the milestones. OneLauncher exits as soon as the
+Play button is enabled.
+
+Phases are timed with `sys.monitoring`, so they're measured wherever they end up
+happening. Phases can be nested. For example, schema compilation and finding the
+available locales can happen while importing.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from types import CodeType
+from typing import Any, Final, override
+
+MONITORING_TOOL_ID: Final = sys.monitoring.PROFILER_ID
+
+# Qualified names and file name endings of the functions to time. Network setup goes on
+# to load the newsfeed, so it's counted as finished once the Play button is enabled.
+PHASES: Final = {
+    ("ConfigManager.verify_configs", "onelauncher/config_manager.py"): (
+        "verify_configs"
+    ),
+    ("get_available_locales", "onelauncher/resources.py"): "get_available_locales",
+    ("XMLSchemaBase.__init__", "xmlschema/validators/schemas.py"): (
+        "schema_compilation"
+    ),
+    ("get_qapp", "onelauncher/ui/qtapp.py"): "get_qapp",
+    ("MainWindow.game_initial_network_setup", "onelauncher/main_window.py"): (
+        "network_setup"
+    ),
+}
+
+
+class StartupRecorder:
+    def __init__(self, spawn_time_ns: int) -> None:
+        self.spawn_time_ns = spawn_time_ns
+        self.phases: dict[str, float] = {}
+        self.milestones: dict[str, float] = {}
+        self._started_phases: dict[str, tuple[int, int]] = {}
+        """Start time and nesting depth of phases that are running"""
+        self._phase_codes: dict[CodeType, str] = {}
+        self.on_get_qapp_return: list[Any] = []
+
+    def now_ms(self) -> float:
+        return (time.time_ns() - self.spawn_time_ns) / 1e6
+
+    def start_phase(self, phase: str) -> None:
+        start_ns, depth = self._started_phases.get(phase, (time.perf_counter_ns(), 0))
+        self._started_phases[phase] = (start_ns, depth + 1)
+
+    def end_phase(self, phase: str) -> None:
+        if phase not in self._started_phases:
+            return
+        start_ns, depth = self._started_phases.pop(phase)
+        if depth > 1:
+            self._started_phases[phase] = (start_ns, depth - 1)
+            return
+        self.phases[phase] = (
+            self.phases.get(phase, 0) + (time.perf_counter_ns() - start_ns) / 1e6
+        )
+
+    def add_milestone(self, name: str) -> None:
+        self.milestones.setdefault(name, self.now_ms())
+
+    def _get_phase(self, code: CodeType) -> str | None:
+        if code in self._phase_codes:
+            return self._phase_codes[code]
+        for (qualname, file_suffix), phase in PHASES.items():
+            if code.co_qualname == qualname and code.co_filename.replace(
+                "\\", "/"
+            ).endswith(file_suffix):
+                self._phase_codes[code] = phase
+                return phase
+        return None
+
+    def _on_start(self, code: CodeType, _offset: int) -> object:
+        phase = self._get_phase(code)
+        if phase is None:
+            return sys.monitoring.DISABLE
+        self.start_phase(phase)
+        return None
+
+    def _on_return(self, code: CodeType, _offset: int, retval: object) -> object:
+        phase = self._get_phase(code)
+        if phase is None:
+            return sys.monitoring.DISABLE
+        self.end_phase(phase)
+        if phase == "get_qapp":
+            for callback in self.on_get_qapp_return:
+                callback(retval)
+        return None
+
+    def start_monitoring(self) -> None:
+        sys.monitoring.use_tool_id(MONITORING_TOOL_ID, "onelauncher-startup")
+        sys.monitoring.register_callback(
+            MONITORING_TOOL_ID, sys.monitoring.events.PY_START, self._on_start
+        )
+        sys.monitoring.register_callback(
+            MONITORING_TOOL_ID, sys.monitoring.events.PY_RETURN, self._on_return
+        )
+        sys.monitoring.set_events(
+            MONITORING_TOOL_ID,
+            sys.monitoring.events.PY_START | sys.monitoring.events.PY_RETURN,
+        )
+
+    def stop_monitoring(self) -> None:
+        sys.monitoring.set_events(MONITORING_TOOL_ID, 0)
+        sys.monitoring.free_tool_id(MONITORING_TOOL_ID)
+
+    def get_report(self, exit_code: int) -> dict[str, Any]:
+        return {
+            "exit_code": exit_code,
+            "milestones": self.milestones,
+            "phases": self.phases,
+        }
+
+
+def main() -> int:
+    report_path = Path(sys.argv[1])
+    recorder = StartupRecorder(spawn_time_ns=int(sys.argv[2]))
+    recorder.add_milestone("driver_started")
+    recorder.start_monitoring()
+
+    recorder.start_phase("imports")
+    from PySide6 import QtCore
+
+    import onelauncher.cli
+    import onelauncher.main_window
+    from onelauncher.async_utils import app_cancel_scope
+
+    recorder.end_phase("imports")
+    recorder.add_milestone("imports_finished")
+
+    class StartupEventFilter(QtCore.QObject):
+        @override
+        def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+            event_type = event.type()
+            if watched.objectName() == "btnStartGame":
+                if (
+                    event_type == QtCore.QEvent.Type.EnabledChange
+                    and watched.property("enabled")
+                    and "play_enabled" not in recorder.milestones
+                ):
+                    recorder.end_phase("network_setup")
+                    recorder.add_milestone("play_enabled")
+                    QtCore.QTimer.singleShot(0, app_cancel_scope.cancel)
+            elif watched.metaObject().className() == "MainWindow":
+                if event_type == QtCore.QEvent.Type.Show:
+                    recorder.add_milestone("main_window_shown")
+                elif event_type == QtCore.QEvent.Type.Paint:
+                    recorder.add_milestone("main_window_painted")
+            return False
+
+    event_filter = StartupEventFilter()
+    recorder.on_get_qapp_return.append(
+        lambda qapp: qapp.installEventFilter(event_filter)
+    )
+
+    async def skip_update_check() -> None:
+        """The release check goes to GitHub, which the stand-in servers don't cover"""
+
+    onelauncher.main_window.check_for_update = skip_update_check
+
+    try:
+        exit_code = onelauncher.cli.get_app()(sys.argv[3:])
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    recorder.stop_monitoring()
+    report_path.write_text(json.dumps(recorder.get_report(exit_code or 0), indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+
+from onelauncher.addons.addon_info import parse_addons_feed, parse_compendium_file
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+FEED_ADDONS_COUNT = 5000
+
+
+def test_parse_compendium_files(benchmark: Benchmark, tmp_path: Path) -> None:
+    compendium_files: list[Path] = []
+    for i in range(200):
+        compendium_file = tmp_path / f"Plugin{i}.plugincompendium"
+        compendium_file.write_text(
+            f"<PluginConfig><Id>{i}</Id><Name>Plugin {i}</Name>"
+            f"<Version>1.{i}</Version><Author>Author</Author>"
+            "<Dependencies><dependency>1</dependency><dependency>2</dependency>"
+            "</Dependencies>"
+            f"<StartupScript>Author\\Plugin{i}\\startup.py</StartupScript>"
+            "</PluginConfig>"
+        )
+        compendium_files.append(compendium_file)
+
+    addons = benchmark(
+        lambda: [
+            parse_compendium_file(compendium_file, "PluginConfig")
+            for compendium_file in compendium_files
+        ]
+    )
+    assert addons[-1] is not None
+    assert addons[-1].dependencies == "1,2"
+
+
+def test_parse_addons_feed(benchmark: Benchmark) -> None:
+    feed = (
+        "<UIList>"
+        + "".join(
+            f"<Ui><UID>{i}</UID><UIName>Plugin &amp;1088; {i}</UIName>"
+            f"<UIAuthorName>Author {i}</UIAuthorName><UIVersion>1.{i}</UIVersion>"
+            f"<UIUpdated>{1_700_000_000 + i}</UIUpdated>"
+            "<UICategory>Other</UICategory>"
+            f"<UIFileURL>https://www.lotrointerface.com/downloads/download{i}</UIFileURL>"
+            "</Ui>"
+            for i in range(FEED_ADDONS_COUNT)
+        )
+        + "</UIList>"
+    )
+    addons = benchmark(lambda: parse_addons_feed(feed))
+    assert len(addons) == FEED_ADDONS_COUNT
+    assert addons[0].name == "Plugin \u0440 0"
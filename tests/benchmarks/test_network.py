@@ -0,0 +1,138 @@
+import hashlib
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from onelauncher.addons.config import AddonsConfigSection
+from onelauncher.game_config import GameConfig, GameType
+from onelauncher.network.akamai import PatchingDownloadList
+from onelauncher.network.game_launcher_config import GameLauncherConfig
+from onelauncher.network.game_newsfeed import newsfeed_xml_to_html
+from onelauncher.network.xml_schemas import decode_xml, get_xml_schema
+from onelauncher.resources import get_default_locale
+from onelauncher.utilities import CaseInsensitiveAbsolutePath
+from onelauncher.wine.config import WineConfigSection
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+PATCHING_FILES_COUNT = 20_000
+
+GAME_LAUNCHER_CONFIG_SETTINGS = {
+    "GameClient.WIN64.Filename": "lotroclient64.exe",
+    "GameClient.WIN32.Filename": "lotroclient.exe",
+    "GameClient.WIN32Legacy.Filename": "lotroclient_awesomium.exe",
+    "GameClient.WIN32.ArgTemplate": "-a {SUBSCRIPTION} -h {LOGIN} --glsticketdirect "
+    "{GLS} --chatserver {CHAT} --rodat on --language {LANG} --gametype LOTRO",
+    "GameClient.Arg.crashreceiver": "http://crash.lotro.com:8080/CrashReceiver-1.0",
+    "GameClient.Arg.authserverurl": "https://gls.lotro.com/gls.authserver/service.asmx",
+    "GameClient.Arg.glsticketlifetime": "21600",
+    "Patching.ProductCode": "LOTRO",
+    "WorldQueue.LoginQueue.URL": "https://gls.lotro.com/GLS.AuthServer/LoginQueue.aspx",
+    "WorldQueue.TakeANumber.Parameters": "command=TakeANumber&amp;subscription={0}",
+    "URL.NewsFeed": "https://forums.lotro.com/{lang}/launcher-feed.xml",
+    "URL.DownloadFilesList": "http://akamai.lotro.com/DownloadFilesList.xml",
+    "Game.Version": "3601.0066.7272.4024",
+    # Real configs have many more values than what OneLauncher uses.
+    **{f"Unused.Setting{i}": f"value{i}" for i in range(40)},
+}
+
+
+def test_game_launcher_config_from_xml(benchmark: Benchmark) -> None:
+    config_xml = (
+        "<configuration><appSettings>"
+        + "".join(
+            f'<add key="{key}" value="{value}" />'
+            for key, value in GAME_LAUNCHER_CONFIG_SETTINGS.items()
+        )
+        + "</appSettings></configuration>"
+    )
+    config = benchmark(lambda: GameLauncherConfig.from_xml(config_xml))
+    assert config.patching_product_code == "LOTRO"
+
+
+def test_patching_download_list_from_xml(benchmark: Benchmark) -> None:
+    file_list_xml = (
+        "<FileList>"
+        + "".join(
+            f"<File><From>client\\data{i}.dat</From><To>data\\data{i}.dat</To>"
+            f"<Size>{i * 1024}</Size>"
+            f"<MD5>{hashlib.md5(str(i).encode()).hexdigest()}</MD5></File>"  # noqa: S324
+            for i in range(PATCHING_FILES_COUNT)
+        )
+        + "</FileList>"
+    )
+    download_list = benchmark(lambda: PatchingDownloadList.from_xml(file_list_xml))
+    assert len(download_list.download_files) == PATCHING_FILES_COUNT
+
+
+WORLD_STATUS_XML = (
+    "<Status><name>Glamdring</name><logintiers>1</logintiers>"
+    "<world_full>false</world_full><loginservers>10.0.0.1:9000;</loginservers>"
+    "<logintierlastnumbers>0</logintierlastnumbers>"
+    "<logintiermultipliers>1</logintiermultipliers><queuenames>Queue</queuenames>"
+    "<queueurls>https://gls.lotro.com/GLS.DataCenterServer/Queue.aspx;</queueurls>"
+    "<nowservingqueuenumber>0x1</nowservingqueuenumber>"
+    "<lastassignedqueuenumber>0x2</lastassignedqueuenumber><allow_billing_role/>"
+    "<deny_billing_role/><allow_admin_role/><deny_admin_role/>"
+    "<farmid>12</farmid><wait_hint>0.5</wait_hint></Status>"
+)
+WORLD_QUEUE_RESULT_XML = (
+    "<Result><Command>TakeANumber</Command><HResult>0x00000000</HResult>"
+    "<QueueName>Queue</QueueName><QueueNumber>0x1f</QueueNumber>"
+    "<NowServingNumber>0x1a</NowServingNumber><LoginTier>1</LoginTier>"
+    "<ContextNumber>0x2</ContextNumber></Result>"
+)
+
+
+def test_decode_world_status(benchmark: Benchmark) -> None:
+    status_dict = benchmark(lambda: decode_xml("world_status", WORLD_STATUS_XML))
+    assert status_dict == get_xml_schema("world_status").to_dict(WORLD_STATUS_XML)
+
+
+def test_decode_world_queue_result(benchmark: Benchmark) -> None:
+    result_dict = benchmark(
+        lambda: decode_xml("world_queue_result", WORLD_QUEUE_RESULT_XML)
+    )
+    assert result_dict == get_xml_schema("world_queue_result").to_dict(
+        WORLD_QUEUE_RESULT_XML
+    )
+
+
+def test_newsfeed_xml_to_html(
+    benchmark: Benchmark, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    published = datetime(2024, 1, 1, tzinfo=UTC)
+    newsfeed_xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>News</title><link>https://forums.lotro.com</link>"
+        + "".join(
+            f"<item><title>Update {i}</title>"
+            f"<link>https://forums.lotro.com/threads/{i}</link>"
+            f"<pubDate>{format_datetime(published + timedelta(days=i))}</pubDate>"
+            f"<description><![CDATA[<p>Release notes for update {i}. "
+            f"<b>{'Lots of changes. ' * 20}</b></p>]]></description></item>"
+            for i in range(100)
+        )
+        + "</channel></rss>"
+    )
+    game_config = GameConfig(
+        addons=AddonsConfigSection(),
+        wine=WineConfigSection(),
+        game_type=GameType.LOTRO,
+        is_preview_client=False,
+        game_directory=CaseInsensitiveAbsolutePath(tmp_path_factory.mktemp("game")),
+    )
+    locale = get_default_locale()
+
+    newsfeed_html = benchmark(
+        lambda: newsfeed_xml_to_html(
+            newsfeed_string=newsfeed_xml,
+            locale=locale,
+            game_config=game_config,
+            original_feed_url="https://forums.lotro.com/en/launcher-feed.xml",
+        )
+    )
+    assert "Update 99" in newsfeed_html
@@ -0,0 +1,59 @@
+import shutil
+
+import pytest
+
+from onelauncher.addons import service as service_module
+from onelauncher.addons.service import AddonService
+from onelauncher.config_manager import ConfigManager
+from onelauncher.game_config import GameType
+from onelauncher.patch_game import akamai_patching
+from onelauncher.utilities import Progress
+from tests.stand_in_servers import StandInServers
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+
+async def test_akamai_patching(
+    benchmark: Benchmark,
+    stand_in_servers: StandInServers,
+    config_manager: ConfigManager,
+) -> None:
+    stand_in_servers.config.patching_file_count = 200
+    stand_in_servers.config.patching_file_size = 256 * 1024
+    stand_in_servers.config.latency = 0.005
+    (game_id,) = config_manager.get_game_config_ids()
+    game_directory = config_manager.get_game_config(game_id).game_directory
+    stand_in_servers.write_launcher_config(game_directory)
+
+    await benchmark.call_async(
+        lambda: akamai_patching(
+            game_id=game_id, config_manager=config_manager, progress=Progress()
+        ),
+        # Only missing data files are downloaded.
+        setup=lambda: shutil.rmtree(game_directory / "data", ignore_errors=True),
+    )
+    assert len(list((game_directory / "data").iterdir())) == 200  # noqa: PLR2004
+
+
+async def test_refresh_addon_catalog(
+    benchmark: Benchmark,
+    stand_in_servers: StandInServers,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stand_in_servers.config.addon_count = 1000
+    stand_in_servers.config.latency = 0.02
+    monkeypatch.setattr(
+        service_module, "get_addons_feed_url", stand_in_servers.get_addons_feed_url
+    )
+    settings_dir = tmp_path_factory.mktemp("settings")
+    service = AddonService(
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+        catalog_path=settings_dir / "catalog.sqlite",
+    )
+
+    await benchmark.call_async(lambda: service.refresh_catalog(force=True))
+    assert len(service.get_catalog("plugin")) == 1000  # noqa: PLR2004
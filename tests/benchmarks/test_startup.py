@@ -0,0 +1,157 @@
+"""
+End-to-end startup latency, from spawning a fresh OneLauncher process to the main
+window being shown and the Play button being enabled. Network requests go to the local
+stand-in servers.
+
+The first run uses an empty bytecode cache, so it's a cold start. The rest are warm
+starts. A JSON report with a per phase breakdown and an import time profile can be
+saved for comparing releases:
+
+    pytest tests/benchmarks/test_startup.py --benchmarks --startup-report=startup.json
+"""
+
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final
+
+import pytest
+import trio
+
+from onelauncher.__about__ import __version__
+from onelauncher.config_manager import ConfigManager
+from tests.stand_in_servers import StandInServers
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+DRIVER_PATH: Final = Path(__file__).parent / "startup_driver.py"
+WARM_RUNS: Final = 5
+RUN_TIMEOUT: Final = 120
+IMPORT_PROFILE_SIZE: Final = 25
+IMPORT_TIME_PATTERN: Final = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<module>.+)$"
+)
+
+
+def get_child_env(tmp_path: Path) -> dict[str, str]:
+    env = os.environ.copy()
+    # Keep the child away from the real keyring and user directories.
+    env["PYTHON_KEYRING_BACKEND"] = "keyring.backends.null.Keyring"
+    for name in ("XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_STATE_HOME"):
+        xdg_dir = tmp_path / name.lower()
+        xdg_dir.mkdir(exist_ok=True)
+        env[name] = str(xdg_dir)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Nothing has been compiled yet, so the first run is a cold start.
+    env["PYTHONPYCACHEPREFIX"] = str(tmp_path / "pycache")
+    return env
+
+
+async def run_startup(
+    report_path: Path, cli_args: list[str], env: dict[str, str]
+) -> dict[str, Any]:
+    with trio.fail_after(RUN_TIMEOUT):
+        await trio.run_process(
+            [
+                sys.executable,
+                str(DRIVER_PATH),
+                str(report_path),
+                str(time.time_ns()),
+                *cli_args,
+            ],
+            env=env,
+        )
+    report: dict[str, Any] = json.loads(await trio.Path(report_path).read_text())
+    assert report["exit_code"] == 0
+    assert "play_enabled" in report["milestones"]
+    return report
+
+
+async def get_import_profile(env: dict[str, str]) -> list[dict[str, Any]]:
+    """Slowest modules to import by cumulative time, according to `-X importtime`"""
+    process = await trio.run_process(
+        [sys.executable, "-X", "importtime", "-c", "import onelauncher.cli"],
+        env=env,
+        capture_stderr=True,
+    )
+    imports: list[dict[str, Any]] = []
+    for line in process.stderr.decode().splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        imports.append(
+            {
+                "module": match["module"].strip(),
+                "self_ms": int(match["self"]) / 1000,
+                "cumulative_ms": int(match["cumulative"]) / 1000,
+            }
+        )
+    imports.sort(key=lambda module_import: module_import["cumulative_ms"], reverse=True)
+    return imports[:IMPORT_PROFILE_SIZE]
+
+
+def get_medians(reports: list[dict[str, Any]], key: str) -> dict[str, float]:
+    names = {name for report in reports for name in report[key]}
+    return {
+        name: statistics.median(report[key].get(name, 0) for report in reports)
+        for name in sorted(names)
+    }
+
+
+async def test_startup(
+    benchmark: Benchmark,
+    stand_in_servers: StandInServers,
+    config_manager: ConfigManager,
+    tmp_path: Path,
+    pytestconfig: pytest.Config,
+) -> None:
+    (game_id,) = config_manager.get_game_config_ids()
+    game_directory = config_manager.get_game_config(game_id).game_directory
+    stand_in_servers.write_launcher_config(game_directory)
+    (game_directory / "client_local_English.dat").touch()
+
+    cli_args = [
+        "--config-directory",
+        str(config_manager.program_config_dir),
+        "--games-directory",
+        str(config_manager.games_dir),
+        "--addon-update-check-interval",
+        "0",
+    ]
+    env = get_child_env(tmp_path)
+    reports = [
+        await run_startup(tmp_path / f"startup-{i}.json", cli_args, env)
+        for i in range(WARM_RUNS + 1)
+    ]
+    cold_report, warm_reports = reports[0], reports[1:]
+    benchmark.record(
+        [int(report["milestones"]["play_enabled"] * 1e6) for report in warm_reports]
+    )
+
+    report_path: str | None = pytestconfig.getoption("--startup-report")
+    if report_path is None:
+        return
+    await trio.Path(report_path).write_text(
+        json.dumps(
+            {
+                "python_version": platform.python_version(),
+                "machine": platform.platform(),
+                "onelauncher_version": __version__,
+                "cold": cold_report,
+                "warm": warm_reports,
+                "warm_medians": {
+                    "milestones": get_medians(warm_reports, "milestones"),
+                    "phases": get_medians(warm_reports, "phases"),
+                },
+                "import_profile": await get_import_profile(env),
+            },
+            indent=4,
+        )
+    )
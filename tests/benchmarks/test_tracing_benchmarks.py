@@ -0,0 +1,26 @@
+import pytest
+
+from onelauncher.tracing import Span, count
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+SPANS_COUNT = 10_000
+
+
+@Span("decorated", "benchmark")
+def decorated() -> None:
+    pass
+
+
+def test_disabled_spans(benchmark: Benchmark) -> None:
+    """Spans are left in hot code paths, so they need to be cheap when not tracing"""
+
+    def run() -> None:
+        for _ in range(SPANS_COUNT):
+            with Span("span", "benchmark", number=1):
+                count("count")
+            decorated()
+
+    benchmark(run)
@@ -0,0 +1,105 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from onelauncher.utilities import (
+    CaseInsensitiveAbsolutePath,
+    Progress,
+    ProgressItem,
+    parse_app_settings_config,
+)
+
+from .conftest import Benchmark
+
+pytestmark = pytest.mark.benchmark
+
+DIR_WIDTH = 8
+DIR_DEPTH = 4
+FILES_PER_DIR = 5
+APP_SETTINGS_COUNT = 500
+PROGRESS_ITEMS_COUNT = 10_000
+
+
+@pytest.fixture(scope="module")
+def addon_tree(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Mixed case directory tree like a plugins folder"""
+    root = tmp_path_factory.mktemp("addon_tree")
+    dirs = [root]
+    for _ in range(DIR_DEPTH):
+        dirs = [
+            parent / f"Folder{i}"
+            for parent in dirs[:DIR_WIDTH]
+            for i in range(DIR_WIDTH)
+        ]
+        for path in dirs:
+            path.mkdir()
+            for i in range(FILES_PER_DIR):
+                (path / f"File{i}.Plugin").touch()
+    # Directories that were just modified aren't cached.
+    for dir_path, _, _ in os.walk(root):
+        os.utime(dir_path, (1_000_000_000, 1_000_000_000))
+    return root
+
+
+def test_case_insensitive_path_construction(
+    benchmark: Benchmark, addon_tree: Path
+) -> None:
+    paths = [
+        addon_tree.joinpath(*("folder0",) * depth, f"file{depth}.plugin")
+        for depth in range(1, DIR_DEPTH + 1)
+    ] * 50
+
+    resolved = benchmark(
+        lambda: [
+            CaseInsensitiveAbsolutePath(path, known_to_exist_base_path=addon_tree)
+            for path in paths
+        ]
+    )
+    assert resolved[0] == addon_tree / "Folder0" / "File1.Plugin"
+
+
+def test_case_insensitive_path_join(benchmark: Benchmark, addon_tree: Path) -> None:
+    base = CaseInsensitiveAbsolutePath(addon_tree)
+
+    def join() -> list[CaseInsensitiveAbsolutePath]:
+        return [
+            base / "folder0" / "folder1" / "folder2" / f"file{i}.plugin"
+            for i in range(FILES_PER_DIR)
+            for _ in range(40)
+        ]
+
+    assert benchmark(join)[0].name == "File0.Plugin"
+
+
+def test_case_insensitive_path_glob(benchmark: Benchmark, addon_tree: Path) -> None:
+    base = CaseInsensitiveAbsolutePath(addon_tree)
+    plugin_files = benchmark(lambda: list(base.rglob("*.plugin")))
+    assert len(plugin_files) == FILES_PER_DIR * sum(
+        DIR_WIDTH ** min(depth, 2) for depth in range(1, DIR_DEPTH + 1)
+    )
+
+
+def test_parse_app_settings_config(benchmark: Benchmark) -> None:
+    config_xml = (
+        "<configuration><appSettings>"
+        + "".join(
+            f'<add key="Setting.Key{i}" value="https://example.com/{i}" />'
+            for i in range(APP_SETTINGS_COUNT)
+        )
+        + "</appSettings></configuration>"
+    )
+    assert (
+        len(benchmark(lambda: parse_app_settings_config(config_xml)))
+        == APP_SETTINGS_COUNT
+    )
+
+
+def test_progress_get_current_progress(benchmark: Benchmark) -> None:
+    progress = Progress(
+        progress_items=[
+            ProgressItem(completed=i, total=i * 2) for i in range(PROGRESS_ITEMS_COUNT)
+        ],
+        unit_type="byte",
+    )
+    assert benchmark(progress.get_current_progress).completed > 0
@@ -0,0 +1,107 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from onelauncher.addons.config import AddonsConfigSection
+from onelauncher.config_manager import ConfigManager
+from onelauncher.game_config import GameConfig, GameType, generate_game_config_id
+from onelauncher.network import httpx_client
+from onelauncher.utilities import CaseInsensitiveAbsolutePath
+from onelauncher.wine.config import WineConfigSection
+from tests.stand_in_servers import StandInServers, open_stand_in_servers
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--benchmarks",
+        action="store_true",
+        help="Run the benchmarks in tests/benchmarks. They are skipped otherwise.",
+    )
+    group.addoption(
+        "--benchmark-save",
+        metavar="PATH",
+        help="Save benchmark results as a JSON baseline",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        metavar="PATH",
+        help="Fail benchmarks that are slower than the JSON baseline",
+    )
+    group.addoption(
+        "--benchmark-max-regression",
+        type=float,
+        default=0.2,
+        metavar="FRACTION",
+        help="How much slower than the baseline a benchmark can be. Default: 0.2",
+    )
+    group.addoption(
+        "--startup-report",
+        metavar="PATH",
+        help="Save a JSON report of the startup benchmark's phases and imports",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="Pass --benchmarks to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture
+async def stand_in_servers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[StandInServers]:
+    # The default client is shared between tests, but its connections can't be
+    # shared between the event loops of different tests.
+    async with httpx.AsyncClient() as client, open_stand_in_servers() as servers:
+        monkeypatch.setattr(httpx_client, "_get_default_httpx_client", lambda: client)
+        yield servers
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    return config_dir
+
+
+@pytest.fixture
+def games_dir(tmp_path: Path) -> Path:
+    games_dir = tmp_path / "games"
+    games_dir.mkdir()
+    return games_dir
+
+
+@pytest.fixture
+def config_manager(config_dir: Path, games_dir: Path, tmp_path: Path) -> ConfigManager:
+    config_manager = ConfigManager(
+        program_config_dir=config_dir,
+        games_dir=games_dir,
+        config_snapshots_path=tmp_path / "config_snapshots.pickle",
+    )
+    config_manager.verify_configs()
+
+    config_manager.update_program_config_file(config_manager.read_program_config_file())
+
+    mock_game_dir = CaseInsensitiveAbsolutePath(tmp_path / "lotro_game_dir")
+    mock_game_dir.mkdir()
+    game_config = GameConfig(
+        addons=AddonsConfigSection(),
+        wine=WineConfigSection(),
+        game_type=GameType.LOTRO,
+        is_preview_client=False,
+        game_directory=mock_game_dir,
+    )
+    config_manager.update_game_config_file(
+        game_id=generate_game_config_id(game_config), config=game_config
+    )
+
+    return config_manager
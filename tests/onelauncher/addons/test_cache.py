@@ -0,0 +1,144 @@
+import os
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+
+from onelauncher.addons.cache import (
+    ADDON_CATALOG_MAX_AGE,
+    attach_addon_catalog,
+    compute_addon_updates,
+    create_addon_updates_table,
+    create_cache_state_table,
+    get_addon_folder_fingerprint,
+    get_cache_state,
+    get_catalog_conditional_headers,
+    get_catalog_fetched_at,
+    get_catalog_modified_at,
+    get_outdated_addon_ids,
+    is_catalog_fresh,
+    set_cache_state,
+    set_catalog_fetched,
+    set_catalog_not_modified,
+)
+
+
+def test_get_addon_folder_fingerprint(tmp_path: Path) -> None:
+    (tmp_path / "Author").mkdir()
+    fingerprint = get_addon_folder_fingerprint(tmp_path)
+    assert fingerprint == get_addon_folder_fingerprint(tmp_path)
+
+    # Adding a file to an addon folder changes its modification time.
+    stat = (tmp_path / "Author").stat()
+    (tmp_path / "Author" / "Plugin.plugin").touch()
+    os.utime(tmp_path / "Author", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert get_addon_folder_fingerprint(tmp_path) != fingerprint
+
+    # Compendium files can be edited in place without changing their folder's
+    # modification time.
+    (tmp_path / "Author" / "Plugin.plugincompendium").write_text("<PluginConfig/>")
+    fingerprint = get_addon_folder_fingerprint(tmp_path)
+    (tmp_path / "Author" / "Plugin.plugincompendium").write_text("<PluginConfig />")
+    assert get_addon_folder_fingerprint(tmp_path) != fingerprint
+
+    assert get_addon_folder_fingerprint(tmp_path / "missing") == ""
+
+
+def test_cache_state() -> None:
+    cursor = sqlite3.connect(":memory:").cursor()
+    create_cache_state_table(cursor)
+    assert get_cache_state(cursor, "name") is None
+    set_cache_state(cursor, "name", "value")
+    set_cache_state(cursor, "name", "new value")
+    assert get_cache_state(cursor, "name") == "new value"
+
+
+def test_addon_catalog(tmp_path: Path) -> None:
+    catalog_path = tmp_path / "catalog.sqlite"
+    cursor = sqlite3.connect(":memory:").cursor()
+    attach_addon_catalog(
+        cursor, ("tablePlugins",), ("Name", "File"), catalog_path=catalog_path
+    )
+    assert get_catalog_fetched_at(cursor, "tablePlugins") is None
+    assert not is_catalog_fresh(cursor, "tablePlugins")
+
+    cursor.execute("INSERT INTO catalog.tablePlugins VALUES ('Plugin', 'url')")
+    fetched_at = set_catalog_fetched(cursor, "tablePlugins")
+    cursor.connection.commit()
+    assert is_catalog_fresh(cursor, "tablePlugins")
+
+    # The catalog is shared with other connections.
+    other_cursor = sqlite3.connect(":memory:").cursor()
+    attach_addon_catalog(
+        other_cursor, ("tablePlugins",), ("Name", "File"), catalog_path=catalog_path
+    )
+    assert get_catalog_fetched_at(other_cursor, "tablePlugins") == fetched_at
+    assert other_cursor.execute("SELECT * FROM catalog.tablePlugins").fetchall() == [
+        ("Plugin", "url")
+    ]
+
+    other_cursor.execute(
+        "UPDATE catalog.fetches SET fetched_at = ?",
+        ((datetime.now(UTC) - ADDON_CATALOG_MAX_AGE).isoformat(),),
+    )
+    assert not is_catalog_fresh(other_cursor, "tablePlugins")
+
+
+def test_compute_addon_updates(tmp_path: Path) -> None:
+    cursor = sqlite3.connect(":memory:").cursor()
+    attach_addon_catalog(
+        cursor,
+        ("tablePlugins",),
+        ("Version", "InterfaceID"),
+        catalog_path=tmp_path / "catalog.sqlite",
+    )
+    create_addon_updates_table(cursor)
+    cursor.execute(
+        "CREATE VIRTUAL TABLE tablePluginsInstalled USING FTS5(Version, InterfaceID)"
+    )
+    cursor.executemany(
+        "INSERT INTO tablePluginsInstalled VALUES (?, ?)",
+        [("1.0", "1"), ("2.0", "2"), ("1.0", "3"), ("1.0", "")],
+    )
+    cursor.executemany(
+        "INSERT INTO catalog.tablePlugins VALUES (?, ?)",
+        [("1.1", "1"), ("2.0", "2"), ("1.0", "4")],
+    )
+
+    compute_addon_updates(cursor, "tablePluginsInstalled", "tablePlugins")
+    assert get_outdated_addon_ids(cursor, "tablePluginsInstalled") == {"1"}
+    assert cursor.execute(
+        "SELECT interface_id, installed_version, latest_version, has_update "
+        "FROM addon_updates ORDER BY interface_id"
+    ).fetchall() == [("1", "1.0", "1.1", 1), ("2", "2.0", "2.0", 0)]
+
+    # Computing again replaces the previous state.
+    cursor.execute(
+        "UPDATE tablePluginsInstalled SET Version = '1.1' WHERE InterfaceID = '1'"
+    )
+    compute_addon_updates(cursor, "tablePluginsInstalled", "tablePlugins")
+    assert get_outdated_addon_ids(cursor, "tablePluginsInstalled") == set()
+
+
+def test_catalog_conditional_fetches(tmp_path: Path) -> None:
+    cursor = sqlite3.connect(":memory:").cursor()
+    attach_addon_catalog(
+        cursor, ("tablePlugins",), ("Name",), catalog_path=tmp_path / "catalog.sqlite"
+    )
+    assert get_catalog_conditional_headers(cursor, "tablePlugins") == {}
+
+    fetched_at = set_catalog_fetched(
+        cursor, "tablePlugins", etag='"abc"', last_modified="Mon, 1 Jan 2024"
+    )
+    assert get_catalog_conditional_headers(cursor, "tablePlugins") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 1 Jan 2024",
+    }
+
+    # Fetches without changes keep the validators and modification time.
+    not_modified_at = set_catalog_not_modified(cursor, "tablePlugins")
+    assert get_catalog_fetched_at(cursor, "tablePlugins") == not_modified_at
+    assert get_catalog_modified_at(cursor, "tablePlugins") == fetched_at
+    assert get_catalog_conditional_headers(cursor, "tablePlugins") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 1 Jan 2024",
+    }
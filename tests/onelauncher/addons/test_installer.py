@@ -0,0 +1,203 @@
+import zipfile
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from onelauncher.addons import installer
+from onelauncher.addons.addon_info import (
+    AddonInfo,
+    get_compendium_plugin_files,
+    parse_compendium_file,
+)
+from onelauncher.addons.installer import (
+    AddonOperationError,
+    install_zip_addon,
+    scan_installed_addons,
+    uninstall_addon,
+)
+from onelauncher.addons.transactions import (
+    BACKUP_PREFIX,
+    STAGING_DIR_PREFIX,
+    addon_transaction,
+    get_archived_addon_version,
+)
+from onelauncher.game_config import GameType
+
+PLUGIN_FILE = """<Plugin>
+    <Information><Name>Plugin</Name><Author>Author</Author><Version>1</Version>
+    </Information>
+    <Package>Author.Plugin.Main</Package>
+</Plugin>
+"""
+
+REMOTE_ADDON_INFO = AddonInfo(
+    # Remote addon tables in the addon manager window have status prefixes.
+    name="(Installed) Plugin",
+    version="2.0",
+    author="Author",
+    file="https://www.lotrointerface.com/downloads/download1-Plugin",
+    interface_id="1",
+)
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    archive_dir = tmp_path / "archive"
+    monkeypatch.setattr(
+        installer,
+        "addon_transaction",
+        partial(
+            addon_transaction, journal_dir=tmp_path / "journal", archive_dir=archive_dir
+        ),
+    )
+    return archive_dir
+
+
+@pytest.fixture
+def settings_dir(tmp_path: Path) -> Path:
+    settings_dir = tmp_path / "settings"
+    settings_dir.mkdir()
+    return settings_dir
+
+
+def make_plugin_zip(path: Path, main_lua: str = "new") -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("Author/Plugin.plugin", PLUGIN_FILE)
+        archive.writestr("Author/Plugin/Main.lua", main_lua)
+    return path
+
+
+def test_install_plugin(tmp_path: Path, settings_dir: Path) -> None:
+    installed_addon = install_zip_addon(
+        make_plugin_zip(tmp_path / "Plugin.zip"),
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+        remote_addon_info=REMOTE_ADDON_INFO,
+    )
+
+    plugins_dir = settings_dir / "Plugins"
+    assert installed_addon.root_dir == plugins_dir / "Author"
+    assert installed_addon.plugin_files == (plugins_dir / "Author" / "Plugin.plugin",)
+    assert installed_addon.compendium_file == (
+        plugins_dir / "Author" / "Plugin.plugincompendium"
+    )
+    assert (plugins_dir / "Author" / "Plugin" / "Main.lua").read_text() == "new"
+
+    compendium_info = parse_compendium_file(
+        installed_addon.compendium_file, "PluginConfig"
+    )
+    assert compendium_info is not None
+    # Status prefixes aren't written to the compendium file.
+    assert compendium_info.name == "Plugin"
+    assert compendium_info.version == "2.0"
+    assert compendium_info.interface_id == "1"
+
+    (scanned_addon,) = scan_installed_addons(settings_dir, "plugin")
+    assert scanned_addon.interface_id == "1"
+    assert scanned_addon.file == str(installed_addon.compendium_file)
+
+
+def test_install_unmanaged_plugin(tmp_path: Path, settings_dir: Path) -> None:
+    installed_addon = install_zip_addon(
+        make_plugin_zip(tmp_path / "Plugin.zip"),
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+    )
+    assert installed_addon.compendium_file is None
+
+    (scanned_addon,) = scan_installed_addons(settings_dir, "plugin")
+    assert scanned_addon.name == "Plugin"
+    assert not scanned_addon.interface_id
+
+
+def test_scan_skips_transaction_paths(tmp_path: Path, settings_dir: Path) -> None:
+    install_zip_addon(
+        make_plugin_zip(tmp_path / "Plugin.zip"),
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+    )
+    plugins_dir = settings_dir / "Plugins"
+    # Left behind by interrupted transactions
+    staged_author_dir = plugins_dir / f"{STAGING_DIR_PREFIX}1" / "Author"
+    staged_author_dir.mkdir(parents=True)
+    (staged_author_dir / "Plugin.plugin").write_text(PLUGIN_FILE)
+    backup_dir = plugins_dir / "Author" / f"{BACKUP_PREFIX}2-0"
+    backup_dir.mkdir()
+    (backup_dir / "Plugin.plugin").write_text(PLUGIN_FILE)
+    (settings_dir / "ui" / "skins" / f"{STAGING_DIR_PREFIX}3").mkdir(parents=True)
+
+    (scanned_addon,) = scan_installed_addons(settings_dir, "plugin")
+    assert scanned_addon.file == str(plugins_dir / "Author" / "Plugin.plugin")
+    assert scan_installed_addons(settings_dir, "skin") == []
+
+
+def test_compendium_without_descriptors(settings_dir: Path) -> None:
+    compendium_file = settings_dir / "Plugin.plugincompendium"
+    compendium_file.write_text(
+        "<PluginConfig><Id>1</Id><Name>Plugin</Name></PluginConfig>"
+    )
+    assert get_compendium_plugin_files(compendium_file, settings_dir) == []
+
+
+def test_unsupported_addon_type(tmp_path: Path, settings_dir: Path) -> None:
+    with pytest.raises(AddonOperationError):
+        install_zip_addon(
+            make_plugin_zip(tmp_path / "Plugin.zip"),
+            settings_dir=settings_dir,
+            game_type=GameType.DDO,
+        )
+    assert not (settings_dir / "Plugins").exists()
+
+
+def test_replaced_paths(tmp_path: Path, settings_dir: Path) -> None:
+    old_file = settings_dir / "Plugins" / "Author" / "Old.plugin"
+    old_file.parent.mkdir(parents=True)
+    old_file.write_text(PLUGIN_FILE)
+
+    install_zip_addon(
+        make_plugin_zip(tmp_path / "Plugin.zip"),
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+        remote_addon_info=REMOTE_ADDON_INFO,
+        replaced_paths=(old_file,),
+    )
+    assert not old_file.exists()
+
+
+def test_uninstall_addon(tmp_path: Path, settings_dir: Path, archive_dir: Path) -> None:
+    installed_addon = install_zip_addon(
+        make_plugin_zip(tmp_path / "Plugin.zip"),
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+        remote_addon_info=REMOTE_ADDON_INFO,
+    )
+    assert installed_addon.compendium_file is not None
+    uninstall_addon(
+        installed_addon.compendium_file,
+        settings_dir=settings_dir,
+        addon_type="plugin",
+        addon_id="1",
+    )
+
+    # The empty author folder is removed too.
+    assert not list((settings_dir / "Plugins").iterdir())
+    # Uninstalled addons can be rolled back.
+    assert (
+        get_archived_addon_version(
+            installer.get_addon_archive_id(settings_dir, "plugin", "1"),
+            archive_dir=archive_dir,
+        )
+        is not None
+    )
+
+
+def test_scan_unmanaged_music(settings_dir: Path) -> None:
+    music_dir = settings_dir / "Music"
+    (music_dir / "Songs").mkdir(parents=True)
+    (music_dir / "loose.abc").write_text("X: 1\nT: Loose Song\nZ: Alice\n")
+
+    assert [
+        (addon_info.name, addon_info.author)
+        for addon_info in scan_installed_addons(settings_dir, "music")
+    ] == [("Songs", ""), ("Loose Song", "Alice")]
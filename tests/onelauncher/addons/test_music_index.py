@@ -0,0 +1,134 @@
+import os
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from onelauncher.addons.music_index import MusicIndex, parse_abc_file
+from onelauncher.addons.transactions import STAGING_DIR_PREFIX
+
+SONG = """X: 1
+T: Concerning Hobbits (1/2)
+Z: Transcribed by Bob
+K: C
+X: 2
+T: Concerning Hobbits (2/2)
+"""
+
+
+@pytest.fixture
+def music_dir(tmp_path: Path) -> Path:
+    music_dir = tmp_path / "Music"
+    (music_dir / "Shire" / "Extra").mkdir(parents=True)
+    (music_dir / "Shire" / "hobbits.abc").write_text(SONG)
+    (music_dir / "Shire" / "Extra" / "bree.abc").write_text("X: 1\nT: Bree\n")
+    (music_dir / "Shire" / "Shire.musiccompendium").write_text("<MusicConfig/>")
+    (music_dir / "loose.abc").write_text("X: 1\nT: Loose Song\nZ: Alice\n")
+    return music_dir
+
+
+@pytest.fixture
+def music_index(music_dir: Path, tmp_path: Path) -> Iterator[MusicIndex]:
+    with MusicIndex(music_dir, index_path=tmp_path / "index.sqlite") as music_index:
+        music_index.refresh()
+        yield music_index
+
+
+def test_parse_abc_file(tmp_path: Path) -> None:
+    abc_file = tmp_path / "song.abc"
+    abc_file.write_text(SONG)
+    abc_info = parse_abc_file(abc_file)
+    assert abc_info.title == "Concerning Hobbits (1/2)"
+    assert abc_info.transcriber == "Bob"
+    assert abc_info.parts == 2  # noqa: PLR2004
+
+
+def test_refresh(music_index: MusicIndex) -> None:
+    assert music_index.get_subdirectories(PurePosixPath()) == [PurePosixPath("Shire")]
+    (loose_song,) = music_index.get_files(PurePosixPath())
+    assert loose_song.path == PurePosixPath("loose.abc")
+    assert loose_song.title == "Loose Song"
+    assert loose_song.transcriber == "Alice"
+    assert [
+        entry.path
+        for entry in music_index.get_files(
+            PurePosixPath("Shire"), suffix=".musiccompendium"
+        )
+    ] == [PurePosixPath("Shire/Shire.musiccompendium")]
+
+
+def test_incremental_refresh(music_dir: Path, music_index: MusicIndex) -> None:
+    (music_dir / "Shire" / "Extra" / "bree.abc").unlink()
+    (music_dir / "Shire" / "Extra" / "new.abc").write_text("X: 1\nT: New Song\n")
+    (music_dir / "Rohan").mkdir()
+    (music_dir / "Rohan" / "edoras.abc").write_text("X: 1\nT: Edoras\n")
+    assert music_index.refresh()
+    assert not music_index.refresh()
+
+    assert [entry.title for entry in music_index.search("song")] == [
+        "New Song",
+        "Loose Song",
+    ]
+    assert music_index.search("bree") == []
+    assert music_index.get_subdirectories(PurePosixPath()) == [
+        PurePosixPath("Rohan"),
+        PurePosixPath("Shire"),
+    ]
+
+
+def test_unchanged_directories_are_not_relisted(
+    music_dir: Path, music_index: MusicIndex, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    song = music_dir / "Shire" / "hobbits.abc"
+    stat = song.stat()
+    song.write_text(SONG.replace("Bob", "Rob"))
+    os.utime(song, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def scandir(path: object) -> None:
+        raise AssertionError
+
+    # The directory's modification time is only changed by adding or removing
+    # entries. Edits are still picked up from the files' modification times.
+    with monkeypatch.context() as context:
+        context.setattr(os, "scandir", scandir)
+        assert music_index.refresh()
+        assert not music_index.refresh()
+    assert [entry.path for entry in music_index.search("rob")] == [
+        PurePosixPath("Shire/hobbits.abc")
+    ]
+
+
+def test_removed_directory(music_dir: Path, music_index: MusicIndex) -> None:
+    for path in sorted((music_dir / "Shire").rglob("*"), reverse=True):
+        path.rmdir() if path.is_dir() else path.unlink()
+    (music_dir / "Shire").rmdir()
+    music_index.refresh()
+
+    assert music_index.get_subdirectories(PurePosixPath()) == []
+    assert music_index.search("hobbits") == []
+
+
+def test_transaction_staging_dirs_are_skipped(
+    music_dir: Path, music_index: MusicIndex
+) -> None:
+    staging_dir = music_dir / f"{STAGING_DIR_PREFIX}1" / "Shire"
+    staging_dir.mkdir(parents=True)
+    (staging_dir / "hobbits.abc").write_text(SONG)
+    music_index.refresh()
+
+    assert music_index.get_subdirectories(PurePosixPath()) == [PurePosixPath("Shire")]
+    assert [entry.path for entry in music_index.search("hobbits")] == [
+        PurePosixPath("Shire/hobbits.abc")
+    ]
+
+
+def test_search(music_index: MusicIndex) -> None:
+    assert [entry.path for entry in music_index.search("bob hobb")] == [
+        PurePosixPath("Shire/hobbits.abc")
+    ]
+    # FTS syntax is escaped
+    assert [entry.path for entry in music_index.search('"hobbits AND')] == []
+    assert [entry.path for entry in music_index.search('hobbits"')] == [
+        PurePosixPath("Shire/hobbits.abc")
+    ]
+    assert music_index.search("") == []
@@ -0,0 +1,295 @@
+import shutil
+import sqlite3
+import zipfile
+from functools import partial
+from pathlib import Path
+
+import httpx
+import pytest
+
+from onelauncher.addons import installer
+from onelauncher.addons import service as service_module
+from onelauncher.addons.addon_info import AddonInfo
+from onelauncher.addons.cache import (
+    ADDON_COLUMN_NAMES,
+    attach_addon_catalog,
+    get_catalog_table_name,
+    set_catalog_fetched,
+)
+from onelauncher.addons.service import AddonService, check_for_addon_updates
+from onelauncher.addons.transactions import addon_transaction
+from onelauncher.game_config import GameType
+from tests.stand_in_servers import StandInServers
+
+
+def make_plugin_zip(
+    path: Path, name: str, version: str, dependencies: tuple[str, ...] = ()
+) -> Path:
+    dependency_nodes = "".join(
+        f"<dependency>{dependency}</dependency>" for dependency in dependencies
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            f"{name}Author/{name}.plugin",
+            f"<Plugin><Information><Name>{name}</Name><Version>{version}</Version>"
+            f"</Information><Package>{name}Author.{name}.Main</Package></Plugin>",
+        )
+        archive.writestr(f"{name}Author/{name}/Main.lua", version)
+        archive.writestr(
+            f"{name}Author/{name}.plugincompendium",
+            f"<PluginConfig><Name>{name}</Name><Dependencies>{dependency_nodes}"
+            "</Dependencies><StartupScript>"
+            f"{name}Author\\{name}\\startup.py</StartupScript></PluginConfig>",
+        )
+    return path
+
+
+class FakeCatalog:
+    """Addon catalog with local zip files as the download URLs"""
+
+    def __init__(self, tmp_path: Path) -> None:
+        self.path = tmp_path / "catalog.sqlite"
+        self.zips_dir = tmp_path / "zips"
+        self.zips_dir.mkdir()
+
+    def set_plugins(self, plugins: list[tuple[str, str, str, tuple[str, ...]]]) -> None:
+        """
+        Args:
+            plugins (list[tuple[str, str, str, tuple[str, ...]]]): Interface ID, name,
+                version, and dependencies of each plugin
+        """
+        with sqlite3.connect(":memory:") as conn:
+            cursor = conn.cursor()
+            attach_addon_catalog(cursor, catalog_path=self.path)
+            for addon_type in ("plugin", "skin", "music"):
+                table_name = get_catalog_table_name(GameType.LOTRO, addon_type)
+                cursor.execute(f"DELETE FROM catalog.{table_name}")  # noqa: S608
+                set_catalog_fetched(cursor, table_name)
+            question_marks = ",".join("?" * len(ADDON_COLUMN_NAMES))
+            cursor.executemany(
+                "INSERT INTO catalog."
+                f"{get_catalog_table_name(GameType.LOTRO, 'plugin')} "
+                f"VALUES({question_marks})",
+                [
+                    AddonInfo(
+                        name=name,
+                        version=version,
+                        file=str(
+                            make_plugin_zip(
+                                self.zips_dir / f"{interface_id}-{version}.zip",
+                                name,
+                                version,
+                                dependencies,
+                            )
+                        ),
+                        interface_id=interface_id,
+                    )
+                    for interface_id, name, version, dependencies in plugins
+                ],
+            )
+            conn.commit()
+
+
+@pytest.fixture
+def catalog(tmp_path: Path) -> FakeCatalog:
+    return FakeCatalog(tmp_path)
+
+
+@pytest.fixture
+def service(
+    tmp_path: Path, catalog: FakeCatalog, monkeypatch: pytest.MonkeyPatch
+) -> AddonService:
+    monkeypatch.setattr(
+        installer,
+        "addon_transaction",
+        partial(
+            addon_transaction,
+            journal_dir=tmp_path / "journal",
+            archive_dir=tmp_path / "archive",
+        ),
+    )
+
+    async def download(url: str, path: Path) -> None:
+        shutil.copyfile(url, path)
+
+    monkeypatch.setattr(AddonService, "_download", staticmethod(download))
+    settings_dir = tmp_path / "settings"
+    settings_dir.mkdir()
+    return AddonService(
+        settings_dir=settings_dir, game_type=GameType.LOTRO, catalog_path=catalog.path
+    )
+
+
+async def test_install_with_dependencies(
+    service: AddonService, catalog: FakeCatalog
+) -> None:
+    catalog.set_plugins([("1", "Main", "1.0", ("2",)), ("2", "Library", "1.0", ())])
+    await service.refresh_catalog()
+
+    results = await service.install_addons(["1", "3"])
+    assert [(result.interface_id, result.succeeded) for result in results] == [
+        ("3", False),
+        ("1", True),
+        ("2", True),
+    ]
+    assert results[1].dependencies == ("2",)
+    # Startup scripts are reported, but never enabled.
+    assert results[1].startup_script == Path("Plugins/MainAuthor/Main/startup.py")
+
+    installed_addons = await service.get_installed_addons()
+    assert sorted(addon.interface_id for addon in installed_addons) == ["1", "2"]
+    assert not any(addon.has_update for addon in installed_addons)
+
+
+async def test_update(service: AddonService, catalog: FakeCatalog) -> None:
+    catalog.set_plugins([("1", "Main", "1.0", ())])
+    await service.install_addons(["1"])
+
+    catalog.set_plugins([("1", "Main", "2.0", ())])
+    (installed_addon,) = await service.get_installed_addons()
+    assert installed_addon.has_update
+    assert installed_addon.latest_version == "2.0"
+
+    (result,) = await service.update_addons()
+    assert result.succeeded
+    assert result.version == "2.0"
+    (installed_addon,) = await service.get_installed_addons()
+    assert installed_addon.version == "2.0"
+    assert not installed_addon.has_update
+    assert (
+        service.settings_dir / "Plugins" / "MainAuthor" / "Main" / "Main.lua"
+    ).read_text() == "2.0"
+
+    (result,) = await service.update_addons(["1"])
+    assert result.succeeded
+    assert result.message == "Already up to date"
+
+
+async def test_uninstall_with_dependents(
+    service: AddonService, catalog: FakeCatalog
+) -> None:
+    catalog.set_plugins([("1", "Main", "1.0", ("2",)), ("2", "Library", "1.0", ())])
+    await service.install_addons(["1"])
+
+    (result,) = await service.uninstall_addons(["2"])
+    assert not result.succeeded
+    assert result.message == "Required by Main"
+
+    # Uninstalling the dependent at the same time is fine.
+    results = await service.uninstall_addons(["2", "1"])
+    assert all(result.succeeded for result in results)
+    assert await service.get_installed_addons() == []
+
+
+async def test_force_uninstall(service: AddonService, catalog: FakeCatalog) -> None:
+    catalog.set_plugins([("1", "Main", "1.0", ("2",)), ("2", "Library", "1.0", ())])
+    await service.install_addons(["1"])
+
+    (result,) = await service.uninstall_addons(["2"], force=True)
+    assert result.succeeded
+    assert [addon.interface_id for addon in await service.get_installed_addons()] == [
+        "1"
+    ]
+
+
+async def test_refresh_catalog_conditional_requests(
+    service: AddonService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            text="<UIList><Ui><UID>1</UID><UIName>Main</UIName>"
+            "<UIVersion>1.0</UIVersion></Ui></UIList>",
+            headers={"ETag": '"v1"'},
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        monkeypatch.setattr(service_module, "get_httpx_client", lambda _url: client)
+        await service.refresh_catalog(force=True)
+        state_fingerprint = service.get_state_fingerprint()
+        await service.refresh_catalog(force=True)
+
+    assert [request.headers.get("If-None-Match") for request in requests] == [
+        *(None for _ in service.addon_types),
+        *('"v1"' for _ in service.addon_types),
+    ]
+    assert [addon.name for addon in service.get_catalog("plugin")] == ["Main"]
+    # Unchanged feeds don't count as catalog changes.
+    assert service.get_state_fingerprint() == state_fingerprint
+
+
+async def test_check_for_addon_updates(
+    service: AddonService, catalog: FakeCatalog, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    catalog.set_plugins([("1", "Main", "1.0", ()), ("2", "Library", "1.0", ())])
+    await service.install_addons(["1", "2"])
+    catalog.set_plugins([("1", "Main", "2.0", ()), ("2", "Library", "1.0", ())])
+
+    async def refresh_catalog(*, force: bool = False) -> None:
+        pass
+
+    monkeypatch.setattr(service, "refresh_catalog", refresh_catalog)
+    check = await check_for_addon_updates(service)
+    assert [addon.interface_id for addon in check.outdated_addons] == ["1"]
+
+    # Installed addons aren't scanned again when nothing changed.
+    async def get_installed_addons() -> None:
+        raise AssertionError
+
+    with monkeypatch.context() as context:
+        context.setattr(service, "get_installed_addons", get_installed_addons)
+        assert await check_for_addon_updates(service, check) is check
+
+    # Updating an addon in place outside of the launcher doesn't change any folder
+    # modification times.
+    compendium_file = service.settings_dir / "Plugins/MainAuthor/Main.plugincompendium"
+    compendium_file.write_text(
+        compendium_file.read_text().replace(
+            "<Version>1.0</Version>", "<Version>2.0</Version>"
+        )
+    )
+    check = await check_for_addon_updates(service, check)
+    assert check.outdated_addons == ()
+
+
+async def test_stand_in_servers(
+    stand_in_servers: StandInServers,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        installer,
+        "addon_transaction",
+        partial(
+            addon_transaction,
+            journal_dir=tmp_path / "journal",
+            archive_dir=tmp_path / "archive",
+        ),
+    )
+    monkeypatch.setattr(
+        service_module, "get_addons_feed_url", stand_in_servers.get_addons_feed_url
+    )
+    settings_dir = tmp_path / "settings"
+    settings_dir.mkdir()
+    service = AddonService(
+        settings_dir=settings_dir,
+        game_type=GameType.LOTRO,
+        catalog_path=tmp_path / "catalog.sqlite",
+    )
+
+    await service.refresh_catalog()
+    interface_ids = [
+        addon_info.interface_id
+        for addon_type in service.addon_types
+        for addon_info in service.get_catalog(addon_type)[:2]
+    ]
+    results = await service.install_addons(interface_ids)
+    assert all(result.succeeded for result in results)
+    assert sorted(
+        addon.interface_id for addon in await service.get_installed_addons()
+    ) == sorted(interface_ids)
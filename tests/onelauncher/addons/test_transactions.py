@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import pytest
+
+from onelauncher.addons.transactions import (
+    AddonTransaction,
+    AddonTransactionState,
+    addon_transaction,
+    get_archived_addon_version,
+    recover_addon_transactions,
+    rollback_addon_version,
+)
+
+
+@pytest.fixture
+def journal_dir(tmp_path: Path) -> Path:
+    return tmp_path / "journal"
+
+
+@pytest.fixture
+def archive_dir(tmp_path: Path) -> Path:
+    return tmp_path / "archive"
+
+
+@pytest.fixture
+def skins_dir(tmp_path: Path) -> Path:
+    skins_dir = tmp_path / "ui" / "skins"
+    (skins_dir / "Skin").mkdir(parents=True)
+    (skins_dir / "Skin" / "SkinDefinition.xml").write_text("old")
+    return skins_dir
+
+
+def stage_new_skin(transaction: AddonTransaction, skins_dir: Path) -> None:
+    staged_skin = transaction.make_staging_dir(skins_dir) / "Skin"
+    staged_skin.mkdir()
+    (staged_skin / "SkinDefinition.xml").write_text("new")
+    transaction.replace(skins_dir / "Skin", staged=staged_skin)
+
+
+def test_commit(skins_dir: Path, journal_dir: Path, archive_dir: Path) -> None:
+    with addon_transaction(
+        addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+    ) as transaction:
+        stage_new_skin(transaction, skins_dir)
+        transaction.commit()
+
+    assert (skins_dir / "Skin" / "SkinDefinition.xml").read_text() == "new"
+    # Only the installed skin is left. Staging and backup dirs are cleaned up.
+    assert [path.name for path in skins_dir.iterdir()] == ["Skin"]
+    assert not list(journal_dir.iterdir())
+
+    archived_version = get_archived_addon_version("skin", archive_dir=archive_dir)
+    assert archived_version is not None
+    assert archived_version.transaction_id == transaction.id
+    (entry,) = archived_version.entries
+    assert entry.archived is not None
+    assert (entry.archived / "SkinDefinition.xml").read_text() == "old"
+
+
+def test_only_newest_version_is_archived(
+    skins_dir: Path, journal_dir: Path, archive_dir: Path
+) -> None:
+    transaction_ids: list[str] = []
+    for _ in range(2):
+        with addon_transaction(
+            addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+        ) as transaction:
+            stage_new_skin(transaction, skins_dir)
+            transaction.commit()
+        transaction_ids.append(transaction.id)
+
+    assert [path.name for path in archive_dir.iterdir()] == transaction_ids[-1:]
+
+
+def test_abort(skins_dir: Path, journal_dir: Path, archive_dir: Path) -> None:
+    with addon_transaction(
+        addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+    ) as transaction:
+        stage_new_skin(transaction, skins_dir)
+
+    assert (skins_dir / "Skin" / "SkinDefinition.xml").read_text() == "old"
+    assert [path.name for path in skins_dir.iterdir()] == ["Skin"]
+    assert not list(journal_dir.iterdir())
+    assert get_archived_addon_version("skin", archive_dir=archive_dir) is None
+
+
+def test_failed_commit_is_reverted(
+    skins_dir: Path, journal_dir: Path, archive_dir: Path
+) -> None:
+    with addon_transaction(
+        addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+    ) as transaction:
+        stage_new_skin(transaction, skins_dir)
+        # Staged file that doesn't exist, so its swap fails.
+        transaction.replace(skins_dir / "Other", staged=skins_dir / "missing" / "Other")
+        with pytest.raises(OSError):  # noqa: PT011
+            transaction.commit()
+
+    assert (skins_dir / "Skin" / "SkinDefinition.xml").read_text() == "old"
+    assert [path.name for path in skins_dir.iterdir()] == ["Skin"]
+
+
+class TestRecoverAddonTransactions:
+    def test_revert_swapping(
+        self, skins_dir: Path, journal_dir: Path, archive_dir: Path
+    ) -> None:
+        transaction = AddonTransaction(
+            addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+        )
+        stage_new_skin(transaction, skins_dir)
+        # Simulate being interrupted partway through the swap.
+        transaction._write_journal(AddonTransactionState.SWAPPING)
+        (entry,) = transaction._entries.values()
+        entry.destination.rename(entry.backup)
+
+        recover_addon_transactions(journal_dir=journal_dir, archive_dir=archive_dir)
+
+        assert (skins_dir / "Skin" / "SkinDefinition.xml").read_text() == "old"
+        assert [path.name for path in skins_dir.iterdir()] == ["Skin"]
+        assert not list(journal_dir.iterdir())
+
+    def test_finish_swapped(
+        self, skins_dir: Path, journal_dir: Path, archive_dir: Path
+    ) -> None:
+        transaction = AddonTransaction(
+            addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+        )
+        stage_new_skin(transaction, skins_dir)
+        # Simulate being interrupted after the swap, but before archiving.
+        (entry,) = transaction._entries.values()
+        entry.destination.rename(entry.backup)
+        assert entry.staged is not None
+        entry.staged.rename(entry.destination)
+        transaction._write_journal(AddonTransactionState.SWAPPED)
+
+        recover_addon_transactions(journal_dir=journal_dir, archive_dir=archive_dir)
+
+        assert (skins_dir / "Skin" / "SkinDefinition.xml").read_text() == "new"
+        assert [path.name for path in skins_dir.iterdir()] == ["Skin"]
+        assert not list(journal_dir.iterdir())
+        assert get_archived_addon_version("skin", archive_dir=archive_dir)
+
+
+def test_rollback(skins_dir: Path, journal_dir: Path, archive_dir: Path) -> None:
+    with addon_transaction(
+        addon_id="skin", journal_dir=journal_dir, archive_dir=archive_dir
+    ) as transaction:
+        stage_new_skin(transaction, skins_dir)
+        # File that is removed in the new version
+        (skins_dir / "Removed.txt").write_text("")
+        transaction.replace(skins_dir / "Removed.txt")
+        transaction.commit()
+    archived_version = get_archived_addon_version("skin", archive_dir=archive_dir)
+    assert archived_version is not None
+
+    rollback_addon_version(
+        archived_version, journal_dir=journal_dir, archive_dir=archive_dir
+    )
+
+    assert (skins_dir / "Skin" / "SkinDefinition.xml").read_text() == "old"
+    assert (skins_dir / "Removed.txt").exists()
+    assert not list(journal_dir.iterdir())
+    # The rollback can itself be rolled back.
+    new_archived_version = get_archived_addon_version("skin", archive_dir=archive_dir)
+    assert new_archived_version is not None
+    assert new_archived_version.transaction_id != archived_version.transaction_id
+    assert not (archive_dir / archived_version.transaction_id).exists()
@@ -0,0 +1,117 @@
+import zipfile
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from onelauncher.addons.zip_addon import (
+    InvalidAddonArchiveError,
+    extract_zip_addon,
+    get_zip_addon_layout,
+    move_into_place,
+)
+
+
+def make_archive(path: Path, names: list[str]) -> zipfile.ZipFile:
+    with zipfile.ZipFile(path, "w") as archive:
+        for name in names:
+            if name.endswith("/"):
+                archive.mkdir(name)
+            else:
+                archive.writestr(name, f"contents of {name}")
+    return zipfile.ZipFile(path)
+
+
+class TestGetZipAddonLayout:
+    def test_plugin(self, tmp_path: Path) -> None:
+        with make_archive(
+            tmp_path / "addon.zip",
+            [
+                "Plugins/Turbine/Utils/Class.lua",
+                "Plugins/Author/Author.plugincompendium",
+                "Plugins/Author/Plugin.plugin",
+                "Plugins/Author/Plugin/Main.lua",
+                "readme.txt",
+            ],
+        ) as archive:
+            layout = get_zip_addon_layout(archive, addon_name="addon")
+
+        assert layout.addon_type == "plugin"
+        assert layout.root_dir == PurePosixPath("Author")
+        assert layout.top_level_dirs == ("Turbine", "Author")
+        # Loose files aren't installed for plugins
+        assert PurePosixPath("readme.txt") not in {
+            member.path for member in layout.members
+        }
+
+    def test_plugin_author_folder_from_plugin_file(self, tmp_path: Path) -> None:
+        with make_archive(
+            tmp_path / "addon.zip",
+            ["Lib/Lib/Main.lua", "Author/Plugin.plugin", "Author/Plugin/Main.lua"],
+        ) as archive:
+            layout = get_zip_addon_layout(archive, addon_name="addon")
+
+        assert layout.root_dir == PurePosixPath("Author")
+
+    def test_plugin_without_author_folder(self, tmp_path: Path) -> None:
+        with (
+            make_archive(
+                tmp_path / "addon.zip", ["A/Main.lua", "B/Main.lua", "C.plugin"]
+            ) as archive,
+            pytest.raises(InvalidAddonArchiveError),
+        ):
+            get_zip_addon_layout(archive, addon_name="addon")
+
+    def test_music_without_root_dir(self, tmp_path: Path) -> None:
+        with make_archive(
+            tmp_path / "songs.zip", ["Music/song.abc", "Music/other.abc"]
+        ) as archive:
+            layout = get_zip_addon_layout(archive, addon_name="songs")
+
+        assert layout.addon_type == "music"
+        assert layout.root_dir == PurePosixPath("songs")
+        assert {member.path for member in layout.members} == {
+            PurePosixPath("songs/song.abc"),
+            PurePosixPath("songs/other.abc"),
+        }
+
+    def test_skin_with_root_dir(self, tmp_path: Path) -> None:
+        with make_archive(
+            tmp_path / "skin.zip",
+            ["ui/", "ui/skins/", "ui/skins/Skin/", "ui/skins/Skin/SkinDefinition.xml"],
+        ) as archive:
+            layout = get_zip_addon_layout(archive, addon_name="skin")
+
+        assert layout.addon_type == "skin"
+        assert layout.root_dir == PurePosixPath("Skin")
+        assert layout.top_level_dirs == ("Skin",)
+
+    def test_empty(self, tmp_path: Path) -> None:
+        with (
+            make_archive(tmp_path / "empty.zip", ["Folder/"]) as archive,
+            pytest.raises(InvalidAddonArchiveError),
+        ):
+            get_zip_addon_layout(archive, addon_name="empty")
+
+
+def test_extract_and_move_into_place(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "Plugins"
+    (plugins_dir / "Author" / "Other").mkdir(parents=True)
+    (plugins_dir / "Author" / "Plugin.plugin").write_text("old")
+
+    with make_archive(
+        tmp_path / "addon.zip", ["Author/Plugin.plugin", "Author/Plugin/Main.lua"]
+    ) as archive:
+        layout = get_zip_addon_layout(archive, addon_name="addon")
+        staging_dir = plugins_dir / ".staging"
+        extract_zip_addon(archive, layout, staging_dir)
+
+    for dir_name in layout.top_level_dirs:
+        move_into_place(staging_dir / dir_name, plugins_dir / dir_name)
+
+    assert (plugins_dir / "Author" / "Plugin.plugin").read_text() == (
+        "contents of Author/Plugin.plugin"
+    )
+    assert (plugins_dir / "Author" / "Plugin" / "Main.lua").exists()
+    # Existing folders are merged into, not replaced.
+    assert (plugins_dir / "Author" / "Other").exists()
+    assert not (staging_dir / "Author").exists()
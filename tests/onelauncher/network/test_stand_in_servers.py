@@ -0,0 +1,86 @@
+import pytest
+
+from onelauncher.config_manager import ConfigManager
+from onelauncher.network.game_launcher_config import GameLauncherConfig
+from onelauncher.network.game_services_info import GameServicesInfo
+from onelauncher.network.login_account import (
+    WrongUsernameOrPasswordError,
+    login_account,
+)
+from onelauncher.network.world_login_queue import WorldLoginQueue
+from onelauncher.patch_game import AkamaiPatchingError, akamai_patching
+from onelauncher.utilities import Progress
+from tests.stand_in_servers import StandInServers
+
+
+async def test_login_flow(stand_in_servers: StandInServers) -> None:
+    stand_in_servers.config.queue_length = 2
+    game_services_info = await GameServicesInfo.from_url(
+        gls_datacenter_service=stand_in_servers.gls_datacenter_service,
+        game_datacenter_name="LOTRO",
+    )
+    assert sorted(world.name for world in game_services_info.worlds) == list(
+        stand_in_servers.get_world_names()
+    )
+
+    with pytest.raises(WrongUsernameOrPasswordError):
+        await login_account(game_services_info.auth_server, "user", "wrong")
+    login_response = await login_account(
+        game_services_info.auth_server, "user", "password"
+    )
+    (subscription,) = login_response.get_game_subscriptions("LOTRO")
+
+    game_launcher_config = await GameLauncherConfig.from_url(
+        game_services_info.launcher_config_url
+    )
+    world = min(game_services_info.worlds, key=lambda world: world.name)
+    world_status = await world.get_status()
+    world_login_queue = WorldLoginQueue(
+        login_queue_url=game_launcher_config.login_queue_url,
+        login_queue_params_template=game_launcher_config.login_queue_params_template,
+        subscription_name=subscription.name,
+        session_ticket=login_response.session_ticket,
+        world_queue_url=world_status.queue_url,
+    )
+    queue_results = [await world_login_queue.join_queue() for _ in range(3)]
+    assert [result.now_serving_number for result in queue_results] == [1, 2, 3]
+    assert {result.queue_number for result in queue_results} == {3}
+
+
+async def test_akamai_patching(
+    stand_in_servers: StandInServers, config_manager: ConfigManager
+) -> None:
+    (game_id,) = config_manager.get_game_config_ids()
+    game_directory = config_manager.get_game_config(game_id).game_directory
+    stand_in_servers.write_launcher_config(game_directory)
+
+    progress = Progress()
+    await akamai_patching(
+        game_id=game_id, config_manager=config_manager, progress=progress
+    )
+    assert len(list((game_directory / "data").iterdir())) == (
+        stand_in_servers.config.patching_file_count
+    )
+    assert len(list((game_directory / "raw" / "en" / "logo").iterdir())) == (
+        stand_in_servers.config.splashscreen_count
+    )
+    assert (
+        progress.get_current_progress().completed
+        == progress.get_current_progress().total
+    )
+
+
+async def test_akamai_patching_file_list_error(
+    stand_in_servers: StandInServers, config_manager: ConfigManager
+) -> None:
+    (game_id,) = config_manager.get_game_config_ids()
+    stand_in_servers.write_launcher_config(
+        config_manager.get_game_config(game_id).game_directory
+    )
+    stand_in_servers.config.failing_paths = frozenset({"/akamai/"})
+
+    with pytest.raises(AkamaiPatchingError):
+        await akamai_patching(
+            game_id=game_id, config_manager=config_manager, progress=Progress()
+        )
+    assert stand_in_servers.requests[-1].status == stand_in_servers.config.error_status
@@ -0,0 +1,114 @@
+from itertools import pairwise
+
+import httpx
+import pytest
+import trio
+
+from onelauncher.network import world_login_queue as world_login_queue_module
+from onelauncher.network.world_login_queue import (
+    WorldLoginQueue,
+    WorldQueuePollingPolicy,
+    WorldQueueProgress,
+)
+
+QUEUE_URL = "https://gls.example.com/GLS.AuthServer/LoginQueue.aspx"
+QUEUE_NUMBER = 0x100
+SERVING_RATE = 2
+"""Queue numbers served per second"""
+
+
+def get_queue_result_xml(now_serving_number: int) -> str:
+    return (
+        "<Result><Command>TakeANumber</Command><HResult>0x00000000</HResult>"
+        f"<QueueNumber>{QUEUE_NUMBER:#x}</QueueNumber>"
+        f"<NowServingNumber>{now_serving_number:#x}</NowServingNumber></Result>"
+    )
+
+
+def get_world_login_queue() -> WorldLoginQueue:
+    return WorldLoginQueue(
+        login_queue_url=QUEUE_URL,
+        login_queue_params_template="command=TakeANumber&subscription={0}"
+        "&ticket={1}&ticket_type=GLS&queue_url={2}",
+        subscription_name="subscription",
+        session_ticket="ticket",
+        world_queue_url="https://gls.example.com/queue",
+    )
+
+
+async def poll_queue(
+    monkeypatch: pytest.MonkeyPatch,
+    statuses: list[int],
+    polling_policy: WorldQueuePollingPolicy,
+) -> tuple[list[float], list[WorldQueueProgress]]:
+    """
+    Wait for a turn in a queue that moves at `SERVING_RATE`. Responses use
+    `statuses`, in order, before always succeeding.
+
+    Returns:
+        tuple[list[float], list[WorldQueueProgress]]: Time of each poll and
+            the reported progress
+    """
+    start_time = trio.current_time()
+    poll_times: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        poll_times.append(trio.current_time() - start_time)
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(
+            200,
+            text=get_queue_result_xml(
+                int((trio.current_time() - start_time) * SERVING_RATE)
+            ),
+        )
+
+    progress: list[WorldQueueProgress] = []
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        monkeypatch.setattr(
+            world_login_queue_module, "get_httpx_client", lambda _url: client
+        )
+        await get_world_login_queue().wait_for_turn(
+            on_progress=progress.append, polling_policy=polling_policy
+        )
+    return poll_times, progress
+
+
+async def test_wait_for_turn(
+    monkeypatch: pytest.MonkeyPatch, autojump_clock: trio.testing.MockClock
+) -> None:
+    polling_policy = WorldQueuePollingPolicy(jitter=0)
+    poll_times, progress = await poll_queue(monkeypatch, [], polling_policy)
+    # Reaching the front takes `QUEUE_NUMBER / SERVING_RATE` seconds. Polls are
+    # spread out while the queue is long, rather than made every second.
+    assert (
+        QUEUE_NUMBER / SERVING_RATE
+        <= poll_times[-1]
+        <= (QUEUE_NUMBER / SERVING_RATE + 1)
+    )
+    assert len(poll_times) < QUEUE_NUMBER / SERVING_RATE / 4
+    assert max(b - a for a, b in pairwise(poll_times)) == polling_policy.max_interval
+    assert progress[0].eta is None
+    for update in progress[1:]:
+        assert update.serving_rate == pytest.approx(SERVING_RATE, rel=0.1)
+        assert update.eta == pytest.approx(update.people_ahead / SERVING_RATE, rel=0.1)
+
+
+async def test_wait_for_turn_retries(
+    monkeypatch: pytest.MonkeyPatch, autojump_clock: trio.testing.MockClock
+) -> None:
+    poll_times, _ = await poll_queue(
+        monkeypatch,
+        [503, 503, 503],
+        WorldQueuePollingPolicy(retry_interval=4, max_retries=3),
+    )
+    # Retry delays double and are between half and all of the full delay.
+    retry_delays = [b - a for a, b in pairwise(poll_times[:4])]
+    assert len(retry_delays) == 3  # noqa: PLR2004
+    for retry_number, delay in enumerate(retry_delays):
+        assert 2 * 2**retry_number <= delay <= 4 * 2**retry_number
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await poll_queue(
+            monkeypatch, [503, 503], WorldQueuePollingPolicy(max_retries=1)
+        )
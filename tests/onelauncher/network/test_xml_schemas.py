@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+import xmlschema
+
+from onelauncher.network import xml_schemas
+from onelauncher.network.xml_schemas import (
+    NetworkXMLSchemaName,
+    decode_xml,
+    get_xml_schema,
+)
+
+WORLD_STATUS_XML = (
+    "<Status><name>{name}</name><logintiers>1</logintiers>"
+    "<world_full>false</world_full><loginservers>10.0.0.1:9000;</loginservers>"
+    "<logintierlastnumbers>0</logintierlastnumbers>"
+    "<logintiermultipliers>1</logintiermultipliers><queuenames>Queue</queuenames>"
+    "<queueurls>{queue_urls}</queueurls>"
+    "<nowservingqueuenumber>0x1</nowservingqueuenumber>"
+    "<lastassignedqueuenumber>0x2</lastassignedqueuenumber>"
+    "<allow_billing_role>{allow_billing_role}</allow_billing_role>"
+    "<deny_billing_role/><allow_admin_role/><deny_admin_role/>"
+    "<farmid>{farm_id}</farmid><wait_hint>{wait_hint}</wait_hint></Status>"
+)
+
+
+def get_world_status_xml(
+    name: str = "Glamdring",
+    queue_urls: str = "https://gls.lotro.com/GLS.DataCenterServer/Queue.aspx;",
+    allow_billing_role: str = "",
+    farm_id: str = "12",
+    wait_hint: str = "0.5",
+) -> str:
+    return WORLD_STATUS_XML.format(
+        name=name,
+        queue_urls=queue_urls,
+        allow_billing_role=allow_billing_role,
+        farm_id=farm_id,
+        wait_hint=wait_hint,
+    )
+
+
+@pytest.fixture(scope="module")
+def schemas_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("schemas_cache")
+
+
+@pytest.fixture(autouse=True)
+def schemas_cache_path(
+    schemas_cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    schemas_cache_path = schemas_cache_dir / "schemas.pickle"
+    monkeypatch.setattr(xml_schemas, "SCHEMAS_CACHE_PATH", schemas_cache_path)
+    return schemas_cache_path
+
+
+@pytest.mark.parametrize(
+    ("name", "xml"),
+    [
+        ("world_status", get_world_status_xml()),
+        ("world_status", get_world_status_xml(name=" Spaced ", farm_id=" +7 ")),
+        ("world_status", get_world_status_xml(allow_billing_role="A,B")),
+        ("world_status", get_world_status_xml(wait_hint="1e999")),
+        ("world_status", get_world_status_xml(wait_hint="INF")),
+        ("world_status", get_world_status_xml(wait_hint="inf")),
+        ("world_status", get_world_status_xml(farm_id="2147483648")),
+        ("world_status", get_world_status_xml(farm_id="")),
+        ("world_status", get_world_status_xml(queue_urls="")),
+        ("world_status", get_world_status_xml(queue_urls=" https://a b ")),
+        ("world_status", get_world_status_xml().replace("<name>", "<name a='1'>")),
+        ("world_status", get_world_status_xml().replace("<farmid>12</farmid>", "")),
+        ("world_status", get_world_status_xml().replace("</Status>", "<x/></Status>")),
+        (
+            "world_queue_result",
+            "<Result><HResult>0x00000000</HResult><QueueNumber>0x1f</QueueNumber>"
+            "<NowServingNumber>0x1A</NowServingNumber><Command/></Result>",
+        ),
+        ("world_queue_result", "<Result><HResult>0x80004005</HResult></Result>"),
+        ("world_queue_result", "<Result><HResult> 0x00000000</HResult></Result>"),
+        ("world_queue_result", "<Result><HResult>0x0</HResult></Result>"),
+        ("world_queue_result", "<Result><HResult/></Result>"),
+        ("world_queue_result", "<Result>text<HResult>0x00000000</HResult></Result>"),
+        (
+            "world_queue_result",
+            "<Result><HResult>0x00000000</HResult><HResult>0x00000000</HResult>"
+            "</Result>",
+        ),
+        ("world_queue_result", "<Other><HResult>0x00000000</HResult></Other>"),
+    ],
+)
+def test_decode_xml_matches_schema(name: NetworkXMLSchemaName, xml: str) -> None:
+    try:
+        expected = get_xml_schema(name).to_dict(xml)
+    except xmlschema.XMLSchemaValidationError:
+        with pytest.raises(xmlschema.XMLSchemaValidationError):
+            decode_xml(name, xml)
+    else:
+        assert decode_xml(name, xml) == expected
+
+
+def test_decode_xml_fast_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    def get_xml_schema(name: NetworkXMLSchemaName) -> xmlschema.XMLSchema:
+        raise AssertionError
+
+    monkeypatch.setattr(xml_schemas, "get_xml_schema", get_xml_schema)
+    assert decode_xml("world_status", get_world_status_xml())["farmid"] == 12  # noqa: PLR2004
+    assert decode_xml(
+        "world_queue_result", "<Result><HResult>0x00000000</HResult></Result>"
+    ) == {"HResult": "0x00000000"}
+
+
+def test_schemas_cache(
+    schemas_cache_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    schemas_cache_path.unlink(missing_ok=True)
+    xml_schemas._get_xml_schemas.cache_clear()
+    schema = get_xml_schema("world_status")
+    assert schemas_cache_path.exists()
+
+    def compile_schema(*args: object, **kwargs: object) -> None:
+        raise AssertionError
+
+    xml_schemas._get_xml_schemas.cache_clear()
+    with monkeypatch.context() as context:
+        context.setattr(xmlschema, "XMLSchema", compile_schema)
+        cached_schema = get_xml_schema("world_status")
+    assert cached_schema is not schema
+    assert cached_schema.to_dict(get_world_status_xml()) == schema.to_dict(
+        get_world_status_xml()
+    )
+
+    # Broken caches are replaced.
+    schemas_cache_path.write_bytes(b"broken")
+    xml_schemas._get_xml_schemas.cache_clear()
+    assert get_xml_schema("world_status").is_valid(get_world_status_xml())
+    xml_schemas._get_xml_schemas.cache_clear()
+    with monkeypatch.context() as context:
+        context.setattr(xmlschema, "XMLSchema", compile_schema)
+        get_xml_schema("world_status")
+
+
+def test_schemas_cache_key() -> None:
+    xml_schemas._get_xml_schemas.cache_clear()
+    get_xml_schema("world_status")
+    schema_paths = sorted(xml_schemas.SCHEMAS_DIR.glob("*.xsd"))
+    assert xml_schemas._load_cached_schemas(
+        xml_schemas._get_cache_key(schema_paths, xmlschema.__version__)
+    )
+    assert (
+        xml_schemas._load_cached_schemas(
+            xml_schemas._get_cache_key(schema_paths, "0.0.0")
+        )
+        is None
+    )
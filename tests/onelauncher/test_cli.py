@@ -1,17 +1,25 @@
+import json
+import subprocess
+import sys
+from datetime import UTC, datetime
 from pathlib import Path
-from shutil import rmtree
+from shutil import copyfile, rmtree
 
+import attrs
 import cyclopts
 import pytest
+import trio
+import trio.testing
 from PySide6 import QtWidgets
 from pytest_mock import MockerFixture
 
-from onelauncher import cli, main
+from onelauncher import cli, install_game, main, main_window, setup_wizard, tracing
 from onelauncher.config_manager import (
     PROGRAM_CONFIG_DEFAULT_NAME,
     ConfigFileError,
     ConfigManager,
 )
+from onelauncher.ui.qtapp import get_qapp
 
 
 @pytest.fixture
@@ -35,12 +43,28 @@ async def test_normal(
     assert app([]) == 0
     async_mock.assert_called_once()
 
-    main_window_mock = mocker.patch.object(main, "MainWindow", autospec=True)
+    main_window_mock = mocker.patch.object(main_window, "MainWindow", autospec=True)
 
     await async_mock.call_args.kwargs["entry"]()
     main_window_mock.assert_called_once()
 
 
+async def test_trace_file(
+    config_manager: ConfigManager,
+    app: cyclopts.App,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    async_mock = mocker.patch.object(cli, "start_async_gui")
+    async_mock.return_value = 0
+    trace_file = tmp_path / "trace.json"
+
+    assert app(["--trace-file", str(trace_file)]) == 0
+    trace = json.loads(trace_file.read_text())
+    assert any(event["name"] == "Parse config file" for event in trace["traceEvents"])
+    assert not tracing.is_tracing()
+
+
 async def test_no_config(app: cyclopts.App, mocker: MockerFixture) -> None:
     async_mock = mocker.patch.object(cli, "start_async_gui")
     async_mock.return_value = 0
@@ -48,7 +72,7 @@ async def test_no_config(app: cyclopts.App, mocker: MockerFixture) -> None:
     assert app([]) == 0
     async_mock.assert_called_once()
 
-    mock = mocker.patch.object(main, "SetupWizard", autospec=True)
+    mock = mocker.patch.object(setup_wizard, "SetupWizard", autospec=True)
     mock_instance = mock.return_value
     mock_instance.result.return_value = QtWidgets.QDialog.DialogCode.Rejected
 
@@ -69,7 +93,7 @@ async def test_no_games(
     async_mock.assert_called_once()
 
     mocker.patch.object(QtWidgets.QMessageBox, "information")
-    mock = mocker.patch.object(main, "SetupWizard", autospec=True)
+    mock = mocker.patch.object(setup_wizard, "SetupWizard", autospec=True)
     mock_instance = mock.return_value
     mock_instance.result.return_value = QtWidgets.QDialog.DialogCode.Rejected
 
@@ -109,6 +133,84 @@ def test_invalid_program_config_with_backup(
     assert mock.call_args.kwargs["backup_available"] is True
 
 
+def test_invalid_game_config(
+    config_manager: ConfigManager, app: cyclopts.App, mocker: MockerFixture
+) -> None:
+    (game_id,) = config_manager.get_game_config_ids()
+    game_config_path = config_manager.get_game_config_path(game_id)
+    game_config_path.write_text(
+        game_config_path.read_text().replace(
+            'game_type = "LOTRO"', 'game_type = "INVALID"'
+        )
+    )
+
+    mock = mocker.patch.object(main, "show_invalid_config_dialog")
+    mock.return_value = None
+
+    assert app([]) == 1
+    mock.assert_called_once()
+    assert mock.call_args.kwargs["error"].config_file_path == game_config_path
+
+
+async def test_invalid_game_configs_load_backup(
+    config_manager: ConfigManager, app: cyclopts.App, mocker: MockerFixture
+) -> None:
+    (initial_game_id,) = config_manager.get_game_config_ids()
+    config_manager.update_game_config_file(
+        game_id=initial_game_id,
+        config=attrs.evolve(
+            config_manager.get_game_config(initial_game_id),
+            last_played=datetime.now(tz=UTC),
+        ),
+    )
+    config_manager.update_game_accounts_config_file(
+        game_id=initial_game_id, accounts=()
+    )
+    second_game_id, second_game_config = install_game.get_default_game_config(
+        installer=install_game.GAME_INSTALLERS[0], config_manager=config_manager
+    )
+    config_manager.update_game_config_file(
+        game_id=second_game_id, config=second_game_config
+    )
+    # Neither of these is the config of the initial game.
+    game_config_path = config_manager.get_game_config_path(second_game_id)
+    accounts_config_path = config_manager.get_game_accounts_config_path(initial_game_id)
+    for config_path in (game_config_path, accounts_config_path):
+        copyfile(config_path, config_manager.get_config_backup_path(config_path))
+    game_config_path.write_text(
+        game_config_path.read_text().replace(
+            'game_type = "LOTRO"', 'game_type = "INVALID"'
+        )
+    )
+    accounts_config_path.write_text("INVALID")
+
+    mock = mocker.patch.object(main, "show_invalid_config_dialog")
+    mock.return_value = True
+
+    async_mock = mocker.patch.object(cli, "start_async_gui")
+    async_mock.return_value = 0
+
+    assert app([]) == 0
+    assert {call.kwargs["error"].config_file_path for call in mock.call_args_list} == {
+        game_config_path,
+        accounts_config_path,
+    }
+
+    # The real main window loads every game and the accounts of the initial game.
+    get_qapp()
+    mocker.patch.object(main_window, "check_for_update")
+    run_spy = mocker.spy(main_window.MainWindow, "run")
+    with trio.fail_after(10):
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(async_mock.call_args.kwargs["entry"])
+            await trio.testing.wait_all_tasks_blocked(cushion=0.1)
+            nursery.cancel_scope.cancel()
+    window: main_window.MainWindow = run_spy.call_args.args[0]
+    switch_game_menu = window.ui.btnSwitchGame.menu()
+    assert switch_game_menu is not None
+    assert len(switch_game_menu.actions()) == 1
+
+
 async def test_invalid_program_config_load_backup(
     app: cyclopts.App,
     mocker: MockerFixture,
@@ -129,7 +231,7 @@ async def test_invalid_program_config_load_backup(
     assert app([]) == 0
     async_mock.assert_called_once()
 
-    main_window_mock = mocker.patch.object(main, "MainWindow", autospec=True)
+    main_window_mock = mocker.patch.object(main_window, "MainWindow", autospec=True)
 
     await async_mock.call_args.kwargs["entry"]()
     main_window_mock.assert_called_once()
@@ -137,7 +239,47 @@ async def test_invalid_program_config_load_backup(
     assert not backup_program_config.exists()
 
 
+def test_addons_without_interface_ids(
+    config_manager: ConfigManager, app: cyclopts.App
+) -> None:
+    assert app(["addons", "install"]) == 1
+    assert app(["addons", "uninstall"]) == 1
+    assert app(["addons", "update"]) == 1
+
+
+def test_addons_update_all_with_interface_ids(
+    config_manager: ConfigManager, app: cyclopts.App, mocker: MockerFixture
+) -> None:
+    mock = mocker.patch.object(cli, "get_game_addon_service")
+    assert app(["addons", "update", "--all", "1"]) == 1
+    mock.assert_not_called()
+
+
 def test_generate_shell_completion(app: cyclopts.App) -> None:
     assert app(["generate-shell-completion", "bash"]) == 0
     assert app(["generate-shell-completion", "fish"]) == 0
     assert app(["generate-shell-completion", "zsh"]) == 0
+
+
+def test_lazy_imports() -> None:
+    # A fresh interpreter is needed, since the tests have already imported everything.
+    heavy_modules = (
+        "onelauncher.main_window",
+        "onelauncher.addon_manager_window",
+        "feedparser",
+        "keyring",
+        "qtawesome",
+        "xmlschema",
+        "zeep",
+    )
+    imported_modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, onelauncher.cli; print(*sys.modules, sep='\\n')",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.splitlines()
+    assert not set(heavy_modules).intersection(imported_modules)
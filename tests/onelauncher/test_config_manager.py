@@ -1,15 +1,20 @@
-from datetime import datetime, timedelta, timezone
+import os
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta, timezone
 from pathlib import Path
 from textwrap import dedent
 from typing import Any
 
+import attrs
 import pytest
 import tomlkit
 
 import onelauncher.config_manager
 from onelauncher import install_game
-from onelauncher.config import ConfigFieldMetadata, ConfigValWithMetadata
-from onelauncher.program_config import ProgramConfig
+from onelauncher.config import Config, ConfigFieldMetadata, ConfigValWithMetadata
+from onelauncher.game_account_config import GameAccountConfig
+from onelauncher.game_config import GameConfig, GameConfigID, GameType
+from onelauncher.program_config import GamesSortingMode, ProgramConfig
 
 test_key_val_params: list[tuple[dict[str, Any], str]] = [
     ({"key": "val"}, 'key = "val"\n'),
@@ -198,3 +203,268 @@ class TestConfigManager:
         game_config.game_directory.mkdir(parents=True)
         config_manager.delete_game_config(game_id, exclude_install_dir=True)
         assert game_config.game_directory.exists()
+
+    def test_verify_configs_structures_all_configs(
+        self,
+        config_manager: onelauncher.config_manager.ConfigManager,
+    ) -> None:
+        (played_game_id,) = config_manager.get_game_config_ids()
+        config_manager.update_game_config_file(
+            game_id=played_game_id,
+            config=attrs.evolve(
+                config_manager.get_game_config(played_game_id),
+                last_played=datetime.now(tz=UTC),
+            ),
+        )
+        invalid_game_id, invalid_game_config = install_game.get_default_game_config(
+            installer=install_game.GAME_INSTALLERS[0], config_manager=config_manager
+        )
+        config_manager.update_game_config_file(
+            game_id=invalid_game_id, config=invalid_game_config
+        )
+        invalid_game_config_path = config_manager.get_game_config_path(invalid_game_id)
+        valid_game_config_text = invalid_game_config_path.read_text()
+        invalid_game_config_path.write_text(
+            valid_game_config_text.replace(
+                'game_type = "LOTRO"', 'game_type = "INVALID"'
+            )
+        )
+
+        # Invalid values are found even for games that aren't loaded first.
+        with pytest.raises(onelauncher.config_manager.ConfigFileParseError) as exc_info:
+            config_manager.verify_configs()
+        assert exc_info.value.config_file_path == invalid_game_config_path
+
+        invalid_game_config_path.write_text(valid_game_config_text)
+        config_manager.verify_configs()
+        # Verification creates new game ID objects.
+        game_ids = {
+            str(game_id): game_id for game_id in config_manager.get_game_config_ids()
+        }
+        assert str(config_manager.get_initial_game()) == str(played_game_id)
+        assert config_manager.get_game_accounts(game_ids[str(invalid_game_id)]) == ()
+
+    def test_config_snapshots(
+        self,
+        config_manager: onelauncher.config_manager.ConfigManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (game_id,) = config_manager.get_game_config_ids()
+        game_config_path = config_manager.get_game_config_path(game_id)
+        game_config = onelauncher.config_manager.read_config_file(
+            config_class=GameConfig, config_file_path=game_config_path
+        )
+        # Configs modified this recently are always parsed, since they could be
+        # edited again without their modification time changing.
+        config_manager.verify_configs()
+        parsed_strings: list[str] = []
+        tomlkit_parse = tomlkit.parse
+
+        def parse(string: str) -> tomlkit.TOMLDocument:
+            parsed_strings.append(string)
+            return tomlkit_parse(string)
+
+        with monkeypatch.context() as context:
+            context.setattr(tomlkit, "parse", parse)
+            config_manager.verify_configs()
+        assert len(parsed_strings) == 3  # noqa: PLR2004
+        assert config_manager.config_snapshots_path
+        assert not config_manager.config_snapshots_path.exists()
+
+        config_paths = (
+            config_manager.program_config_path,
+            game_config_path,
+            config_manager.get_game_accounts_config_path(game_id),
+        )
+        old_mtime = datetime.now(tz=UTC).timestamp() - 60
+        for config_path in config_paths:
+            os.utime(config_path, (old_mtime, old_mtime))
+        config_manager.verify_configs()
+        assert config_manager.config_snapshots_path.exists()
+
+        # Unchanged configs are loaded from the snapshots.
+        parsed_strings.clear()
+        with monkeypatch.context() as context:
+            context.setattr(tomlkit, "parse", parse)
+            config_manager.verify_configs()
+            (game_id,) = config_manager.get_game_config_ids()
+            assert config_manager.read_game_config_file(game_id) == game_config
+            assert config_manager.read_game_accounts_config_file(game_id) == ()
+        assert parsed_strings == []
+
+        # Edited configs are parsed again, even if their size is the same.
+        game_config_path.write_text(
+            game_config_path.read_text().replace(
+                f'name = "{game_config.name}"',
+                f'name = "{"E" * len(game_config.name)}"',
+            )
+        )
+        config_manager.verify_configs()
+        (game_id,) = config_manager.get_game_config_ids()
+        assert config_manager.read_game_config_file(game_id).name == (
+            "E" * len(game_config.name)
+        )
+
+    def test_batch_writes(
+        self,
+        config_manager: onelauncher.config_manager.ConfigManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (game_id,) = config_manager.get_game_config_ids()
+        game_config_path = config_manager.get_game_config_path(game_id)
+        game_config_text = game_config_path.read_text()
+        written_paths: list[Path] = []
+        update_config_file = onelauncher.config_manager.update_config_file
+
+        def record_update_config_file(
+            config: Config,
+            config_file_path: Path,
+            postconverter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        ) -> None:
+            written_paths.append(config_file_path)
+            update_config_file(config, config_file_path, postconverter)
+
+        monkeypatch.setattr(
+            onelauncher.config_manager, "update_config_file", record_update_config_file
+        )
+        account = GameAccountConfig(
+            username="user", display_name=None, last_used_world_name="World"
+        )
+        with config_manager.batch_writes():
+            for sorting_priority in range(3):
+                config_manager.update_game_config_file(
+                    game_id,
+                    attrs.evolve(
+                        config_manager.read_game_config_file(game_id),
+                        sorting_priority=sorting_priority,
+                    ),
+                )
+                config_manager.update_game_accounts_config_file(game_id, (account,))
+            assert config_manager.get_game_config(game_id).sorting_priority == 2  # noqa: PLR2004
+            assert game_config_path.read_text() == game_config_text
+        assert written_paths == [
+            game_config_path,
+            config_manager.get_game_accounts_config_path(game_id),
+        ]
+        config_manager.verify_configs()
+        (game_id,) = config_manager.get_game_config_ids()
+        assert config_manager.get_game_config(game_id).sorting_priority == 2  # noqa: PLR2004
+        assert config_manager.get_game_accounts(game_id) == (account,)
+
+        # Unchanged configs aren't written again.
+        written_paths.clear()
+        config_manager.update_game_accounts_config_file(game_id, (account,))
+        assert written_paths == []
+
+    def test_atomic_writes(
+        self,
+        config_manager: onelauncher.config_manager.ConfigManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (game_id,) = config_manager.get_game_config_ids()
+        game_config_path = config_manager.get_game_config_path(game_id)
+        game_config_text = game_config_path.read_text()
+
+        def fsync(fd: int) -> None:
+            raise OSError
+
+        monkeypatch.setattr(os, "fsync", fsync)
+        with pytest.raises(OSError):  # noqa: PT011
+            config_manager.update_game_config_file(
+                game_id,
+                attrs.evolve(
+                    config_manager.read_game_config_file(game_id), name="Renamed"
+                ),
+            )
+        assert game_config_path.read_text() == game_config_text
+        assert not list(game_config_path.parent.glob(".*.tmp"))
+
+    def test_reload_configs(
+        self, config_manager: onelauncher.config_manager.ConfigManager
+    ) -> None:
+        (game_id,) = config_manager.get_game_config_ids()
+        game_config = config_manager.read_game_config_file(game_id)
+        game_config_path = config_manager.get_game_config_path(game_id)
+        accounts_config_path = config_manager.get_game_accounts_config_path(game_id)
+
+        # Configs that are the same as the cached ones aren't changes.
+        assert not config_manager.reload_program_config_file()
+        assert not config_manager.reload_game_config_file(game_id)
+        assert not config_manager.reload_game_accounts_config_file(game_id)
+
+        game_config_path.write_text(
+            game_config_path.read_text().replace(
+                f'name = "{game_config.name}"', 'name = "Edited"'
+            )
+        )
+        assert config_manager.reload_game_config_file(game_id)
+        assert config_manager.get_game_config_ids() == (game_id,)
+        assert config_manager.read_game_config_file(game_id).name == "Edited"
+
+        account = GameAccountConfig(
+            username="user", display_name=None, last_used_world_name="World"
+        )
+        other_config_manager = onelauncher.config_manager.ConfigManager(
+            program_config_dir=config_manager.program_config_dir,
+            games_dir=config_manager.games_dir,
+            config_snapshots_path=None,
+        )
+        other_config_manager.verify_configs()
+        (other_game_id,) = other_config_manager.get_game_config_ids()
+        other_config_manager.update_game_accounts_config_file(other_game_id, (account,))
+        assert config_manager.reload_game_accounts_config_file(game_id)
+        assert config_manager.read_game_accounts_config_file(game_id) == (account,)
+
+        # Invalid files don't replace the cached config.
+        accounts_config_path.write_text("invalid = ")
+        with pytest.raises(onelauncher.config_manager.ConfigFileParseError):
+            config_manager.reload_game_accounts_config_file(game_id)
+        assert config_manager.read_game_accounts_config_file(game_id) == (account,)
+
+        # Games are added and removed.
+        new_game_id = GameConfigID("new_game")
+        config_manager.get_game_config_dir(new_game_id).mkdir()
+        assert not config_manager.reload_game_config_file(new_game_id)
+        config_manager.get_game_config_path(new_game_id).write_text(
+            game_config_path.read_text()
+        )
+        assert config_manager.reload_game_config_file(new_game_id)
+        assert config_manager.get_game_config_ids() == (game_id, new_game_id)
+        assert config_manager.read_game_accounts_config_file(new_game_id) == ()
+        game_config_path.unlink()
+        assert config_manager.reload_game_config_file(game_id)
+        assert config_manager.get_game_config_ids() == (new_game_id,)
+
+    def test_merged_game_configs_memoized(
+        self, config_manager: onelauncher.config_manager.ConfigManager
+    ) -> None:
+        (game_id,) = config_manager.get_game_config_ids()
+        merged_configs: list[GameConfig] = []
+
+        def get_merged_game_config(config: GameConfig) -> GameConfig:
+            merged_configs.append(config)
+            return attrs.evolve(config, newsfeed="https://example.com")
+
+        config_manager.get_merged_game_config = get_merged_game_config
+        for sorting_mode in GamesSortingMode:
+            assert config_manager.get_games_sorted(sorting_mode, GameType.LOTRO) == (
+                game_id,
+            )
+        assert config_manager.get_game_config(game_id).newsfeed == (
+            "https://example.com"
+        )
+        assert len(merged_configs) == 1
+
+        # Updates are merged again.
+        config_manager.update_game_config_file(
+            game_id,
+            attrs.evolve(
+                config_manager.read_game_config_file(game_id), game_type=GameType.DDO
+            ),
+        )
+        assert config_manager.get_games_by_game_type(GameType.LOTRO) == ()
+        assert config_manager.get_games_by_game_type(GameType.DDO) == (game_id,)
+        assert len(merged_configs) == 2  # noqa: PLR2004
+
+        config_manager.get_merged_game_config = lambda config: config
+        assert config_manager.get_game_config(game_id).newsfeed is None
@@ -0,0 +1,225 @@
+from collections.abc import Iterator
+from typing import override
+
+import keyring
+import pytest
+from keyring.backend import KeyringBackend
+from keyring.backends import SecretService, fail
+from keyring.errors import NoKeyringError, PasswordDeleteError
+
+from onelauncher.config_manager import ConfigManager
+from onelauncher.game_account_config import GameAccountConfig
+from onelauncher.keyring_cache import KeyringCache
+
+SERVICE_NAME = "OneLauncherTest"
+
+
+class MemoryKeyring(KeyringBackend):
+    priority = 1
+
+    def __init__(self) -> None:
+        super().__init__()  # type: ignore[no-untyped-call]
+        self.passwords: dict[tuple[str, str], str] = {}
+        self.get_password_calls = 0
+
+    @override
+    def get_password(self, service: str, username: str) -> str | None:
+        self.get_password_calls += 1
+        return self.passwords.get((service, username))
+
+    @override
+    def set_password(self, service: str, username: str, password: str) -> None:
+        self.passwords[service, username] = password
+
+    @override
+    def delete_password(self, service: str, username: str) -> None:
+        if self.passwords.pop((service, username), None) is None:
+            raise PasswordDeleteError
+
+
+@pytest.fixture
+def memory_keyring() -> Iterator[MemoryKeyring]:
+    previous_keyring = keyring.get_keyring()
+    memory_keyring = MemoryKeyring()
+    keyring.set_keyring(memory_keyring)
+    yield memory_keyring
+    keyring.set_keyring(previous_keyring)
+
+
+def test_keyring_cache(memory_keyring: MemoryKeyring) -> None:
+    memory_keyring.set_password(SERVICE_NAME, "a", "password_a")
+    keyring_cache = KeyringCache(SERVICE_NAME)
+    keyring_cache.prefetch(["a", "b"])
+    assert memory_keyring.get_password_calls == 2  # noqa: PLR2004
+    assert keyring_cache.get_password("a") == "password_a"
+    assert keyring_cache.get_password("b") is None
+    keyring_cache.prefetch(["a", "b"])
+    assert memory_keyring.get_password_calls == 2  # noqa: PLR2004
+
+    # Changes made through the cache are cached too.
+    keyring_cache.set_password("b", "password_b")
+    assert keyring_cache.get_password("b") == "password_b"
+    keyring_cache.delete_password("a")
+    assert keyring_cache.get_password("a") is None
+    with pytest.raises(PasswordDeleteError):
+        keyring_cache.delete_password("a")
+    assert memory_keyring.get_password_calls == 2  # noqa: PLR2004
+    assert memory_keyring.passwords == {(SERVICE_NAME, "b"): "password_b"}
+
+
+def test_keyring_cache_expires(memory_keyring: MemoryKeyring) -> None:
+    keyring_cache = KeyringCache(SERVICE_NAME, max_age=-1)
+    keyring_cache.prefetch(["a"])
+    memory_keyring.set_password(SERVICE_NAME, "a", "password_a")
+    assert keyring_cache.get_password("a") == "password_a"
+
+
+class FakeSecretServiceItem:
+    def __init__(self, attributes: dict[str, str], secret: str) -> None:
+        self.attributes = attributes
+        self.secret = secret
+
+    def get_attributes(self) -> dict[str, str]:
+        return self.attributes
+
+    def get_secret(self) -> bytes:
+        return self.secret.encode("utf-8")
+
+    def is_locked(self) -> bool:
+        return False
+
+
+class FakeSecretServiceConnection:
+    def close(self) -> None:
+        pass
+
+
+class FakeSecretServiceCollection:
+    def __init__(self, items: list[FakeSecretServiceItem]) -> None:
+        self.items = items
+        self.connection = FakeSecretServiceConnection()
+        self.search_count = 0
+
+    def search_items(
+        self, attributes: dict[str, str]
+    ) -> Iterator[FakeSecretServiceItem]:
+        self.search_count += 1
+        return (
+            item for item in self.items if attributes.items() <= item.attributes.items()
+        )
+
+
+class FakeSecretServiceKeyring(SecretService.Keyring):
+    def __init__(self, collection: FakeSecretServiceCollection) -> None:
+        super().__init__()  # type: ignore[no-untyped-call]
+        self.collection = collection
+        self.get_password_calls = 0
+
+    @override
+    def get_preferred_collection(self) -> FakeSecretServiceCollection:
+        return self.collection
+
+    @override
+    def get_password(self, service: str, username: str) -> str | None:
+        self.get_password_calls += 1
+        return next(
+            (
+                item.secret
+                for item in self.collection.items
+                if item.attributes == {"service": service, "username": username}
+            ),
+            None,
+        )
+
+
+@pytest.mark.parametrize("scheme", ["default", "KeePassXC"])
+def test_keyring_cache_secret_service(scheme: str) -> None:
+    service_attribute, username_attribute = (
+        ("service", "username") if scheme == "default" else ("Title", "UserName")
+    )
+    collection = FakeSecretServiceCollection(
+        [
+            FakeSecretServiceItem(
+                {service_attribute: SERVICE_NAME, username_attribute: "a"},
+                "password_a",
+            ),
+            FakeSecretServiceItem(
+                {service_attribute: "Other", username_attribute: "b"}, "password_b"
+            ),
+        ]
+    )
+    backend = FakeSecretServiceKeyring(collection)
+    backend.scheme = scheme
+    previous_keyring = keyring.get_keyring()
+    keyring.set_keyring(backend)
+    try:
+        keyring_cache = KeyringCache(SERVICE_NAME)
+        keyring_cache.prefetch(["a", "b"])
+        assert keyring_cache.get_password("a") == "password_a"
+        assert keyring_cache.get_password("b") is None
+    finally:
+        keyring.set_keyring(previous_keyring)
+    assert collection.search_count == 1
+    assert backend.get_password_calls == 0
+
+
+@pytest.mark.parametrize("search_error", [False, True])
+def test_keyring_cache_secret_service_fallback(search_error: bool) -> None:
+    collection = FakeSecretServiceCollection(
+        [
+            FakeSecretServiceItem(
+                {"service": SERVICE_NAME, "username": "a"}, "password_a"
+            )
+        ]
+    )
+    if search_error:
+        # Like if the library changed.
+        del collection.connection
+    backend = FakeSecretServiceKeyring(collection)
+    if not search_error:
+        backend.scheme = "Unknown"
+    previous_keyring = keyring.get_keyring()
+    keyring.set_keyring(backend)
+    try:
+        keyring_cache = KeyringCache(SERVICE_NAME)
+        keyring_cache.prefetch(["a", "b"])
+        assert keyring_cache.get_password("a") == "password_a"
+        assert keyring_cache.get_password("b") is None
+    finally:
+        keyring.set_keyring(previous_keyring)
+    assert backend.get_password_calls == 2  # noqa: PLR2004
+
+
+def test_keyring_cache_no_keyring() -> None:
+    previous_keyring = keyring.get_keyring()
+    keyring.set_keyring(fail.Keyring())  # type: ignore[no-untyped-call]
+    try:
+        with pytest.raises(NoKeyringError):
+            KeyringCache(SERVICE_NAME).prefetch([])
+    finally:
+        keyring.set_keyring(previous_keyring)
+
+
+async def test_prefetch_game_keyring_info(
+    config_manager: ConfigManager, memory_keyring: MemoryKeyring
+) -> None:
+    (game_id,) = config_manager.get_game_config_ids()
+    accounts = tuple(
+        GameAccountConfig(
+            username=f"user{i}", display_name=None, last_used_world_name=None
+        )
+        for i in range(3)
+    )
+    config_manager.update_game_accounts_config_file(game_id, accounts)
+    config_manager.save_game_account_password(game_id, accounts[0], "password")
+    config_manager._keyring_cache.clear()
+
+    await config_manager.prefetch_game_keyring_info(game_id)
+    get_password_calls = memory_keyring.get_password_calls
+    for account in accounts:
+        config_manager.get_game_account_password(game_id, account)
+        config_manager.get_game_account_last_used_subscription_name(game_id, account)
+    assert memory_keyring.get_password_calls == get_password_calls
+    assert config_manager.get_game_account_password(game_id, accounts[0]) == (
+        "password"
+    )
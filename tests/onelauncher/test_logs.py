@@ -0,0 +1,123 @@
+import logging
+import queue
+import sys
+import threading
+from collections.abc import Callable
+from typing import override
+
+import pytest
+
+from onelauncher import logs
+from onelauncher.logs import DroppingQueueHandler, ForwardLogsHandler
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+        self.format_threads: set[threading.Thread] = set()
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format_threads.add(threading.current_thread())
+        self.messages.append(self.format(record))
+
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    logger = logging.getLogger(f"{__name__}.test")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_dropping_queue_handler(logger: logging.Logger) -> None:
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(2)
+    queue_handler = DroppingQueueHandler(log_queue, block_timeout=0)
+    logger.addHandler(queue_handler)
+    try:
+        mutable_arg = ["before"]
+        logger.info("Message %s", mutable_arg)
+        mutable_arg[0] = "after"
+        logger.info("Message 2")
+        # The queue is full, so these are dropped.
+        logger.info("Message 3")
+        logger.error("Message 4")
+        assert queue_handler.dropped_count == 2  # noqa: PLR2004
+
+        records = [log_queue.get_nowait(), log_queue.get_nowait()]
+        logger.info("Message 5")
+    finally:
+        logger.removeHandler(queue_handler)
+    records.extend((log_queue.get_nowait(), log_queue.get_nowait()))
+
+    assert [record.getMessage() for record in records] == [
+        "Message ['before']",
+        "Message 2",
+        "2 log messages were dropped, because logging fell behind",
+        "Message 5",
+    ]
+    assert queue_handler.dropped_count == 0
+
+
+def test_setup_application_logging(monkeypatch: pytest.MonkeyPatch) -> None:
+    root_logger = logging.getLogger()
+    recording_handler = RecordingHandler()
+    monkeypatch.setattr(logging, "StreamHandler", lambda: recording_handler)
+    # Leave any logging set up by other tests alone.
+    monkeypatch.setattr(root_logger, "handlers", [])
+    monkeypatch.setattr(root_logger, "level", root_logger.level)
+    monkeypatch.setattr(logs, "_queue_listener", None)
+    monkeypatch.setattr(logging, "logThreads", logging.logThreads)
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    logs.setup_application_logging(logs.LogLevel.DEBUG)
+    # Setting up again replaces the previous handlers.
+    logs.setup_application_logging(logs.LogLevel.DEBUG)
+    assert len(root_logger.handlers) == 1
+
+    logging.getLogger(__name__).info("Queued")
+    logs._stop_queue_listener()
+    monkeypatch.undo()
+    assert recording_handler.messages[-1] == f"{__name__} - INFO - Queued"
+    assert threading.current_thread() not in recording_handler.format_threads
+
+
+def test_forward_logs_handler(logger: logging.Logger) -> None:
+    batches: list[list[tuple[str, int]]] = []
+    scheduled_calls: list[tuple[float, Callable[[], None]]] = []
+    forward_logs_handler = ForwardLogsHandler(
+        new_logs_callback=lambda forwarded_records: batches.append(
+            [
+                (forwarded_record.record.message, forwarded_record.repeat_count)
+                for forwarded_record in forwarded_records
+            ]
+        ),
+        max_batches_per_second=2,
+        max_pending_records=3,
+        call_later=lambda delay, callback: scheduled_calls.append((delay, callback)),
+    )
+    logger.addHandler(forward_logs_handler)
+    try:
+        for _ in range(3):
+            logger.info("Repeated")
+        logger.info("Other")
+        # Only one send is scheduled for the whole batch.
+        assert len(scheduled_calls) == 1
+        assert scheduled_calls[0][0] == 0
+        scheduled_calls.pop()[1]()
+        assert batches == [[("Repeated", 3), ("Other", 1)]]
+
+        # The next batch waits for the rest of the interval.
+        for i in range(5):
+            logger.info("Message %d", i)
+        ((delay, send),) = scheduled_calls
+        assert 0 < delay <= 0.5  # noqa: PLR2004
+        send()
+    finally:
+        logger.removeHandler(forward_logs_handler)
+    assert batches[1] == [
+        ("2 log messages were dropped, because they were logged too quickly", 1),
+        ("Message 2", 1),
+        ("Message 3", 1),
+        ("Message 4", 1),
+    ]
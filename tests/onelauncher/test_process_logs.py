@@ -0,0 +1,145 @@
+import os
+import subprocess
+import sys
+from contextlib import AsyncExitStack
+from functools import partial
+from pathlib import Path
+
+import pytest
+import trio
+
+from onelauncher import process_logs
+from onelauncher.async_utils import for_each_in_stream
+from onelauncher.process_logs import (
+    INDEX_TAIL_LENGTH,
+    ProcessOutputCapture,
+    get_process_run,
+    read_process_run_output,
+    read_process_runs,
+)
+
+LINE_COUNT = 100
+EXIT_CODE = 3
+
+
+async def run_captured_process(
+    logs_dir: Path, tail_length: int = 1000
+) -> tuple[ProcessOutputCapture, list[str]]:
+    """
+    Capture a process that prints `LINE_COUNT` numbers to stdout and then "crashed"
+    to stderr, the same way `start_game` does.
+
+    Returns:
+        tuple[ProcessOutputCapture, list[str]]: The closed capture and the lines
+            that were passed on to be logged
+    """
+    logged_lines: list[str] = []
+    async with AsyncExitStack() as exit_stack, trio.open_nursery() as nursery:
+        process: trio.Process = await nursery.start(
+            partial(
+                trio.run_process,
+                (
+                    sys.executable,
+                    "-c",
+                    f"import sys\nfor i in range({LINE_COUNT}): print(i)\n"
+                    f"print('crashed', file=sys.stderr)\nsys.exit({EXIT_CODE})",
+                ),
+                check=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        )
+        output_capture = await exit_stack.enter_async_context(
+            ProcessOutputCapture(
+                process=process,
+                phase="game",
+                game_id="game",
+                logs_dir=logs_dir,
+                tail_length=tail_length,
+            )
+        )
+        assert process.stdout is not None
+        assert process.stderr is not None
+        # Streams are read one after the other, so the order of lines is known.
+        await for_each_in_stream(
+            process.stdout,
+            output_capture.get_line_handler("stdout", logged_lines.append),
+        )
+        await for_each_in_stream(
+            process.stderr,
+            output_capture.get_line_handler("stderr", logged_lines.append),
+        )
+    return output_capture, logged_lines
+
+
+def get_log_file_names(logs_dir: Path) -> set[str]:
+    return {path.name for path in logs_dir.glob("*.jsonl.gz")}
+
+
+async def test_process_output_capture(tmp_path: Path) -> None:
+    output_capture, logged_lines = await run_captured_process(tmp_path, tail_length=10)
+    expected_lines = [*(str(i) for i in range(LINE_COUNT)), "crashed"]
+    assert logged_lines == expected_lines
+    assert [line.text for line in output_capture.tail] == expected_lines[-10:]
+    assert output_capture.tail[-1].stream == "stderr"
+    assert output_capture.tail[-1].pid == output_capture.process.pid
+    assert output_capture.tail[-1].phase == "game"
+
+    run_info = get_process_run(output_capture.run_id, tmp_path)
+    assert run_info is not None
+    assert run_info.exit_code == EXIT_CODE
+    assert run_info.tail == tuple(output_capture.tail)
+    output = list(read_process_run_output(run_info, tmp_path))
+    assert [line.text for line in output] == expected_lines
+    assert output[-10:] == list(output_capture.tail)
+
+    # Only the end of the output is kept in the index.
+    output_capture, _ = await run_captured_process(tmp_path)
+    run_info = get_process_run(output_capture.run_id, tmp_path)
+    assert run_info is not None
+    assert len(run_info.tail) == INDEX_TAIL_LENGTH
+    assert run_info.tail[-1].text == "crashed"
+
+
+async def test_process_runs_pruned(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(process_logs, "MAX_PROCESS_RUNS", 2)
+    run_ids = [(await run_captured_process(tmp_path))[0].run_id for _ in range(3)]
+    runs = read_process_runs(tmp_path)
+    assert [run.run_id for run in runs] == run_ids[1:]
+    assert get_log_file_names(tmp_path) == {run.log_file_name for run in runs}
+
+
+async def test_read_cut_off_process_run_output(tmp_path: Path) -> None:
+    output_capture, logged_lines = await run_captured_process(tmp_path)
+    run_info = get_process_run(output_capture.run_id, tmp_path)
+    assert run_info is not None
+    log_file_path = tmp_path / run_info.log_file_name
+    log_file_data = log_file_path.read_bytes()
+    log_file_path.write_bytes(log_file_data[: len(log_file_data) // 2])
+
+    output = [line.text for line in read_process_run_output(run_info, tmp_path)]
+    assert 0 < len(output) < len(logged_lines)
+    assert output == logged_lines[: len(output)]
+
+    # Lines that were only partially written are skipped.
+    with (tmp_path / process_logs.PROCESS_LOGS_INDEX_NAME).open("a") as index_file:
+        index_file.write('{"run_id": "')
+    assert [run.run_id for run in read_process_runs(tmp_path)] == [run_info.run_id]
+
+
+async def test_unindexed_log_files_pruned(tmp_path: Path) -> None:
+    await run_captured_process(tmp_path)
+    # Left by runs that were never indexed, like because of a crash.
+    old_log_file = tmp_path / "old.jsonl.gz"
+    old_log_file.touch()
+    os.utime(old_log_file, (0, 0))
+    new_log_file = tmp_path / "new.jsonl.gz"
+    new_log_file.touch()
+
+    await run_captured_process(tmp_path)
+    assert get_log_file_names(tmp_path) == {
+        *(run.log_file_name for run in read_process_runs(tmp_path)),
+        new_log_file.name,
+    }
@@ -0,0 +1,134 @@
+from collections.abc import Iterator
+
+import pytest
+import trio
+
+from onelauncher import tracing
+from onelauncher.config_manager import ConfigManager
+from onelauncher.patch_game import akamai_patching
+from onelauncher.tracing import (
+    Span,
+    TraceEvent,
+    count,
+    start_tracing,
+    stop_tracing,
+)
+from onelauncher.utilities import Progress
+from tests.stand_in_servers import StandInServers
+
+
+@pytest.fixture
+def tracing_started() -> Iterator[None]:
+    start_tracing()
+    yield
+    stop_tracing()
+
+
+def get_spans(events: list[TraceEvent], name: str) -> list[TraceEvent]:
+    return [event for event in events if event["ph"] == "X" and event["name"] == name]
+
+
+@Span("sync function", "test", kind="sync")
+def sync_function(value: int) -> int:
+    return value + 1
+
+
+@Span("async function", "test")
+async def async_function(value: int) -> int:
+    await trio.lowlevel.checkpoint()
+    return value + 1
+
+
+@pytest.mark.usefixtures("tracing_started")
+async def test_span() -> None:
+    with Span("outer", "test", number=1) as span:
+        with pytest.raises(ValueError, match="inner"), Span("inner", "test"):
+            raise ValueError("inner")
+        span.set(result="done")
+        assert sync_function(1) == 2  # noqa: PLR2004
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(async_function, 1)
+        nursery.start_soon(async_function, 2)
+    events = stop_tracing()
+
+    (outer,) = get_spans(events, "outer")
+    (inner,) = get_spans(events, "inner")
+    (sync_span,) = get_spans(events, "sync function")
+    assert outer["cat"] == "test"
+    assert outer["args"] == {"number": "1", "result": "done"}
+    assert inner["args"] == {"exception": "ValueError"}
+    assert sync_span["args"] == {"kind": "sync"}
+    for span_event in (inner, sync_span):
+        assert outer["ts"] <= span_event["ts"]
+        assert span_event["ts"] + span_event["dur"] <= outer["ts"] + outer["dur"]
+        assert span_event["tid"] == outer["tid"]
+
+    # Concurrent tasks get their own tracks.
+    async_spans = get_spans(events, "async function")
+    assert len(async_spans) == 2  # noqa: PLR2004
+    track_ids = {span_event["tid"] for span_event in async_spans}
+    assert len(track_ids) == 2  # noqa: PLR2004
+    assert outer["tid"] not in track_ids
+    track_names = {
+        event["tid"]: event["args"]["name"]
+        for event in events
+        if event["name"] == "thread_name"
+    }
+    assert all(
+        track_names[track_id].endswith("async_function") for track_id in track_ids
+    )
+
+
+async def test_tracing_disabled() -> None:
+    with Span("not recorded", "test"):
+        count("not recorded")
+    assert sync_function(1) == 2  # noqa: PLR2004
+    assert await async_function(1) == 2  # noqa: PLR2004
+    assert not tracing.is_tracing()
+    assert stop_tracing() == []
+
+
+@pytest.mark.usefixtures("tracing_started")
+def test_count(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tracing, "COUNTER_SAMPLE_INTERVAL_NS", 60 * 10**9)
+    for _ in range(100):
+        count("items", 2)
+    counter_events = [event for event in stop_tracing() if event["ph"] == "C"]
+    # Only the first and final values are recorded, because of the sample interval.
+    assert [event["args"]["value"] for event in counter_events] == [2, 200]
+
+
+@pytest.mark.usefixtures("tracing_started")
+async def test_akamai_patching_trace(
+    stand_in_servers: StandInServers, config_manager: ConfigManager
+) -> None:
+    stand_in_servers.config.patching_file_count = 5
+    stand_in_servers.config.patching_file_size = 1024
+    (game_id,) = config_manager.get_game_config_ids()
+    stand_in_servers.write_launcher_config(
+        config_manager.get_game_config(game_id).game_directory
+    )
+    await akamai_patching(
+        game_id=game_id, config_manager=config_manager, progress=Progress()
+    )
+    events = stop_tracing()
+
+    assert len(get_spans(events, "Akamai patching")) == 1
+    download_spans = get_spans(events, "Download Akamai file")
+    patching_file_spans = [
+        span_event
+        for span_event in download_spans
+        if span_event["args"]["path"].startswith("data")
+    ]
+    assert len(patching_file_spans) == 5  # noqa: PLR2004
+    assert all(
+        span_event["args"]["size"] == "1024" for span_event in patching_file_spans
+    )
+    bytes_downloaded = [
+        event["args"]["value"]
+        for event in events
+        if event["ph"] == "C" and event["name"] == "Akamai bytes downloaded"
+    ]
+    assert bytes_downloaded[-1] == sum(
+        int(span_event["args"]["size"]) for span_event in download_spans
+    )
@@ -7,7 +7,16 @@ import pytest
 
 import onelauncher
 import onelauncher.utilities
-from onelauncher.utilities import CaseInsensitiveAbsolutePath, RelativePathError
+from onelauncher.utilities import (
+    CaseInsensitiveAbsolutePath,
+    RelativePathError,
+    invalidate_case_insensitive_path_cache,
+)
+
+
+def set_old_mtime(path: Path, mtime: int = 1_000_000_000) -> None:
+    """Make `path` look like it hasn't been modified recently, so it can be cached"""
+    os.utime(path, (mtime, mtime))
 
 
 class TestCaseInsensitiveAbsolutePath:
@@ -29,6 +38,49 @@ class TestCaseInsensitiveAbsolutePath:
 
             assert CaseInsensitiveAbsolutePath(tmp_path / paths[0]) == real_path
 
+    def test_directory_listings_cached(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "Folder").mkdir()
+        (tmp_path / "Folder" / "File").touch()
+        set_old_mtime(tmp_path / "Folder")
+        set_old_mtime(tmp_path)
+        real_path = tmp_path / "Folder" / "File"
+
+        def resolve(path: Path) -> Path:
+            return CaseInsensitiveAbsolutePath(path, known_to_exist_base_path=tmp_path)
+
+        assert resolve(tmp_path / "folder" / "file") == real_path
+
+        listed_dirs: list[str] = []
+        listdir = os.listdir
+
+        def counting_listdir(path: str) -> list[str]:
+            listed_dirs.append(path)
+            return listdir(path)
+
+        monkeypatch.setattr(os, "listdir", counting_listdir)
+        assert resolve(tmp_path / "FOLDER" / "FILE") == real_path
+        assert listed_dirs == []
+
+    def test_directory_listing_invalidated(self, tmp_path: Path) -> None:
+        (tmp_path / "File").touch()
+        set_old_mtime(tmp_path)
+        assert CaseInsensitiveAbsolutePath(tmp_path / "file").name == "File"
+
+        # The mtime changing is noticed.
+        (tmp_path / "File").rename(tmp_path / "FILE")
+        assert CaseInsensitiveAbsolutePath(tmp_path / "file").name == "FILE"
+
+        # Changes that keep the same mtime need explicit invalidation.
+        set_old_mtime(tmp_path, 1_100_000_000)
+        CaseInsensitiveAbsolutePath(tmp_path / "file")
+        (tmp_path / "FILE").rename(tmp_path / "file")
+        set_old_mtime(tmp_path, 1_100_000_000)
+        assert CaseInsensitiveAbsolutePath(tmp_path / "FILE").name == "FILE"
+        invalidate_case_insensitive_path_cache(tmp_path)
+        assert CaseInsensitiveAbsolutePath(tmp_path / "FILE").name == "file"
+
     def test_relative_path(self) -> None:
         with pytest.raises(RelativePathError):
             CaseInsensitiveAbsolutePath()
@@ -0,0 +1,654 @@
+"""
+Local stand-ins for the GLS, akamai and LotroInterface servers
+
+The servers run on a real localhost socket, so everything from the SOAP client to the
+akamai downloads goes through the normal network code. Latency, bandwidth, errors and
+how much content is served can all be configured for reproducible load.
+
+Every URL the servers hand out points back at them, so only the GLS datacenter service
+URL needs to be given to OneLauncher. `StandInServers.write_launcher_config` puts it in
+a game directory. Addon feed URLs are hardcoded in OneLauncher, so
+`StandInServers.get_addons_feed_url` has to be patched in.
+"""
+
+import hashlib
+import io
+import random
+import zipfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from functools import cache, partial
+from pathlib import Path
+from typing import Final
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+import attrs
+import h11
+import trio
+from defusedxml import ElementTree  # type: ignore[import-untyped]
+
+from onelauncher.addons.addon_info import AddonType
+from onelauncher.game_config import GameType
+
+GLS_NAMESPACE: Final = "http://www.turbine.com/SE/GLS"
+GAME_VERSION: Final = "3601.0066.7272.4024"
+BODY_CHUNK_SIZE: Final = 16 * 1024
+WRONG_PASSWORD_FAULT: Final = "No Subscriber Formal Entity was found."  # noqa: S105
+
+
+@attrs.define(kw_only=True)
+class StandInServersConfig:
+    """Can be changed while the servers are running"""
+
+    latency: float = 0
+    """Seconds before each response is sent"""
+    bandwidth: int | None = None
+    """Bytes per second that each response body is sent at"""
+    error_rate: float = 0
+    """Fraction of requests that fail with `error_status`"""
+    error_status: int = 503
+    failing_paths: frozenset[str] = frozenset()
+    """Lowercase path prefixes that always fail with `error_status`"""
+    seed: int = 0
+    """Seed for which requests fail from `error_rate`"""
+
+    datacenter_game_name: str = "LOTRO"
+    world_count: int = 3
+    username: str = "user"
+    password: str = "password"  # noqa: S105
+    subscription_count: int = 1
+    queue_length: int = 0
+    """How far back in the world login queue new tickets start"""
+    queue_advance: int = 1
+    """How far the world login queue advances every time it's polled"""
+    patching_file_count: int = 10
+    patching_file_size: int = 1024
+    """Bytes"""
+    splashscreen_count: int = 2
+    newsfeed_entry_count: int = 10
+    addon_count: int = 10
+    """Number of addons in each addon feed"""
+
+
+@attrs.frozen(kw_only=True)
+class StandInRequest:
+    method: str
+    path: str
+    """Includes the query string"""
+    status: int
+
+
+@attrs.frozen(kw_only=True)
+class _Response:
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "text/xml; charset=utf-8"
+
+
+class StandInServers:
+    def __init__(self, config: StandInServersConfig) -> None:
+        self.config = config
+        self.port: int = 0
+        self.requests: list[StandInRequest] = []
+        self._random = random.Random(config.seed)  # noqa: S311
+        self._now_serving_number = 1
+        self._queue_numbers: dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def gls_datacenter_service(self) -> str:
+        return f"{self.base_url}/GLS.DataCenterServer/Service.asmx"
+
+    @property
+    def auth_server(self) -> str:
+        return f"{self.base_url}/GLS.AuthServer/Service.asmx"
+
+    @property
+    def launcher_config_url(self) -> str:
+        return f"{self.base_url}/launcher/config.xml"
+
+    @property
+    def akamai_download_url(self) -> str:
+        return f"{self.base_url}/akamai"
+
+    def get_world_names(self) -> tuple[str, ...]:
+        return tuple(f"World{i}" for i in range(self.config.world_count))
+
+    def get_addons_feed_url(self, game_type: GameType, addon_type: AddonType) -> str:
+        """Replacement for `onelauncher.addons.addon_info.get_addons_feed_url`"""
+        return f"{self.base_url}/fav/{game_type.lower()}-{addon_type}.xml"
+
+    def write_launcher_config(
+        self, game_directory: Path, game_type: GameType = GameType.LOTRO
+    ) -> Path:
+        """Write a .launcherconfig file that points at the stand-in servers"""
+        launcher_config_path = game_directory / f"{game_type.lower()}.launcherconfig"
+        launcher_config_path.write_text(
+            _app_settings_xml(
+                {
+                    "Launcher.DataCenterService.GLS": self.gls_datacenter_service,
+                    "DataCenter.GameName": self.config.datacenter_game_name,
+                    "Product.DocumentFolder": "The Lord of the Rings Online",
+                }
+            )
+        )
+        return launcher_config_path
+
+    async def handle_connection(self, stream: trio.SocketStream) -> None:
+        connection = h11.Connection(h11.SERVER)
+        try:
+            while True:
+                received = await self._receive_request(stream, connection)
+                if received is None:
+                    return
+                request, body = received
+                await self._send_response(
+                    stream, connection, request, await self._respond(request, body)
+                )
+                if connection.our_state is h11.MUST_CLOSE:
+                    return
+                connection.start_next_cycle()
+        except (h11.ProtocolError, trio.BrokenResourceError):
+            return
+        finally:
+            await stream.aclose()
+
+    @staticmethod
+    async def _receive_request(
+        stream: trio.SocketStream, connection: h11.Connection
+    ) -> tuple[h11.Request, bytes] | None:
+        request: h11.Request | None = None
+        body = bytearray()
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                connection.receive_data(await stream.receive_some())
+            elif isinstance(event, h11.Request):
+                request = event
+            elif isinstance(event, h11.Data):
+                body += event.data
+            elif isinstance(event, h11.EndOfMessage):
+                assert request is not None
+                return request, bytes(body)
+            else:
+                # Connection closed
+                return None
+
+    async def _send_response(
+        self,
+        stream: trio.SocketStream,
+        connection: h11.Connection,
+        request: h11.Request,
+        response: _Response,
+    ) -> None:
+        self.requests.append(
+            StandInRequest(
+                method=request.method.decode(),
+                path=request.target.decode(),
+                status=response.status,
+            )
+        )
+        if self.config.latency:
+            await trio.sleep(self.config.latency)
+        await stream.send_all(
+            connection.send(
+                h11.Response(
+                    status_code=response.status,
+                    headers=[
+                        ("Content-Type", response.content_type),
+                        ("Content-Length", str(len(response.body))),
+                    ],
+                )
+            )
+            or b""
+        )
+        for start in range(0, len(response.body), BODY_CHUNK_SIZE):
+            chunk = response.body[start : start + BODY_CHUNK_SIZE]
+            await stream.send_all(connection.send(h11.Data(data=chunk)) or b"")
+            if self.config.bandwidth:
+                await trio.sleep(len(chunk) / self.config.bandwidth)
+        await stream.send_all(connection.send(h11.EndOfMessage()) or b"")
+
+    async def _respond(self, request: h11.Request, body: bytes) -> _Response:  # noqa: PLR0911
+        target = urlsplit(request.target.decode())
+        path = target.path.lower()
+        query = target.query.lower()
+        if path.startswith(tuple(self.config.failing_paths)) or (
+            self._random.random() < self.config.error_rate
+        ):
+            return _Response(status=self.config.error_status)
+
+        if path == "/gls.datacenterserver/service.asmx":
+            if query == "wsdl":
+                return _Response(body=_get_datacenter_wsdl(self.gls_datacenter_service))
+            return self._get_datacenters_response()
+        elif path == "/gls.authserver/service.asmx":
+            if query == "wsdl":
+                return _Response(body=_get_auth_wsdl(self.auth_server))
+            return self._login_account_response(body)
+        elif path == "/gls.datacenterserver/statusserver.aspx":
+            return self._world_status_response(parse_qs(target.query).get("s", [""])[0])
+        elif path == "/gls.authserver/loginqueue.aspx":
+            return self._login_queue_response(body)
+        elif path == "/launcher/config.xml":
+            return _Response(body=self._get_launcher_config().encode())
+        elif path.startswith("/akamai/"):
+            return self._akamai_response(path.removeprefix("/akamai/"))
+        elif path.startswith("/splashscreens/"):
+            return self._splashscreens_response(path.removeprefix("/splashscreens/"))
+        elif path.startswith("/news/"):
+            return _Response(body=self._get_newsfeed().encode())
+        elif path.startswith("/fav/"):
+            return _Response(body=self._get_addons_feed(path.removeprefix("/fav/")))
+        elif path.startswith("/downloads/"):
+            return self._addon_download_response(path.removeprefix("/downloads/"))
+        return _Response(status=404)
+
+    def _get_datacenters_response(self) -> _Response:
+        worlds = "".join(
+            f"<World><Name>{name}</Name><LoginServerUrl />"
+            f"<ChatServerUrl>127.0.0.1:{2900 + i}</ChatServerUrl>"
+            "<StatusServerUrl>"
+            + escape(f"{self.base_url}/GLS.DataCenterServer/StatusServer.aspx?s={name}")
+            + f"</StatusServerUrl><Order>{i}</Order></World>"
+            for i, name in enumerate(self.get_world_names())
+        )
+        return _soap_response(
+            "GetDatacenters",
+            "<GetDatacentersResult><Datacenter>"
+            f"<Name>{self.config.datacenter_game_name}</Name>"
+            f"<Worlds>{worlds}</Worlds>"
+            f"<AuthServer>{self.auth_server}</AuthServer>"
+            f"<PatchServer>{self.base_url}/patch</PatchServer>"
+            "<LauncherConfigurationServer>"
+            f"{self.launcher_config_url}"
+            "</LauncherConfigurationServer>"
+            "</Datacenter></GetDatacentersResult>",
+        )
+
+    def _login_account_response(self, body: bytes) -> _Response:
+        request = ElementTree.fromstring(body)
+        if (
+            request.findtext(f".//{{{GLS_NAMESPACE}}}username") != self.config.username
+            or request.findtext(f".//{{{GLS_NAMESPACE}}}password")
+            != self.config.password
+        ):
+            return _soap_fault(WRONG_PASSWORD_FAULT)
+        subscriptions = "".join(
+            "<GameSubscription>"
+            f"<Game>{self.config.datacenter_game_name}</Game>"
+            f"<Name>subscription{i}</Name>"
+            f"<Description>Subscription {i}</Description>"
+            "<ProductTokens><string>LOTRO</string></ProductTokens>"
+            "<CustomerServiceTokens />"
+            "<Status>Active</Status>"
+            "</GameSubscription>"
+            for i in range(self.config.subscription_count)
+        )
+        return _soap_response(
+            "LoginAccount",
+            "<LoginAccountResult>"
+            f"<Ticket>ticket-{self.config.username}</Ticket>"
+            f"<Subscriptions>{subscriptions}</Subscriptions>"
+            "</LoginAccountResult>",
+        )
+
+    def _world_status_response(self, world_name: str) -> _Response:
+        if world_name not in self.get_world_names():
+            return _Response(status=404)
+        queue_url = f"{self.base_url}/GLS.AuthServer/LoginQueue.aspx?world={world_name}"
+        return _Response(
+            body=(
+                "<Status>"
+                f"<name>{world_name}</name>"
+                "<logintiers>0</logintiers>"
+                "<world_full>false</world_full>"
+                "<loginservers>127.0.0.1:9000;</loginservers>"
+                "<logintierlastnumbers>0</logintierlastnumbers>"
+                "<logintiermultipliers>1</logintiermultipliers>"
+                "<queuenames>Main</queuenames>"
+                f"<queueurls>{escape(queue_url)};</queueurls>"
+                f"<nowservingqueuenumber>{self._now_serving_number:#x}"
+                "</nowservingqueuenumber>"
+                "<lastassignedqueuenumber>0x0</lastassignedqueuenumber>"
+                "<allow_billing_role>StandardUser,TurbineEmployee</allow_billing_role>"
+                "<deny_billing_role />"
+                "<allow_admin_role />"
+                "<deny_admin_role />"
+                "<farmid>1</farmid>"
+                "<wait_hint>0.5</wait_hint>"
+                "</Status>"
+            ).encode()
+        )
+
+    def _login_queue_response(self, body: bytes) -> _Response:
+        ticket = parse_qs(body.decode()).get("ticket", [""])[0]
+        if ticket not in self._queue_numbers:
+            self._queue_numbers[ticket] = (
+                self._now_serving_number + self.config.queue_length
+            )
+        else:
+            self._now_serving_number += self.config.queue_advance
+        return _Response(
+            body=(
+                "<Result><Command>TakeANumber</Command><HResult>0x00000000</HResult>"
+                f"<QueueName>Main</QueueName>"
+                f"<QueueNumber>{self._queue_numbers[ticket]:#x}</QueueNumber>"
+                f"<NowServingNumber>{self._now_serving_number:#x}</NowServingNumber>"
+                "<ContextNumber>0x1</ContextNumber></Result>"
+            ).encode()
+        )
+
+    def _get_launcher_config(self) -> str:
+        return _app_settings_xml(
+            {
+                "GameClient.WIN64.Filename": "lotroclient64.exe",
+                "GameClient.WIN32.Filename": "lotroclient.exe",
+                "GameClient.WIN32Legacy.Filename": "lotroclient_awesomium.exe",
+                "GameClient.WIN32.ArgTemplate": "-a {SUBSCRIPTION} -h {LOGIN} "
+                "--glsticketdirect {GLS} --chatserver {CHAT} --rodat on "
+                "--language {LANG} --gametype LOTRO --authserverurl {AUTHSERVERURL} "
+                "--glsticketlifetime {GLSTICKETLIFETIME}",
+                "GameClient.Arg.authserverurl": self.auth_server,
+                "GameClient.Arg.glsticketlifetime": "21600",
+                "Patching.ProductCode": self.config.datacenter_game_name,
+                "WorldQueue.LoginQueue.URL": (
+                    f"{self.base_url}/GLS.AuthServer/LoginQueue.aspx"
+                ),
+                "WorldQueue.TakeANumber.Parameters": "command=TakeANumber&subscription={0}"
+                "&ticket={1}&ticket_type=GLS&queue_url={2}",
+                "URL.NewsFeed": f"{self.base_url}/news/{{lang}}/launcher-feed.xml",
+                "URL.DownloadFilesList": (
+                    f"{self.base_url}/splashscreens/DownloadFilesList.xml"
+                ),
+                "URL.AkamaiDownloadURL": self.akamai_download_url,
+                "Game.Version": GAME_VERSION,
+            }
+        )
+
+    def _akamai_response(self, path: str) -> _Response:
+        version, _, name = path.partition("/")
+        if version != GAME_VERSION.lower():
+            return _Response(status=404)
+        if name.endswith("_download_list.xml"):
+            return _Response(body=self._get_patching_file_list().encode())
+        index = name.removeprefix("data/").removesuffix(".dat")
+        if not index.isdigit() or int(index) >= self.config.patching_file_count:
+            return _Response(status=404)
+        return _Response(
+            body=_get_file_content(int(index), self.config.patching_file_size),
+            content_type="application/octet-stream",
+        )
+
+    def _get_patching_file_list(self) -> str:
+        content_md5 = hashlib.md5(  # noqa: S324
+            _get_file_content(0, self.config.patching_file_size)
+        ).hexdigest()
+        files = "".join(
+            f"<File><From>data\\{i}.dat</From><To>data\\client_data_{i}.dat</To>"
+            f"<Size>{self.config.patching_file_size}</Size>"
+            # Every file has the same content after its first byte, and the hash
+            # isn't checked by OneLauncher. This just has to match the schema.
+            f"<MD5>{content_md5}</MD5></File>"
+            for i in range(self.config.patching_file_count)
+        )
+        return f"<FileList>{files}</FileList>"
+
+    def _splashscreens_response(self, name: str) -> _Response:
+        if name == "downloadfileslist.xml":
+            files = "".join(
+                "<File><Description>Splashscreen</Description>"
+                f"<FileName>raw\\en\\logo\\splash{i}.jpg</FileName>"
+                f"<DownloadUrl>{self.base_url}/splashscreens/splash{i}.jpg"
+                "</DownloadUrl></File>"
+                for i in range(self.config.splashscreen_count)
+            )
+            return _Response(body=f"<FileList>{files}</FileList>".encode())
+        return _Response(
+            body=_get_file_content(0, 4096), content_type="application/octet-stream"
+        )
+
+    def _get_newsfeed(self) -> str:
+        published = datetime(2024, 1, 1, tzinfo=UTC)
+        items = "".join(
+            f"<item><title>Update {i}</title>"
+            f"<link>{self.base_url}/news/{i}</link>"
+            f"<pubDate>{format_datetime(published + timedelta(days=i))}</pubDate>"
+            f"<description>Release notes for update {i}</description></item>"
+            for i in range(self.config.newsfeed_entry_count)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>News</title><link>{self.base_url}/news</link>{items}"
+            "</channel></rss>"
+        )
+
+    def _get_addons_feed(self, name: str) -> bytes:
+        addon_type = name.removesuffix(".xml").rpartition("-")[2]
+        addons = "".join(
+            f"<Ui><UID>{interface_id}</UID><UIName>{addon_type}{interface_id}</UIName>"
+            "<UIAuthorName>Author</UIAuthorName><UIVersion>1.0</UIVersion>"
+            "<UIUpdated>1700000000</UIUpdated><UICategory>Other</UICategory>"
+            "<UIFileURL>"
+            f"{self.base_url}/downloads/download{interface_id}-{addon_type}.zip"
+            "</UIFileURL></Ui>"
+            for interface_id in _get_addon_interface_ids(
+                addon_type, self.config.addon_count
+            )
+        )
+        return f"<UIList>{addons}</UIList>".encode()
+
+    def _addon_download_response(self, name: str) -> _Response:
+        interface_id, _, file_name = name.removeprefix("download").partition("-")
+        addon_type = file_name.removesuffix(".zip")
+        if interface_id not in _get_addon_interface_ids(
+            addon_type, self.config.addon_count
+        ):
+            return _Response(status=404)
+        return _Response(
+            body=_get_addon_zip(addon_type, interface_id),
+            content_type="application/zip",
+        )
+
+
+@asynccontextmanager
+async def open_stand_in_servers(
+    config: StandInServersConfig | None = None,
+) -> AsyncIterator[StandInServers]:
+    servers = StandInServers(config or StandInServersConfig())
+    async with trio.open_nursery() as nursery:
+        listeners: list[trio.SocketListener] = await nursery.start(
+            partial(trio.serve_tcp, servers.handle_connection, 0, host="127.0.0.1")
+        )
+        servers.port = listeners[0].socket.getsockname()[1]
+        try:
+            yield servers
+        finally:
+            nursery.cancel_scope.cancel()
+
+
+def _app_settings_xml(settings: dict[str, str]) -> str:
+    adds = "".join(
+        f"<add key={quoteattr(key)} value={quoteattr(value)} />"
+        for key, value in settings.items()
+    )
+    return f"<configuration><appSettings>{adds}</appSettings></configuration>"
+
+
+@cache
+def _get_file_content(index: int, size: int) -> bytes:
+    return bytes([index % 256]) + b"\0" * (size - 1) if size else b""
+
+
+def _get_addon_interface_ids(addon_type: str, addon_count: int) -> tuple[str, ...]:
+    offset = {"plugin": 1000, "skin": 2000, "music": 3000}.get(addon_type, 0)
+    return tuple(str(offset + i) for i in range(addon_count))
+
+
+@cache
+def _get_addon_zip(addon_type: str, interface_id: str) -> bytes:
+    name = f"{addon_type}{interface_id}"
+    zip_bytes = io.BytesIO()
+    with zipfile.ZipFile(zip_bytes, "w") as archive:
+        if addon_type == "plugin":
+            archive.writestr(
+                f"Author/{name}.plugin",
+                f"<Plugin><Information><Name>{name}</Name><Author>Author</Author>"
+                f"<Version>1.0</Version></Information>"
+                f"<Package>Author.{name}.Main</Package></Plugin>",
+            )
+            archive.writestr(f"Author/{name}/Main.lua", "")
+        elif addon_type == "music":
+            archive.writestr(f"{name}/song.abc", f"X: 1\nT: {name}\nZ: Author\n")
+        else:
+            archive.writestr(f"{name}/SkinDefinition.xml", "<opt />")
+    return zip_bytes.getvalue()
+
+
+def _soap_response(operation: str, result: str) -> _Response:
+    return _Response(
+        body=(
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            f'<soap:Body><{operation}Response xmlns="{GLS_NAMESPACE}">{result}'
+            f"</{operation}Response></soap:Body></soap:Envelope>"
+        ).encode()
+    )
+
+
+def _soap_fault(message: str) -> _Response:
+    return _Response(
+        status=500,
+        body=(
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            "<soap:Body><soap:Fault><faultcode>soap:Server</faultcode>"
+            f"<faultstring>{escape(message)}</faultstring>"
+            "</soap:Fault></soap:Body></soap:Envelope>"
+        ).encode(),
+    )
+
+
+def _wsdl(
+    service_name: str, service_url: str, operations: dict[str, str], types: str
+) -> bytes:
+    """
+    Args:
+        operations (dict[str, str]): Operation names and their request parameter
+            elements
+        types (str): Schema types. There must be an `{operation}Result` type for each
+            operation.
+    """
+    elements = "".join(
+        f'<s:element name="{operation}"><s:complexType><s:sequence>{parameters}'
+        f'</s:sequence></s:complexType></s:element><s:element name="{operation}'
+        'Response"><s:complexType><s:sequence><s:element minOccurs="0" '
+        f'name="{operation}Result" type="tns:{operation}Result" /></s:sequence>'
+        "</s:complexType></s:element>"
+        for operation, parameters in operations.items()
+    )
+    messages = "".join(
+        f'<wsdl:message name="{operation}SoapIn"><wsdl:part name="parameters" '
+        f'element="tns:{operation}" /></wsdl:message>'
+        f'<wsdl:message name="{operation}SoapOut"><wsdl:part name="parameters" '
+        f'element="tns:{operation}Response" /></wsdl:message>'
+        for operation in operations
+    )
+    port_operations = "".join(
+        f'<wsdl:operation name="{operation}">'
+        f'<wsdl:input message="tns:{operation}SoapIn" />'
+        f'<wsdl:output message="tns:{operation}SoapOut" /></wsdl:operation>'
+        for operation in operations
+    )
+    binding_operations = "".join(
+        f'<wsdl:operation name="{operation}"><soap:operation '
+        f'soapAction="{GLS_NAMESPACE}/{operation}" style="document" />'
+        '<wsdl:input><soap:body use="literal" /></wsdl:input>'
+        '<wsdl:output><soap:body use="literal" /></wsdl:output></wsdl:operation>'
+        for operation in operations
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<wsdl:definitions xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" '
+        'xmlns:s="http://www.w3.org/2001/XMLSchema" '
+        'xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/" '
+        f'xmlns:tns="{GLS_NAMESPACE}" targetNamespace="{GLS_NAMESPACE}">'
+        "<wsdl:types>"
+        f'<s:schema elementFormDefault="qualified" targetNamespace="{GLS_NAMESPACE}">'
+        f"{elements}{types}</s:schema></wsdl:types>{messages}"
+        f'<wsdl:portType name="{service_name}Soap">{port_operations}</wsdl:portType>'
+        f'<wsdl:binding name="{service_name}Soap" type="tns:{service_name}Soap">'
+        '<soap:binding transport="http://schemas.xmlsoap.org/soap/http" />'
+        f"{binding_operations}</wsdl:binding>"
+        f'<wsdl:service name="{service_name}"><wsdl:port name="{service_name}Soap" '
+        f'binding="tns:{service_name}Soap"><soap:address location="{service_url}" />'
+        "</wsdl:port></wsdl:service></wsdl:definitions>"
+    ).encode()
+
+
+def _string_elements(*names: str) -> str:
+    return "".join(
+        f'<s:element minOccurs="0" name="{name}" type="s:string" />' for name in names
+    )
+
+
+def _get_datacenter_wsdl(service_url: str) -> bytes:
+    return _wsdl(
+        "DatacenterService",
+        service_url,
+        {"GetDatacenters": _string_elements("game")},
+        '<s:complexType name="GetDatacentersResult"><s:sequence>'
+        '<s:element minOccurs="0" maxOccurs="unbounded" name="Datacenter" '
+        'type="tns:Datacenter" /></s:sequence></s:complexType>'
+        '<s:complexType name="Datacenter"><s:sequence>'
+        + _string_elements("Name")
+        + '<s:element minOccurs="0" name="Worlds" type="tns:ArrayOfWorld" />'
+        + _string_elements("AuthServer", "PatchServer", "LauncherConfigurationServer")
+        + "</s:sequence></s:complexType>"
+        '<s:complexType name="ArrayOfWorld"><s:sequence>'
+        '<s:element minOccurs="0" maxOccurs="unbounded" name="World" '
+        'type="tns:World" /></s:sequence></s:complexType>'
+        '<s:complexType name="World"><s:sequence>'
+        + _string_elements("Name", "LoginServerUrl", "ChatServerUrl", "StatusServerUrl")
+        + '<s:element minOccurs="0" name="Order" type="s:int" />'
+        "</s:sequence></s:complexType>",
+    )
+
+
+def _get_auth_wsdl(service_url: str) -> bytes:
+    return _wsdl(
+        "AuthService",
+        service_url,
+        {"LoginAccount": _string_elements("username", "password", "additionalInfo")},
+        '<s:complexType name="LoginAccountResult"><s:sequence>'
+        + _string_elements("Ticket")
+        + '<s:element minOccurs="0" name="Subscriptions" '
+        'type="tns:ArrayOfGameSubscription" /></s:sequence></s:complexType>'
+        '<s:complexType name="ArrayOfGameSubscription"><s:sequence>'
+        '<s:element minOccurs="0" maxOccurs="unbounded" name="GameSubscription" '
+        'type="tns:GameSubscription" /></s:sequence></s:complexType>'
+        '<s:complexType name="GameSubscription"><s:sequence>'
+        + _string_elements("Game", "Name", "Description")
+        + '<s:element minOccurs="0" name="ProductTokens" type="tns:ArrayOfString" />'
+        '<s:element minOccurs="0" name="CustomerServiceTokens" '
+        'type="tns:ArrayOfString" />'
+        + _string_elements(
+            "ExpirationDate",
+            "Status",
+            "NextBillingDate",
+            "PendingCancelDate",
+            "AutoRenew",
+            "BillingSystemTime",
+            "AdditionalInfo",
+        )
+        + "</s:sequence></s:complexType>"
+        '<s:complexType name="ArrayOfString"><s:sequence>'
+        '<s:element minOccurs="0" maxOccurs="unbounded" name="string" '
+        'type="s:string" /></s:sequence></s:complexType>',
+    )